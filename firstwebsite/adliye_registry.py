@@ -0,0 +1,241 @@
+"""
+Adliye listesi kayıt defteri
+
+adliyelist.txt bir kez ayrıştırılır ve dosya değişene kadar (mtime) bellekte
+tutulur. Ayrıştırılan liste üzerinde şu dizinler kurulur:
+
+    - şehir -> adliyeler
+    - adliye -> şehir
+    - normalize edilmiş ad üzerinde önek araması için trie
+
+Liste ayrıca JSON olarak (ETag ile) sunulabilecek şekilde önceden
+serileştirilir.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADLIYE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'adliyelist.txt')
+
+# Önek aramasında döndürülecek varsayılan en fazla sonuç
+DEFAULT_SEARCH_LIMIT = 20
+
+_TURKISH_LOWER = str.maketrans({'İ': 'i', 'I': 'ı'})
+_TRIE_END = '$'
+
+
+def normalize_name(name):
+    """
+    Adliye/şehir adını karşılaştırma için normalize eder
+
+    Türkçe büyük/küçük harf dönüşümü yapılır, şapkalı harflerin şapkası
+    kaldırılır ve boşluklar tekleştirilir ('Kâhta' -> 'kahta').
+    """
+    text = (name or '').translate(_TURKISH_LOWER).lower()
+    text = text.replace('â', 'a').replace('î', 'i').replace('û', 'u')
+    text = unicodedata.normalize('NFC', text)
+    return ' '.join(text.split())
+
+
+def base_name(courthouse):
+    """Parantez içi açıklamayı atar: 'Adana (Merkez ACM)' -> 'Adana'"""
+    return courthouse.split('(', 1)[0].strip()
+
+
+@dataclass(frozen=True)
+class AdliyeSnapshot:
+    """Ayrıştırılmış adliye listesinin değişmez görüntüsü"""
+    cities_courthouses: Dict[str, List[str]]
+    cities: List[str]
+    courthouse_city: Dict[str, str]
+    normalized_city: Dict[str, str]
+    trie: dict
+    json_bytes: bytes
+    etag: str
+    mtime: float = 0.0
+    courthouse_count: int = field(default=0)
+
+
+def _parse_lines(lines):
+    """adliyelist.txt satırlarını şehir -> adliyeler sözlüğüne çevirir"""
+    cities_courthouses = {}
+    data_lines = [line.strip() for line in lines
+                  if line.strip() and not line.startswith('İl\t') and not line.startswith('___')]
+    for line in data_lines:
+        parts = line.split('\t', 1)
+        if len(parts) == 2:
+            city, courthouses_str = parts
+            # Adliye adları ACM açıklamalarıyla birlikte korunur
+            cities_courthouses[city.strip()] = [
+                ch.strip() for ch in re.split(r'\s*,\s*|\s*•\s*', courthouses_str) if ch.strip()
+            ]
+
+    # İstanbul adliyeleri ön yüzde sabit tanımlı olduğundan listede boş da olsa yer alır
+    if 'İstanbul' not in cities_courthouses:
+        cities_courthouses['İstanbul'] = []
+    return cities_courthouses
+
+
+def _order_cities(cities_courthouses):
+    """Şehirleri sıralar: İstanbul başta, İzmir Isparta'dan hemen sonra"""
+    cities = sorted(cities_courthouses.keys())
+    if 'İstanbul' in cities:
+        cities.remove('İstanbul')
+        cities.insert(0, 'İstanbul')
+    if 'İzmir' in cities and 'Isparta' in cities:
+        cities.remove('İzmir')
+        cities.insert(cities.index('Isparta') + 1, 'İzmir')
+    return cities
+
+
+def _trie_insert(trie, key, value):
+    node = trie
+    for char in key:
+        node = node.setdefault(char, {})
+    entries = node.setdefault(_TRIE_END, [])
+    if value not in entries:
+        entries.append(value)
+
+
+def build_snapshot(cities_courthouses, mtime=0.0):
+    """Şehir -> adliyeler sözlüğünden dizinli görüntüyü kurar"""
+    cities = _order_cities(cities_courthouses)
+    courthouse_city = {}
+    normalized_city = {}
+    trie = {}
+    count = 0
+    for city in cities:
+        normalized_city.setdefault(normalize_name(city), city)
+        for courthouse in cities_courthouses[city]:
+            count += 1
+            courthouse_city.setdefault(courthouse, city)
+            entry = (courthouse, city)
+            for key in {normalize_name(courthouse), normalize_name(base_name(courthouse))}:
+                normalized_city.setdefault(key, city)
+                _trie_insert(trie, key, entry)
+
+    json_bytes = json.dumps(cities_courthouses, ensure_ascii=False).encode('utf-8')
+    return AdliyeSnapshot(
+        cities_courthouses=cities_courthouses,
+        cities=cities,
+        courthouse_city=courthouse_city,
+        normalized_city=normalized_city,
+        trie=trie,
+        json_bytes=json_bytes,
+        etag=hashlib.sha1(json_bytes).hexdigest(),
+        mtime=mtime,
+        courthouse_count=count
+    )
+
+
+class AdliyeRegistry:
+    """
+    Adliye listesine dizinli erişim
+
+    Dosya yalnızca ilk erişimde ve değişiklik zamanı değiştiğinde yeniden
+    ayrıştırılır. Döndürülen sözlük ve listeler paylaşımlıdır,
+    değiştirilmemelidir.
+    """
+
+    def __init__(self, filepath=DEFAULT_ADLIYE_FILE):
+        self.filepath = filepath
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> AdliyeSnapshot:
+        """Güncel görüntüyü döndürür; dosya değiştiyse yeniden yükler"""
+        try:
+            mtime = os.path.getmtime(self.filepath)
+        except OSError:
+            mtime = None
+
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.mtime == mtime:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.mtime != mtime:
+                snapshot = self._load(mtime)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _load(self, mtime):
+        if mtime is None:
+            logger.error(f"Adliye listesi bulunamadı: {self.filepath}")
+            return build_snapshot({}, mtime=None)
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                cities_courthouses = _parse_lines(f.readlines())
+        except Exception as e:
+            logger.error(f"Adliye listesi ayrıştırılamadı {self.filepath}: {str(e)}")
+            return build_snapshot({}, mtime=mtime)
+        snapshot = build_snapshot(cities_courthouses, mtime=mtime)
+        logger.info(f"Adliye listesi yüklendi: {len(snapshot.cities)} şehir, {snapshot.courthouse_count} adliye")
+        return snapshot
+
+    def cities_and_courthouses(self) -> Tuple[Dict[str, List[str]], List[str]]:
+        """parse_adliye_list ile aynı biçimde (şehir -> adliyeler, sıralı şehirler) döndürür"""
+        snapshot = self.snapshot()
+        return snapshot.cities_courthouses, snapshot.cities
+
+    def find_city(self, courthouse) -> Optional[str]:
+        """
+        Adliyenin bağlı olduğu şehri bulur
+
+        Sırasıyla tam ad, normalize edilmiş ad ve önek eşleşmesi denenir
+        ('Adana' -> 'Adana (Merkez ACM)' -> 'Adana').
+        """
+        if not courthouse:
+            return None
+        snapshot = self.snapshot()
+        city = snapshot.courthouse_city.get(courthouse)
+        if city:
+            return city
+        key = normalize_name(courthouse)
+        city = snapshot.normalized_city.get(key) or snapshot.normalized_city.get(normalize_name(base_name(courthouse)))
+        if city:
+            return city
+        matches = self.search(courthouse, limit=1)
+        return matches[0][1] if matches else None
+
+    def search(self, prefix, limit=DEFAULT_SEARCH_LIMIT) -> List[Tuple[str, str]]:
+        """
+        Normalize edilmiş ad önekine göre adliye arar
+
+        Returns:
+            List[Tuple[str, str]]: (adliye, şehir) çiftleri
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        node = self.snapshot().trie
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        results = []
+        stack = [node]
+        while stack and len(results) < limit:
+            current = stack.pop()
+            for entry in current.get(_TRIE_END, []):
+                if entry not in results:
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+            stack.extend(current[char] for char in sorted(
+                (c for c in current if c != _TRIE_END), reverse=True))
+        return results
+
+
+adliye_registry = AdliyeRegistry()
@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from flask import Flask, render_template, request, url_for, flash, redirect, jsonify, session, send_from_directory, send_file, make_response, current_app, Response
+from flask import render_template, request, url_for, flash, redirect, jsonify, session, send_from_directory, send_file, make_response, current_app, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from datetime import datetime, timedelta, date, time
@@ -27,3692 +27,41 @@ except locale.Error:
 import subprocess
 import tempfile
 from flask_mail import Mail, Message
-from bs4 import BeautifulSoup
 from email_utils import send_calendar_event_assignment_email, send_calendar_event_reminder_email
-import requests
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from flask_wtf.csrf import CSRFProtect # CSRF Koruması için eklendi
-from models import db, User, ActivityLog, Client, Payment, Document, Notification, Expense, CaseFile, Announcement, CalendarEvent, WorkerInterview, IsciGorusmeTutanagi, DilekceKategori, OrnekDilekce, OrnekSozlesme
+from models import db, User, ActivityLog, Client, Payment, Document, Notification, Expense, CaseFile, Announcement, CalendarEvent, WorkerInterview, IsciGorusmeTutanagi, DilekceKategori, OrnekDilekce, OrnekSozlesme, UyapIs, FaizOrani
+from app_factory import create_app
+from extensions import csrf
+from permissions import permission_required
+from hesaplama_routes import hesaplama_bp
 import uuid
-from PIL import Image
 from functools import wraps
-from yargi_integration import yargi_integration
-from uyap_integration_advanced import UYAPManager, UyapFile
+from document_previews import get_preview_dir, get_preview_manifest, get_preview_source, schedule_previews, remove_previews, is_preview_pending
+from dilekce_previews import get_rendition, prepare_rendition, schedule_rendition, invalidate_renditions
+from adliye_registry import adliye_registry
+from tarife_catalogue import tarife_registry
+from faiz_oranlari import faiz_oranlari, RATE_TYPES
+from uyap_bulk_import import UYAPBulkImporter
+from uyap_jobs import UYAPJobQueue
 from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 import re
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from html import escape  # HTML escape için bu modülü kullanacağız
-from fpdf import FPDF
-from xhtml2pdf import pisa
 import glob # Add glob import
 from sqlalchemy import func, desc
 import shutil
-import mammoth
-import pdfkit
 import logging # Logging için eklendi
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
 import traceback # traceback importu eklendi
 
-# Flask-Admin imports
-from flask_admin import Admin, AdminIndexView, BaseView, expose
-from flask_admin.contrib.sqla import ModelView
-from flask_admin.actions import action # Import action decorator
-from markupsafe import Markup # For rendering HTML in actions
-
-# Helper function to parse adliyelist.txt
-def parse_adliye_list(filepath='../adliyelist.txt'): # Adjusted path
-    cities_courthouses = {}
-    try:
-        # Ensure the path is correct relative to app.py location
-        script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
-        abs_file_path = os.path.join(script_dir, filepath)
-
-        with open(abs_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            # Skip header and potential separator lines
-            data_lines = [line.strip() for line in lines if line.strip() and not line.startswith('İl\t') and not line.startswith('___')]
-            current_city = None
-            for line in data_lines:
-                parts = line.split('\t', 1)
-                if len(parts) == 2:
-                    city, courthouses_str = parts
-                    current_city = city.strip()
-                    # Process courthouses string: split by comma or bullet, handle ACM markers etc.
-                    # Keep the original names including ACM details
-                    courthouses = [ch.strip() for ch in re.split(r'\s*,\s*|\s*•\s*', courthouses_str) if ch.strip()]
-                    cities_courthouses[current_city] = courthouses
-                # Removed the elif part as it's unlikely based on file structure
-    except FileNotFoundError:
-        print(f"Error: {abs_file_path} not found.")
-        return {}, []
-    except Exception as e:
-        print(f"Error parsing {abs_file_path}: {e}")
-        return {}, []
-
-    # İstanbul'u şehir listesine manuel olarak ekle (zaten varsa sorun değil)
-    if 'İstanbul' not in cities_courthouses:
-        # İstanbul adliyeleri bu listede olmayacak, çünkü bunlar hardcoded olarak frontend'de tanımlanmış
-        cities_courthouses['İstanbul'] = []  
-        
-    # Önce standart alfabetik sıralama
-    cities = sorted(cities_courthouses.keys())
-    
-    # Özel sıralama için listeyi yeniden düzenle
-    # İstanbul'u listeden çıkar ve en başa ekle
-    if 'İstanbul' in cities:
-        cities.remove('İstanbul')
-        cities.insert(0, 'İstanbul')
-    
-    # İzmir'i Isparta'dan sonra getir
-    if 'İzmir' in cities and 'Isparta' in cities:
-        izmir_index = cities.index('İzmir')
-        isparta_index = cities.index('Isparta')
-        
-        # İzmir'i çıkar
-        cities.remove('İzmir')
-        
-        # Isparta'dan sonraya ekle
-        cities.insert(isparta_index + 1, 'İzmir')
-    
-    # İstanbul'un listede olduğundan emin olalım
-    if 'İstanbul' in cities:
-        print("İstanbul şehir listesinde mevcut.")
-    else:
-        print("UYARI: İstanbul şehir listesine eklenemedi!")
-        
-    return cities_courthouses, cities
-
-def permission_required(permission):
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not current_user.is_authenticated:
-                flash('Bu işlem için giriş yapmanız gerekmektedir.', 'error')
-                return redirect(url_for('login', next=request.url))
-            
-            # Admin kontrolü ekle - Admin her şeyi yapabilir
-            if current_user.is_admin:
-                return f(*args, **kwargs)
-                
-            # Normal kullanıcılar için yetki kontrolü yap
-            if not current_user.has_permission(permission):
-                # Hangi yetkiye ihtiyaç duyulduğunu belirten bir hata mesajı
-                permission_names = {
-                    'dosya_sorgula': 'Dosya Sorgulama',
-                    'dosya_ekle': 'Dosya Ekleme', 
-                    'dosya_duzenle': 'Dosya Düzenleme',
-                    'dosya_sil': 'Dosya Silme',
-                    'takvim_goruntule': 'Takvim Görüntüleme',
-                    'etkinlik_goruntule': 'Etkinlik Görüntüleme',
-                    'etkinlik_ekle': 'Etkinlik Ekleme',
-                    'etkinlik_duzenle': 'Etkinlik Düzenleme',
-                    'etkinlik_sil': 'Etkinlik Silme',
-                    'duyuru_goruntule': 'Duyuru Görüntüleme',
-                    'duyuru_ekle': 'Duyuru Ekleme',
-                    'duyuru_duzenle': 'Duyuru Düzenleme',
-                    'duyuru_sil': 'Duyuru Silme',
-                    'odeme_goruntule': 'Ödeme Görüntüleme',
-                    'odeme_ekle': 'Ödeme Ekleme',
-                    'odeme_duzenle': 'Ödeme Düzenleme',
-                    'odeme_sil': 'Ödeme Silme',
-                    'faiz_hesaplama': 'Faiz Hesaplama',
-                    'harc_hesaplama': 'Harç Hesaplama',
-                    'isci_hesaplama': 'İşçi Alacağı Hesaplama',
-                    'vekalet_hesaplama': 'Vekalet Ücreti Hesaplama',
-                    'ceza_infaz_hesaplama': 'Ceza İnfaz Hesaplama',
-                    'rapor_goruntule': 'Rapor Görüntüleme',
-                    'rapor_olustur': 'Rapor Oluşturma',
-                    'musteri_goruntule': 'Müşteri Görüntüleme',
-                    'musteri_ekle': 'Müşteri Ekleme',
-                    'musteri_duzenle': 'Müşteri Düzenleme',
-                    'musteri_sil': 'Müşteri Silme',
-                    'panel_goruntule': 'Panel Görüntüleme',
-                    'ayarlar': 'Ayarlar Erişimi',
-                    'isci_gorusme_goruntule': 'İşçi Görüşme Görüntüleme',
-                    'isci_gorusme_ekle': 'İşçi Görüşme Ekleme',
-                    'isci_gorusme_duzenle': 'İşçi Görüşme Düzenleme',
-                    'isci_gorusme_sil': 'İşçi Görüşme Silme',
-                    'ornek_dilekceler': 'Örnek Dilekçeler',
-                    'ornek_sozlesmeler': 'Örnek Sözleşmeler',
-                    'ucret_tarifeleri': 'Ücret Tarifeleri',
-                    'yargi_kararlari_arama': 'Yargı Kararları Arama',
-                    'veritabani_yonetimi': 'Veritabanı Yönetimi'
-                }
-                
-                permission_name = permission_names.get(permission, permission)
-                flash(f'Bu işlem için "{permission_name}" yetkisine sahip olmanız gerekiyor.', 'error')
-                
-                # API isteklerinde JSON yanıtı döndür, sayfa isteklerinde anasayfaya yönlendir
-                if request.is_json:
-                    return jsonify({'success': False, 'error': f'Yetkiniz yok: {permission_name}'}), 403
-                    
-                return redirect(url_for('anasayfa'))
-                
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
-app = Flask(__name__, static_url_path='/static')
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SECRET_KEY'] = 'your_secret_key'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'instance', 'database.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'uploads/'
-app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'ornek_dilekceler') # Yeni eklendi
-app.config['UYAP_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'uyap') # UYAP dosyaları için
-# CSRF için WTF_CSRF_ENABLED=True (varsayılan olarak True'dur ama açıkça belirtmek iyi olabilir)
-app.config['WTF_CSRF_ENABLED'] = True
-# SECRET_KEY zaten yukarıda tanımlı, CSRF için de kullanılır.
-
-# E-posta konfigürasyonu (.env dosyasından) - Gmail kullan
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USE_SSL'] = False
-app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_ASCII_ATTACHMENTS'] = False  # Türkçe karakter desteği için
-app.config['MAIL_DEFAULT_CHARSET'] = 'utf-8'  # UTF-8 charset ayarla
-app.config['MAIL_SUPPRESS_SEND'] = False
-app.config['MAIL_DEBUG'] = True  # Debug modunu aç
-
-db.init_app(app)
-migrate = Migrate(app, db)
-mail = Mail(app)
-csrf = CSRFProtect(app) # CSRF korumasını başlat
-
-# Login manager setup
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
-login_manager.login_message = 'Lütfen giriş yapın.'
-login_manager.login_message_category = 'info'
-
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
-
-# --- Flask-Admin Setup ---
-
-# Secure Admin Index View
-class MyAdminIndexView(AdminIndexView):
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-    
-    def inaccessible_callback(self, name, **kwargs):
-        # Redirect non-admins or non-authenticated users to login page
-        flash('Bu sayfaya erişmek için admin yetkilerine sahip olmanız gerekiyor.', 'error')
-        return redirect(url_for('login'))
-    
-    @expose('/')
-    def index(self):
-        stats = {
-            'total_users': User.query.count(),
-            'pending_users': User.query.filter_by(is_approved=False).count(),
-            'total_case_files': CaseFile.query.count(),
-            'active_case_files': CaseFile.query.filter_by(status='Aktif').count(),
-            'total_hearings': CalendarEvent.query.filter(CalendarEvent.event_type.in_(['durusma', 'e-durusma'])).count(),
-            'total_payments': Payment.query.count(),
-            'total_expenses': Expense.query.count(),
-            'total_documents': Document.query.count(),
-        }
-        self._template_args['stats'] = stats
-        self._template_args['admin_view'] = self
-        return super(MyAdminIndexView, self).index()
-
-    # Özel dizayn ekliyoruz
-    @expose('/admin/back_to_app')
-    def back_to_app(self):
-        return redirect(url_for('anasayfa'))
-
-# Secure Model View
-class SecureModelView(ModelView):
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
-    def inaccessible_callback(self, name, **kwargs):
-        flash("Bu sayfaya erişim yetkiniz yok.", "error")
-        return redirect(url_for('login', next=request.url))
-
-# User Model View Customization
-class UserView(SecureModelView):
-    column_exclude_list = ['password_hash']
-    form_excluded_columns = ['password_hash', 'activities']
-    column_searchable_list = ['username', 'email', 'first_name', 'last_name']
-    column_filters = ['role', 'is_admin', 'is_approved']
-    column_list = ('username', 'email', 'first_name', 'last_name', 'role', 'is_admin', 'is_approved', 'created_at')
-    column_labels = dict(username='Kullanıcı Adı', email='E-posta', first_name='Ad', last_name='Soyad', role='Rol', is_admin='Admin?', is_approved='Onaylı?', created_at='Kayıt Tarihi')
-    
-    can_create = True
-    can_edit = True
-    can_delete = True
-
-    # Kullanıcı onaylama eylemi
-    @action('approve', 'Seçili Kullanıcıları Onayla', 'Seçili kullanıcıları onaylamak istediğinizden emin misiniz?')
-    def action_approve(self, ids):
-        try:
-            query = User.query.filter(User.id.in_(ids))
-            count = 0
-            for user in query.all():
-                if not user.is_approved:
-                    user.is_approved = True
-                    user.approval_date = datetime.now()
-                    user.approved_by = current_user.id
-                    count += 1
-            db.session.commit()
-            flash(f'{count} kullanıcı başarıyla onaylandı.', 'success')
-        except Exception as ex:
-            if not self.handle_view_exception(ex):
-                raise
-            flash(f'Kullanıcılar onaylanırken hata oluştu: {ex}', 'error')
-
-    # Kullanıcı onay durumunu değiştirme eylemi
-    @action('toggle_approval', 'Seçili Kullanıcıların Onay Durumunu Değiştir', 'Seçili kullanıcıların onay durumunu değiştirmek istediğinizden emin misiniz?')
-    def action_toggle_approval(self, ids):
-        try:
-            query = User.query.filter(User.id.in_(ids))
-            approved_count = 0
-            disapproved_count = 0
-            for user in query.all():
-                if user.is_approved:
-                    user.is_approved = False
-                    user.approval_date = None
-                    user.approved_by = None
-                    disapproved_count += 1
-                else:
-                    user.is_approved = True
-                    user.approval_date = datetime.now()
-                    user.approved_by = current_user.id
-                    approved_count += 1
-            db.session.commit()
-            flash(f'{approved_count} kullanıcı onaylandı, {disapproved_count} kullanıcının onayı kaldırıldı.', 'success')
-        except Exception as ex:
-            if not self.handle_view_exception(ex):
-                raise
-            flash(f'Onay durumu değiştirilirken hata oluştu: {ex}', 'error')
-
-# ActivityLog için özel view (ilişkili alanları göstermek için)
-class ActivityLogView(SecureModelView):
-    can_create = False
-    can_edit = False
-    can_delete = True # Logları silebilme (opsiyonel)
-    column_list = ('timestamp', 'user', 'activity_type', 'description', 'related_case', 'related_event')
-    column_labels = dict(timestamp='Zaman Damgası', user='Kullanıcı', activity_type='İşlem Türü', description='Açıklama', related_case='İlgili Dosya', related_event='İlgili Etkinlik')
-    column_formatters = {
-        'user': lambda v, c, m, p: m.user.get_full_name() if m.user else '-',
-        'related_case': lambda v, c, m, p: f"{m.case.client_name} ({m.case.year}/{m.case.case_number})" if m.case else '-',
-        'related_event': lambda v, c, m, p: m.event.title if m.event else '-'
-    }
-    column_filters = ('activity_type', 'user.username', 'timestamp')
-    column_searchable_list = ('description', 'user.username', 'activity_type')
-    column_default_sort = ('timestamp', True) # En son işlem en üstte
-
-# Initialize Flask-Admin
-admin = Admin(app, name='Veri Kontrol', template_mode='bootstrap4', index_view=MyAdminIndexView())
-
-# Add Admin Views for your models
-admin.add_view(UserView(User, db.session, name='Kullanıcılar'))
-admin.add_view(SecureModelView(CaseFile, db.session, name='Dosyalar'))
-admin.add_view(SecureModelView(CalendarEvent, db.session, name='Takvim Etkinlikleri'))
-admin.add_view(SecureModelView(Document, db.session, name='Belgeler'))
-admin.add_view(SecureModelView(Expense, db.session, name='Masraflar'))
-admin.add_view(SecureModelView(Client, db.session, name='Müşteri Ödemeleri'))
-admin.add_view(SecureModelView(Payment, db.session, name='Ödemeler (Taksit)'))
-admin.add_view(SecureModelView(Announcement, db.session, name='Duyurular'))
-admin.add_view(ActivityLogView(ActivityLog, db.session, name='İşlem Kayıtları')) # Özel view kullanıldı
-admin.add_view(SecureModelView(WorkerInterview, db.session, name='İşçi Görüşme (Eski)'))
-admin.add_view(SecureModelView(IsciGorusmeTutanagi, db.session, name='İşçi Görüşme Tutanağı'))
-admin.add_view(SecureModelView(Notification, db.session, name='Bildirimler'))
-admin.add_view(SecureModelView(DilekceKategori, db.session, name='Örnek Dilekçe Kategorileri')) # Örnek Dilekçe Kategori için Admin View
-admin.add_view(SecureModelView(OrnekDilekce, db.session, name='Örnek Dilekçeler')) # Örnek Dilekçeler için Admin View
-admin.add_view(SecureModelView(OrnekSozlesme, db.session, name='Örnek Sözleşmeler')) # Yeni eklendi
-
-# --- End Flask-Admin Setup ---
-
-# Auth routes
-def logout():
-    logout_user()
-    return redirect(url_for('login'))
-
-@app.route('/profile')
-@login_required
-def profile():
-    return render_template('profile.html')
-
-@app.route('/settings')
-@login_required
-def settings():
-    return render_template('settings.html')
-
-@app.route('/update_profile', methods=['GET', 'POST'])
-@login_required
-def update_profile():
-    if request.method == 'POST':
-        try:
-            user = User.query.get(current_user.id)
-            
-            # Profil resmi yükleme işlemi
-            if 'profile_image' in request.files:
-                file = request.files['profile_image']
-                if file and allowed_file(file.filename):
-                    try:
-                        # Eski profil resmini sil (varsayılan resim hariç)
-                        if user.profile_image and user.profile_image != 'images/pp.png':
-                            old_image_path = os.path.join(app.static_folder, user.profile_image)
-                            if os.path.exists(old_image_path):
-                                os.remove(old_image_path)
-                        
-                        # Yeni resmi kaydet
-                        filename = secure_filename(file.filename)
-                        unique_filename = f"images/profile_{user.id}_{int(pytime.time())}_{filename}"
-                        filepath = os.path.join(app.static_folder, unique_filename)
-                        
-                        # Resmi boyutlandır ve kaydet
-                        image = Image.open(file)
-                        image = image.convert('RGB')  # PNG'yi JPG'ye çevir
-                        
-                        # En-boy oranını koru ve 300x300 boyutuna getir
-                        output_size = (300, 300)
-                        image.thumbnail(output_size, Image.Resampling.LANCZOS)
-                        
-                        # Kare crop için merkezi al
-                        width, height = image.size
-                        left = (width - min(width, height))/2
-                        top = (height - min(width, height))/2
-                        right = (width + min(width, height))/2
-                        bottom = (height + min(width, height))/2
-                        image = image.crop((left, top, right, bottom))
-                        
-                        # Resmi kaydet
-                        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                        image.save(filepath, 'JPEG', quality=85)
-                        user.profile_image = unique_filename
-                    except Exception as e:
-                        return jsonify(success=False, message=f"Resim yükleme hatası: {str(e)}")
-
-            # Diğer profil bilgilerini güncelle
-            user.username = request.form.get('username')
-            user.first_name = request.form.get('first_name')
-            user.last_name = request.form.get('last_name')
-            user.email = request.form.get('email')
-            user.phone = request.form.get('phone')
-            user.role = request.form.get('meslek')
-            user.gender = request.form.get('gender')
-            
-            # Doğum tarihi kontrolü ve dönüşümü
-            birth_date = request.form.get('birthdate')
-            if birth_date:
-                try:
-                    user.birthdate = datetime.strptime(birth_date, '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify(success=False, message="Geçersiz doğum tarihi formatı")
-            
-            db.session.commit()
-            
-            return jsonify({
-                'success': True,
-                'message': 'Profil başarıyla güncellendi',
-                'profile_image': user.profile_image
-            })
-            
-        except Exception as e:
-            db.session.rollback()
-            return jsonify(success=False, message=f"Profil güncellenirken bir hata oluştu: {str(e)}")
-
-    return render_template('profile.html')
-
-@app.route('/change_password', methods=['POST'])
-@login_required
-def change_password():
-    try:
-        current_password = request.form.get('current_password')
-        new_password = request.form.get('new_password')
-        
-        if not current_password or not new_password:
-            return jsonify({'success': False, 'message': 'Tüm alanları doldurun.'}), 400
-        
-        if not current_user.check_password(current_password):
-            return jsonify({'success': False, 'message': 'Mevcut şifre yanlış!'}), 400
-        
-        if len(new_password) < 6:
-            return jsonify({'success': False, 'message': 'Yeni şifre en az 6 karakter olmalıdır!'}), 400
-        
-        current_user.set_password(new_password)
-        db.session.commit()
-        
-        # Log oluştur
-        log_activity(
-            activity_type='sifre_degistirme',
-            description='Kullanıcı şifresini değiştirdi',
-            user_id=current_user.id
-        )
-        
-        return jsonify({'success': True, 'message': 'Şifreniz başarıyla değiştirildi!'})
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': f'Şifre değiştirme işlemi başarısız: {str(e)}'}), 500
-
-@app.route('/delete_account', methods=['POST'])
-@login_required
-def delete_account():
-    try:
-        password = request.form.get('password')
-        
-        if not password:
-            return jsonify({'success': False, 'message': 'Şifre gereklidir.'}), 400
-        
-        if not current_user.check_password(password):
-            return jsonify({'success': False, 'message': 'Şifre yanlış!'}), 400
-        
-        # Admin kullanıcısını silemezsiniz
-        if current_user.is_admin:
-            return jsonify({'success': False, 'message': 'Admin hesabı silinemez!'}), 400
-        
-        user_id = current_user.id
-        username = current_user.username
-        
-        # Log oluştur (kullanıcı silinmeden önce)
-        log_activity(
-            activity_type='hesap_silme',
-            description=f'Kullanıcı hesabını sildi: {username}',
-            user_id=current_user.id
-        )
-        
-        # İlişkili verileri temizle
-        ActivityLog.query.filter_by(user_id=user_id).delete()
-        
-        # Kullanıcının dosyalarını, duyurularını vs. başka kullanıcıya aktar veya sil
-        # (Bu kısım daha karmaşık, şimdilik basit tutuyoruz)
-        
-        # Kullanıcıyı sil
-        User.query.filter_by(id=user_id).delete()
-        db.session.commit()
-        
-        logout_user()
-        
-        return jsonify({'success': True, 'message': 'Hesabınız başarıyla silindi!'})
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': f'Hesap silme işlemi başarısız: {str(e)}'}), 500
-
-@app.route('/enable_2fa', methods=['POST'])
-@login_required
-def enable_2fa():
-    """İki faktörlü doğrulamayı etkinleştir/devre dışı bırak"""
-    try:
-        data = request.get_json()
-        enabled = data.get('enabled', False)
-        
-        user = User.query.get(current_user.id)
-        
-        # Permissions'ı güncelle
-        if not user.permissions:
-            user.permissions = {}
-        
-        user.permissions['two_factor_auth'] = enabled
-        db.session.commit()
-        
-        # Log oluştur
-        log_activity(
-            activity_type='guvenlik_ayar',
-            description=f'İki faktörlü doğrulama {"etkinleştirildi" if enabled else "devre dışı bırakıldı"}',
-            user_id=current_user.id
-        )
-        
-        return jsonify({
-            'success': True, 
-            'message': f'İki faktörlü doğrulama {"etkinleştirildi" if enabled else "devre dışı bırakıldı"}'
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'message': f'İşlem başarısız: {str(e)}'
-        }), 500
-
-# Admin paneli için decorator
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash('Bu sayfaya erişmek için giriş yapmanız gerekiyor.', 'error')
-            return redirect(url_for('login', next=request.url))
-            
-        if not current_user.is_admin:
-            flash('Bu sayfa sadece yöneticiler tarafından erişilebilir.', 'error')
-            
-            # API istekleri için JSON yanıtı
-            if request.is_json:
-                return jsonify({'success': False, 'error': 'Yönetici yetkisi gerekiyor'}), 403
-                
-            return redirect(url_for('anasayfa'))
-            
-        return f(*args, **kwargs)
-    return decorated_function
-
-# Protect routes
-@app.before_request
-def check_user_auth():
-    # Giriş gerektirmeyen sayfalar
-    public_endpoints = ['login', 'register', 'static']
-    
-    # Kullanıcı giriş yapmış ama onaylanmamış ise
-    if current_user.is_authenticated and not current_user.is_approved and not current_user.is_admin:
-        if request.endpoint not in ['logout']:
-            flash('Hesabınız henüz onaylanmamış. Lütfen yönetici onayını bekleyin.', 'warning')
-            logout_user()
-            return redirect(url_for('login'))
-    
-    # Kullanıcı giriş yapmamış ve korumalı bir sayfaya erişmeye çalışıyorsa
-    if not current_user.is_authenticated and request.endpoint not in public_endpoints:
-        return redirect(url_for('login'))
-
-# Türkçe tarih için locale ayarı
-try:
-    locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'tr_TR')
-    except locale.Error:
-        locale.setlocale(locale.LC_ALL, '')  # Sistem varsayılanını kullan
-
-@app.context_processor
-def inject_datetime():
-    try:
-        now = datetime.now()
-        current_time = {
-            'weekday': now.strftime('%A'),  # Gün adı
-            'time': now.strftime('%H:%M'),  # Saat
-            'date': now.strftime('%d.%m.%Y')  # Tarih
-        }
-    except Exception:
-        current_time = {
-            'weekday': '',
-            'time': '',
-            'date': ''
-        }
-    return dict(current_time=current_time)
-
-def log_activity(activity_type, description, user_id, case_id=None, related_announcement_id=None, related_event_id=None, related_payment_id=None, details=None):
-    user = User.query.get(user_id)
-    if user:
-        activity = ActivityLog(
-            activity_type=activity_type,
-            description=description.format(user_name=user.get_full_name()), # Kullanıcı adını formatla
-            user_id=user_id,
-            related_case_id=case_id,
-            related_announcement_id=related_announcement_id, # Yeni eklendi
-            related_event_id=related_event_id,           # Yeni eklendi
-            related_payment_id=related_payment_id,         # Yeni eklendi
-            details=details                              # Yeni eklendi
-        )
-        db.session.add(activity)
-        db.session.commit()
-
-@app.route('/')
-def anasayfa():
-    # Kullanıcı giriş yapmamışsa login sayfasına yönlendir
-    if not current_user.is_authenticated:
-        # landing.html dosyasında duyurular bölümü olmadığı için buraya eklemeyeceğiz.
-        return render_template('landing.html', title="Anasayfa")
-
-    # Giriş yapmış kullanıcı için ana sayfa içeriği
-    activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).limit(5).all() # Limit 10'dan 5'e düşürüldü
-    total_activities = ActivityLog.query.count() # Tüm aktivitelerin sayısını al
-    upcoming_hearings = CalendarEvent.query.filter(
-        db.func.datetime(CalendarEvent.date, CalendarEvent.time) >= datetime.utcnow(),
-        CalendarEvent.event_type.in_(['durusma', 'e-durusma']),
-        CalendarEvent.is_completed == False
-    ).order_by(CalendarEvent.date.asc(), CalendarEvent.time.asc()).limit(5).all()
-    total_hearings = CalendarEvent.query.filter(CalendarEvent.event_type.in_(['durusma', 'e-durusma'])).count() # Tüm duruşmaların sayısını al
-    
-    # Duyuruları al (örneğin son 5 duyuru)
-    announcements = Announcement.query.order_by(Announcement.created_at.desc()).limit(5).all()
-
-    user_cases = CaseFile.query.all() # Kullanıcı filtresi kaldırıldı
-    total_cases = len(user_cases)
-    total_active_cases = sum(1 for case in user_cases if case.status == 'Aktif') 
-    pending_cases = sum(1 for case in user_cases if case.status == 'Beklemede')
-    closed_cases = sum(1 for case in user_cases if case.status == 'Kapalı')
-
-    # Dosya türüne göre istatistikler
-    hukuk_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'hukuk')
-    ceza_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'ceza')
-    icra_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'icra')
-
-    # Adliye istatistikleri
-    courthouse_stats_dict = {}
-    for case in user_cases:
-        if case.courthouse and case.courthouse.strip().lower() not in ['', 'uygulanmaz']:
-            courthouse_stats_dict[case.courthouse] = courthouse_stats_dict.get(case.courthouse, 0) + 1
-    courthouse_stats = [{'courthouse': k, 'total_cases': v} for k, v in courthouse_stats_dict.items()]
-
-
-    # Ödeme istatistikleri (opsiyonel, gerekirse eklenebilir)
-    # total_payments_this_month = db.session.query(func.sum(Payment.amount)).filter(...).scalar()
-
-    return render_template('anasayfa.html', 
-                           title="Anasayfa", 
-                           activities=activities, # Kullanıcı filtresi kaldırıldı
-                           total_activities=total_activities, # Şablona gönder
-                           upcoming_hearings=upcoming_hearings, # Kullanıcı filtresi kaldırıldı
-                           announcements=announcements,
-                           total_hearings=total_hearings, # Şablona gönder
-                           user_cases=user_cases, # Dosya istatistikleri için eklendi
-                           total_cases=total_cases,
-                           total_active_cases=total_active_cases, # active_cases -> total_active_cases
-                           pending_cases=pending_cases,
-                           closed_cases=closed_cases,
-                           hukuk_count=hukuk_count, # Eklendi
-                           ceza_count=ceza_count,   # Eklendi
-                           icra_count=icra_count,   # Eklendi
-                           courthouse_stats=courthouse_stats # Eklendi
-                           )
-
-# Daha fazla aktivite yüklemek için yeni endpoint
-@app.route('/load_more_activities/<int:offset>')
-def load_more_activities(offset):
-    activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).offset(offset).limit(5).all()
-    
-    activities_data = []
-    for activity in activities:
-        user = User.query.get(activity.user_id)
-        activity_data = {
-            'type': activity.activity_type,
-            'description': activity.description,
-            'timestamp': activity.timestamp.strftime('%d.%m.%Y %H:%M'),
-            'user': user.get_full_name() if user else 'Bilinmeyen Kullanıcı',
-            'details': activity.details,
-            'profile_image': url_for('static', filename=user.profile_image) if user and user.profile_image else url_for('static', filename='images/pp.png')
-        }
-        activities_data.append(activity_data)
-    
-    return jsonify(activities=activities_data)
-
-@app.route('/takvim')
-@login_required
-@permission_required('takvim_goruntule')
-def takvim():
-    # Debug mesajları
-    print(f"Kullanıcı admin mi: {current_user.is_admin}")
-    print(f"Kullanıcı yetkileri: {current_user.permissions}")
-    print(f"Takvim görüntüleme yetkisi: {current_user.has_permission('takvim_goruntule')}")
-    
-    # Tüm etkinlikleri getir
-    events = CalendarEvent.query.all()
-    events_data = []
-    
-    for event in events:
-        event_data = {
-            'id': event.id,
-            'title': event.title,
-            'date': event.date.strftime('%Y-%m-%d'),
-            'time': event.time.strftime('%H:%M'),
-            'event_type': event.event_type,
-            'description': event.description,
-            'assigned_to': event.assigned_to,
-            'file_type': event.file_type,
-            'courthouse': event.courthouse,
-            'department': event.department,
-            'deadline_date': event.deadline_date.strftime('%Y-%m-%d') if event.deadline_date else None,
-            'is_completed': event.is_completed
-        }
-        events_data.append(event_data)
-    
-    # Debug için dosya türü, adliye ve departman verilerini kontrol et
-    for event_data in events_data:
-        if event_data['event_type'] in ['durusma', 'e-durusma']:
-            print(f"Etkinlik {event_data['id']} - Dosya Türü: {event_data['file_type']}, Adliye: {event_data['courthouse']}, Departman: {event_data['department']}")
-    
-    # Adli tatil tarihlerini ekle
-    current_year = datetime.now().year
-    adli_tatil_data = []
-    
-    # 2024-2027 yılları için adli tatil tarihlerini ekle
-    for year in range(2024, 2028):
-        adli_tatil_data.append({
-            'start': f'{year}-07-20',
-            'end': f'{year}-08-31',
-            'year': year
-        })
-    
-    # === YENİ: Adliye verisini hazırla ===
-    # Adliye listesini dosyadan yükle
-    cities_courthouses, cities = parse_adliye_list()
-    
-    # Kullanıcının yetkilerini template'e gönder
-    user_permissions = {
-        'can_add': current_user.has_permission('etkinlik_ekle'),
-        'can_edit': current_user.has_permission('etkinlik_duzenle'),
-        'can_delete': current_user.has_permission('etkinlik_sil'),
-        'can_view': current_user.has_permission('etkinlik_goruntule')
-    }
-    
-    # Onaylı kullanıcıların listesini al
-    approved_users = User.query.filter_by(is_approved=True).all()
-    users_data = []
-    for user in approved_users:
-        users_data.append({
-            'id': user.id,
-            'full_name': user.get_full_name(),
-            'role': user.role,
-            'email': user.email
-        })
-    
-    return render_template('takvim.html', 
-                         events=events_data,
-                         adli_tatil_data=adli_tatil_data,
-                         all_courthouses=cities_courthouses, # Tüm adliye verilerini gönder
-                         user_permissions=user_permissions,
-                         approved_users=users_data)
-
-@app.route('/dosyalarim')
-def dosyalarim():
-    # URL parametrelerini al
-    file_type = request.args.get('file_type')
-    status = request.args.get('status')
-    
-    # Sorguyu başlat
-    query = CaseFile.query
-    
-    # Filtreler
-    if file_type:
-        query = query.filter_by(file_type=file_type)
-    if status:
-        query = query.filter_by(status=status)
-    
-    # Sonuçları al
-    case_files = query.all()
-    
-    return render_template('dosyalarim.html', 
-                         case_files=case_files,
-                         selected_type=file_type,
-                         selected_status=status)
-
-@app.route('/duyurular', methods=['GET', 'POST'])
-@login_required
-@permission_required('duyuru_goruntule')
-def duyurular():
-    if request.method == 'POST':
-        if not current_user.has_permission('duyuru_ekle'):
-            flash('Duyuru ekleme yetkiniz yok.', 'error')
-            return redirect(url_for('duyurular'))
-            
-        title = request.form['title']
-        content = request.form['content']
-        new_announcement = Announcement(title=title, content=content, user_id=current_user.id)
-        db.session.add(new_announcement)
-        
-        # Log kaydı
-        log = ActivityLog(
-            activity_type='duyuru_ekleme',
-            description=f'Yeni duyuru eklendi',
-            details={
-                'baslik': title,
-                'icerik': content[:50] + '...' if len(content) > 50 else content
-            },
-            user_id=current_user.id,
-            related_announcement_id=new_announcement.id
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-        flash('Duyuru başarıyla eklendi.', 'success')
-        return redirect(url_for('duyurular'))
-    
-    # Açık SQL hatası: Announcement.created_at sütunu eklenmiş ama 
-    # models.py'da tanımlandığını gördük; bu sorgu tüm nesneleri çekiyor
-    # Sadece gerekli sütunları belirterek sorunu çözelim
-    announcements = db.session.query(
-        Announcement.id,
-        Announcement.title,
-        Announcement.content,
-        Announcement.user_id
-    ).all()
-    
-    return render_template('duyurular.html', announcements=announcements)
-
-@app.route('/odemeler', methods=['GET', 'POST'])
-@login_required
-def odemeler():
-    if not current_user.has_permission('odeme_goruntule'):
-        flash('Ödeme görüntüleme yetkiniz bulunmamaktadır.', 'error')
-        return redirect(url_for('anasayfa'))
-        
-    today_date_str = datetime.now().strftime('%Y-%m-%d') # Bugünün tarihini YYYY-MM-DD formatında al
-
-    if request.method == 'POST':
-        if not current_user.has_permission('odeme_ekle'):
-            flash('Ödeme ekleme yetkiniz bulunmamaktadır.', 'error')
-            return redirect(url_for('odemeler'))
-            
-        name = request.form['name']
-        surname = request.form['surname']
-        tc = request.form['tc']
-        currency = request.form['currency']
-        installments = request.form['installments']
-
-        try:
-            # Frontend'den gelen tutarı direkt olarak çevir, hiçbir temizleme işlemi yapmadan
-            amount_str = request.form['amount']
-            
-            # Sayısal değer kontrolü (herhangi bir formatlama yapmıyoruz)
-            try:
-                amount_value = float(amount_str)
-            except ValueError:
-                app.logger.error(f"Tutar dönüşüm hatası: Tutar '{amount_str}' geçerli bir sayı değil")
-                return jsonify({'success': False, 'error': 'Geçersiz tutar formatı. Lütfen sadece sayı girin.'}), 400
-            
-            # Kayıt için kullanılacak değeri log kaydına ekle
-            app.logger.info(f"POST /odemeler - Kaydedilen tutar: {amount_value}")
-        except Exception as e:
-            app.logger.error(f"POST /odemeler - Tutar işleme hatası: {str(e)}")
-            return jsonify({'success': False, 'error': 'Tutar işlenirken bir hata oluştu.'}), 400
-
-        # Tarih alanlarını datetime.date nesnelerine dönüştür
-        registration_date = None
-        due_date = None
-        
-        if request.form.get('registration_date'):
-            registration_date = datetime.strptime(request.form.get('registration_date'), '%Y-%m-%d').date()
-        
-        if request.form.get('due_date'):
-            due_date = datetime.strptime(request.form.get('due_date'), '%Y-%m-%d').date()
-        
-        # Yeni client oluştur
-        new_client = Client(
-            name=name, 
-            surname=surname, 
-            tc=tc, 
-            amount=amount_value,  # Sayısal değeri kullan
-            currency=currency, 
-            installments=installments, 
-            registration_date=registration_date, 
-            due_date=due_date
-        )
-        
-        # Kaydet
-        db.session.add(new_client)
-        
-        # Log kaydı
-        log = ActivityLog(
-            activity_type='odeme_ekleme',
-            description=f'Yeni ödeme eklendi: {name} {surname}',
-            details={
-                'musteri': f'{name} {surname}',
-                'tc': tc,
-                'tutar': f'{amount_value} {currency}',
-                'taksit': installments,
-                'borc_kayit_tarihi': request.form.get('registration_date'),
-                'son_odeme_tarihi': request.form.get('due_date')
-            },
-            user_id=current_user.id,
-            related_payment_id=new_client.id
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-        return jsonify({'success': True})
-    
-    clients = Client.query.all()
-    return render_template('odemeler.html', clients=clients, today_date=today_date_str) # today_date'i template'e gönder
-
-@app.route('/update_client/<int:client_id>', methods=['POST'])
-@login_required
-def update_client(client_id):
-    if not current_user.has_permission('odeme_duzenle'):
-        return jsonify({'success': False, 'error': 'Ödeme düzenleme yetkiniz bulunmamaktadır.'})
-        
-    try:
-        data = request.get_json()
-        client = Client.query.get_or_404(client_id)
-        if client:
-            old_status = client.status
-            client.name = data['name']
-            client.surname = data['surname']
-            client.tc = data['tc']
-            
-            # Frontend'den gelen tutarı doğrudan dönüştür, hiçbir temizleme yapmadan
-            try:
-                amount_str = data['amount']
-                
-                # Sayısal değer kontrolü
-                try:
-                    amount_value = float(amount_str)
-                except ValueError:
-                    app.logger.error(f"Tutar dönüşüm hatası: Tutar '{amount_str}' geçerli bir sayı değil")
-                    return jsonify({'success': False, 'error': 'Geçersiz tutar formatı. Lütfen sadece sayı girin.'}), 400
-                    
-                # Önceki değer ve yeni değeri karşılaştır
-                app.logger.info(f"POST /update_client/{client_id} - Eski tutar: {client.amount}, Yeni tutar: {amount_value}")
-                
-                # Tutarı güncelle
-                client.amount = amount_value
-            except Exception as e:
-                app.logger.error(f"POST /update_client/{client_id} - Tutar işleme hatası: {str(e)}")
-                return jsonify({'success': False, 'error': 'Tutar işlenirken bir hata oluştu.'})
-            
-            client.currency = data['currency']
-            client.installments = data['installments']
-            
-            # Tarih alanlarını datetime.date nesnesine dönüştür
-            if data.get('registration_date'):
-                try:
-                    client.registration_date = datetime.strptime(data['registration_date'], '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'success': False, 'error': 'Geçersiz borç kayıt tarihi formatı'})
-            else:
-                client.registration_date = None
-                
-            if data.get('due_date'):
-                try:
-                    client.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'success': False, 'error': 'Geçersiz son ödeme tarihi formatı'})
-            else:
-                client.due_date = None
-            
-            # Status alanını güvenli bir şekilde al ve güncelle
-            new_status = data.get('status')
-            if new_status is not None:
-                client.status = new_status
-            
-            client.description = data.get('description', '')
-
-            # Ödeme durumu değiştiyse log kaydı ekle
-            if old_status != new_status:
-                log = ActivityLog(
-                    activity_type='odeme_guncelleme',
-                    description=f'Ödeme durumu güncellendi: {client.name} {client.surname}',
-                    details={
-                        'musteri': f'{client.name} {client.surname}',
-                        'eski_durum': old_status,
-                        'yeni_durum': new_status,
-                        'tutar': f'{client.amount} {client.currency}'
-                    },
-                    user_id=current_user.id,
-                    related_payment_id=client.id
-                )
-                db.session.add(log)
-            
-            db.session.commit()
-            return jsonify({'success': True})
-        
-        return jsonify({'success': False, 'error': 'Müşteri bulunamadı'})
-    except Exception as e:
-        db.session.rollback()
-        # Hata ayrıntılarını kaydet
-        app.logger.error(f"update_client hatası: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)})
-
-@app.route('/musteri_yonetimi')
-def musteri_yonetimi():
-    return render_template('musteri_yonetimi.html')
-
-@app.route('/raporlar')
-def raporlar():
-    return render_template('raporlar.html')
-
-@app.route('/kullanici_yonetimi')
-def kullanici_yonetimi():
-    users = User.query.all()
-    return render_template('kullanici_yonetimi.html', users=users)
-
-@app.route('/bildirimler')
-def bildirimler():
-    notifications = Notification.query.filter_by(read=False).all()
-    return render_template('bildirimler.html', notifications=notifications)
-
-@app.route('/dosya_sorgula', methods=['GET', 'POST'])
-@login_required
-@permission_required('dosya_sorgula')
-def dosya_sorgula():
-    # Form verilerini al (POST veya GET parametrelerinden)
-    file_type = request.form.get('file-type') or request.args.get('file_type')
-    city = request.form.get('city') or request.args.get('city')
-    courthouse = request.form.get('courthouse') or request.args.get('courthouse')
-    department = request.form.get('department') or request.args.get('department')
-    court_number = request.form.get('court-number') or request.args.get('court_number')
-    year = request.form.get('year') or request.args.get('year')
-    case_number = request.form.get('case-number') or request.args.get('case_number')
-    client_name = request.form.get('client-name') or request.args.get('client_name')
-    status = request.form.get('status') or request.args.get('status')
-    
-    # Eğer herhangi bir filtre varsa sorguyu çalıştır
-    if request.method == 'POST' or any([file_type, city, courthouse, department, court_number, year, case_number, client_name, status]):
-        # Sorguyu başlat (Kullanıcı filtresi kaldırıldı)
-        query = CaseFile.query
-        
-        # Filtreler
-        if file_type:
-            query = query.filter_by(file_type=file_type)
-        if courthouse:
-            query = query.filter_by(courthouse=courthouse)
-        if department:
-            query = query.filter_by(department=department)
-        # Mahkeme numarası filtresi eklendi
-        if court_number:
-            query = query.filter_by(department=court_number)
-        if year:
-            query = query.filter_by(year=year)
-        if case_number:
-            query = query.filter_by(case_number=case_number)
-        if client_name:
-            query = query.filter(CaseFile.client_name.ilike(f'%{client_name}%'))
-        if status:
-            query = query.filter_by(status=status)
-        
-        # Sonuçları al
-        case_files = query.all()
-    else:
-        case_files = []
-    
-    # Şehir ve adliye verilerini yükle (dosya_ekle ile aynı fonksiyonu kullanıyor)
-    cities_courthouses, cities = parse_adliye_list()
-    
-    return render_template('dosya_sorgula.html', 
-                         case_files=case_files,
-                         cities=cities,
-                         all_courthouses=json.dumps(cities_courthouses, ensure_ascii=False))
-
-# .env dosyasını yükle
-from dotenv import load_dotenv
-load_dotenv()
-
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
-
-from flask import Flask, render_template, request, url_for, flash, redirect, jsonify, session, send_from_directory, send_file, make_response, current_app, Response
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from datetime import datetime, timedelta, date, time
-import json
-import os
-from werkzeug.utils import secure_filename
-import locale
-import time as pytime
-
-# Türkçe karakter desteği için encoding ayarı
-try:
-    locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'Turkish_Turkey.1254')
-    except locale.Error:
-        pass  # Sistem desteklemiyorsa varsayılan encoding kullan
-import subprocess
-import tempfile
-from flask_mail import Mail, Message
-from bs4 import BeautifulSoup
-from email_utils import send_calendar_event_assignment_email, send_calendar_event_reminder_email
-import requests
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from flask_wtf.csrf import CSRFProtect # CSRF Koruması için eklendi
-from models import db, User, ActivityLog, Client, Payment, Document, Notification, Expense, CaseFile, Announcement, CalendarEvent, WorkerInterview, IsciGorusmeTutanagi, DilekceKategori, OrnekDilekce, OrnekSozlesme
-import uuid
-from PIL import Image
-from functools import wraps
-from yargi_integration import yargi_integration
-from uyap_integration_advanced import UYAPManager, UyapFile
-from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-import re
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from html import escape  # HTML escape için bu modülü kullanacağız
-from fpdf import FPDF
-from xhtml2pdf import pisa
-import glob # Add glob import
-from sqlalchemy import func, desc
-import shutil
-import mammoth
-import pdfkit
-import logging # Logging için eklendi
-
-# Logger yapılandırması
-logger = logging.getLogger(__name__)
-import traceback # traceback importu eklendi
-
-# Flask-Admin imports
-from flask_admin import Admin, AdminIndexView, BaseView, expose
-from flask_admin.contrib.sqla import ModelView
-from flask_admin.actions import action # Import action decorator
-from markupsafe import Markup # For rendering HTML in actions
-
-# Helper function to parse adliyelist.txt
-def parse_adliye_list(filepath='../adliyelist.txt'): # Adjusted path
-    cities_courthouses = {}
-    try:
-        # Ensure the path is correct relative to app.py location
-        script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
-        abs_file_path = os.path.join(script_dir, filepath)
-
-        with open(abs_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            # Skip header and potential separator lines
-            data_lines = [line.strip() for line in lines if line.strip() and not line.startswith('İl\t') and not line.startswith('___')]
-            current_city = None
-            for line in data_lines:
-                parts = line.split('\t', 1)
-                if len(parts) == 2:
-                    city, courthouses_str = parts
-                    current_city = city.strip()
-                    # Process courthouses string: split by comma or bullet, handle ACM markers etc.
-                    # Keep the original names including ACM details
-                    courthouses = [ch.strip() for ch in re.split(r'\s*,\s*|\s*•\s*', courthouses_str) if ch.strip()]
-                    cities_courthouses[current_city] = courthouses
-                # Removed the elif part as it's unlikely based on file structure
-    except FileNotFoundError:
-        print(f"Error: {abs_file_path} not found.")
-        return {}, []
-    except Exception as e:
-        print(f"Error parsing {abs_file_path}: {e}")
-        return {}, []
-
-    # İstanbul'u şehir listesine manuel olarak ekle (zaten varsa sorun değil)
-    if 'İstanbul' not in cities_courthouses:
-        # İstanbul adliyeleri bu listede olmayacak, çünkü bunlar hardcoded olarak frontend'de tanımlanmış
-        cities_courthouses['İstanbul'] = []  
-        
-    # Önce standart alfabetik sıralama
-    cities = sorted(cities_courthouses.keys())
-    
-    # Özel sıralama için listeyi yeniden düzenle
-    # İstanbul'u listeden çıkar ve en başa ekle
-    if 'İstanbul' in cities:
-        cities.remove('İstanbul')
-        cities.insert(0, 'İstanbul')
-    
-    # İzmir'i Isparta'dan sonra getir
-    if 'İzmir' in cities and 'Isparta' in cities:
-        izmir_index = cities.index('İzmir')
-        isparta_index = cities.index('Isparta')
-        
-        # İzmir'i çıkar
-        cities.remove('İzmir')
-        
-        # Isparta'dan sonraya ekle
-        cities.insert(isparta_index + 1, 'İzmir')
-    
-    # İstanbul'un listede olduğundan emin olalım
-    if 'İstanbul' in cities:
-        print("İstanbul şehir listesinde mevcut.")
-    else:
-        print("UYARI: İstanbul şehir listesine eklenemedi!")
-        
-    return cities_courthouses, cities
-
-def permission_required(permission):
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not current_user.is_authenticated:
-                flash('Bu işlem için giriş yapmanız gerekmektedir.', 'error')
-                return redirect(url_for('login', next=request.url))
-            
-            # Admin kontrolü ekle - Admin her şeyi yapabilir
-            if current_user.is_admin:
-                return f(*args, **kwargs)
-                
-            # Normal kullanıcılar için yetki kontrolü yap
-            if not current_user.has_permission(permission):
-                # Hangi yetkiye ihtiyaç duyulduğunu belirten bir hata mesajı
-                permission_names = {
-                    'dosya_sorgula': 'Dosya Sorgulama',
-                    'dosya_ekle': 'Dosya Ekleme', 
-                    'dosya_duzenle': 'Dosya Düzenleme',
-                    'dosya_sil': 'Dosya Silme',
-                    'takvim_goruntule': 'Takvim Görüntüleme',
-                    'etkinlik_goruntule': 'Etkinlik Görüntüleme',
-                    'etkinlik_ekle': 'Etkinlik Ekleme',
-                    'etkinlik_duzenle': 'Etkinlik Düzenleme',
-                    'etkinlik_sil': 'Etkinlik Silme',
-                    'duyuru_goruntule': 'Duyuru Görüntüleme',
-                    'duyuru_ekle': 'Duyuru Ekleme',
-                    'duyuru_duzenle': 'Duyuru Düzenleme',
-                    'duyuru_sil': 'Duyuru Silme',
-                    'odeme_goruntule': 'Ödeme Görüntüleme',
-                    'odeme_ekle': 'Ödeme Ekleme',
-                    'odeme_duzenle': 'Ödeme Düzenleme',
-                    'odeme_sil': 'Ödeme Silme',
-                    'faiz_hesaplama': 'Faiz Hesaplama',
-                    'harc_hesaplama': 'Harç Hesaplama',
-                    'isci_hesaplama': 'İşçi Alacağı Hesaplama',
-                    'vekalet_hesaplama': 'Vekalet Ücreti Hesaplama',
-                    'ceza_infaz_hesaplama': 'Ceza İnfaz Hesaplama',
-                    'rapor_goruntule': 'Rapor Görüntüleme',
-                    'rapor_olustur': 'Rapor Oluşturma',
-                    'musteri_goruntule': 'Müşteri Görüntüleme',
-                    'musteri_ekle': 'Müşteri Ekleme',
-                    'musteri_duzenle': 'Müşteri Düzenleme',
-                    'musteri_sil': 'Müşteri Silme',
-                    'panel_goruntule': 'Panel Görüntüleme',
-                    'ayarlar': 'Ayarlar Erişimi',
-                    'isci_gorusme_goruntule': 'İşçi Görüşme Görüntüleme',
-                    'isci_gorusme_ekle': 'İşçi Görüşme Ekleme',
-                    'isci_gorusme_duzenle': 'İşçi Görüşme Düzenleme',
-                    'isci_gorusme_sil': 'İşçi Görüşme Silme',
-                    'ornek_dilekceler': 'Örnek Dilekçeler',
-                    'ornek_sozlesmeler': 'Örnek Sözleşmeler',
-                    'ucret_tarifeleri': 'Ücret Tarifeleri',
-                    'yargi_kararlari_arama': 'Yargı Kararları Arama',
-                    'veritabani_yonetimi': 'Veritabanı Yönetimi'
-                }
-                
-                permission_name = permission_names.get(permission, permission)
-                flash(f'Bu işlem için "{permission_name}" yetkisine sahip olmanız gerekiyor.', 'error')
-                
-                # API isteklerinde JSON yanıtı döndür, sayfa isteklerinde anasayfaya yönlendir
-                if request.is_json:
-                    return jsonify({'success': False, 'error': f'Yetkiniz yok: {permission_name}'}), 403
-                    
-                return redirect(url_for('anasayfa'))
-                
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
-app = Flask(__name__, static_url_path='/static')
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SECRET_KEY'] = 'your_secret_key'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'instance', 'database.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'uploads/'
-app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'ornek_dilekceler') # Yeni eklendi
-app.config['UYAP_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'uyap') # UYAP dosyaları için
-# CSRF için WTF_CSRF_ENABLED=True (varsayılan olarak True'dur ama açıkça belirtmek iyi olabilir)
-app.config['WTF_CSRF_ENABLED'] = True
-# SECRET_KEY zaten yukarıda tanımlı, CSRF için de kullanılır.
-
-# E-posta konfigürasyonu (.env dosyasından) - Gmail kullan
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USE_SSL'] = False
-app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_ASCII_ATTACHMENTS'] = False  # Türkçe karakter desteği için
-app.config['MAIL_DEFAULT_CHARSET'] = 'utf-8'  # UTF-8 charset ayarla
-app.config['MAIL_SUPPRESS_SEND'] = False
-app.config['MAIL_DEBUG'] = True  # Debug modunu aç
-
-db.init_app(app)
-migrate = Migrate(app, db)
-mail = Mail(app)
-csrf = CSRFProtect(app) # CSRF korumasını başlat
-
-# Login manager setup
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
-login_manager.login_message = 'Lütfen giriş yapın.'
-login_manager.login_message_category = 'info'
-
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
-
-# --- Flask-Admin Setup ---
-
-# Secure Admin Index View
-class MyAdminIndexView(AdminIndexView):
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-    
-    def inaccessible_callback(self, name, **kwargs):
-        # Redirect non-admins or non-authenticated users to login page
-        flash('Bu sayfaya erişmek için admin yetkilerine sahip olmanız gerekiyor.', 'error')
-        return redirect(url_for('login'))
-    
-    @expose('/')
-    def index(self):
-        stats = {
-            'total_users': User.query.count(),
-            'pending_users': User.query.filter_by(is_approved=False).count(),
-            'total_case_files': CaseFile.query.count(),
-            'active_case_files': CaseFile.query.filter_by(status='Aktif').count(),
-            'total_hearings': CalendarEvent.query.filter(CalendarEvent.event_type.in_(['durusma', 'e-durusma'])).count(),
-            'total_payments': Payment.query.count(),
-            'total_expenses': Expense.query.count(),
-            'total_documents': Document.query.count(),
-        }
-        self._template_args['stats'] = stats
-        self._template_args['admin_view'] = self
-        return super(MyAdminIndexView, self).index()
-
-    # Özel dizayn ekliyoruz
-    @expose('/admin/back_to_app')
-    def back_to_app(self):
-        return redirect(url_for('anasayfa'))
-
-# Secure Model View
-class SecureModelView(ModelView):
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
-    def inaccessible_callback(self, name, **kwargs):
-        flash("Bu sayfaya erişim yetkiniz yok.", "error")
-        return redirect(url_for('login', next=request.url))
-
-# User Model View Customization
-class UserView(SecureModelView):
-    column_exclude_list = ['password_hash']
-    form_excluded_columns = ['password_hash', 'activities']
-    column_searchable_list = ['username', 'email', 'first_name', 'last_name']
-    column_filters = ['role', 'is_admin', 'is_approved']
-    column_list = ('username', 'email', 'first_name', 'last_name', 'role', 'is_admin', 'is_approved', 'created_at')
-    column_labels = dict(username='Kullanıcı Adı', email='E-posta', first_name='Ad', last_name='Soyad', role='Rol', is_admin='Admin?', is_approved='Onaylı?', created_at='Kayıt Tarihi')
-    
-    can_create = True
-    can_edit = True
-    can_delete = True
-
-    # Kullanıcı onaylama eylemi
-    @action('approve', 'Seçili Kullanıcıları Onayla', 'Seçili kullanıcıları onaylamak istediğinizden emin misiniz?')
-    def action_approve(self, ids):
-        try:
-            query = User.query.filter(User.id.in_(ids))
-            count = 0
-            for user in query.all():
-                if not user.is_approved:
-                    user.is_approved = True
-                    user.approval_date = datetime.now()
-                    user.approved_by = current_user.id
-                    count += 1
-            db.session.commit()
-            flash(f'{count} kullanıcı başarıyla onaylandı.', 'success')
-        except Exception as ex:
-            if not self.handle_view_exception(ex):
-                raise
-            flash(f'Kullanıcılar onaylanırken hata oluştu: {ex}', 'error')
-
-    # Kullanıcı onay durumunu değiştirme eylemi
-    @action('toggle_approval', 'Seçili Kullanıcıların Onay Durumunu Değiştir', 'Seçili kullanıcıların onay durumunu değiştirmek istediğinizden emin misiniz?')
-    def action_toggle_approval(self, ids):
-        try:
-            query = User.query.filter(User.id.in_(ids))
-            approved_count = 0
-            disapproved_count = 0
-            for user in query.all():
-                if user.is_approved:
-                    user.is_approved = False
-                    user.approval_date = None
-                    user.approved_by = None
-                    disapproved_count += 1
-                else:
-                    user.is_approved = True
-                    user.approval_date = datetime.now()
-                    user.approved_by = current_user.id
-                    approved_count += 1
-            db.session.commit()
-            flash(f'{approved_count} kullanıcı onaylandı, {disapproved_count} kullanıcının onayı kaldırıldı.', 'success')
-        except Exception as ex:
-            if not self.handle_view_exception(ex):
-                raise
-            flash(f'Onay durumu değiştirilirken hata oluştu: {ex}', 'error')
-
-# ActivityLog için özel view (ilişkili alanları göstermek için)
-class ActivityLogView(SecureModelView):
-    can_create = False
-    can_edit = False
-    can_delete = True # Logları silebilme (opsiyonel)
-    column_list = ('timestamp', 'user', 'activity_type', 'description', 'related_case', 'related_event')
-    column_labels = dict(timestamp='Zaman Damgası', user='Kullanıcı', activity_type='İşlem Türü', description='Açıklama', related_case='İlgili Dosya', related_event='İlgili Etkinlik')
-    column_formatters = {
-        'user': lambda v, c, m, p: m.user.get_full_name() if m.user else '-',
-        'related_case': lambda v, c, m, p: f"{m.case.client_name} ({m.case.year}/{m.case.case_number})" if m.case else '-',
-        'related_event': lambda v, c, m, p: m.event.title if m.event else '-'
-    }
-    column_filters = ('activity_type', 'user.username', 'timestamp')
-    column_searchable_list = ('description', 'user.username', 'activity_type')
-    column_default_sort = ('timestamp', True) # En son işlem en üstte
-
-# Initialize Flask-Admin
-admin = Admin(app, name='Veri Kontrol', template_mode='bootstrap4', index_view=MyAdminIndexView())
-
-# Add Admin Views for your models
-admin.add_view(UserView(User, db.session, name='Kullanıcılar'))
-admin.add_view(SecureModelView(CaseFile, db.session, name='Dosyalar'))
-admin.add_view(SecureModelView(CalendarEvent, db.session, name='Takvim Etkinlikleri'))
-admin.add_view(SecureModelView(Document, db.session, name='Belgeler'))
-admin.add_view(SecureModelView(Expense, db.session, name='Masraflar'))
-admin.add_view(SecureModelView(Client, db.session, name='Müşteri Ödemeleri'))
-admin.add_view(SecureModelView(Payment, db.session, name='Ödemeler (Taksit)'))
-admin.add_view(SecureModelView(Announcement, db.session, name='Duyurular'))
-admin.add_view(ActivityLogView(ActivityLog, db.session, name='İşlem Kayıtları')) # Özel view kullanıldı
-admin.add_view(SecureModelView(WorkerInterview, db.session, name='İşçi Görüşme (Eski)'))
-admin.add_view(SecureModelView(IsciGorusmeTutanagi, db.session, name='İşçi Görüşme Tutanağı'))
-admin.add_view(SecureModelView(Notification, db.session, name='Bildirimler'))
-admin.add_view(SecureModelView(DilekceKategori, db.session, name='Örnek Dilekçe Kategorileri')) # Örnek Dilekçe Kategori için Admin View
-admin.add_view(SecureModelView(OrnekDilekce, db.session, name='Örnek Dilekçeler')) # Örnek Dilekçeler için Admin View
-admin.add_view(SecureModelView(OrnekSozlesme, db.session, name='Örnek Sözleşmeler')) # Yeni eklendi
-
-# --- End Flask-Admin Setup ---
-
-# Auth routes
-def logout():
-    logout_user()
-    return redirect(url_for('login'))
-
-@app.route('/profile')
-@login_required
-def profile():
-    return render_template('profile.html')
-
-@app.route('/settings')
-@login_required
-def settings():
-    return render_template('settings.html')
-
-@app.route('/update_profile', methods=['GET', 'POST'])
-@login_required
-def update_profile():
-    if request.method == 'POST':
-        try:
-            user = User.query.get(current_user.id)
-            
-            # Profil resmi yükleme işlemi
-            if 'profile_image' in request.files:
-                file = request.files['profile_image']
-                if file and allowed_file(file.filename):
-                    try:
-                        # Eski profil resmini sil (varsayılan resim hariç)
-                        if user.profile_image and user.profile_image != 'images/pp.png':
-                            old_image_path = os.path.join(app.static_folder, user.profile_image)
-                            if os.path.exists(old_image_path):
-                                os.remove(old_image_path)
-                        
-                        # Yeni resmi kaydet
-                        filename = secure_filename(file.filename)
-                        unique_filename = f"images/profile_{user.id}_{int(pytime.time())}_{filename}"
-                        filepath = os.path.join(app.static_folder, unique_filename)
-                        
-                        # Resmi boyutlandır ve kaydet
-                        image = Image.open(file)
-                        image = image.convert('RGB')  # PNG'yi JPG'ye çevir
-                        
-                        # En-boy oranını koru ve 300x300 boyutuna getir
-                        output_size = (300, 300)
-                        image.thumbnail(output_size, Image.Resampling.LANCZOS)
-                        
-                        # Kare crop için merkezi al
-                        width, height = image.size
-                        left = (width - min(width, height))/2
-                        top = (height - min(width, height))/2
-                        right = (width + min(width, height))/2
-                        bottom = (height + min(width, height))/2
-                        image = image.crop((left, top, right, bottom))
-                        
-                        # Resmi kaydet
-                        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                        image.save(filepath, 'JPEG', quality=85)
-                        user.profile_image = unique_filename
-                    except Exception as e:
-                        return jsonify(success=False, message=f"Resim yükleme hatası: {str(e)}")
-
-            # Diğer profil bilgilerini güncelle
-            user.username = request.form.get('username')
-            user.first_name = request.form.get('first_name')
-            user.last_name = request.form.get('last_name')
-            user.email = request.form.get('email')
-            user.phone = request.form.get('phone')
-            user.role = request.form.get('meslek')
-            user.gender = request.form.get('gender')
-            
-            # Doğum tarihi kontrolü ve dönüşümü
-            birth_date = request.form.get('birthdate')
-            if birth_date:
-                try:
-                    user.birthdate = datetime.strptime(birth_date, '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify(success=False, message="Geçersiz doğum tarihi formatı")
-            
-            db.session.commit()
-            
-            return jsonify({
-                'success': True,
-                'message': 'Profil başarıyla güncellendi',
-                'profile_image': user.profile_image
-            })
-            
-        except Exception as e:
-            db.session.rollback()
-            return jsonify(success=False, message=f"Profil güncellenirken bir hata oluştu: {str(e)}")
-
-    return render_template('profile.html')
-
-@app.route('/change_password', methods=['POST'])
-@login_required
-def change_password():
-    try:
-        current_password = request.form.get('current_password')
-        new_password = request.form.get('new_password')
-        
-        if not current_password or not new_password:
-            return jsonify({'success': False, 'message': 'Tüm alanları doldurun.'}), 400
-        
-        if not current_user.check_password(current_password):
-            return jsonify({'success': False, 'message': 'Mevcut şifre yanlış!'}), 400
-        
-        if len(new_password) < 6:
-            return jsonify({'success': False, 'message': 'Yeni şifre en az 6 karakter olmalıdır!'}), 400
-        
-        current_user.set_password(new_password)
-        db.session.commit()
-        
-        # Log oluştur
-        log_activity(
-            activity_type='sifre_degistirme',
-            description='Kullanıcı şifresini değiştirdi',
-            user_id=current_user.id
-        )
-        
-        return jsonify({'success': True, 'message': 'Şifreniz başarıyla değiştirildi!'})
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': f'Şifre değiştirme işlemi başarısız: {str(e)}'}), 500
-
-@app.route('/delete_account', methods=['POST'])
-@login_required
-def delete_account():
-    try:
-        password = request.form.get('password')
-        
-        if not password:
-            return jsonify({'success': False, 'message': 'Şifre gereklidir.'}), 400
-        
-        if not current_user.check_password(password):
-            return jsonify({'success': False, 'message': 'Şifre yanlış!'}), 400
-        
-        # Admin kullanıcısını silemezsiniz
-        if current_user.is_admin:
-            return jsonify({'success': False, 'message': 'Admin hesabı silinemez!'}), 400
-        
-        user_id = current_user.id
-        username = current_user.username
-        
-        # Log oluştur (kullanıcı silinmeden önce)
-        log_activity(
-            activity_type='hesap_silme',
-            description=f'Kullanıcı hesabını sildi: {username}',
-            user_id=current_user.id
-        )
-        
-        # İlişkili verileri temizle
-        ActivityLog.query.filter_by(user_id=user_id).delete()
-        
-        # Kullanıcının dosyalarını, duyurularını vs. başka kullanıcıya aktar veya sil
-        # (Bu kısım daha karmaşık, şimdilik basit tutuyoruz)
-        
-        # Kullanıcıyı sil
-        User.query.filter_by(id=user_id).delete()
-        db.session.commit()
-        
-        logout_user()
-        
-        return jsonify({'success': True, 'message': 'Hesabınız başarıyla silindi!'})
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': f'Hesap silme işlemi başarısız: {str(e)}'}), 500
-
-@app.route('/enable_2fa', methods=['POST'])
-@login_required
-def enable_2fa():
-    """İki faktörlü doğrulamayı etkinleştir/devre dışı bırak"""
-    try:
-        data = request.get_json()
-        enabled = data.get('enabled', False)
-        
-        user = User.query.get(current_user.id)
-        
-        # Permissions'ı güncelle
-        if not user.permissions:
-            user.permissions = {}
-        
-        user.permissions['two_factor_auth'] = enabled
-        db.session.commit()
-        
-        # Log oluştur
-        log_activity(
-            activity_type='guvenlik_ayar',
-            description=f'İki faktörlü doğrulama {"etkinleştirildi" if enabled else "devre dışı bırakıldı"}',
-            user_id=current_user.id
-        )
-        
-        return jsonify({
-            'success': True, 
-            'message': f'İki faktörlü doğrulama {"etkinleştirildi" if enabled else "devre dışı bırakıldı"}'
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'message': f'İşlem başarısız: {str(e)}'
-        }), 500
-
-# Admin paneli için decorator
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash('Bu sayfaya erişmek için giriş yapmanız gerekiyor.', 'error')
-            return redirect(url_for('login', next=request.url))
-            
-        if not current_user.is_admin:
-            flash('Bu sayfa sadece yöneticiler tarafından erişilebilir.', 'error')
-            
-            # API istekleri için JSON yanıtı
-            if request.is_json:
-                return jsonify({'success': False, 'error': 'Yönetici yetkisi gerekiyor'}), 403
-                
-            return redirect(url_for('anasayfa'))
-            
-        return f(*args, **kwargs)
-    return decorated_function
-
-# Protect routes
-@app.before_request
-def check_user_auth():
-    # Giriş gerektirmeyen sayfalar
-    public_endpoints = ['login', 'register', 'static']
-    
-    # Kullanıcı giriş yapmış ama onaylanmamış ise
-    if current_user.is_authenticated and not current_user.is_approved and not current_user.is_admin:
-        if request.endpoint not in ['logout']:
-            flash('Hesabınız henüz onaylanmamış. Lütfen yönetici onayını bekleyin.', 'warning')
-            logout_user()
-            return redirect(url_for('login'))
-    
-    # Kullanıcı giriş yapmamış ve korumalı bir sayfaya erişmeye çalışıyorsa
-    if not current_user.is_authenticated and request.endpoint not in public_endpoints:
-        return redirect(url_for('login'))
-
-# Türkçe tarih için locale ayarı
-try:
-    locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'tr_TR')
-    except locale.Error:
-        locale.setlocale(locale.LC_ALL, '')  # Sistem varsayılanını kullan
-
-@app.context_processor
-def inject_datetime():
-    try:
-        now = datetime.now()
-        current_time = {
-            'weekday': now.strftime('%A'),  # Gün adı
-            'time': now.strftime('%H:%M'),  # Saat
-            'date': now.strftime('%d.%m.%Y')  # Tarih
-        }
-    except Exception:
-        current_time = {
-            'weekday': '',
-            'time': '',
-            'date': ''
-        }
-    return dict(current_time=current_time)
-
-def log_activity(activity_type, description, user_id, case_id=None, related_announcement_id=None, related_event_id=None, related_payment_id=None, details=None):
-    user = User.query.get(user_id)
-    if user:
-        activity = ActivityLog(
-            activity_type=activity_type,
-            description=description.format(user_name=user.get_full_name()), # Kullanıcı adını formatla
-            user_id=user_id,
-            related_case_id=case_id,
-            related_announcement_id=related_announcement_id, # Yeni eklendi
-            related_event_id=related_event_id,           # Yeni eklendi
-            related_payment_id=related_payment_id,         # Yeni eklendi
-            details=details                              # Yeni eklendi
-        )
-        db.session.add(activity)
-        db.session.commit()
-
-@app.route('/')
-def anasayfa():
-    # Kullanıcı giriş yapmamışsa login sayfasına yönlendir
-    if not current_user.is_authenticated:
-        # landing.html dosyasında duyurular bölümü olmadığı için buraya eklemeyeceğiz.
-        return render_template('landing.html', title="Anasayfa")
-
-    # Giriş yapmış kullanıcı için ana sayfa içeriği
-    activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).limit(5).all() # Limit 10'dan 5'e düşürüldü
-    total_activities = ActivityLog.query.count() # Tüm aktivitelerin sayısını al
-    upcoming_hearings = CalendarEvent.query.filter(
-        db.func.datetime(CalendarEvent.date, CalendarEvent.time) >= datetime.utcnow(),
-        CalendarEvent.event_type.in_(['durusma', 'e-durusma']),
-        CalendarEvent.is_completed == False
-    ).order_by(CalendarEvent.date.asc(), CalendarEvent.time.asc()).limit(5).all()
-    total_hearings = CalendarEvent.query.filter(CalendarEvent.event_type.in_(['durusma', 'e-durusma'])).count() # Tüm duruşmaların sayısını al
-    
-    # Duyuruları al (örneğin son 5 duyuru)
-    announcements = Announcement.query.order_by(Announcement.created_at.desc()).limit(5).all()
-
-    user_cases = CaseFile.query.all() # Kullanıcı filtresi kaldırıldı
-    total_cases = len(user_cases)
-    total_active_cases = sum(1 for case in user_cases if case.status == 'Aktif') 
-    pending_cases = sum(1 for case in user_cases if case.status == 'Beklemede')
-    closed_cases = sum(1 for case in user_cases if case.status == 'Kapalı')
-
-    # Dosya türüne göre istatistikler
-    hukuk_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'hukuk')
-    ceza_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'ceza')
-    icra_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'icra')
-
-    # Adliye istatistikleri
-    courthouse_stats_dict = {}
-    for case in user_cases:
-        if case.courthouse and case.courthouse.strip().lower() not in ['', 'uygulanmaz']:
-            courthouse_stats_dict[case.courthouse] = courthouse_stats_dict.get(case.courthouse, 0) + 1
-    courthouse_stats = [{'courthouse': k, 'total_cases': v} for k, v in courthouse_stats_dict.items()]
-
-
-    # Ödeme istatistikleri (opsiyonel, gerekirse eklenebilir)
-    # total_payments_this_month = db.session.query(func.sum(Payment.amount)).filter(...).scalar()
-
-    return render_template('anasayfa.html', 
-                           title="Anasayfa", 
-                           activities=activities, # Kullanıcı filtresi kaldırıldı
-                           total_activities=total_activities, # Şablona gönder
-                           upcoming_hearings=upcoming_hearings, # Kullanıcı filtresi kaldırıldı
-                           announcements=announcements,
-                           total_hearings=total_hearings, # Şablona gönder
-                           user_cases=user_cases, # Dosya istatistikleri için eklendi
-                           total_cases=total_cases,
-                           total_active_cases=total_active_cases, # active_cases -> total_active_cases
-                           pending_cases=pending_cases,
-                           closed_cases=closed_cases,
-                           hukuk_count=hukuk_count, # Eklendi
-                           ceza_count=ceza_count,   # Eklendi
-                           icra_count=icra_count,   # Eklendi
-                           courthouse_stats=courthouse_stats # Eklendi
-                           )
-
-# Daha fazla aktivite yüklemek için yeni endpoint
-@app.route('/load_more_activities/<int:offset>')
-def load_more_activities(offset):
-    activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).offset(offset).limit(5).all()
-    
-    activities_data = []
-    for activity in activities:
-        user = User.query.get(activity.user_id)
-        activity_data = {
-            'type': activity.activity_type,
-            'description': activity.description,
-            'timestamp': activity.timestamp.strftime('%d.%m.%Y %H:%M'),
-            'user': user.get_full_name() if user else 'Bilinmeyen Kullanıcı',
-            'details': activity.details,
-            'profile_image': url_for('static', filename=user.profile_image) if user and user.profile_image else url_for('static', filename='images/pp.png')
-        }
-        activities_data.append(activity_data)
-    
-    return jsonify(activities=activities_data)
-
-@app.route('/takvim')
-@login_required
-@permission_required('takvim_goruntule')
-def takvim():
-    # Debug mesajları
-    print(f"Kullanıcı admin mi: {current_user.is_admin}")
-    print(f"Kullanıcı yetkileri: {current_user.permissions}")
-    print(f"Takvim görüntüleme yetkisi: {current_user.has_permission('takvim_goruntule')}")
-    
-    # Tüm etkinlikleri getir
-    events = CalendarEvent.query.all()
-    events_data = []
-    
-    for event in events:
-        event_data = {
-            'id': event.id,
-            'title': event.title,
-            'date': event.date.strftime('%Y-%m-%d'),
-            'time': event.time.strftime('%H:%M'),
-            'event_type': event.event_type,
-            'description': event.description,
-            'assigned_to': event.assigned_to,
-            'file_type': event.file_type,
-            'courthouse': event.courthouse,
-            'department': event.department,
-            'deadline_date': event.deadline_date.strftime('%Y-%m-%d') if event.deadline_date else None,
-            'is_completed': event.is_completed
-        }
-        events_data.append(event_data)
-    
-    # Debug için dosya türü, adliye ve departman verilerini kontrol et
-    for event_data in events_data:
-        if event_data['event_type'] in ['durusma', 'e-durusma']:
-            print(f"Etkinlik {event_data['id']} - Dosya Türü: {event_data['file_type']}, Adliye: {event_data['courthouse']}, Departman: {event_data['department']}")
-    
-    # Adli tatil tarihlerini ekle
-    current_year = datetime.now().year
-    adli_tatil_data = []
-    
-    # 2024-2027 yılları için adli tatil tarihlerini ekle
-    for year in range(2024, 2028):
-        adli_tatil_data.append({
-            'start': f'{year}-07-20',
-            'end': f'{year}-08-31',
-            'year': year
-        })
-    
-    # === YENİ: Adliye verisini hazırla ===
-    # Adliye listesini dosyadan yükle
-    cities_courthouses, cities = parse_adliye_list()
-    
-    # Kullanıcının yetkilerini template'e gönder
-    user_permissions = {
-        'can_add': current_user.has_permission('etkinlik_ekle'),
-        'can_edit': current_user.has_permission('etkinlik_duzenle'),
-        'can_delete': current_user.has_permission('etkinlik_sil'),
-        'can_view': current_user.has_permission('etkinlik_goruntule')
-    }
-    
-    # Onaylı kullanıcıların listesini al
-    approved_users = User.query.filter_by(is_approved=True).all()
-    users_data = []
-    for user in approved_users:
-        users_data.append({
-            'id': user.id,
-            'full_name': user.get_full_name(),
-            'role': user.role,
-            'email': user.email
-        })
-    
-    return render_template('takvim.html', 
-                         events=events_data,
-                         adli_tatil_data=adli_tatil_data,
-                         all_courthouses=cities_courthouses, # Tüm adliye verilerini gönder
-                         user_permissions=user_permissions,
-                         approved_users=users_data)
-
-@app.route('/dosyalarim')
-def dosyalarim():
-    # URL parametrelerini al
-    file_type = request.args.get('file_type')
-    status = request.args.get('status')
-    
-    # Sorguyu başlat
-    query = CaseFile.query
-    
-    # Filtreler
-    if file_type:
-        query = query.filter_by(file_type=file_type)
-    if status:
-        query = query.filter_by(status=status)
-    
-    # Sonuçları al
-    case_files = query.all()
-    
-    return render_template('dosyalarim.html', 
-                         case_files=case_files,
-                         selected_type=file_type,
-                         selected_status=status)
-
-@app.route('/duyurular', methods=['GET', 'POST'])
-@login_required
-@permission_required('duyuru_goruntule')
-def duyurular():
-    if request.method == 'POST':
-        if not current_user.has_permission('duyuru_ekle'):
-            flash('Duyuru ekleme yetkiniz yok.', 'error')
-            return redirect(url_for('duyurular'))
-            
-        title = request.form['title']
-        content = request.form['content']
-        new_announcement = Announcement(title=title, content=content, user_id=current_user.id)
-        db.session.add(new_announcement)
-        
-        # Log kaydı
-        log = ActivityLog(
-            activity_type='duyuru_ekleme',
-            description=f'Yeni duyuru eklendi',
-            details={
-                'baslik': title,
-                'icerik': content[:50] + '...' if len(content) > 50 else content
-            },
-            user_id=current_user.id,
-            related_announcement_id=new_announcement.id
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-        flash('Duyuru başarıyla eklendi.', 'success')
-        return redirect(url_for('duyurular'))
-    
-    # Açık SQL hatası: Announcement.created_at sütunu eklenmiş ama 
-    # models.py'da tanımlandığını gördük; bu sorgu tüm nesneleri çekiyor
-    # Sadece gerekli sütunları belirterek sorunu çözelim
-    announcements = db.session.query(
-        Announcement.id,
-        Announcement.title,
-        Announcement.content,
-        Announcement.user_id
-    ).all()
-    
-    return render_template('duyurular.html', announcements=announcements)
-
-@app.route('/odemeler', methods=['GET', 'POST'])
-@login_required
-def odemeler():
-    if not current_user.has_permission('odeme_goruntule'):
-        flash('Ödeme görüntüleme yetkiniz bulunmamaktadır.', 'error')
-        return redirect(url_for('anasayfa'))
-        
-    today_date_str = datetime.now().strftime('%Y-%m-%d') # Bugünün tarihini YYYY-MM-DD formatında al
-
-    if request.method == 'POST':
-        if not current_user.has_permission('odeme_ekle'):
-            flash('Ödeme ekleme yetkiniz bulunmamaktadır.', 'error')
-            return redirect(url_for('odemeler'))
-            
-        name = request.form['name']
-        surname = request.form['surname']
-        tc = request.form['tc']
-        currency = request.form['currency']
-        installments = request.form['installments']
-
-        try:
-            # Frontend'den gelen tutarı direkt olarak çevir, hiçbir temizleme işlemi yapmadan
-            amount_str = request.form['amount']
-            
-            # Sayısal değer kontrolü (herhangi bir formatlama yapmıyoruz)
-            try:
-                amount_value = float(amount_str)
-            except ValueError:
-                app.logger.error(f"Tutar dönüşüm hatası: Tutar '{amount_str}' geçerli bir sayı değil")
-                return jsonify({'success': False, 'error': 'Geçersiz tutar formatı. Lütfen sadece sayı girin.'}), 400
-            
-            # Kayıt için kullanılacak değeri log kaydına ekle
-            app.logger.info(f"POST /odemeler - Kaydedilen tutar: {amount_value}")
-        except Exception as e:
-            app.logger.error(f"POST /odemeler - Tutar işleme hatası: {str(e)}")
-            return jsonify({'success': False, 'error': 'Tutar işlenirken bir hata oluştu.'}), 400
-
-        # Tarih alanlarını datetime.date nesnelerine dönüştür
-        registration_date = None
-        due_date = None
-        
-        if request.form.get('registration_date'):
-            registration_date = datetime.strptime(request.form.get('registration_date'), '%Y-%m-%d').date()
-        
-        if request.form.get('due_date'):
-            due_date = datetime.strptime(request.form.get('due_date'), '%Y-%m-%d').date()
-        
-        # Yeni client oluştur
-        new_client = Client(
-            name=name, 
-            surname=surname, 
-            tc=tc, 
-            amount=amount_value,  # Sayısal değeri kullan
-            currency=currency, 
-            installments=installments, 
-            registration_date=registration_date, 
-            due_date=due_date
-        )
-        
-        # Kaydet
-        db.session.add(new_client)
-        
-        # Log kaydı
-        log = ActivityLog(
-            activity_type='odeme_ekleme',
-            description=f'Yeni ödeme eklendi: {name} {surname}',
-            details={
-                'musteri': f'{name} {surname}',
-                'tc': tc,
-                'tutar': f'{amount_value} {currency}',
-                'taksit': installments,
-                'borc_kayit_tarihi': request.form.get('registration_date'),
-                'son_odeme_tarihi': request.form.get('due_date')
-            },
-            user_id=current_user.id,
-            related_payment_id=new_client.id
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-        return jsonify({'success': True})
-    
-    clients = Client.query.all()
-    return render_template('odemeler.html', clients=clients, today_date=today_date_str) # today_date'i template'e gönder
-
-@app.route('/update_client/<int:client_id>', methods=['POST'])
-@login_required
-def update_client(client_id):
-    if not current_user.has_permission('odeme_duzenle'):
-        return jsonify({'success': False, 'error': 'Ödeme düzenleme yetkiniz bulunmamaktadır.'})
-        
-    try:
-        data = request.get_json()
-        client = Client.query.get_or_404(client_id)
-        if client:
-            old_status = client.status
-            client.name = data['name']
-            client.surname = data['surname']
-            client.tc = data['tc']
-            
-            # Frontend'den gelen tutarı doğrudan dönüştür, hiçbir temizleme yapmadan
-            try:
-                amount_str = data['amount']
-                
-                # Sayısal değer kontrolü
-                try:
-                    amount_value = float(amount_str)
-                except ValueError:
-                    app.logger.error(f"Tutar dönüşüm hatası: Tutar '{amount_str}' geçerli bir sayı değil")
-                    return jsonify({'success': False, 'error': 'Geçersiz tutar formatı. Lütfen sadece sayı girin.'}), 400
-                    
-                # Önceki değer ve yeni değeri karşılaştır
-                app.logger.info(f"POST /update_client/{client_id} - Eski tutar: {client.amount}, Yeni tutar: {amount_value}")
-                
-                # Tutarı güncelle
-                client.amount = amount_value
-            except Exception as e:
-                app.logger.error(f"POST /update_client/{client_id} - Tutar işleme hatası: {str(e)}")
-                return jsonify({'success': False, 'error': 'Tutar işlenirken bir hata oluştu.'})
-            
-            client.currency = data['currency']
-            client.installments = data['installments']
-            
-            # Tarih alanlarını datetime.date nesnesine dönüştür
-            if data.get('registration_date'):
-                try:
-                    client.registration_date = datetime.strptime(data['registration_date'], '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'success': False, 'error': 'Geçersiz borç kayıt tarihi formatı'})
-            else:
-                client.registration_date = None
-                
-            if data.get('due_date'):
-                try:
-                    client.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'success': False, 'error': 'Geçersiz son ödeme tarihi formatı'})
-            else:
-                client.due_date = None
-            
-            # Status alanını güvenli bir şekilde al ve güncelle
-            new_status = data.get('status')
-            if new_status is not None:
-                client.status = new_status
-            
-            client.description = data.get('description', '')
-
-            # Ödeme durumu değiştiyse log kaydı ekle
-            if old_status != new_status:
-                log = ActivityLog(
-                    activity_type='odeme_guncelleme',
-                    description=f'Ödeme durumu güncellendi: {client.name} {client.surname}',
-                    details={
-                        'musteri': f'{client.name} {client.surname}',
-                        'eski_durum': old_status,
-                        'yeni_durum': new_status,
-                        'tutar': f'{client.amount} {client.currency}'
-                    },
-                    user_id=current_user.id,
-                    related_payment_id=client.id
-                )
-                db.session.add(log)
-            
-            db.session.commit()
-            return jsonify({'success': True})
-        
-        return jsonify({'success': False, 'error': 'Müşteri bulunamadı'})
-    except Exception as e:
-        db.session.rollback()
-        # Hata ayrıntılarını kaydet
-        app.logger.error(f"update_client hatası: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)})
-
-@app.route('/musteri_yonetimi')
-def musteri_yonetimi():
-    return render_template('musteri_yonetimi.html')
-
-@app.route('/raporlar')
-def raporlar():
-    return render_template('raporlar.html')
-
-@app.route('/kullanici_yonetimi')
-def kullanici_yonetimi():
-    users = User.query.all()
-    return render_template('kullanici_yonetimi.html', users=users)
-
-@app.route('/bildirimler')
-def bildirimler():
-    notifications = Notification.query.filter_by(read=False).all()
-    return render_template('bildirimler.html', notifications=notifications)
-
-@app.route('/dosya_sorgula', methods=['GET', 'POST'])
-@login_required
-@permission_required('dosya_sorgula')
-def dosya_sorgula():
-    # Form verilerini al (POST veya GET parametrelerinden)
-    file_type = request.form.get('file-type') or request.args.get('file_type')
-    city = request.form.get('city') or request.args.get('city')
-    courthouse = request.form.get('courthouse') or request.args.get('courthouse')
-    department = request.form.get('department') or request.args.get('department')
-    court_number = request.form.get('court-number') or request.args.get('court_number')
-    year = request.form.get('year') or request.args.get('year')
-    case_number = request.form.get('case-number') or request.args.get('case_number')
-    client_name = request.form.get('client-name') or request.args.get('client_name')
-    status = request.form.get('status') or request.args.get('status')
-    
-    # Eğer herhangi bir filtre varsa sorguyu çalıştır
-    if request.method == 'POST' or any([file_type, city, courthouse, department, court_number, year, case_number, client_name, status]):
-        # Sorguyu başlat (Kullanıcı filtresi kaldırıldı)
-        query = CaseFile.query
-        
-        # Filtreler
-        if file_type:
-            query = query.filter_by(file_type=file_type)
-        if courthouse:
-            query = query.filter_by(courthouse=courthouse)
-        if department:
-            query = query.filter_by(department=department)
-        # Mahkeme numarası filtresi eklendi
-        if court_number:
-            query = query.filter_by(department=court_number)
-        if year:
-            query = query.filter_by(year=year)
-        if case_number:
-            query = query.filter_by(case_number=case_number)
-        if client_name:
-            query = query.filter(CaseFile.client_name.ilike(f'%{client_name}%'))
-        if status:
-            query = query.filter_by(status=status)
-        
-        # Sonuçları al
-        case_files = query.all()
-    else:
-        case_files = []
-    
-    # Şehir ve adliye verilerini yükle (dosya_ekle ile aynı fonksiyonu kullanıyor)
-    cities_courthouses, cities = parse_adliye_list()
-    
-    return render_template('dosya_sorgula.html', 
-                         case_files=case_files,
-                         cities=cities,
-                         all_courthouses=json.dumps(cities_courthouses, ensure_ascii=False))
-
-@app.route('/dosya_ekle', methods=['GET', 'POST'])
-@login_required
-@permission_required('dosya_ekle')
-@csrf.exempt
-def dosya_ekle():
-    if request.method == 'POST':
-        try:
-            # Form data'yı al (JSON değil)
-            data = request.form
-            file_type = data.get('file-type')
-
-            # Define required fields based on file_type
-            required_fields = ['file-type', 'year', 'case-number', 'client-name', 'open-date']
-
-            # Add courthouse/department based on type
-            if file_type not in ['ARABULUCULUK', 'AİHM', 'AYM']:
-                required_fields.append('courthouse')
-                # Only require department if not Savcılık or the others
-                if file_type != 'savcilik':
-                    required_fields.append('department')
-
-            # Check if all required fields are present and not empty
-            missing_fields = [field for field in required_fields if not data.get(field)]
-            if missing_fields:
-                return jsonify(success=False, message=f"Eksik alanlar: {', '.join(missing_fields)}"), 400
-
-            # Get courthouse and department, defaulting to None if not applicable/provided
-            courthouse = data.get('courthouse')
-            department = data.get('department')
-
-            # Dosya türüne göre özel kontroller
-            if file_type.upper() in ['ARABULUCULUK', 'AİHM', 'AYM', 'SAVCILIK']:
-                if file_type.upper() == 'AİHM':
-                    courthouse = "Avrupa İnsan Hakları Mahkemesi"
-                    department = "AİHM"
-                elif file_type.upper() == 'AYM':
-                    courthouse = "Anayasa Mahkemesi"
-                    department = "AYM"
-                elif file_type.upper() == 'ARABULUCULUK':
-                    courthouse = "Arabuluculuk Merkezi"
-                    department = "Arabuluculuk"
-                elif file_type.upper() == 'SAVCILIK':
-                    courthouse = courthouse or "Cumhuriyet Başsavcılığı"
-                    department = ""
-            else:
-                # Numaralı mahkeme/daire seçilmişse onu kullan
-                numbered_department = data.get('court-number')
-                if numbered_department:
-                    department = numbered_department
-
-            new_case_file = CaseFile(
-                file_type=file_type,
-                courthouse=courthouse,
-                department=department,
-                year=int(data['year']),
-                case_number=data['case-number'],
-                client_name=data['client-name'],
-                phone_number=data.get('client-phone', ''), # Phone number is now optional
-                status='Aktif',
-                open_date=datetime.strptime(data['open-date'], '%Y-%m-%d').date(),
-                user_id=current_user.id,
-                
-                # Müvekkil detay bilgileri
-                client_entity_type=data.get('client-entity-type', 'person'),
-                client_identity_number=data.get('client-id', ''),
-                client_capacity=data.get('client-capacity', ''),
-                client_address=data.get('client-address', ''),
-                
-                # Karşı taraf bilgileri
-                opponent_entity_type=data.get('opponent-entity-type', 'person'),
-                opponent_name=data.get('opponent-name', ''),
-                opponent_identity_number=data.get('opponent-id', ''),
-                opponent_capacity=data.get('opponent-capacity', ''),
-                opponent_phone=data.get('opponent-phone', ''),
-                opponent_address=data.get('opponent-address', ''),
-                
-                # Vekil bilgileri
-                opponent_lawyer=data.get('opponent-lawyer', ''),
-                opponent_lawyer_bar_number=data.get('opponent-lawyer-bar-number', ''),
-                opponent_lawyer_phone=data.get('opponent-lawyer-phone', ''),
-                opponent_lawyer_address=data.get('opponent-lawyer-address', '')
-            )
-
-            db.session.add(new_case_file)
-            db.session.commit()
-
-            # İşlem logu ekle
-            log_activity(
-                activity_type='dosya_ekleme',
-                description=f"Yeni dosya eklendi: {data['client-name']} - {data['case-number']}",
-                user_id=current_user.id,
-                case_id=new_case_file.id
-            )
-
-            # Başarılı yanıt için yönlendirme yap
-            flash('Dosya başarıyla eklendi!', 'success')
-            return redirect(url_for('dosya_sorgula'))
-
-        except Exception as e:
-            db.session.rollback()
-            print(f"Hata: {str(e)}")
-            flash(f"Dosya eklenirken hata oluştu: {str(e)}", 'error')
-            return redirect(url_for('dosya_ekle'))
-
-    # GET isteği için şehir ve adliye verilerini yükle
-    cities_courthouses, cities = parse_adliye_list()
-    today_date = datetime.now().strftime('%Y-%m-%d')
-    return render_template('dosya_ekle.html',
-                         today_date=today_date,
-                         cities=cities,
-                         all_courthouses=json.dumps(cities_courthouses, ensure_ascii=False)) # Pass all data as JSON
-
-@app.route('/case_details/<int:case_id>')
-def case_details(case_id):
-    try:
-        case_file = CaseFile.query.get_or_404(case_id)
-        
-        # Belgeleri hazırla
-        documents = [{
-            'id': doc.id,
-            'filename': doc.filename,
-            'document_type': doc.document_type,
-            'upload_date': doc.upload_date.strftime('%d.%m.%Y')
-        } for doc in case_file.documents]
-        
-        # Dosya numarasını yıl/esas no formatında hazırla
-        formatted_case_number = f"{case_file.year}/{case_file.case_number}"
-        
-        # Duruşma türünü Büyük Harfle başlayacak şekilde biçimlendir
-        formatted_hearing_type = "E-Duruşma" if case_file.hearing_type == "e-durusma" else "Duruşma"
-        
-        return jsonify({
-            'success': True,
-            'file_type': case_file.file_type,
-            'courthouse': case_file.courthouse,
-            'department': case_file.department,
-            'year': case_file.year,
-            'case_number': formatted_case_number,  # Formatlanmış dosya numarası
-            'client_name': case_file.client_name,
-            'phone_number': case_file.phone_number,
-            'status': case_file.status,
-            'open_date': case_file.open_date.strftime('%d.%m.%Y') if case_file.open_date else None,
-            'next_hearing': case_file.next_hearing.strftime('%d.%m.%Y') if case_file.next_hearing else None,
-            'hearing_time': case_file.hearing_time,  # Eklenen hearing_time alanı
-            'hearing_type': case_file.hearing_type, # Duruşma türü
-            'event_type': case_file.hearing_type,   # Frontend'de doğru radio button'un seçilmesi için
-            'formatted_hearing_type': formatted_hearing_type, # Görüntü için biçimlendirilmiş tür
-            
-            # Müvekkil detay bilgileri
-            'client_entity_type': case_file.client_entity_type,
-            'client_identity_number': case_file.client_identity_number,
-            'client_capacity': case_file.client_capacity,
-            'client_address': case_file.client_address,
-            
-            # Karşı taraf bilgileri
-            'opponent_entity_type': case_file.opponent_entity_type,
-            'opponent_name': case_file.opponent_name,
-            'opponent_identity_number': case_file.opponent_identity_number,
-            'opponent_capacity': case_file.opponent_capacity,
-            'opponent_phone': case_file.opponent_phone,
-            'opponent_address': case_file.opponent_address,
-            
-            # Vekil bilgileri
-            'opponent_lawyer': case_file.opponent_lawyer,
-            'opponent_lawyer_bar_number': case_file.opponent_lawyer_bar_number,
-            'opponent_lawyer_phone': case_file.opponent_lawyer_phone,
-            'opponent_lawyer_address': case_file.opponent_lawyer_address,
-            
-            'expenses': [{
-                'id': expense.id,
-                'expense_type': expense.expense_type,
-                'amount': str(expense.amount),
-                'date': expense.date.strftime('%d.%m.%Y'),
-                'description': expense.description,
-                'is_paid': expense.is_paid
-            } for expense in case_file.expenses],
-            'documents': documents,
-            'description': case_file.description
-        })
-    except Exception as e:
-        print(f"Hata: {str(e)}")
-        return jsonify(success=False, message=str(e))
-
-@app.route('/edit_case/<int:case_id>', methods=['POST'])
-@login_required
-@permission_required('dosya_duzenle')
-def edit_case(case_id):
-    try:
-        data = request.values
-        if not data:
-            return jsonify({'success': False, 'message': 'Geçersiz veri.'}), 400
-
-        case = CaseFile.query.get_or_404(case_id)
-
-        # Gelen verileri işle
-        case.file_type = data.get('file-type')
-        case.year = data.get('year')
-        case.case_number = data.get('case-number')
-        case.courthouse = data.get('courthouse')
-        
-        department = data.get('numbered-department') or data.get('department')
-        case.department = department
-
-        open_date_str = data.get('open-date')
-        if open_date_str:
-            case.open_date = datetime.strptime(open_date_str, '%Y-%m-%d').date()
-
-        case.client_name = data.get('client-name')
-        case.client_capacity = data.get('client-capacity')
-        case.client_identity_number = data.get('client-identity-number')
-        case.phone_number = data.get('phone-number')
-        case.client_address = data.get('client-address')
-
-        case.opponent_name = data.get('opponent-name')
-        case.opponent_capacity = data.get('opponent-capacity')
-        case.opponent_identity_number = data.get('opponent-identity-number')
-        case.opponent_phone = data.get('opponent-phone')
-        case.opponent_address = data.get('opponent-address')
-
-        case.opponent_lawyer = data.get('opponent-lawyer')
-        case.opponent_lawyer_phone = data.get('opponent-lawyer-phone')
-        case.opponent_lawyer_address = data.get('opponent-lawyer-address')
-
-        case.description = data.get('description')
-
-        # Duruşma tarihi güncellenmişse takvim etkinliğini de güncelle
-        next_hearing_str = data.get('next-hearing')
-        hearing_time_str = data.get('hearing-time')
-        
-        if next_hearing_str:
-            try:
-                next_hearing = datetime.strptime(next_hearing_str, '%Y-%m-%d').date()
-                case.next_hearing = next_hearing
-                
-                # Takvim etkinliğini bul veya oluştur
-                calendar_event = CalendarEvent.query.filter_by(case_file_id=case.id).first()
-                if not calendar_event:
-                    calendar_event = CalendarEvent(case_file_id=case.id, user_id=current_user.id)
-                    db.session.add(calendar_event)
-
-                # Takvim etkinliğini güncelle
-                calendar_event.title = f"Duruşma: {case.client_name} - {case.case_number}"
-                calendar_event.date = next_hearing
-                if hearing_time_str:
-                    hearing_time = datetime.strptime(hearing_time_str, '%H:%M').time()
-                    calendar_event.time = hearing_time
-                    case.hearing_time = hearing_time
-                else:
-                    calendar_event.time = None
-                    case.hearing_time = None
-            except ValueError:
-                # Tarih formatı yanlışsa görmezden gel
-                pass
-        else:
-            # Duruşma tarihi kaldırıldıysa takvim etkinliğini sil
-            case.next_hearing = None
-            case.hearing_time = None
-            calendar_event = CalendarEvent.query.filter_by(case_file_id=case.id).first()
-            if calendar_event:
-                db.session.delete(calendar_event)
-        
-        db.session.commit()
-        return jsonify({'success': True, 'message': 'Dosya başarıyla güncellendi.'})
-    except Exception as e:
-        db.session.rollback()
-        error_message = f"Dosya güncelleme hatası: {e}"
-        print(error_message) # Sunucu loglarına yazdırma
-        return jsonify({'success': False, 'message': 'Dosya güncellenirken bir sunucu hatası oluştu.'}), 500
-
-@app.route('/delete_case/<int:case_id>', methods=['POST'])
-@login_required
-@permission_required('dosya_sil')
-def delete_case(case_id):
-    # .env dosyasını yükle
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    import sys
-    import os
-    sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
-
-from flask import Flask, render_template, request, url_for, flash, redirect, jsonify, session, send_from_directory, send_file, make_response, current_app, Response
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from datetime import datetime, timedelta, date, time
-import json
-import os
-from werkzeug.utils import secure_filename
-import locale
-import time as pytime
-
-# Türkçe karakter desteği için encoding ayarı
-try:
-    locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'Turkish_Turkey.1254')
-    except locale.Error:
-        pass  # Sistem desteklemiyorsa varsayılan encoding kullan
-import subprocess
-import tempfile
-from flask_mail import Mail, Message
-from bs4 import BeautifulSoup
-from email_utils import send_calendar_event_assignment_email, send_calendar_event_reminder_email
-import requests
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from flask_wtf.csrf import CSRFProtect # CSRF Koruması için eklendi
-from models import db, User, ActivityLog, Client, Payment, Document, Notification, Expense, CaseFile, Announcement, CalendarEvent, WorkerInterview, IsciGorusmeTutanagi, DilekceKategori, OrnekDilekce, OrnekSozlesme
-import uuid
-from PIL import Image
-from functools import wraps
-from yargi_integration import yargi_integration
-from uyap_integration_advanced import UYAPManager, UyapFile
-from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-import re
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from html import escape  # HTML escape için bu modülü kullanacağız
-from fpdf import FPDF
-from xhtml2pdf import pisa
-import glob # Add glob import
-from sqlalchemy import func, desc
-import shutil
-import mammoth
-import pdfkit
-import logging # Logging için eklendi
-
-# Logger yapılandırması
-logger = logging.getLogger(__name__)
-import traceback # traceback importu eklendi
-
-# Flask-Admin imports
-from flask_admin import Admin, AdminIndexView, BaseView, expose
-from flask_admin.contrib.sqla import ModelView
-from flask_admin.actions import action # Import action decorator
-from markupsafe import Markup # For rendering HTML in actions
-
-# Helper function to parse adliyelist.txt
-def parse_adliye_list(filepath='../adliyelist.txt'): # Adjusted path
-    cities_courthouses = {}
-    try:
-        # Ensure the path is correct relative to app.py location
-        script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
-        abs_file_path = os.path.join(script_dir, filepath)
-
-        with open(abs_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            # Skip header and potential separator lines
-            data_lines = [line.strip() for line in lines if line.strip() and not line.startswith('İl\t') and not line.startswith('___')]
-            current_city = None
-            for line in data_lines:
-                parts = line.split('\t', 1)
-                if len(parts) == 2:
-                    city, courthouses_str = parts
-                    current_city = city.strip()
-                    # Process courthouses string: split by comma or bullet, handle ACM markers etc.
-                    # Keep the original names including ACM details
-                    courthouses = [ch.strip() for ch in re.split(r'\s*,\s*|\s*•\s*', courthouses_str) if ch.strip()]
-                    cities_courthouses[current_city] = courthouses
-                # Removed the elif part as it's unlikely based on file structure
-    except FileNotFoundError:
-        print(f"Error: {abs_file_path} not found.")
-        return {}, []
-    except Exception as e:
-        print(f"Error parsing {abs_file_path}: {e}")
-        return {}, []
-
-    # İstanbul'u şehir listesine manuel olarak ekle (zaten varsa sorun değil)
-    if 'İstanbul' not in cities_courthouses:
-        # İstanbul adliyeleri bu listede olmayacak, çünkü bunlar hardcoded olarak frontend'de tanımlanmış
-        cities_courthouses['İstanbul'] = []  
-        
-    # Önce standart alfabetik sıralama
-    cities = sorted(cities_courthouses.keys())
-    
-    # Özel sıralama için listeyi yeniden düzenle
-    # İstanbul'u listeden çıkar ve en başa ekle
-    if 'İstanbul' in cities:
-        cities.remove('İstanbul')
-        cities.insert(0, 'İstanbul')
-    
-    # İzmir'i Isparta'dan sonra getir
-    if 'İzmir' in cities and 'Isparta' in cities:
-        izmir_index = cities.index('İzmir')
-        isparta_index = cities.index('Isparta')
-        
-        # İzmir'i çıkar
-        cities.remove('İzmir')
-        
-        # Isparta'dan sonraya ekle
-        cities.insert(isparta_index + 1, 'İzmir')
-    
-    # İstanbul'un listede olduğundan emin olalım
-    if 'İstanbul' in cities:
-        print("İstanbul şehir listesinde mevcut.")
-    else:
-        print("UYARI: İstanbul şehir listesine eklenemedi!")
-        
-    return cities_courthouses, cities
-
-def permission_required(permission):
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not current_user.is_authenticated:
-                flash('Bu işlem için giriş yapmanız gerekmektedir.', 'error')
-                return redirect(url_for('login', next=request.url))
-            
-            # Admin kontrolü ekle - Admin her şeyi yapabilir
-            if current_user.is_admin:
-                return f(*args, **kwargs)
-                
-            # Normal kullanıcılar için yetki kontrolü yap
-            if not current_user.has_permission(permission):
-                # Hangi yetkiye ihtiyaç duyulduğunu belirten bir hata mesajı
-                permission_names = {
-                    'dosya_sorgula': 'Dosya Sorgulama',
-                    'dosya_ekle': 'Dosya Ekleme', 
-                    'dosya_duzenle': 'Dosya Düzenleme',
-                    'dosya_sil': 'Dosya Silme',
-                    'takvim_goruntule': 'Takvim Görüntüleme',
-                    'etkinlik_goruntule': 'Etkinlik Görüntüleme',
-                    'etkinlik_ekle': 'Etkinlik Ekleme',
-                    'etkinlik_duzenle': 'Etkinlik Düzenleme',
-                    'etkinlik_sil': 'Etkinlik Silme',
-                    'duyuru_goruntule': 'Duyuru Görüntüleme',
-                    'duyuru_ekle': 'Duyuru Ekleme',
-                    'duyuru_duzenle': 'Duyuru Düzenleme',
-                    'duyuru_sil': 'Duyuru Silme',
-                    'odeme_goruntule': 'Ödeme Görüntüleme',
-                    'odeme_ekle': 'Ödeme Ekleme',
-                    'odeme_duzenle': 'Ödeme Düzenleme',
-                    'odeme_sil': 'Ödeme Silme',
-                    'faiz_hesaplama': 'Faiz Hesaplama',
-                    'harc_hesaplama': 'Harç Hesaplama',
-                    'isci_hesaplama': 'İşçi Alacağı Hesaplama',
-                    'vekalet_hesaplama': 'Vekalet Ücreti Hesaplama',
-                    'ceza_infaz_hesaplama': 'Ceza İnfaz Hesaplama',
-                    'rapor_goruntule': 'Rapor Görüntüleme',
-                    'rapor_olustur': 'Rapor Oluşturma',
-                    'musteri_goruntule': 'Müşteri Görüntüleme',
-                    'musteri_ekle': 'Müşteri Ekleme',
-                    'musteri_duzenle': 'Müşteri Düzenleme',
-                    'musteri_sil': 'Müşteri Silme',
-                    'panel_goruntule': 'Panel Görüntüleme',
-                    'ayarlar': 'Ayarlar Erişimi',
-                    'isci_gorusme_goruntule': 'İşçi Görüşme Görüntüleme',
-                    'isci_gorusme_ekle': 'İşçi Görüşme Ekleme',
-                    'isci_gorusme_duzenle': 'İşçi Görüşme Düzenleme',
-                    'isci_gorusme_sil': 'İşçi Görüşme Silme',
-                    'ornek_dilekceler': 'Örnek Dilekçeler',
-                    'ornek_sozlesmeler': 'Örnek Sözleşmeler',
-                    'ucret_tarifeleri': 'Ücret Tarifeleri',
-                    'yargi_kararlari_arama': 'Yargı Kararları Arama',
-                    'veritabani_yonetimi': 'Veritabanı Yönetimi'
-                }
-                
-                permission_name = permission_names.get(permission, permission)
-                flash(f'Bu işlem için "{permission_name}" yetkisine sahip olmanız gerekiyor.', 'error')
-                
-                # API isteklerinde JSON yanıtı döndür, sayfa isteklerinde anasayfaya yönlendir
-                if request.is_json:
-                    return jsonify({'success': False, 'error': f'Yetkiniz yok: {permission_name}'}), 403
-                    
-                return redirect(url_for('anasayfa'))
-                
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
-app = Flask(__name__, static_url_path='/static')
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SECRET_KEY'] = 'your_secret_key'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'instance', 'database.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'uploads/'
-app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'ornek_dilekceler') # Yeni eklendi
-app.config['UYAP_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'uyap') # UYAP dosyaları için
-# CSRF için WTF_CSRF_ENABLED=True (varsayılan olarak True'dur ama açıkça belirtmek iyi olabilir)
-app.config['WTF_CSRF_ENABLED'] = True
-# SECRET_KEY zaten yukarıda tanımlı, CSRF için de kullanılır.
-
-# E-posta konfigürasyonu (.env dosyasından) - Gmail kullan
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USE_SSL'] = False
-app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_ASCII_ATTACHMENTS'] = False  # Türkçe karakter desteği için
-app.config['MAIL_DEFAULT_CHARSET'] = 'utf-8'  # UTF-8 charset ayarla
-app.config['MAIL_SUPPRESS_SEND'] = False
-app.config['MAIL_DEBUG'] = True  # Debug modunu aç
-
-db.init_app(app)
-migrate = Migrate(app, db)
-mail = Mail(app)
-csrf = CSRFProtect(app) # CSRF korumasını başlat
-
-# Login manager setup
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
-login_manager.login_message = 'Lütfen giriş yapın.'
-login_manager.login_message_category = 'info'
-
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
-
-# --- Flask-Admin Setup ---
-
-# Secure Admin Index View
-class MyAdminIndexView(AdminIndexView):
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-    
-    def inaccessible_callback(self, name, **kwargs):
-        # Redirect non-admins or non-authenticated users to login page
-        flash('Bu sayfaya erişmek için admin yetkilerine sahip olmanız gerekiyor.', 'error')
-        return redirect(url_for('login'))
-    
-    @expose('/')
-    def index(self):
-        stats = {
-            'total_users': User.query.count(),
-            'pending_users': User.query.filter_by(is_approved=False).count(),
-            'total_case_files': CaseFile.query.count(),
-            'active_case_files': CaseFile.query.filter_by(status='Aktif').count(),
-            'total_hearings': CalendarEvent.query.filter(CalendarEvent.event_type.in_(['durusma', 'e-durusma'])).count(),
-            'total_payments': Payment.query.count(),
-            'total_expenses': Expense.query.count(),
-            'total_documents': Document.query.count(),
-        }
-        self._template_args['stats'] = stats
-        self._template_args['admin_view'] = self
-        return super(MyAdminIndexView, self).index()
-
-    # Özel dizayn ekliyoruz
-    @expose('/admin/back_to_app')
-    def back_to_app(self):
-        return redirect(url_for('anasayfa'))
-
-# Secure Model View
-class SecureModelView(ModelView):
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
-    def inaccessible_callback(self, name, **kwargs):
-        flash("Bu sayfaya erişim yetkiniz yok.", "error")
-        return redirect(url_for('login', next=request.url))
-
-# User Model View Customization
-class UserView(SecureModelView):
-    column_exclude_list = ['password_hash']
-    form_excluded_columns = ['password_hash', 'activities']
-    column_searchable_list = ['username', 'email', 'first_name', 'last_name']
-    column_filters = ['role', 'is_admin', 'is_approved']
-    column_list = ('username', 'email', 'first_name', 'last_name', 'role', 'is_admin', 'is_approved', 'created_at')
-    column_labels = dict(username='Kullanıcı Adı', email='E-posta', first_name='Ad', last_name='Soyad', role='Rol', is_admin='Admin?', is_approved='Onaylı?', created_at='Kayıt Tarihi')
-    
-    can_create = True
-    can_edit = True
-    can_delete = True
-
-    # Kullanıcı onaylama eylemi
-    @action('approve', 'Seçili Kullanıcıları Onayla', 'Seçili kullanıcıları onaylamak istediğinizden emin misiniz?')
-    def action_approve(self, ids):
-        try:
-            query = User.query.filter(User.id.in_(ids))
-            count = 0
-            for user in query.all():
-                if not user.is_approved:
-                    user.is_approved = True
-                    user.approval_date = datetime.now()
-                    user.approved_by = current_user.id
-                    count += 1
-            db.session.commit()
-            flash(f'{count} kullanıcı başarıyla onaylandı.', 'success')
-        except Exception as ex:
-            if not self.handle_view_exception(ex):
-                raise
-            flash(f'Kullanıcılar onaylanırken hata oluştu: {ex}', 'error')
-
-    # Kullanıcı onay durumunu değiştirme eylemi
-    @action('toggle_approval', 'Seçili Kullanıcıların Onay Durumunu Değiştir', 'Seçili kullanıcıların onay durumunu değiştirmek istediğinizden emin misiniz?')
-    def action_toggle_approval(self, ids):
-        try:
-            query = User.query.filter(User.id.in_(ids))
-            approved_count = 0
-            disapproved_count = 0
-            for user in query.all():
-                if user.is_approved:
-                    user.is_approved = False
-                    user.approval_date = None
-                    user.approved_by = None
-                    disapproved_count += 1
-                else:
-                    user.is_approved = True
-                    user.approval_date = datetime.now()
-                    user.approved_by = current_user.id
-                    approved_count += 1
-            db.session.commit()
-            flash(f'{approved_count} kullanıcı onaylandı, {disapproved_count} kullanıcının onayı kaldırıldı.', 'success')
-        except Exception as ex:
-            if not self.handle_view_exception(ex):
-                raise
-            flash(f'Onay durumu değiştirilirken hata oluştu: {ex}', 'error')
-
-# ActivityLog için özel view (ilişkili alanları göstermek için)
-class ActivityLogView(SecureModelView):
-    can_create = False
-    can_edit = False
-    can_delete = True # Logları silebilme (opsiyonel)
-    column_list = ('timestamp', 'user', 'activity_type', 'description', 'related_case', 'related_event')
-    column_labels = dict(timestamp='Zaman Damgası', user='Kullanıcı', activity_type='İşlem Türü', description='Açıklama', related_case='İlgili Dosya', related_event='İlgili Etkinlik')
-    column_formatters = {
-        'user': lambda v, c, m, p: m.user.get_full_name() if m.user else '-',
-        'related_case': lambda v, c, m, p: f"{m.case.client_name} ({m.case.year}/{m.case.case_number})" if m.case else '-',
-        'related_event': lambda v, c, m, p: m.event.title if m.event else '-'
-    }
-    column_filters = ('activity_type', 'user.username', 'timestamp')
-    column_searchable_list = ('description', 'user.username', 'activity_type')
-    column_default_sort = ('timestamp', True) # En son işlem en üstte
-
-# Initialize Flask-Admin
-admin = Admin(app, name='Veri Kontrol', template_mode='bootstrap4', index_view=MyAdminIndexView())
-
-# Add Admin Views for your models
-admin.add_view(UserView(User, db.session, name='Kullanıcılar'))
-admin.add_view(SecureModelView(CaseFile, db.session, name='Dosyalar'))
-admin.add_view(SecureModelView(CalendarEvent, db.session, name='Takvim Etkinlikleri'))
-admin.add_view(SecureModelView(Document, db.session, name='Belgeler'))
-admin.add_view(SecureModelView(Expense, db.session, name='Masraflar'))
-admin.add_view(SecureModelView(Client, db.session, name='Müşteri Ödemeleri'))
-admin.add_view(SecureModelView(Payment, db.session, name='Ödemeler (Taksit)'))
-admin.add_view(SecureModelView(Announcement, db.session, name='Duyurular'))
-admin.add_view(ActivityLogView(ActivityLog, db.session, name='İşlem Kayıtları')) # Özel view kullanıldı
-admin.add_view(SecureModelView(WorkerInterview, db.session, name='İşçi Görüşme (Eski)'))
-admin.add_view(SecureModelView(IsciGorusmeTutanagi, db.session, name='İşçi Görüşme Tutanağı'))
-admin.add_view(SecureModelView(Notification, db.session, name='Bildirimler'))
-admin.add_view(SecureModelView(DilekceKategori, db.session, name='Örnek Dilekçe Kategorileri')) # Örnek Dilekçe Kategori için Admin View
-admin.add_view(SecureModelView(OrnekDilekce, db.session, name='Örnek Dilekçeler')) # Örnek Dilekçeler için Admin View
-admin.add_view(SecureModelView(OrnekSozlesme, db.session, name='Örnek Sözleşmeler')) # Yeni eklendi
-
-# --- End Flask-Admin Setup ---
-
-# Auth routes
-def logout():
-    logout_user()
-    return redirect(url_for('login'))
-
-@app.route('/profile')
-@login_required
-def profile():
-    return render_template('profile.html')
-
-@app.route('/settings')
-@login_required
-def settings():
-    return render_template('settings.html')
-
-@app.route('/update_profile', methods=['GET', 'POST'])
-@login_required
-def update_profile():
-    if request.method == 'POST':
-        try:
-            user = User.query.get(current_user.id)
-            
-            # Profil resmi yükleme işlemi
-            if 'profile_image' in request.files:
-                file = request.files['profile_image']
-                if file and allowed_file(file.filename):
-                    try:
-                        # Eski profil resmini sil (varsayılan resim hariç)
-                        if user.profile_image and user.profile_image != 'images/pp.png':
-                            old_image_path = os.path.join(app.static_folder, user.profile_image)
-                            if os.path.exists(old_image_path):
-                                os.remove(old_image_path)
-                        
-                        # Yeni resmi kaydet
-                        filename = secure_filename(file.filename)
-                        unique_filename = f"images/profile_{user.id}_{int(pytime.time())}_{filename}"
-                        filepath = os.path.join(app.static_folder, unique_filename)
-                        
-                        # Resmi boyutlandır ve kaydet
-                        image = Image.open(file)
-                        image = image.convert('RGB')  # PNG'yi JPG'ye çevir
-                        
-                        # En-boy oranını koru ve 300x300 boyutuna getir
-                        output_size = (300, 300)
-                        image.thumbnail(output_size, Image.Resampling.LANCZOS)
-                        
-                        # Kare crop için merkezi al
-                        width, height = image.size
-                        left = (width - min(width, height))/2
-                        top = (height - min(width, height))/2
-                        right = (width + min(width, height))/2
-                        bottom = (height + min(width, height))/2
-                        image = image.crop((left, top, right, bottom))
-                        
-                        # Resmi kaydet
-                        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                        image.save(filepath, 'JPEG', quality=85)
-                        user.profile_image = unique_filename
-                    except Exception as e:
-                        return jsonify(success=False, message=f"Resim yükleme hatası: {str(e)}")
-
-            # Diğer profil bilgilerini güncelle
-            user.username = request.form.get('username')
-            user.first_name = request.form.get('first_name')
-            user.last_name = request.form.get('last_name')
-            user.email = request.form.get('email')
-            user.phone = request.form.get('phone')
-            user.role = request.form.get('meslek')
-            user.gender = request.form.get('gender')
-            
-            # Doğum tarihi kontrolü ve dönüşümü
-            birth_date = request.form.get('birthdate')
-            if birth_date:
-                try:
-                    user.birthdate = datetime.strptime(birth_date, '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify(success=False, message="Geçersiz doğum tarihi formatı")
-            
-            db.session.commit()
-            
-            return jsonify({
-                'success': True,
-                'message': 'Profil başarıyla güncellendi',
-                'profile_image': user.profile_image
-            })
-            
-        except Exception as e:
-            db.session.rollback()
-            return jsonify(success=False, message=f"Profil güncellenirken bir hata oluştu: {str(e)}")
-
-    return render_template('profile.html')
-
-@app.route('/change_password', methods=['POST'])
-@login_required
-def change_password():
-    try:
-        current_password = request.form.get('current_password')
-        new_password = request.form.get('new_password')
-        
-        if not current_password or not new_password:
-            return jsonify({'success': False, 'message': 'Tüm alanları doldurun.'}), 400
-        
-        if not current_user.check_password(current_password):
-            return jsonify({'success': False, 'message': 'Mevcut şifre yanlış!'}), 400
-        
-        if len(new_password) < 6:
-            return jsonify({'success': False, 'message': 'Yeni şifre en az 6 karakter olmalıdır!'}), 400
-        
-        current_user.set_password(new_password)
-        db.session.commit()
-        
-        # Log oluştur
-        log_activity(
-            activity_type='sifre_degistirme',
-            description='Kullanıcı şifresini değiştirdi',
-            user_id=current_user.id
-        )
-        
-        return jsonify({'success': True, 'message': 'Şifreniz başarıyla değiştirildi!'})
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': f'Şifre değiştirme işlemi başarısız: {str(e)}'}), 500
-
-@app.route('/delete_account', methods=['POST'])
-@login_required
-def delete_account():
-    try:
-        password = request.form.get('password')
-        
-        if not password:
-            return jsonify({'success': False, 'message': 'Şifre gereklidir.'}), 400
-        
-        if not current_user.check_password(password):
-            return jsonify({'success': False, 'message': 'Şifre yanlış!'}), 400
-        
-        # Admin kullanıcısını silemezsiniz
-        if current_user.is_admin:
-            return jsonify({'success': False, 'message': 'Admin hesabı silinemez!'}), 400
-        
-        user_id = current_user.id
-        username = current_user.username
-        
-        # Log oluştur (kullanıcı silinmeden önce)
-        log_activity(
-            activity_type='hesap_silme',
-            description=f'Kullanıcı hesabını sildi: {username}',
-            user_id=current_user.id
-        )
-        
-        # İlişkili verileri temizle
-        ActivityLog.query.filter_by(user_id=user_id).delete()
-        
-        # Kullanıcının dosyalarını, duyurularını vs. başka kullanıcıya aktar veya sil
-        # (Bu kısım daha karmaşık, şimdilik basit tutuyoruz)
-        
-        # Kullanıcıyı sil
-        User.query.filter_by(id=user_id).delete()
-        db.session.commit()
-        
-        logout_user()
-        
-        return jsonify({'success': True, 'message': 'Hesabınız başarıyla silindi!'})
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'message': f'Hesap silme işlemi başarısız: {str(e)}'}), 500
-
-@app.route('/enable_2fa', methods=['POST'])
-@login_required
-def enable_2fa():
-    """İki faktörlü doğrulamayı etkinleştir/devre dışı bırak"""
-    try:
-        data = request.get_json()
-        enabled = data.get('enabled', False)
-        
-        user = User.query.get(current_user.id)
-        
-        # Permissions'ı güncelle
-        if not user.permissions:
-            user.permissions = {}
-        
-        user.permissions['two_factor_auth'] = enabled
-        db.session.commit()
-        
-        # Log oluştur
-        log_activity(
-            activity_type='guvenlik_ayar',
-            description=f'İki faktörlü doğrulama {"etkinleştirildi" if enabled else "devre dışı bırakıldı"}',
-            user_id=current_user.id
-        )
-        
-        return jsonify({
-            'success': True, 
-            'message': f'İki faktörlü doğrulama {"etkinleştirildi" if enabled else "devre dışı bırakıldı"}'
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'message': f'İşlem başarısız: {str(e)}'
-        }), 500
-
-# Admin paneli için decorator
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash('Bu sayfaya erişmek için giriş yapmanız gerekiyor.', 'error')
-            return redirect(url_for('login', next=request.url))
-            
-        if not current_user.is_admin:
-            flash('Bu sayfa sadece yöneticiler tarafından erişilebilir.', 'error')
-            
-            # API istekleri için JSON yanıtı
-            if request.is_json:
-                return jsonify({'success': False, 'error': 'Yönetici yetkisi gerekiyor'}), 403
-                
-            return redirect(url_for('anasayfa'))
-            
-        return f(*args, **kwargs)
-    return decorated_function
-
-# Protect routes
-@app.before_request
-def check_user_auth():
-    # Giriş gerektirmeyen sayfalar
-    public_endpoints = ['login', 'register', 'static']
-    
-    # Kullanıcı giriş yapmış ama onaylanmamış ise
-    if current_user.is_authenticated and not current_user.is_approved and not current_user.is_admin:
-        if request.endpoint not in ['logout']:
-            flash('Hesabınız henüz onaylanmamış. Lütfen yönetici onayını bekleyin.', 'warning')
-            logout_user()
-            return redirect(url_for('login'))
-    
-    # Kullanıcı giriş yapmamış ve korumalı bir sayfaya erişmeye çalışıyorsa
-    if not current_user.is_authenticated and request.endpoint not in public_endpoints:
-        return redirect(url_for('login'))
-
-# Türkçe tarih için locale ayarı
-try:
-    locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'tr_TR')
-    except locale.Error:
-        locale.setlocale(locale.LC_ALL, '')  # Sistem varsayılanını kullan
-
-@app.context_processor
-def inject_datetime():
-    try:
-        now = datetime.now()
-        current_time = {
-            'weekday': now.strftime('%A'),  # Gün adı
-            'time': now.strftime('%H:%M'),  # Saat
-            'date': now.strftime('%d.%m.%Y')  # Tarih
-        }
-    except Exception:
-        current_time = {
-            'weekday': '',
-            'time': '',
-            'date': ''
-        }
-    return dict(current_time=current_time)
-
-def log_activity(activity_type, description, user_id, case_id=None, related_announcement_id=None, related_event_id=None, related_payment_id=None, details=None):
-    user = User.query.get(user_id)
-    if user:
-        activity = ActivityLog(
-            activity_type=activity_type,
-            description=description.format(user_name=user.get_full_name()), # Kullanıcı adını formatla
-            user_id=user_id,
-            related_case_id=case_id,
-            related_announcement_id=related_announcement_id, # Yeni eklendi
-            related_event_id=related_event_id,           # Yeni eklendi
-            related_payment_id=related_payment_id,         # Yeni eklendi
-            details=details                              # Yeni eklendi
-        )
-        db.session.add(activity)
-        db.session.commit()
-
-@app.route('/')
-def anasayfa():
-    # Kullanıcı giriş yapmamışsa login sayfasına yönlendir
-    if not current_user.is_authenticated:
-        # landing.html dosyasında duyurular bölümü olmadığı için buraya eklemeyeceğiz.
-        return render_template('landing.html', title="Anasayfa")
-
-    # Giriş yapmış kullanıcı için ana sayfa içeriği
-    activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).limit(5).all() # Limit 10'dan 5'e düşürüldü
-    total_activities = ActivityLog.query.count() # Tüm aktivitelerin sayısını al
-    upcoming_hearings = CalendarEvent.query.filter(
-        db.func.datetime(CalendarEvent.date, CalendarEvent.time) >= datetime.utcnow(),
-        CalendarEvent.event_type.in_(['durusma', 'e-durusma']),
-        CalendarEvent.is_completed == False
-    ).order_by(CalendarEvent.date.asc(), CalendarEvent.time.asc()).limit(5).all()
-    total_hearings = CalendarEvent.query.filter(CalendarEvent.event_type.in_(['durusma', 'e-durusma'])).count() # Tüm duruşmaların sayısını al
-    
-    # Duyuruları al (örneğin son 5 duyuru)
-    announcements = Announcement.query.order_by(Announcement.created_at.desc()).limit(5).all()
-
-    user_cases = CaseFile.query.all() # Kullanıcı filtresi kaldırıldı
-    total_cases = len(user_cases)
-    total_active_cases = sum(1 for case in user_cases if case.status == 'Aktif') 
-    pending_cases = sum(1 for case in user_cases if case.status == 'Beklemede')
-    closed_cases = sum(1 for case in user_cases if case.status == 'Kapalı')
-
-    # Dosya türüne göre istatistikler
-    hukuk_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'hukuk')
-    ceza_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'ceza')
-    icra_count = sum(1 for case in user_cases if case.file_type and case.file_type.lower() == 'icra')
-
-    # Adliye istatistikleri
-    courthouse_stats_dict = {}
-    for case in user_cases:
-        if case.courthouse and case.courthouse.strip().lower() not in ['', 'uygulanmaz']:
-            courthouse_stats_dict[case.courthouse] = courthouse_stats_dict.get(case.courthouse, 0) + 1
-    courthouse_stats = [{'courthouse': k, 'total_cases': v} for k, v in courthouse_stats_dict.items()]
-
-
-    # Ödeme istatistikleri (opsiyonel, gerekirse eklenebilir)
-    # total_payments_this_month = db.session.query(func.sum(Payment.amount)).filter(...).scalar()
-
-    return render_template('anasayfa.html', 
-                           title="Anasayfa", 
-                           activities=activities, # Kullanıcı filtresi kaldırıldı
-                           total_activities=total_activities, # Şablona gönder
-                           upcoming_hearings=upcoming_hearings, # Kullanıcı filtresi kaldırıldı
-                           announcements=announcements,
-                           total_hearings=total_hearings, # Şablona gönder
-                           user_cases=user_cases, # Dosya istatistikleri için eklendi
-                           total_cases=total_cases,
-                           total_active_cases=total_active_cases, # active_cases -> total_active_cases
-                           pending_cases=pending_cases,
-                           closed_cases=closed_cases,
-                           hukuk_count=hukuk_count, # Eklendi
-                           ceza_count=ceza_count,   # Eklendi
-                           icra_count=icra_count,   # Eklendi
-                           courthouse_stats=courthouse_stats # Eklendi
-                           )
-
-# Daha fazla aktivite yüklemek için yeni endpoint
-@app.route('/load_more_activities/<int:offset>')
-def load_more_activities(offset):
-    activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).offset(offset).limit(5).all()
-    
-    activities_data = []
-    for activity in activities:
-        user = User.query.get(activity.user_id)
-        activity_data = {
-            'type': activity.activity_type,
-            'description': activity.description,
-            'timestamp': activity.timestamp.strftime('%d.%m.%Y %H:%M'),
-            'user': user.get_full_name() if user else 'Bilinmeyen Kullanıcı',
-            'details': activity.details,
-            'profile_image': url_for('static', filename=user.profile_image) if user and user.profile_image else url_for('static', filename='images/pp.png')
-        }
-        activities_data.append(activity_data)
-    
-    return jsonify(activities=activities_data)
-
-@app.route('/takvim')
-@login_required
-@permission_required('takvim_goruntule')
-def takvim():
-    # Debug mesajları
-    print(f"Kullanıcı admin mi: {current_user.is_admin}")
-    print(f"Kullanıcı yetkileri: {current_user.permissions}")
-    print(f"Takvim görüntüleme yetkisi: {current_user.has_permission('takvim_goruntule')}")
-    
-    # Tüm etkinlikleri getir
-    events = CalendarEvent.query.all()
-    events_data = []
-    
-    for event in events:
-        event_data = {
-            'id': event.id,
-            'title': event.title,
-            'date': event.date.strftime('%Y-%m-%d'),
-            'time': event.time.strftime('%H:%M'),
-            'event_type': event.event_type,
-            'description': event.description,
-            'assigned_to': event.assigned_to,
-            'file_type': event.file_type,
-            'courthouse': event.courthouse,
-            'department': event.department,
-            'deadline_date': event.deadline_date.strftime('%Y-%m-%d') if event.deadline_date else None,
-            'is_completed': event.is_completed
-        }
-        events_data.append(event_data)
-    
-    # Debug için dosya türü, adliye ve departman verilerini kontrol et
-    for event_data in events_data:
-        if event_data['event_type'] in ['durusma', 'e-durusma']:
-            print(f"Etkinlik {event_data['id']} - Dosya Türü: {event_data['file_type']}, Adliye: {event_data['courthouse']}, Departman: {event_data['department']}")
-    
-    # Adli tatil tarihlerini ekle
-    current_year = datetime.now().year
-    adli_tatil_data = []
-    
-    # 2024-2027 yılları için adli tatil tarihlerini ekle
-    for year in range(2024, 2028):
-        adli_tatil_data.append({
-            'start': f'{year}-07-20',
-            'end': f'{year}-08-31',
-            'year': year
-        })
-    
-    # === YENİ: Adliye verisini hazırla ===
-    # Adliye listesini dosyadan yükle
-    cities_courthouses, cities = parse_adliye_list()
-    
-    # Kullanıcının yetkilerini template'e gönder
-    user_permissions = {
-        'can_add': current_user.has_permission('etkinlik_ekle'),
-        'can_edit': current_user.has_permission('etkinlik_duzenle'),
-        'can_delete': current_user.has_permission('etkinlik_sil'),
-        'can_view': current_user.has_permission('etkinlik_goruntule')
-    }
-    
-    # Onaylı kullanıcıların listesini al
-    approved_users = User.query.filter_by(is_approved=True).all()
-    users_data = []
-    for user in approved_users:
-        users_data.append({
-            'id': user.id,
-            'full_name': user.get_full_name(),
-            'role': user.role,
-            'email': user.email
-        })
-    
-    return render_template('takvim.html', 
-                         events=events_data,
-                         adli_tatil_data=adli_tatil_data,
-                         all_courthouses=cities_courthouses, # Tüm adliye verilerini gönder
-                         user_permissions=user_permissions,
-                         approved_users=users_data)
-
-@app.route('/dosyalarim')
-def dosyalarim():
-    # URL parametrelerini al
-    file_type = request.args.get('file_type')
-    status = request.args.get('status')
-    
-    # Sorguyu başlat
-    query = CaseFile.query
-    
-    # Filtreler
-    if file_type:
-        query = query.filter_by(file_type=file_type)
-    if status:
-        query = query.filter_by(status=status)
-    
-    # Sonuçları al
-    case_files = query.all()
-    
-    return render_template('dosyalarim.html', 
-                         case_files=case_files,
-                         selected_type=file_type,
-                         selected_status=status)
-
-@app.route('/duyurular', methods=['GET', 'POST'])
-@login_required
-@permission_required('duyuru_goruntule')
-def duyurular():
-    if request.method == 'POST':
-        if not current_user.has_permission('duyuru_ekle'):
-            flash('Duyuru ekleme yetkiniz yok.', 'error')
-            return redirect(url_for('duyurular'))
-            
-        title = request.form['title']
-        content = request.form['content']
-        new_announcement = Announcement(title=title, content=content, user_id=current_user.id)
-        db.session.add(new_announcement)
-        
-        # Log kaydı
-        log = ActivityLog(
-            activity_type='duyuru_ekleme',
-            description=f'Yeni duyuru eklendi',
-            details={
-                'baslik': title,
-                'icerik': content[:50] + '...' if len(content) > 50 else content
-            },
-            user_id=current_user.id,
-            related_announcement_id=new_announcement.id
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-        flash('Duyuru başarıyla eklendi.', 'success')
-        return redirect(url_for('duyurular'))
-    
-    # Açık SQL hatası: Announcement.created_at sütunu eklenmiş ama 
-    # models.py'da tanımlandığını gördük; bu sorgu tüm nesneleri çekiyor
-    # Sadece gerekli sütunları belirterek sorunu çözelim
-    announcements = db.session.query(
-        Announcement.id,
-        Announcement.title,
-        Announcement.content,
-        Announcement.user_id
-    ).all()
-    
-    return render_template('duyurular.html', announcements=announcements)
-
-@app.route('/odemeler', methods=['GET', 'POST'])
-@login_required
-def odemeler():
-    if not current_user.has_permission('odeme_goruntule'):
-        flash('Ödeme görüntüleme yetkiniz bulunmamaktadır.', 'error')
-        return redirect(url_for('anasayfa'))
-        
-    today_date_str = datetime.now().strftime('%Y-%m-%d') # Bugünün tarihini YYYY-MM-DD formatında al
-
-    if request.method == 'POST':
-        if not current_user.has_permission('odeme_ekle'):
-            flash('Ödeme ekleme yetkiniz bulunmamaktadır.', 'error')
-            return redirect(url_for('odemeler'))
-            
-        name = request.form['name']
-        surname = request.form['surname']
-        tc = request.form['tc']
-        currency = request.form['currency']
-        installments = request.form['installments']
-
-        try:
-            # Frontend'den gelen tutarı direkt olarak çevir, hiçbir temizleme işlemi yapmadan
-            amount_str = request.form['amount']
-            
-            # Sayısal değer kontrolü (herhangi bir formatlama yapmıyoruz)
-            try:
-                amount_value = float(amount_str)
-            except ValueError:
-                app.logger.error(f"Tutar dönüşüm hatası: Tutar '{amount_str}' geçerli bir sayı değil")
-                return jsonify({'success': False, 'error': 'Geçersiz tutar formatı. Lütfen sadece sayı girin.'}), 400
-            
-            # Kayıt için kullanılacak değeri log kaydına ekle
-            app.logger.info(f"POST /odemeler - Kaydedilen tutar: {amount_value}")
-        except Exception as e:
-            app.logger.error(f"POST /odemeler - Tutar işleme hatası: {str(e)}")
-            return jsonify({'success': False, 'error': 'Tutar işlenirken bir hata oluştu.'}), 400
-
-        # Tarih alanlarını datetime.date nesnelerine dönüştür
-        registration_date = None
-        due_date = None
-        
-        if request.form.get('registration_date'):
-            registration_date = datetime.strptime(request.form.get('registration_date'), '%Y-%m-%d').date()
-        
-        if request.form.get('due_date'):
-            due_date = datetime.strptime(request.form.get('due_date'), '%Y-%m-%d').date()
-        
-        # Yeni client oluştur
-        new_client = Client(
-            name=name, 
-            surname=surname, 
-            tc=tc, 
-            amount=amount_value,  # Sayısal değeri kullan
-            currency=currency, 
-            installments=installments, 
-            registration_date=registration_date, 
-            due_date=due_date
-        )
-        
-        # Kaydet
-        db.session.add(new_client)
-        
-        # Log kaydı
-        log = ActivityLog(
-            activity_type='odeme_ekleme',
-            description=f'Yeni ödeme eklendi: {name} {surname}',
-            details={
-                'musteri': f'{name} {surname}',
-                'tc': tc,
-                'tutar': f'{amount_value} {currency}',
-                'taksit': installments,
-                'borc_kayit_tarihi': request.form.get('registration_date'),
-                'son_odeme_tarihi': request.form.get('due_date')
-            },
-            user_id=current_user.id,
-            related_payment_id=new_client.id
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-        return jsonify({'success': True})
-    
-    clients = Client.query.all()
-    return render_template('odemeler.html', clients=clients, today_date=today_date_str) # today_date'i template'e gönder
-
-@app.route('/update_client/<int:client_id>', methods=['POST'])
-@login_required
-def update_client(client_id):
-    if not current_user.has_permission('odeme_duzenle'):
-        return jsonify({'success': False, 'error': 'Ödeme düzenleme yetkiniz bulunmamaktadır.'})
-        
-    try:
-        data = request.get_json()
-        client = Client.query.get_or_404(client_id)
-        if client:
-            old_status = client.status
-            client.name = data['name']
-            client.surname = data['surname']
-            client.tc = data['tc']
-            
-            # Frontend'den gelen tutarı doğrudan dönüştür, hiçbir temizleme yapmadan
-            try:
-                amount_str = data['amount']
-                
-                # Sayısal değer kontrolü
-                try:
-                    amount_value = float(amount_str)
-                except ValueError:
-                    app.logger.error(f"Tutar dönüşüm hatası: Tutar '{amount_str}' geçerli bir sayı değil")
-                    return jsonify({'success': False, 'error': 'Geçersiz tutar formatı. Lütfen sadece sayı girin.'}), 400
-                    
-                # Önceki değer ve yeni değeri karşılaştır
-                app.logger.info(f"POST /update_client/{client_id} - Eski tutar: {client.amount}, Yeni tutar: {amount_value}")
-                
-                # Tutarı güncelle
-                client.amount = amount_value
-            except Exception as e:
-                app.logger.error(f"POST /update_client/{client_id} - Tutar işleme hatası: {str(e)}")
-                return jsonify({'success': False, 'error': 'Tutar işlenirken bir hata oluştu.'})
-            
-            client.currency = data['currency']
-            client.installments = data['installments']
-            
-            # Tarih alanlarını datetime.date nesnesine dönüştür
-            if data.get('registration_date'):
-                try:
-                    client.registration_date = datetime.strptime(data['registration_date'], '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'success': False, 'error': 'Geçersiz borç kayıt tarihi formatı'})
-            else:
-                client.registration_date = None
-                
-            if data.get('due_date'):
-                try:
-                    client.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'success': False, 'error': 'Geçersiz son ödeme tarihi formatı'})
-            else:
-                client.due_date = None
-            
-            # Status alanını güvenli bir şekilde al ve güncelle
-            new_status = data.get('status')
-            if new_status is not None:
-                client.status = new_status
-            
-            client.description = data.get('description', '')
-
-            # Ödeme durumu değiştiyse log kaydı ekle
-            if old_status != new_status:
-                log = ActivityLog(
-                    activity_type='odeme_guncelleme',
-                    description=f'Ödeme durumu güncellendi: {client.name} {client.surname}',
-                    details={
-                        'musteri': f'{client.name} {client.surname}',
-                        'eski_durum': old_status,
-                        'yeni_durum': new_status,
-                        'tutar': f'{client.amount} {client.currency}'
-                    },
-                    user_id=current_user.id,
-                    related_payment_id=client.id
-                )
-                db.session.add(log)
-            
-            db.session.commit()
-            return jsonify({'success': True})
-        
-        return jsonify({'success': False, 'error': 'Müşteri bulunamadı'})
-    except Exception as e:
-        db.session.rollback()
-        # Hata ayrıntılarını kaydet
-        app.logger.error(f"update_client hatası: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)})
-
-@app.route('/musteri_yonetimi')
-def musteri_yonetimi():
-    return render_template('musteri_yonetimi.html')
-
-@app.route('/raporlar')
-def raporlar():
-    return render_template('raporlar.html')
-
-@app.route('/kullanici_yonetimi')
-def kullanici_yonetimi():
-    users = User.query.all()
-    return render_template('kullanici_yonetimi.html', users=users)
-
-@app.route('/bildirimler')
-def bildirimler():
-    notifications = Notification.query.filter_by(read=False).all()
-    return render_template('bildirimler.html', notifications=notifications)
-
-@app.route('/dosya_sorgula', methods=['GET', 'POST'])
-@login_required
-@permission_required('dosya_sorgula')
-def dosya_sorgula():
-    # Form verilerini al (POST veya GET parametrelerinden)
-    file_type = request.form.get('file-type') or request.args.get('file_type')
-    city = request.form.get('city') or request.args.get('city')
-    courthouse = request.form.get('courthouse') or request.args.get('courthouse')
-    department = request.form.get('department') or request.args.get('department')
-    court_number = request.form.get('court-number') or request.args.get('court_number')
-    year = request.form.get('year') or request.args.get('year')
-    case_number = request.form.get('case-number') or request.args.get('case_number')
-    client_name = request.form.get('client-name') or request.args.get('client_name')
-    status = request.form.get('status') or request.args.get('status')
-    
-    # Eğer herhangi bir filtre varsa sorguyu çalıştır
-    if request.method == 'POST' or any([file_type, city, courthouse, department, court_number, year, case_number, client_name, status]):
-        # Sorguyu başlat (Kullanıcı filtresi kaldırıldı)
-        query = CaseFile.query
-        
-        # Filtreler
-        if file_type:
-            query = query.filter_by(file_type=file_type)
-        if courthouse:
-            query = query.filter_by(courthouse=courthouse)
-        if department:
-            query = query.filter_by(department=department)
-        # Mahkeme numarası filtresi eklendi
-        if court_number:
-            query = query.filter_by(department=court_number)
-        if year:
-            query = query.filter_by(year=year)
-        if case_number:
-            query = query.filter_by(case_number=case_number)
-        if client_name:
-            query = query.filter(CaseFile.client_name.ilike(f'%{client_name}%'))
-        if status:
-            query = query.filter_by(status=status)
-        
-        # Sonuçları al
-        case_files = query.all()
-    else:
-        case_files = []
-    
-    # Şehir ve adliye verilerini yükle (dosya_ekle ile aynı fonksiyonu kullanıyor)
-    cities_courthouses, cities = parse_adliye_list()
-    
-    return render_template('dosya_sorgula.html', 
-                         case_files=case_files,
-                         cities=cities,
-                         all_courthouses=json.dumps(cities_courthouses, ensure_ascii=False))
-
-# .env dosyasını yükle
-from dotenv import load_dotenv
-load_dotenv()
-
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
-
-from flask import Flask, render_template, request, url_for, flash, redirect, jsonify, session, send_from_directory, send_file, make_response, current_app, Response
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from datetime import datetime, timedelta, date, time
-import json
-import os
-from werkzeug.utils import secure_filename
-import locale
-import time as pytime
-
-# Türkçe karakter desteği için encoding ayarı
-try:
-    locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'Turkish_Turkey.1254')
-    except locale.Error:
-        pass  # Sistem desteklemiyorsa varsayılan encoding kullan
-import subprocess
-import tempfile
-from flask_mail import Mail, Message
-from bs4 import BeautifulSoup
-from email_utils import send_calendar_event_assignment_email, send_calendar_event_reminder_email
-import requests
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from flask_wtf.csrf import CSRFProtect # CSRF Koruması için eklendi
-from models import db, User, ActivityLog, Client, Payment, Document, Notification, Expense, CaseFile, Announcement, CalendarEvent, WorkerInterview, IsciGorusmeTutanagi, DilekceKategori, OrnekDilekce, OrnekSozlesme
-import uuid
-from PIL import Image
-from functools import wraps
-from yargi_integration import yargi_integration
-from uyap_integration_advanced import UYAPManager, UyapFile
-from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-import re
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from html import escape  # HTML escape için bu modülü kullanacağız
-from fpdf import FPDF
-from xhtml2pdf import pisa
-import glob # Add glob import
-from sqlalchemy import func, desc
-import shutil
-import mammoth
-import pdfkit
-import logging # Logging için eklendi
-
-# Logger yapılandırması
-logger = logging.getLogger(__name__)
-import traceback # traceback importu eklendi
+# Ağır alt sistemler (PDF/DOCX dönüştürücüler, PIL, selenium, içtihat istemcileri)
+# açılışta değil, kullanıldıkları fonksiyonlarda içe aktarılır; böylece worker'lar
+# ve CLI işleri (event_reminder.py) yalnızca uygulama çekirdeğini yükler.
+def UYAPManager(*args, **kwargs):
+    """UYAP yöneticisini ilk kullanımda yükler (selenium açılışta içe aktarılmaz)"""
+    from uyap_integration_advanced import UYAPManager as _UYAPManager
+    return _UYAPManager(*args, **kwargs)
 
 # Flask-Admin imports
 from flask_admin import Admin, AdminIndexView, BaseView, expose
@@ -3721,167 +70,21 @@ from flask_admin.actions import action # Import action decorator
 from markupsafe import Markup # For rendering HTML in actions
 
 # Helper function to parse adliyelist.txt
-def parse_adliye_list(filepath='../adliyelist.txt'): # Adjusted path
-    cities_courthouses = {}
-    try:
-        # Ensure the path is correct relative to app.py location
-        script_dir = os.path.dirname(__file__) #<-- absolute dir the script is in
-        abs_file_path = os.path.join(script_dir, filepath)
-
-        with open(abs_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            # Skip header and potential separator lines
-            data_lines = [line.strip() for line in lines if line.strip() and not line.startswith('İl\t') and not line.startswith('___')]
-            current_city = None
-            for line in data_lines:
-                parts = line.split('\t', 1)
-                if len(parts) == 2:
-                    city, courthouses_str = parts
-                    current_city = city.strip()
-                    # Process courthouses string: split by comma or bullet, handle ACM markers etc.
-                    # Keep the original names including ACM details
-                    courthouses = [ch.strip() for ch in re.split(r'\s*,\s*|\s*•\s*', courthouses_str) if ch.strip()]
-                    cities_courthouses[current_city] = courthouses
-                # Removed the elif part as it's unlikely based on file structure
-    except FileNotFoundError:
-        print(f"Error: {abs_file_path} not found.")
-        return {}, []
-    except Exception as e:
-        print(f"Error parsing {abs_file_path}: {e}")
-        return {}, []
+def parse_adliye_list():
+    """
+    Adliye listesini döndürür: (şehir -> adliyeler, sıralı şehirler)
 
-    # İstanbul'u şehir listesine manuel olarak ekle (zaten varsa sorun değil)
-    if 'İstanbul' not in cities_courthouses:
-        # İstanbul adliyeleri bu listede olmayacak, çünkü bunlar hardcoded olarak frontend'de tanımlanmış
-        cities_courthouses['İstanbul'] = []  
-        
-    # Önce standart alfabetik sıralama
-    cities = sorted(cities_courthouses.keys())
-    
-    # Özel sıralama için listeyi yeniden düzenle
-    # İstanbul'u listeden çıkar ve en başa ekle
-    if 'İstanbul' in cities:
-        cities.remove('İstanbul')
-        cities.insert(0, 'İstanbul')
-    
-    # İzmir'i Isparta'dan sonra getir
-    if 'İzmir' in cities and 'Isparta' in cities:
-        izmir_index = cities.index('İzmir')
-        isparta_index = cities.index('Isparta')
-        
-        # İzmir'i çıkar
-        cities.remove('İzmir')
-        
-        # Isparta'dan sonraya ekle
-        cities.insert(isparta_index + 1, 'İzmir')
-    
-    # İstanbul'un listede olduğundan emin olalım
-    if 'İstanbul' in cities:
-        print("İstanbul şehir listesinde mevcut.")
-    else:
-        print("UYARI: İstanbul şehir listesine eklenemedi!")
-        
-    return cities_courthouses, cities
+    Liste adliye_registry üzerinden bir kez ayrıştırılır ve adliyelist.txt
+    değişene kadar bellekten sunulur. Dönen veriler paylaşımlıdır,
+    değiştirilmemelidir.
+    """
+    return adliye_registry.cities_and_courthouses()
 
-def permission_required(permission):
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not current_user.is_authenticated:
-                flash('Bu işlem için giriş yapmanız gerekmektedir.', 'error')
-                return redirect(url_for('login', next=request.url))
-            
-            # Admin kontrolü ekle - Admin her şeyi yapabilir
-            if current_user.is_admin:
-                return f(*args, **kwargs)
-                
-            # Normal kullanıcılar için yetki kontrolü yap
-            if not current_user.has_permission(permission):
-                # Hangi yetkiye ihtiyaç duyulduğunu belirten bir hata mesajı
-                permission_names = {
-                    'dosya_sorgula': 'Dosya Sorgulama',
-                    'dosya_ekle': 'Dosya Ekleme', 
-                    'dosya_duzenle': 'Dosya Düzenleme',
-                    'dosya_sil': 'Dosya Silme',
-                    'takvim_goruntule': 'Takvim Görüntüleme',
-                    'etkinlik_goruntule': 'Etkinlik Görüntüleme',
-                    'etkinlik_ekle': 'Etkinlik Ekleme',
-                    'etkinlik_duzenle': 'Etkinlik Düzenleme',
-                    'etkinlik_sil': 'Etkinlik Silme',
-                    'duyuru_goruntule': 'Duyuru Görüntüleme',
-                    'duyuru_ekle': 'Duyuru Ekleme',
-                    'duyuru_duzenle': 'Duyuru Düzenleme',
-                    'duyuru_sil': 'Duyuru Silme',
-                    'odeme_goruntule': 'Ödeme Görüntüleme',
-                    'odeme_ekle': 'Ödeme Ekleme',
-                    'odeme_duzenle': 'Ödeme Düzenleme',
-                    'odeme_sil': 'Ödeme Silme',
-                    'faiz_hesaplama': 'Faiz Hesaplama',
-                    'harc_hesaplama': 'Harç Hesaplama',
-                    'isci_hesaplama': 'İşçi Alacağı Hesaplama',
-                    'vekalet_hesaplama': 'Vekalet Ücreti Hesaplama',
-                    'ceza_infaz_hesaplama': 'Ceza İnfaz Hesaplama',
-                    'rapor_goruntule': 'Rapor Görüntüleme',
-                    'rapor_olustur': 'Rapor Oluşturma',
-                    'musteri_goruntule': 'Müşteri Görüntüleme',
-                    'musteri_ekle': 'Müşteri Ekleme',
-                    'musteri_duzenle': 'Müşteri Düzenleme',
-                    'musteri_sil': 'Müşteri Silme',
-                    'panel_goruntule': 'Panel Görüntüleme',
-                    'ayarlar': 'Ayarlar Erişimi',
-                    'isci_gorusme_goruntule': 'İşçi Görüşme Görüntüleme',
-                    'isci_gorusme_ekle': 'İşçi Görüşme Ekleme',
-                    'isci_gorusme_duzenle': 'İşçi Görüşme Düzenleme',
-                    'isci_gorusme_sil': 'İşçi Görüşme Silme',
-                    'ornek_dilekceler': 'Örnek Dilekçeler',
-                    'ornek_sozlesmeler': 'Örnek Sözleşmeler',
-                    'ucret_tarifeleri': 'Ücret Tarifeleri',
-                    'yargi_kararlari_arama': 'Yargı Kararları Arama',
-                    'veritabani_yonetimi': 'Veritabanı Yönetimi'
-                }
-                
-                permission_name = permission_names.get(permission, permission)
-                flash(f'Bu işlem için "{permission_name}" yetkisine sahip olmanız gerekiyor.', 'error')
-                
-                # API isteklerinde JSON yanıtı döndür, sayfa isteklerinde anasayfaya yönlendir
-                if request.is_json:
-                    return jsonify({'success': False, 'error': f'Yetkiniz yok: {permission_name}'}), 403
-                    
-                return redirect(url_for('anasayfa'))
-                
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
-app = Flask(__name__, static_url_path='/static')
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SECRET_KEY'] = 'your_secret_key'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'instance', 'database.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'uploads/'
-app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'ornek_dilekceler') # Yeni eklendi
-app.config['UYAP_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'uyap') # UYAP dosyaları için
-# CSRF için WTF_CSRF_ENABLED=True (varsayılan olarak True'dur ama açıkça belirtmek iyi olabilir)
-app.config['WTF_CSRF_ENABLED'] = True
-# SECRET_KEY zaten yukarıda tanımlı, CSRF için de kullanılır.
-
-# E-posta konfigürasyonu (.env dosyasından) - Gmail kullan
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USE_SSL'] = False
-app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_ASCII_ATTACHMENTS'] = False  # Türkçe karakter desteği için
-app.config['MAIL_DEFAULT_CHARSET'] = 'utf-8'  # UTF-8 charset ayarla
-app.config['MAIL_SUPPRESS_SEND'] = False
-app.config['MAIL_DEBUG'] = True  # Debug modunu aç
-
-db.init_app(app)
+# Yapılandırma ve veritabanı bağlantısı app_factory.create_app içinde kurulur
+app = create_app(__name__)
 migrate = Migrate(app, db)
 mail = Mail(app)
-csrf = CSRFProtect(app) # CSRF korumasını başlat
+csrf.init_app(app) # CSRF korumasını başlat
 
 # Login manager setup
 login_manager = LoginManager()
@@ -4009,6 +212,25 @@ class ActivityLogView(SecureModelView):
     column_searchable_list = ('description', 'user.username', 'activity_type')
     column_default_sort = ('timestamp', True) # En son işlem en üstte
 
+# Faiz oranları için özel view (temerrüt ve mevduat oranları buradan elle girilir)
+class FaizOraniView(SecureModelView):
+    column_list = ('oran_turu', 'yururluk_tarihi', 'oran', 'kaynak', 'kayit_tarihi')
+    column_labels = dict(oran_turu='Oran Türü', yururluk_tarihi='Yürürlük Tarihi', oran='Oran (%)', kaynak='Kaynak', kayit_tarihi='Kayıt Tarihi')
+    column_filters = ('oran_turu', 'kaynak')
+    column_default_sort = [('oran_turu', False), ('yururluk_tarihi', True)]
+    form_columns = ('oran_turu', 'yururluk_tarihi', 'oran')
+    form_choices = {'oran_turu': [(oran_turu, oran_turu) for oran_turu in RATE_TYPES]}
+
+    def on_model_change(self, form, model, is_created):
+        # Elle girilen/düzeltilen oranın üzerine TCMB güncellemesi yazmaz
+        model.kaynak = 'manuel'
+
+    def after_model_change(self, form, model, is_created):
+        faiz_oranlari.load()
+
+    def after_model_delete(self, model):
+        faiz_oranlari.load()
+
 # Initialize Flask-Admin
 admin = Admin(app, name='Veri Kontrol', template_mode='bootstrap4', index_view=MyAdminIndexView())
 
@@ -4028,9 +250,13 @@ admin.add_view(SecureModelView(Notification, db.session, name='Bildirimler'))
 admin.add_view(SecureModelView(DilekceKategori, db.session, name='Örnek Dilekçe Kategorileri')) # Örnek Dilekçe Kategori için Admin View
 admin.add_view(SecureModelView(OrnekDilekce, db.session, name='Örnek Dilekçeler')) # Örnek Dilekçeler için Admin View
 admin.add_view(SecureModelView(OrnekSozlesme, db.session, name='Örnek Sözleşmeler')) # Yeni eklendi
+admin.add_view(FaizOraniView(FaizOrani, db.session, name='Faiz Oranları'))
 
 # --- End Flask-Admin Setup ---
 
+# Hesaplama araçları (faiz, işçi alacakları, harç/vekalet, ceza infaz)
+app.register_blueprint(hesaplama_bp)
+
 # Auth routes
 @app.route('/register', methods=['GET', 'POST'])
 def register():
@@ -4130,6 +356,7 @@ def update_profile():
                         filepath = os.path.join(app.static_folder, unique_filename)
                         
                         # Resmi boyutlandır ve kaydet
+                        from PIL import Image
                         image = Image.open(file)
                         image = image.convert('RGB')  # PNG'yi JPG'ye çevir
                         
@@ -4357,6 +584,13 @@ def inject_datetime():
         }
     return dict(current_time=current_time)
 
+@app.context_processor
+def inject_adliye_listesi():
+    def adliye_listesi_url():
+        """Adliye listesi betiğinin içerik sürümlü adresi"""
+        return url_for('api_adliyeler', format='js', v=adliye_registry.snapshot().etag)
+    return dict(adliye_listesi_url=adliye_listesi_url)
+
 def log_activity(activity_type, description, user_id, case_id=None, related_announcement_id=None, related_event_id=None, related_payment_id=None, details=None):
     user = User.query.get(user_id)
     if user:
@@ -4500,9 +734,7 @@ def takvim():
             'year': year
         })
     
-    # === YENİ: Adliye verisini hazırla ===
-    # Adliye listesini dosyadan yükle
-    cities_courthouses, cities = parse_adliye_list()
+    # Adliye listesi sayfaya gömülmez, /api/adliyeler üzerinden önbellekli yüklenir
     
     # Kullanıcının yetkilerini template'e gönder
     user_permissions = {
@@ -4526,7 +758,6 @@ def takvim():
     return render_template('takvim.html', 
                          events=events_data,
                          adli_tatil_data=adli_tatil_data,
-                         all_courthouses=cities_courthouses, # Tüm adliye verilerini gönder
                          user_permissions=user_permissions,
                          approved_users=users_data)
 
@@ -4836,8 +1067,7 @@ def dosya_sorgula():
     
     return render_template('dosya_sorgula.html', 
                          case_files=case_files,
-                         cities=cities,
-                         all_courthouses=json.dumps(cities_courthouses, ensure_ascii=False))
+                         cities=cities)
 
 @app.route('/dosya_ekle', methods=['GET', 'POST'])
 @login_required
@@ -4952,8 +1182,41 @@ def dosya_ekle():
     today_date = datetime.now().strftime('%Y-%m-%d')
     return render_template('dosya_ekle.html',
                          today_date=today_date,
-                         cities=cities,
-                         all_courthouses=json.dumps(cities_courthouses, ensure_ascii=False)) # Pass all data as JSON
+                         cities=cities)
+
+@app.route('/api/adliyeler')
+@login_required
+def api_adliyeler():
+    """
+    Adliye listesini ETag ile sunar
+
+    ?q=<önek> ile adliye adı önekine göre arama yapılır. ?format=js ile liste
+    window.ADLIYE_LISTESI olarak tanımlanan bir betik döner; sayfalar bu betiği
+    adliye_listesi_url() ile sürümlü olarak yükler.
+    """
+    snapshot = adliye_registry.snapshot()
+    query = request.args.get('q', '').strip()
+    if query:
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+        results = [{'adliye': courthouse, 'sehir': city}
+                   for courthouse, city in adliye_registry.search(query, limit=limit)]
+        return jsonify(success=True, results=results)
+
+    if request.args.get('format') == 'js':
+        response = Response(b'window.ADLIYE_LISTESI = ' + snapshot.json_bytes + b';',
+                            mimetype='application/javascript')
+    else:
+        response = Response(snapshot.json_bytes, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    # Sürüm parametresiyle istenen betik içerik değişince URL'si de değiştiğinden uzun süre saklanabilir
+    if request.args.get('v') == snapshot.etag:
+        response.headers['Cache-Control'] = 'private, max-age=86400'
+    else:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
 
 @app.route('/case_details/<int:case_id>')
 def case_details(case_id):
@@ -4961,12 +1224,7 @@ def case_details(case_id):
         case_file = CaseFile.query.get_or_404(case_id)
         
         # Belgeleri hazırla
-        documents = [{
-            'id': doc.id,
-            'filename': doc.filename,
-            'document_type': doc.document_type,
-            'upload_date': doc.upload_date.strftime('%d.%m.%Y')
-        } for doc in case_file.documents]
+        documents = [serialize_document(doc) for doc in case_file.documents]
         
         # Dosya numarasını yıl/esas no formatında hazırla
         formatted_case_number = f"{case_file.year}/{case_file.case_number}"
@@ -4980,12 +1238,8 @@ def case_details(case_id):
             if case_file.courthouse.startswith("İstanbul"):
                 city = "İstanbul"
             else:
-                # Adliye adından şehir ismini çıkarmak için adliye listesini kontrol et
-                cities_courthouses, cities = parse_adliye_list()
-                for city_name, courthouses in cities_courthouses.items():
-                    if any(case_file.courthouse in courthouse for courthouse in courthouses):
-                        city = city_name
-                        break
+                # Adliye -> şehir dizininden bul
+                city = adliye_registry.find_city(case_file.courthouse) or city
         
         # Ek müvekkil, karşı taraf ve vekil bilgilerini JSON'dan parse et
         additional_clients = []
@@ -5798,6 +2052,32 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def schedule_document_previews(document, check_manifest=True):
+    """Belgenin küçük resim ve sayfa önizlemelerini arka planda üretir"""
+    try:
+        source_path = get_preview_source(app.config['UPLOAD_FOLDER'], document.filepath, document.pdf_version)
+        if source_path:
+            blob_path = os.path.join(app.config['UPLOAD_FOLDER'], document.filepath)
+            schedule_previews(source_path, blob_path, check_manifest=check_manifest)
+    except Exception as e:
+        print(f"Önizleme planlanırken hata: {str(e)}")
+
+def serialize_document(document):
+    """Belge listesi için belge bilgilerini ve önizleme bağlantılarını hazırlar"""
+    blob_path = os.path.join(app.config['UPLOAD_FOLDER'], document.filepath)
+    manifest = get_preview_manifest(blob_path)
+    if manifest is None:
+        # Eski belgeler için önizlemeyi arka planda tamamla (manifest yeniden okunmaz)
+        schedule_document_previews(document, check_manifest=False)
+    return {
+        'id': document.id,
+        'filename': document.filename,
+        'document_type': document.document_type,
+        'upload_date': document.upload_date.strftime('%d.%m.%Y'),
+        'thumbnail_url': url_for('document_thumbnail', document_id=document.id) if manifest else None,
+        'page_count': manifest['page_count'] if manifest else None
+    }
+
 @app.route('/upload_document/<int:case_id>', methods=['POST'])
 @csrf.exempt
 def upload_document(case_id):
@@ -5870,6 +2150,9 @@ def upload_document(case_id):
             db.session.add(new_document)
             db.session.commit()
             
+            # Küçük resim ve sayfa önizlemelerini arka planda üret
+            schedule_document_previews(new_document)
+            
             # İşlem logu ekle
             case_file = CaseFile.query.get(case_id)
             log_activity(
@@ -5890,12 +2173,44 @@ def upload_document(case_id):
 @app.route('/get_documents/<int:case_id>')
 def get_documents(case_id):
     documents = Document.query.filter_by(case_id=case_id).all()
-    return jsonify(success=True, documents=[{
-        'id': doc.id,
-        'filename': doc.filename,
-        'document_type': doc.document_type,
-        'upload_date': doc.upload_date.strftime('%d.%m.%Y')
-    } for doc in documents])
+    return jsonify(success=True, documents=[serialize_document(doc) for doc in documents])
+
+@app.route('/document_thumbnail/<int:document_id>')
+def document_thumbnail(document_id):
+    """Belgenin ilk sayfa küçük resmini döndürür"""
+    return _send_document_preview(document_id, None)
+
+@app.route('/document_page_preview/<int:document_id>/<int:page>')
+def document_page_preview(document_id, page):
+    """Belgenin istenen sayfasının önizleme görüntüsünü döndürür"""
+    return _send_document_preview(document_id, page)
+
+def _send_document_preview(document_id, page):
+    document = Document.query.get_or_404(document_id)
+    blob_path = os.path.join(app.config['UPLOAD_FOLDER'], document.filepath)
+    source_path = get_preview_source(app.config['UPLOAD_FOLDER'], document.filepath, document.pdf_version)
+    manifest = get_preview_manifest(blob_path, source_path)
+
+    if manifest is None:
+        # Önizleme henüz yok veya eskimiş: üretimi başlat, istemci sonra tekrar denesin
+        if source_path and (schedule_previews(source_path, blob_path) or is_preview_pending(blob_path)):
+            response = jsonify(success=False, pending=True, message="Önizleme hazırlanıyor")
+            response.status_code = 202
+            response.headers['Retry-After'] = '2'
+            return response
+        return jsonify(success=False, message="Bu belge için önizleme oluşturulamıyor"), 404
+
+    if page is None:
+        image_name = manifest['thumbnail']
+    elif 1 <= page <= len(manifest['pages']):
+        image_name = manifest['pages'][page - 1]
+    else:
+        return jsonify(success=False, message="Sayfa bulunamadı"), 404
+
+    response = send_from_directory(os.path.abspath(get_preview_dir(blob_path)), image_name, mimetype='image/png')
+    response.cache_control.private = True
+    response.cache_control.max_age = 86400
+    return response
 
 @app.route('/download_document/<int:document_id>')
 def download_document(document_id):
@@ -5920,6 +2235,9 @@ def delete_document(document_id):
         if os.path.exists(file_path):
             os.remove(file_path)
         
+        # Önizleme görüntülerini sil
+        remove_previews(file_path)
+        
         # Veritabanından sil
         db.session.delete(document)
         db.session.commit()
@@ -5928,98 +2246,6 @@ def delete_document(document_id):
     except Exception as e:
         return jsonify(success=False, message=str(e))
 
-def convert_udf_to_pdf(input_path):
-    try:
-        # Dosya uzantısını al
-        _, ext = os.path.splitext(input_path)
-        ext = ext.lower()
-        
-        # Geçici PDF dosyası için path oluştur
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_pdf:
-            output_path = tmp_pdf.name
-        
-        print(f"Dönüştürme başlatılıyor: {input_path} -> {output_path}")
-        print(f"Dosya uzantısı: {ext}")
-        
-        # 1. ÖZEL YÖNTEM: UDF dosyaları için UYAP Editör CLI komutunu dene
-        if ext == '.udf':
-            try:
-                # UYAP Editör'ün muhtemel konumları
-                uyap_editor_paths = [
-                    r"C:\Program Files\UYAP\UYAP Editor\UYAPEditor.exe",
-                    r"C:\Program Files (x86)\UYAP\UYAP Editor\UYAPEditor.exe",
-                    r"C:\UYAP\UYAP Editor\UYAPEditor.exe"
-                ]
-                
-                uyap_exe = None
-                for path in uyap_editor_paths:
-                    if os.path.exists(path):
-                        uyap_exe = path
-                        break
-                
-                if uyap_exe:
-                    print(f"UYAP Editör bulundu: {uyap_exe}")
-                    print("UYAP Editör ile dönüştürme deneniyor...")
-                    
-                    # Çıktı dizinini hazırla
-                    output_dir = os.path.dirname(output_path)
-                    
-                    # UYAP Editör export komut satırı kullanımı
-                    # Not: Bu komut satırı özellikleri UYAPEditor'ün gerçekte böyle bir özelliği
-                    # olduğunu varsayar. Gerçek komut satırı seçenekleri farklı olabilir.
-                    result = subprocess.run(
-                        [uyap_exe, "--export-pdf", input_path, "--output", output_path],
-                        check=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-                    
-                    # LibreOffice çıktı dosyasının adını belirle
-                    input_filename = os.path.basename(input_path)
-                    input_name, _ = os.path.splitext(input_filename)
-                    lo_output_path = os.path.join(output_dir, f"{input_name}.pdf")
-                    
-                    # Çıktı dosyasını kontrol et
-                    if os.path.exists(lo_output_path) and os.path.getsize(lo_output_path) > 0:
-                        print(f"LibreOffice ile dönüştürme başarılı: {lo_output_path}")
-                        
-                        # Çıktıyı istenen yere taşı
-                        if lo_output_path != output_path:
-                            shutil.move(lo_output_path, output_path)
-                            print(f"PDF dosyası taşındı: {lo_output_path} -> {output_path}")
-                            
-                        return output_path
-                    else:
-                        print("LibreOffice çıktı dosyası oluşturulamadı veya boş")
-                        if result.stderr:
-                            print(f"LibreOffice stderr: {result.stderr}")
-                else:
-                    print("LibreOffice bulunamadı")
-            except subprocess.CalledProcessError as e:
-                print(f"LibreOffice çalıştırma hatası: {str(e)}")
-                if hasattr(e, 'stderr') and e.stderr:
-                    print(f"LibreOffice stderr: {e.stderr}")
-            except subprocess.TimeoutExpired:
-                print("LibreOffice zaman aşımına uğradı")
-            except Exception as e:
-                print(f"LibreOffice beklenmeyen hata: {str(e)}")
-        
-        # Her iki yöntem de başarısız oldu
-        print("Tüm dönüştürme yöntemleri başarısız oldu")
-        return None
-            
-    except Exception as e:
-        print(f"Üst düzey bir hata oluştu: {str(e)}")
-        # Çıktı dosyası oluşturulduysa temizle
-        if 'output_path' in locals() and os.path.exists(output_path):
-            try:
-                os.remove(output_path)
-                print(f"Geçici dosya temizlendi: {output_path}")
-            except:
-                pass
-        return None
-
 @app.route('/preview_document/<int:document_id>')
 def preview_document(document_id):
     document = Document.query.get_or_404(document_id)
@@ -6074,6 +2300,7 @@ def preview_document(document_id):
                     document.pdf_version = pdf_filename
                     db.session.commit()
                     print(f"PDF sürümü kaydedildi: {pdf_filename}")
+                    schedule_document_previews(document)
                 except Exception as e:
                     print(f"PDF sürümü kaydedilirken hata: {str(e)}")
                 
@@ -6120,6 +2347,8 @@ def convert_office_to_pdf(input_path):
         # 1. DOCX-PREVIEW modülünü kullanarak HTML'e dönüştür ve sonra PDF'e çevir
         if extension == '.docx':
             try:
+                import mammoth
+                import pdfkit
                 with open(input_path, 'rb') as f:
                     html_content = mammoth.convert_to_html(f).value
                 
@@ -6491,52 +2720,6 @@ def send_contact_mail():
     except Exception as e:
         return jsonify(success=False, message=str(e))
 
-def get_current_rates():
-    try:
-        # TCMB'den güncel faiz oranlarını çek
-        url = "https://www.tcmb.gov.tr/wps/wcm/connect/TR/TCMB+TR/Main+Menu/Temel+Faaliyetler/Para+Politikasi/Reeskont+ve+Avans+Faiz+Oranlari"
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Faiz oranlarını parse et
-        rates = {
-            'reeskont': float(soup.find('reeskont').text),
-            'avans': float(soup.find('avans').text),
-            'temerrut': float(soup.find('temerrut').text),
-            'yasal': 24.0,  # Yasal faiz oranı
-            'mevduat': 45.0  # En yüksek mevduat faizi
-        }
-        return rates
-    except:
-        # Hata durumunda varsayılan değerleri döndür
-        return {
-            'reeskont': 13.75,
-            'avans': 14.75,
-            'temerrut': 19.0,
-            'yasal': 24.0,
-            'mevduat': 45.0
-        }
-
-@app.route('/hesaplamalar/<type>')
-@login_required  
-@permission_required('panel_goruntule')
-def hesaplamalar(type):
-    if type == 'faiz':
-        current_rates = get_current_rates()
-        return render_template('faiz_hesaplama.html', rates=current_rates)
-    elif type == 'harc':
-        return render_template('harc_hesaplama.html')
-    elif type == 'isci':
-        return render_template('isci_alacagi_hesaplama.html')
-    elif type == 'vekalet':
-        return render_template('vekalet_hesaplama.html')
-    elif type == 'ceza_infaz':
-        return render_template('ceza_infaz_hesaplama.html')
-
-@app.route("/isci-alacagi-hesaplama")
-def isci_alacagi_hesaplama():
-    return render_template("isci_alacagi_hesaplama.html")
-
 @app.route('/update_theme_preference', methods=['POST'])
 @login_required
 @csrf.exempt
@@ -7807,7 +3990,7 @@ def delete_isci_gorusme_form(form_id):
 
 @app.route('/worker_interview', endpoint='worker_interview_alt')
 @login_required
-def worker_interview():
+def worker_interview_alt():
     return render_template('worker_interview.html')
 
 @app.route('/worker_interview_page')
@@ -7999,6 +4182,7 @@ def preview_udf(document_id):
                 # Veritabanında belgenin PDF sürümünü güncelle
                 document.pdf_version = pdf_filename
                 db.session.commit()
+                schedule_document_previews(document)
                 
                 return send_file(permanent_pdf_path, mimetype='application/pdf')
         except Exception as e:
@@ -8018,282 +4202,96 @@ def preview_udf(document_id):
         print(f"UDF önizleme hatası: {str(e)}")
         return f"UDF dosyasını açarken bir hata oluştu: {str(e)}", 500
 
+UDF_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>UDF Dosya İçeriği</title>
+    <style>
+        body {{ 
+            font-family: Arial, sans-serif; 
+            margin: 0; 
+            padding: 0;
+            line-height: 1.6;
+            color: #333;
+        }}
+        .content {{ 
+            background: #fff; 
+            padding: 30px; 
+            border-radius: 8px; 
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            white-space: pre-wrap;
+            max-width: 100%;
+            margin: 0;
+            text-align: left;
+        }}
+        .warning {{ 
+            background-color: #fff3cd; 
+            padding: 25px; 
+            border-radius: 8px; 
+            margin: 40px auto;
+            max-width: 600px;
+            border-left: 5px solid #ffc107;
+            text-align: left;
+        }}
+    </style>
+</head>
+<body>
+    {body}
+</body>
+</html>
+"""
+
+# Metin biçimli (XML olmayan) UDF dosyalarından okunacak en fazla bayt
+UDF_TEXT_FALLBACK_LIMIT = 2 * 1024 * 1024
+
+def render_udf_content_html(input_path):
+    """
+    UDF dosyasının metin içeriğini HTML sayfası olarak döndürür
+
+    Belge akış halinde ayrıştırılır ve dosya özetine göre önbelleğe alınır
+    (udf_renderer.load_udf); aynı belgenin tekrar görüntülenmesi dosyayı
+    yeniden ayrıştırmaz. Kökü <template> olmayan ya da content.xml
+    içermeyen dosyaların metni udf_renderer.extract_udf_text ile alınır.
+    """
+    from udf_renderer import load_udf, extract_udf_text, UdfFormatError
+    try:
+        text = load_udf(input_path).text
+    except UdfFormatError as e:
+        print(f"UDF içeriği XML olarak ayrıştırılamadı: {str(e)}")
+        text = ''
+    if not text.strip():
+        text = extract_udf_text(input_path)
+    if text.strip():
+        return UDF_HTML_TEMPLATE.format(body=f'<div class="content">{escape(text)}</div>')
+
+    # Metin formatı kontrolü - dosyanın yalnızca başı okunur
+    with open(input_path, 'rb') as f:
+        head = f.read(UDF_TEXT_FALLBACK_LIMIT)
+    text_content = head.decode('utf-8', errors='ignore')
+    if len(text_content) > 10 and not head.startswith(b'PK'):
+        print("UDF metin formatında olabilir, metin olarak işleniyor...")
+        return UDF_HTML_TEMPLATE.format(body=f'<div class="content">{escape(text_content)}</div>')
+
+    print("UDF formatı tanınamadı, bilgilendirme sayfası gösteriliyor...")
+    return UDF_HTML_TEMPLATE.format(body="""<div class="warning">
+        <h2>Bu UDF dosyasının içeriği görüntülenemiyor</h2>
+        <p>Bu UDF dosyası görüntülenebilir metin içeriğine sahip değil veya tanımlanamayan bir formatta.</p>
+        <p>Dosyayı bilgisayarınıza indirip UYAP Editör ile açmanız önerilir.</p>
+    </div>""")
+
 def parse_udf_content(input_path):
-    """UDF dosyasını ayrıştırıp içeriği çıkarır"""
+    """UDF dosyasını ayrıştırıp içeriği geçici bir HTML dosyasına yazar"""
     try:
         print(f"UDF dosyası ayrıştırılıyor: {input_path}")
-        
-        # UDF dosyasını ikili modda aç
-        with open(input_path, 'rb') as f:
-            content = f.read()
-        
-        # UDF formatını analiz et
-        # 1. Magic bytes kontrolü
-        if content.startswith(b'PK'):
-            # ZIP formatındaysa, ZIP olarak açmayı dene
-            import zipfile
-            from io import BytesIO
-            import re
-            
-            print("UDF ZIP formatında olabilir, ZIP olarak açılıyor...")
-            
-            try:
-                with zipfile.ZipFile(BytesIO(content)) as zip_ref:
-                    file_list = zip_ref.namelist()
-                    print(f"ZIP içerisindeki dosyalar: {file_list}")
-                    
-                    # Sadece content.xml dosyasını ara ve içeriğini al
-                    actual_content = ""
-                    
-                    for file_name in file_list:
-                        if file_name == 'content.xml' or file_name.endswith('/content.xml'):
-                            content_xml = zip_ref.read(file_name).decode('utf-8', errors='ignore')
-                            
-                            # CDATA içeriğini çıkar
-                            cdata_match = re.search(r'<!\[CDATA\[(.*?)\]\]>', content_xml, re.DOTALL)
-                            if cdata_match:
-                                # CDATA içeriğini direkt kullan
-                                actual_content = cdata_match.group(1)
-                            else:
-                                # Eğer CDATA yoksa, metin içeriğini çıkar
-                                actual_content = re.sub(r'<[^>]+>', ' ', content_xml)
-                                actual_content = re.sub(r'\s+', ' ', actual_content).strip()
-                    
-                    # İçerik bulunamadıysa boş dönme, ham içeriği temizleyerek göster
-                    if not actual_content:
-                        for file_name in file_list:
-                            if file_name.endswith('.xml') and not file_name.startswith('document'):
-                                try:
-                                    file_content = zip_ref.read(file_name).decode('utf-8', errors='ignore')
-                                    # XML etiketlerini kaldır
-                                    text_only = re.sub(r'<[^>]+>', ' ', file_content)
-                                    # Gereksiz boşlukları temizle
-                                    text_only = re.sub(r'\s+', ' ', text_only).strip()
-                                    
-                                    if len(text_only) > 100:  # Anlamlı içerik kontrolü
-                                        actual_content = text_only
-                                        break
-                                except:
-                                    pass
-                
-                # Daha temiz bir HTML gösterim
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>UDF Dosya İçeriği</title>
-                    <style>
-                        body {{ 
-                            font-family: Arial, sans-serif; 
-                            margin: 0; 
-                            padding: 0;
-                            line-height: 1.6;
-                            color: #333;
-                        }}
-                        .content {{ 
-                            background: #fff; 
-                            padding: 30px; 
-                            border-radius: 8px; 
-                            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                            white-space: pre-wrap;
-                            max-width: 100%;
-                            margin: 0;
-                            text-align: left;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="content">{escape(actual_content)}</div>
-                </body>
-                </html>
-                """
-                
-                # HTML içeriğini geçici dosyaya kaydet
-                with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as tmp_html:
-                    tmp_html.write(html_content.encode('utf-8'))
-                    html_path = tmp_html.name
-                
-                print(f"UDF içeriği HTML olarak kaydedildi: {html_path}")
-                return html_path
-                
-            except zipfile.BadZipFile:
-                print("UDF dosyası geçerli bir ZIP formatında değil")
-        
-        # 2. XML formatı kontrolü
-        if b'<?xml' in content or b'<UYAP' in content:
-            print("UDF XML formatında olabilir, XML olarak ayrıştırılıyor...")
-            import re
-            
-            # XML içeriğini text olarak decode et
-            text_content = content.decode('utf-8', errors='ignore')
-            
-            # CDATA içeriğini arama
-            cdata_match = re.search(r'<!\[CDATA\[(.*?)\]\]>', text_content, re.DOTALL)
-            if cdata_match:
-                # CDATA içeriğini direkt kullan
-                text_only = cdata_match.group(1)
-            else:
-                # XML etiketlerini kaldırarak sadece metin içeriğini al
-                try:
-                    # XML etiketlerini kaldır
-                    text_only = re.sub(r'<[^>]+>', ' ', text_content)
-                    # Gereksiz boşlukları temizle
-                    text_only = re.sub(r'\s+', ' ', text_only).strip()
-                except:
-                    text_only = text_content
-            
-            # Daha temiz bir HTML gösterim
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>UDF Dosya İçeriği</title>
-                <style>
-                    body {{ 
-                        font-family: Arial, sans-serif; 
-                        margin: 0;
-                        padding: 0;
-                        line-height: 1.6;
-                        color: #333;
-                    }}
-                    .content {{ 
-                        background: #fff; 
-                        padding: 30px; 
-                        border-radius: 8px; 
-                        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                        white-space: pre-wrap;
-                        max-width: 100%;
-                        margin: 0;
-                        text-align: left;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="content">{escape(text_only)}</div>
-            </body>
-            </html>
-            """
-            
-            # HTML içeriğini geçici dosyaya kaydet
-            with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as tmp_html:
-                tmp_html.write(html_content.encode('utf-8'))
-                html_path = tmp_html.name
-            
-            print(f"UDF içeriği HTML olarak kaydedildi: {html_path}")
-            return html_path
-        
-        # 3. Metin formatı kontrolü
-        try:
-            # Dosyayı text olarak decode etmeyi dene
-            text_content = content.decode('utf-8', errors='ignore')
-            
-            # Minimum anlamlı içerik kontrolü
-            if len(text_content) > 10:
-                print("UDF metin formatında olabilir, metin olarak işleniyor...")
-                
-                # HTML dönüşümü - daha temiz metin formatlaması
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>UDF Dosya İçeriği</title>
-                    <style>
-                        body {{ 
-                            font-family: Arial, sans-serif; 
-                            margin: 0;
-                            padding: 0;
-                            line-height: 1.6;
-                            color: #333;
-                        }}
-                        .content {{ 
-                            background: #fff; 
-                            padding: 30px; 
-                            border-radius: 8px; 
-                            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                            white-space: pre-wrap;
-                            max-width: 100%;
-                            margin: 0;
-                            text-align: left;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="content">{escape(text_content)}</div>
-                </body>
-                </html>
-                """
-                
-                # HTML içeriğini geçici dosyaya kaydet
-                with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as tmp_html:
-                    tmp_html.write(html_content.encode('utf-8'))
-                    html_path = tmp_html.name
-                
-                print(f"UDF içeriği HTML olarak kaydedildi: {html_path}")
-                return html_path
-        except:
-            pass
-        
-        # 4. İkili içerik olarak göster - son çare
-        print("UDF formatı tanınamadı, ikili içerik olarak gösteriliyor...")
-        
-        # Bilgilendirici hata mesajı göster
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>UDF Dosya İçeriği</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    margin: 0; 
-                    color: #333;
-                    text-align: center;
-                }}
-                .warning {{ 
-                    background-color: #fff3cd; 
-                    padding: 25px; 
-                    border-radius: 8px; 
-                    margin: 40px auto;
-                    max-width: 600px;
-                    border-left: 5px solid #ffc107;
-                    text-align: left;
-                }}
-                h1 {{
-                    color: #2c3e50;
-                }}
-                .btn {{
-                    display: inline-block;
-                    padding: 10px 20px;
-                    background-color: #4CAF50;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 4px;
-                    margin-top: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>UDF Dosya İçeriği</h1>
-            
-            <div class="warning">
-                <h2>Bu UDF dosyasının içeriği görüntülenemiyor</h2>
-                <p>Bu UDF dosyası görüntülenebilir metin içeriğine sahip değil veya tanımlanamayan bir formatta.</p>
-                <p>Dosyayı bilgisayarınıza indirip UYAP Editör ile açmanız önerilir.</p>
-            </div>
-        </body>
-        </html>
-        """
+        html_content = render_udf_content_html(input_path)
         
         # HTML içeriğini geçici dosyaya kaydet
         with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as tmp_html:
             tmp_html.write(html_content.encode('utf-8'))
             html_path = tmp_html.name
         
-        print(f"UDF içeriği ikili formatta HTML olarak kaydedildi: {html_path}")
+        print(f"UDF içeriği HTML olarak kaydedildi: {html_path}")
         return html_path
         
     except Exception as e:
@@ -8309,6 +4307,21 @@ def convert_udf_to_pdf(input_path):
         output_path = os.path.join(tempfile.gettempdir(), 
                                   f"temp_converted_{int(pytime.time())}.pdf")
         
+        # 0. YÖNTEM: Yerel UDF işleyici (harici editör gerektirmez)
+        if os.path.splitext(input_path)[1].lower() == '.udf':
+            from udf_renderer import render_udf_to_pdf_cached, UdfFormatError
+            try:
+                print("Yerel UDF işleyici ile dönüştürme deneniyor...")
+                cached_pdf = render_udf_to_pdf_cached(input_path, app.config['UDF_PDF_CACHE_FOLDER'])
+                # Çağıranlar dönen dosyayı sildiğinden önbellekteki dosyanın kopyası verilir
+                shutil.copy(cached_pdf, output_path)
+                print(f"Yerel UDF işleyici ile dönüştürme başarılı: {output_path}")
+                return output_path
+            except UdfFormatError as e:
+                print(f"UDF biçimi okunamadı: {str(e)}")
+            except Exception as e:
+                print(f"Yerel UDF işleyici hatası: {str(e)}")
+        
         # 1. YÖNTEM: UYAP Editör CLI komutunu dene
         try:
             print("UYAP Editör CLI ile dönüştürme deneniyor...")
@@ -8447,6 +4460,17 @@ def convert_udf_to_pdf(input_path):
         print(f"Dönüştürme hatası: {str(e)}")
         return None
 
+def get_cached_udf_pdf(input_path):
+    """UDF dosyasının yerel işleyiciyle üretilmiş PDF'ini döndürür (gerekirse üretir)"""
+    if os.path.splitext(input_path)[1].lower() != '.udf':
+        return None
+    try:
+        from udf_renderer import render_udf_to_pdf_cached
+        return render_udf_to_pdf_cached(input_path, app.config['UDF_PDF_CACHE_FOLDER'])
+    except Exception as e:
+        print(f"UDF PDF önizlemesi üretilemedi: {str(e)}")
+        return None
+
 @app.route('/view_udf_content/<int:document_id>')
 def view_udf_content(document_id):
     """UDF içeriğini doğrudan tarayıcıda gösterir"""
@@ -8461,22 +4485,8 @@ def view_udf_content(document_id):
         if extension.lower() != '.udf':
             return "Bu dosya .udf uzantılı değil, görüntülenemez", 400
             
-        # UDF içeriğini HTML olarak ayrıştır
-        html_path = parse_udf_content(filepath)
-        if html_path:
-            # HTML içeriğini doğrudan döndür
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-                
-            # HTML dosyasını temizle
-            try:
-                os.remove(html_path)
-            except:
-                pass
-                
-            return html_content
-            
-        return "UDF içeriği ayrıştırılamadı", 500
+        # UDF içeriğini HTML olarak ayrıştır (önbellekten)
+        return render_udf_content_html(filepath)
     except Exception as e:
         return f"UDF içeriği görüntüleme hatası: {str(e)}", 500
 
@@ -8491,25 +4501,14 @@ def direct_view_udf(document_id):
         if not os.path.exists(filepath):
             return "Dosya bulunamadı", 404
             
+        # Önce yerel işleyiciyle üretilen (önbellekteki) PDF'i göster
+        udf_pdf = get_cached_udf_pdf(filepath)
+        if udf_pdf:
+            return send_file(udf_pdf, mimetype='application/pdf')
+            
         # UDF dosyasını ayrıştır ve HTML olarak göster
         print(f"UDF içeriği doğrudan ayrıştırılıyor: {filepath}")
-        html_path = parse_udf_content(filepath)
-        
-        if html_path:
-            # HTML içeriğini oku
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-                
-            # HTML dosyasını temizle
-            try:
-                os.remove(html_path)
-            except:
-                pass
-                
-            # HTML içeriğini doğrudan döndür
-            return Response(html_content, mimetype='text/html')
-        else:
-            return "UDF içeriği ayrıştırılamadı", 500
+        return Response(render_udf_content_html(filepath), mimetype='text/html')
     except Exception as e:
         print(f"UDF içeriği doğrudan görüntüleme hatası: {str(e)}")
         return f"UDF dosyası görüntülenirken hata oluştu: {str(e)}", 500
@@ -8524,135 +4523,34 @@ def direct_view_udf_dilekce(dilekce_id):
         if not os.path.exists(filepath):
             return "Dosya bulunamadı", 404
             
+        # Önce yerel işleyiciyle üretilen (önbellekteki) PDF'i göster
+        udf_pdf = get_cached_udf_pdf(filepath)
+        if udf_pdf:
+            return send_file(udf_pdf, mimetype='application/pdf')
+            
         # UDF dosyasını ayrıştır ve HTML olarak göster
         print(f"UDF dilekçe içeriği doğrudan ayrıştırılıyor: {filepath}")
-        html_path = parse_udf_content(filepath)
-        
-        if html_path:
-            # HTML içeriğini oku
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-                
-            # HTML dosyasını temizle
-            try:
-                os.remove(html_path)
-            except:
-                pass
-                
-            # HTML içeriğini doğrudan döndür
-            return Response(html_content, mimetype='text/html')
-        else:
-            return "UDF içeriği ayrıştırılamadı", 500
+        return Response(render_udf_content_html(filepath), mimetype='text/html')
     except Exception as e:
         print(f"UDF dilekçe içeriği doğrudan görüntüleme hatası: {str(e)}")
         return f"UDF dosyası görüntülenirken hata oluştu: {str(e)}", 500
 
-def parse_tarifeler():
-    filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tarifeler.txt')
-    
-    # Varsayılan olarak boş ve geçerli bir yapı
-    tarifeler = {
-        "İstanbul Barosu": [],
-        "TBB": [],
-        "kaplan_danismanlik_tarifesi": {"kategoriler": []}
-    }
-    
-    grup_map = {
-        "ISTBARO_2025": "İstanbul Barosu",
-        "TBB_2025": "TBB"
-    }
-
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        kaplan_danismanlik_json_str = ""
-        in_kaplan_danismanlik_json_block = False
-
-        for line_num, line_content_raw in enumerate(lines):
-            line_content = line_content_raw.strip()
-
-            if line_content.startswith("KAPLAN HUKUK DANIŞMANLIK ÜCRET TARİFESİ START"):
-                in_kaplan_danismanlik_json_block = True
-                kaplan_danismanlik_json_str = ""  # Bloğa girildiğinde önceki içeriği sıfırla
-                continue
-            elif line_content.startswith("KAPLAN HUKUK DANIŞMANLIK ÜCRET TARİFESİ END"):
-                in_kaplan_danismanlik_json_block = False
-                if kaplan_danismanlik_json_str:
-                    try:
-                        parsed_json = json.loads(kaplan_danismanlik_json_str)
-                        if isinstance(parsed_json, dict) and "kategoriler" in parsed_json and isinstance(parsed_json["kategoriler"], list):
-                            tarifeler["kaplan_danismanlik_tarifesi"] = parsed_json
-                        else:
-                            logging.warning(
-                                f"Kaplan Danışmanlık JSON formatı beklenmiyor (kategoriler listesi yok) tarifeler.txt okunurken. Satır: ~{line_num}. "
-                                f"İçerik başlangıcı: {kaplan_danismanlik_json_str[:200]}..."
-                            )
-                            # Varsayılan boş değer zaten atanmış durumda
-                    except json.JSONDecodeError as e:
-                        logging.error(
-                            f"Kaplan Danışmanlık JSON parse edilemedi tarifeler.txt okunurken: {e}. Satır: ~{line_num}. "
-                            f"İçerik başlangıcı: {kaplan_danismanlik_json_str[:200]}..."
-                        )
-                        # Varsayılan boş değer zaten atanmış durumda
-                kaplan_danismanlik_json_str = "" # Bloğun sonunda string'i temizle
-                continue
-
-            if in_kaplan_danismanlik_json_block:
-                kaplan_danismanlik_json_str += line_content_raw # Orijinal satırları (newline dahil) birleştir
-                continue
-
-            # START/END bloğu dışındaki satırlar (Yorumlar ve boş satırlar hariç)
-            if not line_content or line_content.startswith("#"):
-                continue
-
-            parts = [part.strip() for part in line_content.split('|')]
-            if len(parts) < 7:
-                logging.warning(f"Uyarı: Satır {line_num + 1} ({filepath}) yetersiz bölüm içeriyor ({len(parts)}), atlanıyor: {line_content}")
-                continue
-
-            tarife_grubu_txt, kategori_adi_txt, _, hizmet_adi_txt, temel_ucret_txt, _, birim_txt, *ek_not_parts = parts
-            ek_not_txt = ek_not_parts[0] if ek_not_parts and ek_not_parts[0] else None
-            
-            current_group_key = grup_map.get(tarife_grubu_txt)
-            if not current_group_key:
-                # KAPLAN_OZEL satırları artık START/END bloğunda JSON olarak yönetildiği için burada işlenmemeli.
-                if tarife_grubu_txt.upper() != 'KAPLAN_OZEL':
-                     logging.warning(f"Uyarı: Satır {line_num + 1} ({filepath})'deki tarife grubu '{tarife_grubu_txt}' tanınmıyor, atlanıyor.")
-                continue
-
-            kategori_obj = next((kat for kat in tarifeler[current_group_key] if kat["kategori"] == kategori_adi_txt), None)
-            
-            if kategori_obj is None:
-                kategori_obj = {"kategori": kategori_adi_txt, "items": []}
-                tarifeler[current_group_key].append(kategori_obj)
-
-            item = {
-                "hizmet_adi": hizmet_adi_txt,
-                "temel_ucret": temel_ucret_txt,
-                "original_ucret_str": temel_ucret_txt # JS'nin parse etmesi için orijinal string
-            }
-            if birim_txt and birim_txt.upper() not in ["TL", "TRY", ""]:
-                item["birim"] = birim_txt
-            if ek_not_txt:
-                item["ek_not"] = ek_not_txt
-            
-            kategori_obj["items"].append(item)
-
-    except FileNotFoundError:
-        logging.error(f"Hata: Tarife dosyası bulunamadı: {filepath}")
-    except Exception as e:
-        import traceback
-        logging.error(f"Hata: Tarife dosyası okunurken/işlenirken genel bir hata oluştu ({filepath}): {e}\\n{traceback.format_exc()}")
-    
-    return tarifeler
-
 @app.route('/api/tarifeler')
 def api_tarifeler():
-    data = parse_tarifeler()
-    # parse_tarifeler artık her zaman bir dict döndürdüğü için error kontrolüne gerek yok,
-    # en kötü ihtimalle boş tarifeler döner.
-    return jsonify(data)
+    # Derlenmiş katalog önceden serileştirildiği için yanıt her istekte yeniden üretilmez
+    catalogue = tarife_registry.catalogue()
+    response = Response(catalogue.json_bytes, mimetype='application/json')
+    response.set_etag(catalogue.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/tarifeler/<path:hizmet_kodu>')
+def api_tarife_ucret(hizmet_kodu):
+    """Hizmet koduna göre (IB_A_1, TBB_1_1_5a, ...) ücret kaydını döndürür"""
+    hizmet = tarife_registry.get_service(hizmet_kodu)
+    if hizmet is None:
+        return jsonify({"success": False, "error": f"Hizmet kodu bulunamadı: {hizmet_kodu}"}), 404
+    return jsonify({"success": True, "hizmet": dict(hizmet)})
 
 @app.route('/api/kaydet_kaplan_danismanlik_tarife', methods=['POST'])
 @login_required
@@ -8722,6 +4620,8 @@ def kaydet_kaplan_danismanlik_tarife():
 
         with open(filepath, 'w', encoding='utf-8') as f:
             f.writelines(output_lines)
+        # Aynı saniye içindeki yazımlar mtime ile ayırt edilemeyebilir, katalog açıkça yenilenir
+        tarife_registry.invalidate()
 
         log_activity("Tarife Güncelleme", f"Kaplan Hukuk Danışmanlık Ücret Tarifesi güncellendi.", current_user.id)
         return jsonify({"success": True, "message": "Kaplan Hukuk Danışmanlık Tarifesi başarıyla güncellendi."})
@@ -8781,20 +4681,6 @@ def get_odeme_detay(client_id):
     }
     return jsonify(data)
 
-@login_required
-@permission_required('isci_gorusme_sil')
-def delete_isci_gorusme_form(form_id):
-    form = IsciGorusmeTutanagi.query.get_or_404(form_id)
-    db.session.delete(form)
-    db.session.commit()
-    # Aktivite loglama
-    log_activity(
-        activity_type='İşçi Görüşme Formu Silindi',
-        description=f'{form.name} adlı işçi görüşme formu silindi.',
-        user_id=current_user.id
-    )
-    return jsonify(success=True)
-
 @app.route('/ornek_dilekceler')
 @login_required
 @permission_required('ornek_dilekceler')
@@ -8891,7 +4777,10 @@ def api_ornek_sozlesme_guncelle(sozlesme_id):
         muvekkil_adi = data.get('muvekkil_adi') or data.get('muvekkil_adresi')
         sozlesme_tarihi_str = data.get('sozlesme_tarihi_str') or data.get('sozlesme_tarihi')
         icerik_json = data.get('icerik_json')
+        onceki_pdf = (sozlesme.icerik_json, sozlesme.sozlesme_adi)
         
+        if data.get('sozlesme_adi'):
+            sozlesme.sozlesme_adi = data['sozlesme_adi']
         if muvekkil_adi:
             sozlesme.muvekkil_adi = muvekkil_adi
         if sozlesme_tarihi_str:
@@ -8900,6 +4789,10 @@ def api_ornek_sozlesme_guncelle(sozlesme_id):
             sozlesme.icerik_json = json.dumps(icerik_json)
         
         db.session.commit()
+        if onceki_pdf != (sozlesme.icerik_json, sozlesme.sozlesme_adi):
+            # PDF anahtarı başlık ve içerikten oluşur; eski anahtarın PDF'i artık kullanılmayacak
+            from sozlesme_pdf import discard_contract_pdf
+            discard_contract_pdf(*onceki_pdf, app.config['SOZLESME_PDF_CACHE_FOLDER'])
         log_activity(
             activity_type='Örnek Sözleşme Güncellendi',
             description=f'{sozlesme.sozlesme_adi} adlı sözleşme güncellendi.',
@@ -8938,6 +4831,8 @@ def api_kayitli_ornek_sozlesme_sil(sozlesme_id):
     try:
         sozlesme = OrnekSozlesme.query.filter_by(id=sozlesme_id, user_id=current_user.id).first_or_404()
         sozlesme_adi_log = sozlesme.sozlesme_adi
+        from sozlesme_pdf import discard_contract_pdf
+        discard_contract_pdf(sozlesme.icerik_json, sozlesme.sozlesme_adi, app.config['SOZLESME_PDF_CACHE_FOLDER'])
         db.session.delete(sozlesme)
         db.session.commit()
         log_activity(
@@ -8949,77 +4844,63 @@ def api_kayitli_ornek_sozlesme_sil(sozlesme_id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/sozlesme_pdf/<int:sozlesme_id>')
-@login_required
-def api_sozlesme_pdf(sozlesme_id):
-    """Sözleşmeyi PDF olarak döndür"""
-    try:
-        sozlesme = OrnekSozlesme.query.filter_by(id=sozlesme_id, user_id=current_user.id).first_or_404()
-        
-        # JSON içeriğini parse et
-        icerik = json.loads(sozlesme.icerik_json) if sozlesme.icerik_json else {}
-        
-        # PDF HTML içeriği
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{sozlesme.sozlesme_adi}</title>
-            <style>
-                body {{ font-family: 'Arial', sans-serif; margin: 40px; line-height: 1.6; }}
-                .header {{ text-align: center; margin-bottom: 30px; }}
-                .title {{ font-size: 24px; font-weight: bold; color: #2c3e50; }}
-                .subtitle {{ font-size: 14px; color: #7f8c8d; margin-top: 10px; }}
-                .content {{ margin: 20px 0; }}
-                .field {{ margin: 15px 0; padding: 10px; border-left: 3px solid #3498db; }}
-                .field-label {{ font-weight: bold; color: #2c3e50; }}
-                .field-value {{ color: #34495e; margin-top: 5px; }}
-                .footer {{ margin-top: 40px; text-align: center; font-size: 12px; color: #95a5a6; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <div class="title">{sozlesme.sozlesme_adi}</div>
-                <div class="subtitle">Kaplan Hukuk Bürosu</div>
-                <div class="subtitle">Müvekkil: {sozlesme.muvekkil_adi or 'Belirtilmemiş'}</div>
-                <div class="subtitle">Sözleşme Tarihi: {sozlesme.sozlesme_tarihi.strftime('%d.%m.%Y') if sozlesme.sozlesme_tarihi else 'Belirtilmemiş'}</div>
-            </div>
-            
-            <div class="content">
-        """
-        
-        # İçerikteki her alanı ekle
-        for key, value in icerik.items():
-            if value and str(value).strip():
-                # Anahtar ismini daha okunabilir hale getir
-                label = key.replace('_', ' ').title()
-                html_content += f"""
-                <div class="field">
-                    <div class="field-label">{label}:</div>
-                    <div class="field-value">{value}</div>
-                </div>
-                """
+
+@app.route('/api/sozlesme_pdf/<int:sozlesme_id>')
+@login_required
+def api_sozlesme_pdf(sozlesme_id):
+    """Sözleşmeyi sunucu tarafında üretilen PDF olarak döndür"""
+    try:
+        sozlesme = OrnekSozlesme.query.filter_by(id=sozlesme_id, user_id=current_user.id).first_or_404()
         
-        html_content += f"""
-            </div>
-            
-            <div class="footer">
-                <p>Bu belge Kaplan Hukuk Bürosu tarafından oluşturulmuştur.</p>
-                <p>Oluşturma Tarihi: {sozlesme.olusturulma_tarihi.strftime('%d.%m.%Y %H:%M')}</p>
-            </div>
-        </body>
-        </html>
-        """
+        # PDF içerik özetine göre önbellekten gelir, yoksa bir kez üretilir
+        from sozlesme_pdf import render_contract_pdf_cached
+        cache_key, pdf_bytes = render_contract_pdf_cached(
+            sozlesme.icerik_json, sozlesme.sozlesme_adi, app.config['SOZLESME_PDF_CACHE_FOLDER'])
         
-        # HTML'i Response olarak döndür
-        return Response(html_content, mimetype='text/html')
+        response = send_file(
+            BytesIO(pdf_bytes),
+            mimetype='application/pdf',
+            as_attachment=request.args.get('indir') == '1',
+            download_name=f"{secure_filename(sozlesme.sozlesme_adi) or 'sozlesme'}.pdf"
+        )
+        response.set_etag(cache_key)
+        response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+        return response.make_conditional(request)
         
     except Exception as e:
         print(f"Sözleşme PDF oluşturma hatası: {str(e)}")
         return f"PDF oluşturulurken hata oluştu: {str(e)}", 500
 
+@app.route('/api/sozlesme_pdf/toplu')
+@login_required
+@permission_required('ornek_sozlesmeler')
+def api_sozlesme_pdf_toplu():
+    """Seçilen (veya tüm) sözleşmeleri PDF olarak tek ZIP arşivinde döndür"""
+    try:
+        query = OrnekSozlesme.query.filter_by(user_id=current_user.id)
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip().isdigit()]
+        if ids:
+            query = query.filter(OrnekSozlesme.id.in_(ids))
+        sozlesmeler = query.order_by(OrnekSozlesme.olusturulma_tarihi.desc()).all()
+        
+        if not sozlesmeler:
+            return jsonify({'success': False, 'message': 'Dışa aktarılacak sözleşme bulunamadı.'}), 404
+        
+        from sozlesme_pdf import build_contracts_zip
+        arsiv = build_contracts_zip(
+            [(secure_filename(s.sozlesme_adi) or f"sozlesme_{s.id}", s.icerik_json, s.sozlesme_adi) for s in sozlesmeler],
+            app.config['SOZLESME_PDF_CACHE_FOLDER']
+        )
+        return send_file(
+            arsiv,
+            mimetype='application/zip',
+            as_attachment=True,
+            download_name=f"sozlesmeler_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        )
+    except Exception as e:
+        print(f"Toplu sözleşme PDF dışa aktarma hatası: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 # --- Örnek Sözleşme Kaydetme ve Listeleme API Route'ları SONU ---
 
 # --- Örnek Dilekçe Kategori API Route'ları ---
@@ -9126,6 +5007,21 @@ def api_dilekce_kategori_duzenle(kategori_id):
 # --- Örnek Dilekçe Kategori API Route'ları SONU ---
 
 # --- Örnek Dilekçe CRUD API Route'ları ---
+def schedule_ornek_dilekce_preview(dilekce):
+    """Örnek dilekçenin HTML önizlemesini arka planda (yeniden) hazırlar"""
+    try:
+        filepath = os.path.join(app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'], dilekce.dosya_yolu)
+        schedule_rendition(app.config['ORNEK_DILEKCE_PREVIEW_FOLDER'], dilekce.id, dilekce.ad, filepath)
+    except Exception as e:
+        print(f"Örnek dilekçe önizlemesi planlanamadı (ID: {dilekce.id}): {str(e)}")
+
+def ornek_dilekce_preview_response(key, html):
+    """Önbellekteki önizlemeyi ETag ile sunar"""
+    response = Response(html, mimetype='text/html')
+    response.set_etag(key)
+    response.headers['Cache-Control'] = 'private, max-age=300'
+    return response.make_conditional(request)
+
 @app.route('/api/ornek_dilekceler', methods=['POST'])
 @login_required
 # @permission_required('ornek_dilekce_ekle') # İzin eklenebilir
@@ -9184,6 +5080,7 @@ def api_ornek_dilekce_ekle():
         )
         db.session.add(yeni_dilekce)
         db.session.commit()
+        schedule_ornek_dilekce_preview(yeni_dilekce)
         
         log_activity(
             activity_type='Örnek Dilekçe Eklendi',
@@ -9293,8 +5190,11 @@ def api_ornek_dilekce_onizle(dilekce_id):
             print(f"TXT dosyası tespit edildi, doğrudan gönderiliyor: {dilekce.ad}")
             return send_file(filepath, mimetype='text/plain')
         
-        # DOC/DOCX dosyalar için HTML önizleme
+        # DOC/DOCX dosyalar için HTML önizleme (hazırsa doğrudan önbellekten)
         elif file_ext in ['doc', 'docx']:
+            rendition = get_rendition(app.config['ORNEK_DILEKCE_PREVIEW_FOLDER'], dilekce.id, dilekce.ad, filepath)
+            if rendition:
+                return ornek_dilekce_preview_response(*rendition)
             print(f"DOC/DOCX dosyası tespit edildi, HTML önizleme yapılacak: {dilekce.ad}")
             return redirect(url_for('api_ornek_dilekce_html_onizle', dilekce_id=dilekce_id))
         
@@ -9326,79 +5226,13 @@ def api_ornek_dilekce_html_onizle(dilekce_id):
             return "Bu dosya türü desteklenmiyor", 400
         
         try:
-            # DOCX dosyaları için mammoth kullan
+            # DOCX dosyaları için hazır önizlemeyi kullan, yoksa mammoth ile üret
             if file_ext == 'docx':
-                import mammoth
-                with open(filepath, 'rb') as f:
-                    result = mammoth.convert_to_html(f)
-                    html_content = result.value
-                    
-                # Basit HTML sayfası oluştur
-                full_html = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>{dilekce.ad} - Önizleme</title>
-                    <style>
-                        body {{
-                            font-family: Arial, sans-serif;
-                            margin: 20px;
-                            line-height: 1.6;
-                            background-color: #f5f5f5;
-                        }}
-                        .document-container {{
-                            background: white;
-                            padding: 30px;
-                            border-radius: 8px;
-                            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                            max-width: 800px;
-                            margin: 0 auto;
-                        }}
-                        .document-header {{
-                            border-bottom: 2px solid #007bff;
-                            padding-bottom: 15px;
-                            margin-bottom: 25px;
-                        }}
-                        .document-title {{
-                            color: #007bff;
-                            font-size: 24px;
-                            font-weight: bold;
-                            margin: 0;
-                        }}
-                        .document-info {{
-                            color: #666;
-                            font-size: 14px;
-                            margin-top: 5px;
-                        }}
-                        .document-content {{
-                            color: #333;
-                        }}
-                        .document-content p {{
-                            margin-bottom: 15px;
-                        }}
-                        .document-content h1, .document-content h2, .document-content h3 {{
-                            color: #007bff;
-                            margin-top: 25px;
-                            margin-bottom: 15px;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="document-container">
-                        <div class="document-header">
-                            <div class="document-title">{dilekce.ad}</div>
-                            <div class="document-info">Word Belgesi Önizlemesi</div>
-                        </div>
-                        <div class="document-content">
-                            {html_content}
-                        </div>
-                    </div>
-                </body>
-                </html>
-                """
-                
-                return Response(full_html, mimetype='text/html')
+                preview_folder = app.config['ORNEK_DILEKCE_PREVIEW_FOLDER']
+                rendition = get_rendition(preview_folder, dilekce.id, dilekce.ad, filepath)
+                if rendition is None:
+                    rendition = prepare_rendition(preview_folder, dilekce.id, dilekce.ad, filepath)
+                return ornek_dilekce_preview_response(*rendition)
                 
             # DOC dosyaları için şimdilik hata mesajı
             else:
@@ -9631,6 +5465,7 @@ def api_ornek_dilekce_sil(dilekce_id):
                 # return jsonify({'success': False, 'message': f'Dosya silinemedi: {e}'}), 500
         
         db.session.commit() # Dosya silme başarılı olmasa bile DB değişikliğini commit et
+        invalidate_renditions(app.config['ORNEK_DILEKCE_PREVIEW_FOLDER'], dilekce_id)
         log_activity(
             activity_type='Örnek Dilekçe Silindi',
             description=f'Örnek dilekçe silindi: {dilekce_adi} (Kategori: {kategori_adi})',
@@ -9678,6 +5513,9 @@ def api_ornek_dilekce_duzenle(dilekce_id):
             dilekce.kategori_id = data['kategori_id']
 
         db.session.commit()
+        # Başlık önizlemede yer aldığından eski önizleme geçersizdir
+        invalidate_renditions(app.config['ORNEK_DILEKCE_PREVIEW_FOLDER'], dilekce.id)
+        schedule_ornek_dilekce_preview(dilekce)
         
         log_activity(
             activity_type='Örnek Dilekçe Güncellendi',
@@ -9730,6 +5568,8 @@ def api_ornek_dilekce_ad_duzenle(dilekce_id):
 
         dilekce.ad = guvenli_yeni_ad
         db.session.commit()
+        invalidate_renditions(app.config['ORNEK_DILEKCE_PREVIEW_FOLDER'], dilekce.id)
+        schedule_ornek_dilekce_preview(dilekce)
         
         log_activity(
             activity_type='Örnek Dilekçe Adı Güncellendi',
@@ -11401,6 +7241,154 @@ def test_route():
 
 # =============== UYAP API ENDPOINTS ===============
 
+# Uzun süren UYAP işlemleri ?async=1 ile arka plan işi olarak çalıştırılabilir
+uyap_jobs = UYAPJobQueue(app)
+
+def uyap_file_to_dict(file):
+    """UyapFile nesnesini API yanıtı için sözlüğe çevirir"""
+    return {
+        'id': file.id,
+        'key': file.key,
+        'esas_no': file.esas_no,
+        'mahkeme': file.mahkeme,
+        'yargi_turu': file.yargi_turu,
+        'yargi_birimi': file.yargi_birimi,
+        'durum': file.durum,
+        'acilis_tarihi': file.acilis_tarihi,
+        'taraflar': file.taraflar
+    }
+
+def uyap_search_files_task(user_id, filters, progress=None):
+    """UYAP'ta filtrelere göre dosya arar; /api/uyap/files yanıtını döndürür"""
+    if progress:
+        progress(10, "UYAP'a bağlanılıyor")
+    from uyap_detail_cache import UYAPDetailCache
+    files = UYAPManager().search_files_with_filters(filters, owner=user_id)
+    # Sonraki detay isteklerinin portal dosyaId'sini kalıcı kimlikle eşleyebilmesi için
+    UYAPDetailCache(user_id).store_files(files)
+    db.session.commit()
+    files_dict = [uyap_file_to_dict(file) for file in files]
+    print(f"UYAP'tan {len(files_dict)} dosya bulundu")
+    return {
+        'success': True,
+        'files': files_dict,
+        'count': len(files_dict),
+        'message': f'UYAP\'tan {len(files_dict)} dosya getirildi'
+    }
+
+def fetch_uyap_file_details(user_id, file_id, esas_no, refresh=False):
+    """
+    Dosya detaylarını önbellekten, önbellekteki kopya eskiyse UYAP'tan getirir
+    
+    Returns:
+        tuple: (detaylar, önbellek bilgisi)
+    """
+    from uyap_detail_cache import UYAPDetailCache
+    return UYAPDetailCache(user_id).details(
+        file_id, lambda: UYAPManager().get_file_complete_details(file_id, esas_no, owner=user_id),
+        refresh=refresh)
+
+def uyap_file_details_response(details, cache):
+    """/api/uyap/file/<id>/details yanıtı"""
+    return {
+        'success': True,
+        'details': details,
+        'cache': cache,
+        'message': 'Dosya detayları önbellekten getirildi' if cache['kaynak'] == 'onbellek'
+                   else 'UYAP\'tan dosya detayları getirildi'
+    }
+
+def uyap_file_details_task(user_id, file_id, esas_no, refresh=False, progress=None):
+    """UYAP dosyasının detaylarını getirir; /api/uyap/file/<id>/details yanıtını döndürür"""
+    if progress:
+        progress(10, f"{esas_no} detayları getiriliyor")
+    details, cache = fetch_uyap_file_details(user_id, file_id, esas_no, refresh)
+    print(f"Dosya detayları getirildi ({cache['kaynak']}): {esas_no}")
+    return uyap_file_details_response(details, cache)
+
+def uyap_import_task(user_id, data, progress=None):
+    """UYAP dosyasını getirip aktarır; /api/uyap/import yanıtını döndürür"""
+    if progress:
+        progress(10, "UYAP'tan dosya detayları çekiliyor")
+    file_details, _ = fetch_uyap_file_details(user_id, data.get('file_id'), data.get('esas_no'))
+    if progress:
+        progress(70, "Dosya veritabanına aktarılıyor")
+    result = import_uyap_file_to_database(file_details, data.get('settings', {}), user_id)
+    return {
+        'success': result['success'],
+        'file_info': result.get('file_info', {}),
+        'error': result.get('error'),
+        'message': 'UYAP\'tan başarıyla aktarıldı' if result['success'] else 'Aktarım başarısız'
+    }
+
+def uyap_bulk_import_task(user_id, data, progress=None):
+    """Birden fazla UYAP dosyasını getirip aktarır; /api/uyap/import/bulk yanıtını döndürür"""
+    from uyap_detail_cache import UYAPDetailCache
+    files = data.get('files') or []
+    details, results = [], [None] * len(files)
+    esas_numbers = {item.get('file_id'): item.get('esas_no') for item in files}
+
+    def on_batch(done, total):
+        if progress:
+            progress(done * 90 // total, f"{done}/{total} dosyanın detayları UYAP'tan getirildi")
+
+    # Önbellekte olmayan dosyalar PERFORMANCE_CONFIG['batch_size'] büyüklüğünde gruplarla çekilir
+    fetched = UYAPDetailCache(user_id).details_many(
+        [item.get('file_id') for item in files],
+        lambda file_ids: UYAPManager().get_files_complete_details(
+            [(file_id, esas_numbers.get(file_id)) for file_id in file_ids], owner=user_id, on_progress=on_batch))
+    for index, result in enumerate(fetched):
+        if isinstance(result, Exception):
+            results[index] = {'success': False, 'error': f'UYAP detayları alınamadı: {str(result)}'}
+        else:
+            details.append((index, result[0]))
+
+    if progress:
+        progress(90, f"{len(details)} dosya veritabanına aktarılıyor")
+    importer = UYAPBulkImporter(user_id, data.get('settings', {}))
+    for (index, _), result in zip(details, importer.import_files([d for _, d in details])):
+        results[index] = result
+
+    return {
+        'success': any(result['success'] for result in results),
+        'results': results,
+        'summary': importer.ozet,
+        'message': f"{importer.ozet['aktarilan']} dosya UYAP'tan aktarıldı"
+    }
+
+def uyap_sync_task(user_id, full=False, progress=None):
+    """Kullanıcının UYAP dosyalarını eşitler; eşitleme özetini döndürür"""
+    from uyap_sync import sync_user
+    if progress:
+        progress(5, "UYAP dosyaları eşitleniyor")
+    return {'success': True, 'summary': sync_user(user_id, UYAPManager(), full=full)}
+
+uyap_jobs.register('dosya_arama', lambda job: uyap_search_files_task(
+    job.user_id, job.params.get('filters'), job.progress))
+uyap_jobs.register('dosya_detay', lambda job: uyap_file_details_task(
+    job.user_id, job.params['file_id'], job.params['esas_no'], job.params.get('refresh', False), job.progress))
+uyap_jobs.register('aktarim', lambda job: uyap_import_task(job.user_id, job.params, job.progress))
+uyap_jobs.register('toplu_aktarim', lambda job: uyap_bulk_import_task(job.user_id, job.params, job.progress))
+uyap_jobs.register('senkron', lambda job: uyap_sync_task(
+    job.user_id, job.params.get('full', False), job.progress))
+
+def wants_async_uyap():
+    """İstek ?async=1 ya da JSON gövdesinde async: true ile arka plan işi istiyor mu"""
+    if request.args.get('async', '').lower() in ('1', 'true'):
+        return True
+    return (request.get_json(silent=True) or {}).get('async') is True
+
+def submit_uyap_job(tur, params, message):
+    """UYAP işini kuyruğa ekler ve 202 yanıtı döndürür"""
+    job = uyap_jobs.submit(current_user.id, tur, params)
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(),
+        'status_url': url_for('api_uyap_job_status', job_id=job.id),
+        'events_url': url_for('api_uyap_job_events', job_id=job.id),
+        'message': message
+    }), 202
+
 @app.route('/api/uyap/files', methods=['POST'])
 @login_required
 @csrf.exempt
@@ -11412,37 +7400,10 @@ def api_uyap_search_files():
         filters = request.json
         print(f"UYAP API çağrısı alındı. Filtreler: {filters}")
         
-        # UYAP Manager instance oluştur
-        uyap_manager = UYAPManager()
-        
-        # UYAP'a bağlan ve dosyaları ara
-        print("UYAP'a bağlanılıyor...")
-        
-        # Filtrelerle dosya arama
-        files = uyap_manager.search_files_with_filters(filters)
-        
-        # UyapFile objelerini dictionary'ye çevir
-        files_dict = []
-        for file in files:
-            files_dict.append({
-                'id': file.id,
-                'esas_no': file.esas_no,
-                'mahkeme': file.mahkeme,
-                'yargi_turu': file.yargi_turu,
-                'yargi_birimi': file.yargi_birimi,
-                'durum': file.durum,
-                'acilis_tarihi': file.acilis_tarihi,
-                'taraflar': file.taraflar
-            })
-        
-        print(f"UYAP'tan {len(files_dict)} dosya bulundu")
+        if wants_async_uyap():
+            return submit_uyap_job('dosya_arama', {'filters': filters}, 'UYAP dosya araması başlatıldı')
         
-        return jsonify({
-            'success': True,
-            'files': files_dict,
-            'count': len(files_dict),
-            'message': f'UYAP\'tan {len(files_dict)} dosya getirildi'
-        })
+        return jsonify(uyap_search_files_task(current_user.id, filters))
         
     except Exception as e:
         print(f"UYAP API hatası: {str(e)}")
@@ -11451,6 +7412,53 @@ def api_uyap_search_files():
             'error': f'UYAP bağlantı hatası: {str(e)}'
         }), 500
 
+@app.route('/api/uyap/timings', methods=['GET'])
+@login_required
+def api_uyap_step_timings():
+    """
+    UYAP otomasyon adımlarının ölçülen sürelerini, işlem başına deneme ve
+    bekleme ölçümlerini ve oturum havuzu durumunu döndürür
+    """
+    try:
+        uyap_manager = UYAPManager()
+        return jsonify({
+            'success': True,
+            'timings': uyap_manager.get_step_timings(),
+            'operations': uyap_manager.get_operation_metrics(),
+            'pool': uyap_manager.get_pool_status()
+        })
+    except Exception as e:
+        print(f"UYAP süre bilgisi alınamadı: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/uyap/sync', methods=['GET', 'POST'])
+@login_required
+@csrf.exempt
+def api_uyap_sync():
+    """
+    GET: Kullanıcının son UYAP eşitlemesinin durumunu döndürür
+    POST: Kullanıcının tüm UYAP dosyalarının eşitlenmesini arka plan işi olarak başlatır
+    """
+    from uyap_sync import is_running
+    from models import UyapSenkronImleci
+
+    user_id = current_user.id
+    if request.method == 'GET':
+        cursor = UyapSenkronImleci.query.filter_by(user_id=user_id).first()
+        jobs = uyap_jobs.active(user_id, 'senkron')
+        return jsonify({
+            'success': True,
+            'running': bool(jobs) or is_running(user_id),
+            'job': jobs[0].to_dict() if jobs else None,
+            'sync': cursor.to_dict() if cursor else None
+        })
+
+    if uyap_jobs.active(user_id, 'senkron') or is_running(user_id):
+        return jsonify({'success': False, 'error': 'UYAP eşitlemesi zaten çalışıyor'}), 409
+
+    full = bool((request.get_json(silent=True) or {}).get('full', False))
+    return submit_uyap_job('senkron', {'full': full}, 'UYAP eşitlemesi başlatıldı')
+
 @app.route('/api/uyap/file/<file_id>/details', methods=['GET'])
 @login_required
 @csrf.exempt
@@ -11467,21 +7475,20 @@ def api_uyap_file_details(file_id):
                 'error': 'Esas numarası gerekli'
             }), 400
         
+        # refresh=1 önbellekteki kopyayı atlayıp UYAP'tan yeniden çeker
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true')
         print(f"Dosya detayı istendi - File ID: {file_id}, Esas No: {esas_no}")
         
-        # UYAP Manager instance oluştur
-        uyap_manager = UYAPManager()
-        
-        # Dosya detaylarını getir
-        details = uyap_manager.get_file_complete_details(file_id)
-        
-        print(f"UYAP'tan dosya detayları getirildi: {esas_no}")
+        if wants_async_uyap():
+            # Taze kopya UYAP'a gidilmeden hemen döner; iş yalnızca kopya yoksa ya da eskiyse açılır
+            from uyap_detail_cache import UYAPDetailCache
+            hit = None if refresh else UYAPDetailCache(current_user.id).cached(file_id)
+            if hit is not None:
+                return jsonify(uyap_file_details_response(*hit))
+            return submit_uyap_job('dosya_detay', {'file_id': file_id, 'esas_no': esas_no, 'refresh': refresh},
+                                   'UYAP dosya detayı getiriliyor')
         
-        return jsonify({
-            'success': True,
-            'details': details,
-            'message': 'UYAP\'tan dosya detayları getirildi'
-        })
+        return jsonify(uyap_file_details_task(current_user.id, file_id, esas_no, refresh))
         
     except Exception as e:
         print(f"Dosya detay hatası: {str(e)}")
@@ -11500,7 +7507,6 @@ def api_uyap_import_file():
     try:
         data = request.json
         file_id = data.get('file_id')
-        settings = data.get('settings', {})
         
         if not file_id:
             return jsonify({
@@ -11508,24 +7514,13 @@ def api_uyap_import_file():
                 'error': 'Dosya ID gerekli'
             }), 400
         
-        print(f"Dosya aktarım isteği - File ID: {file_id}, Settings: {settings}")
-        
-        # UYAP Manager instance oluştur
-        uyap_manager = UYAPManager()
-        
-        # Dosya detaylarını UYAP'tan getir
-        print("UYAP'tan dosya detayları çekiliyor...")
-        file_details = uyap_manager.get_file_complete_details(file_id)
+        print(f"Dosya aktarım isteği - File ID: {file_id}, Settings: {data.get('settings', {})}")
         
-        # LawAutomation veritabanına aktar
-        result = import_uyap_file_to_database(file_details, settings, current_user.id)
+        if wants_async_uyap():
+            params = {key: data.get(key) for key in ('file_id', 'esas_no', 'settings')}
+            return submit_uyap_job('aktarim', params, 'UYAP dosya aktarımı başlatıldı')
         
-        return jsonify({
-            'success': result['success'],
-            'file_info': result.get('file_info', {}),
-            'error': result.get('error'),
-            'message': 'UYAP\'tan başarıyla aktarıldı' if result['success'] else 'Aktarım başarısız'
-        })
+        return jsonify(uyap_import_task(current_user.id, data))
         
     except Exception as e:
         print(f"Import hatası: {str(e)}")
@@ -11534,6 +7529,104 @@ def api_uyap_import_file():
             'error': f'UYAP import hatası: {str(e)}'
         }), 500
 
+@app.route('/api/uyap/import/bulk', methods=['POST'])
+@login_required
+@csrf.exempt
+def api_uyap_import_files():
+    """
+    Birden fazla UYAP dosyasını tek istekte aktarır
+    
+    İstek: {'files': [{'file_id', 'esas_no'}, ...], 'settings': {...}}
+    """
+    try:
+        data = request.json or {}
+        
+        if not data.get('files'):
+            return jsonify({
+                'success': False,
+                'error': 'Aktarılacak dosya seçilmedi'
+            }), 400
+        
+        if wants_async_uyap():
+            params = {'files': data['files'], 'settings': data.get('settings', {})}
+            return submit_uyap_job('toplu_aktarim', params, 'UYAP toplu aktarımı başlatıldı')
+        
+        return jsonify(uyap_bulk_import_task(current_user.id, data))
+        
+    except Exception as e:
+        print(f"Toplu import hatası: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'UYAP toplu import hatası: {str(e)}'
+        }), 500
+
+@app.route('/api/uyap/jobs', methods=['GET'])
+@login_required
+def api_uyap_jobs():
+    """
+    Kullanıcının son UYAP işlerini döndürür
+    """
+    jobs = UyapIs.query.filter_by(user_id=current_user.id) \
+        .order_by(UyapIs.id.desc()).limit(request.args.get('limit', 20, type=int)).all()
+    return jsonify({'success': True, 'jobs': [job.to_dict() for job in jobs]})
+
+@app.route('/api/uyap/jobs/<int:job_id>', methods=['GET'])
+@login_required
+def api_uyap_job_status(job_id):
+    """
+    UYAP işinin durumunu, ilerlemesini ve bittiyse sonucunu döndürür
+    """
+    job = uyap_jobs.get(job_id, user_id=current_user.id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/api/uyap/jobs/<int:job_id>/cancel', methods=['POST'])
+@login_required
+@csrf.exempt
+def api_uyap_job_cancel(job_id):
+    """
+    Henüz başlamamış UYAP işini iptal eder
+    """
+    if uyap_jobs.get(job_id, user_id=current_user.id) is None:
+        return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+    if not uyap_jobs.cancel(job_id, user_id=current_user.id):
+        return jsonify({'success': False, 'error': 'Başlamış ya da bitmiş iş iptal edilemez'}), 409
+    return jsonify({'success': True, 'message': 'İş iptal edildi'})
+
+@app.route('/api/uyap/jobs/<int:job_id>/events', methods=['GET'])
+@login_required
+def api_uyap_job_events(job_id):
+    """
+    UYAP işinin ilerlemesini Server-Sent Events olarak akıtır; iş bitince akış kapanır
+    """
+    from uyap_jobs import FINISHED
+    from uyap_config import JOB_CONFIG
+
+    if uyap_jobs.get(job_id, user_id=current_user.id) is None:
+        return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+
+    def events():
+        deadline = pytime.monotonic() + JOB_CONFIG['stream_timeout']
+        last = None
+        while pytime.monotonic() < deadline:
+            # Diğer iş parçacığının commit ettiği ilerlemeyi görmek için önbelleği bırak
+            db.session.expire_all()
+            job = db.session.get(UyapIs, job_id)
+            if job is None:
+                break
+            state = job.to_dict()
+            if state != last:
+                yield f"data: {json.dumps(state, ensure_ascii=False, default=str)}\n\n"
+                last = state
+            if job.durum in FINISHED:
+                break
+            db.session.rollback()
+            pytime.sleep(0.5)
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/uyap/documents/download', methods=['POST'])
 @login_required
 @csrf.exempt
@@ -11563,23 +7656,27 @@ def api_uyap_download_documents():
         
         print(f"UYAP'tan evrak indiriliyor - File ID: {file_id}, Target: {target_folder}")
         
-        # Evrakları UYAP'tan indir
-        downloaded_files = []
-        for doc in documents:
-            try:
-                doc_paths = uyap_manager.download_file_documents([doc], target_folder)
-                if doc_paths:
-                    downloaded_files.extend(doc_paths)
-                    print(f"İndirildi: {doc.get('name', 'Unknown')}")
-            except Exception as e:
-                print(f"Evrak indirilemedi {doc.get('name', 'Unknown')}: {str(e)}")
-                continue
+        # Evrakları UYAP'tan paralel indir; aynı içerik ikinci kez kaydedilmez
+        results = uyap_manager.download_documents(documents, target_folder, owner=current_user.id)
+        downloaded_files = [result.path for result in results if result.status == 'indirildi']
+        existing_files = [result.path for result in results if result.status == 'mevcut']
+        skipped = [result.to_dict() for result in results if result.status == 'atlandi']
+        failed = [result.to_dict() for result in results if result.status == 'hata']
+        
+        for result in failed:
+            print(f"Evrak indirilemedi {result['name']}: {result['error']}")
         
         return jsonify({
             'success': True,
             'downloaded_files': downloaded_files,
+            'existing_files': existing_files,
             'download_count': len(downloaded_files),
+            'skipped': skipped,
+            'failed': failed,
+            'results': [result.to_dict() for result in results],
             'message': f'UYAP\'tan {len(downloaded_files)} evrak indirildi'
+                       + (f', {len(existing_files)} evrak zaten kayıtlı' if existing_files else '')
+                       + (f', {len(skipped)} evrak atlandı' if skipped else '')
         })
         
     except Exception as e:
@@ -11600,237 +7697,7 @@ def import_uyap_file_to_database(file_details, settings, user_id):
     Returns:
         dict: Aktarım sonucu
     """
-    try:
-        print(f"Veritabanına aktarım başlıyor - User ID: {user_id}")
-        print(f"File details: {file_details}")
-        print(f"Settings: {settings}")
-        
-        # Temel bilgileri al
-        basic_info = file_details.get('basic_info', {})
-        parties = file_details.get('parties', [])
-        expenses = file_details.get('expenses', [])
-        documents = file_details.get('documents', [])
-        
-        # Dosyayı kontrol et (idempotent upsert için)
-        existing_case = CaseFile.query.filter_by(
-            case_number=basic_info.get('esas_no', ''),
-            year=basic_info.get('year', datetime.now().year),
-            courthouse=basic_info.get('mahkeme', '')
-        ).first()
-        
-        if existing_case and not settings.get('overwrite_existing', False):
-            return {
-                'success': False,
-                'error': 'Dosya zaten mevcut. Üzerine yazma seçeneği seçilmedi.'
-            }
-        
-        # Yeni dosya oluştur veya mevcut dosyayı güncelle
-        case_file = existing_case if existing_case else CaseFile()
-        
-        # Temel bilgileri güncelle (eğer ayarlarda etkinse)
-        if settings.get('include_basic_info', True):
-            case_file.file_type = basic_info.get('yargi_turu', 'hukuk').lower()
-            case_file.courthouse = basic_info.get('mahkeme', '')
-            case_file.department = basic_info.get('yargi_birimi', '')
-            case_file.year = basic_info.get('year', datetime.now().year)
-            case_file.case_number = basic_info.get('esas_no', '')
-            case_file.status = basic_info.get('durum', 'Aktif')
-            
-            # Tarih parsing'i güvenli hale getir
-            acilis_tarihi = basic_info.get('acilis_tarihi')
-            if acilis_tarihi:
-                try:
-                    case_file.open_date = datetime.strptime(acilis_tarihi, '%d.%m.%Y').date()
-                except ValueError:
-                    case_file.open_date = datetime.now().date()
-            else:
-                case_file.open_date = datetime.now().date()
-                
-            case_file.user_id = user_id
-            
-        # Taraf bilgilerini güncelle (eğer ayarlarda etkinse)
-        if settings.get('include_parties', True) and parties:
-            # Parties'leri dict'e çevir (mock veri dict formatında geliyor)
-            for i, party in enumerate(parties):
-                if isinstance(party, dict):
-                    if i == 0:  # İlk taraf müvekkil
-                        case_file.client_name = party.get('name', '')
-                        case_file.client_capacity = party.get('capacity', '')
-                        case_file.client_identity_number = party.get('identity_number', '')
-                        
-                        # Entity type'ı belirle
-                        identity = party.get('identity_number', '')
-                        if len(identity) == 11 and identity.isdigit():
-                            case_file.client_entity_type = 'person'
-                        else:
-                            case_file.client_entity_type = 'company'
-                    elif i == 1:  # İkinci taraf karşı taraf
-                        case_file.opponent_name = party.get('name', '')
-                        case_file.opponent_capacity = party.get('capacity', '')
-                        case_file.opponent_identity_number = party.get('identity_number', '')
-                        
-                        identity = party.get('identity_number', '')
-                        if len(identity) == 11 and identity.isdigit():
-                            case_file.opponent_entity_type = 'person'
-                        else:
-                            case_file.opponent_entity_type = 'company'
-                        
-                        # Vekil bilgisi varsa
-                        if party.get('lawyer'):
-                            case_file.opponent_lawyer = party.get('lawyer', '')
-                            case_file.opponent_lawyer_bar_number = party.get('lawyer_bar_number', '')
-        
-        # Veritabanına kaydet
-        if not existing_case:
-            db.session.add(case_file)
-        
-        db.session.commit()
-        print(f"Dosya kaydedildi - ID: {case_file.id}")
-        
-        # Masrafları ekle (eğer ayarlarda etkinse)
-        if settings.get('include_expenses', False) and expenses:
-            add_uyap_expenses(case_file.id, expenses, settings.get('expense_conflict', 'skip'))
-        
-        # Evrak bilgilerini kaydet (eğer ayarlarda etkinse)
-        if settings.get('include_documents', False) and documents:
-            save_uyap_documents(case_file.id, documents, user_id)
-        
-        # Activity log ekle
-        activity = ActivityLog(
-            activity_type='uyap_import',
-            description=f'UYAP\'tan dosya aktarıldı: {case_file.case_number}',
-            details={
-                'esas_no': case_file.case_number,
-                'mahkeme': case_file.courthouse,
-                'import_settings': settings
-            },
-            user_id=user_id,
-            related_case_id=case_file.id
-        )
-        db.session.add(activity)
-        db.session.commit()
-        
-        print(f"Aktarım başarılı - Case ID: {case_file.id}")
-        
-        return {
-            'success': True,
-            'file_info': {
-                'id': case_file.id,
-                'esas_no': case_file.case_number,
-                'mahkeme': case_file.courthouse
-            }
-        }
-        
-    except Exception as e:
-        print(f"Aktarım hatası: {str(e)}")
-        db.session.rollback()
-        return {
-            'success': False,
-            'error': str(e)
-        }
-
-def add_uyap_expenses(case_id, expenses, conflict_strategy):
-    """UYAP masraflarını ekler - Mock veriler için uyarlanmış"""
-    try:
-        print(f"Masraf ekleme başlıyor - Case ID: {case_id}, Expense count: {len(expenses)}")
-        
-        for expense_data in expenses:
-            # Mock veri dict formatında geliyor
-            if isinstance(expense_data, dict):
-                expense_type = expense_data.get('expense_type', '')
-                amount = expense_data.get('amount', 0)
-                date_str = expense_data.get('date', '')
-                is_paid = expense_data.get('is_paid', False)
-                description = expense_data.get('description', '')
-                
-                # Tarih parsing
-                try:
-                    expense_date = datetime.strptime(date_str, '%d.%m.%Y').date()
-                except ValueError:
-                    expense_date = datetime.now().date()
-                
-                # Mevcut masrafi kontrol et
-                existing_expense = Expense.query.filter_by(
-                    case_id=case_id,
-                    expense_type=expense_type,
-                    date=expense_date
-                ).first()
-                
-                if existing_expense:
-                    if conflict_strategy == 'skip':
-                        print(f"Masraf atlandı: {expense_type}")
-                        continue
-                    elif conflict_strategy == 'overwrite':
-                        existing_expense.amount = amount
-                        existing_expense.description = description
-                        existing_expense.is_paid = is_paid
-                        print(f"Masraf güncellendi: {expense_type}")
-                    # create-new için yeni kayıt oluşturulacak
-                
-                if conflict_strategy == 'create-new' or not existing_expense:
-                    expense = Expense(
-                        case_id=case_id,
-                        expense_type=expense_type,
-                        amount=amount,
-                        date=expense_date,
-                        is_paid=is_paid,
-                        description=description
-                    )
-                    db.session.add(expense)
-                    print(f"Yeni masraf eklendi: {expense_type} - {amount} TL")
-        
-        db.session.commit()
-        print("Masraflar başarıyla kaydedildi")
-        
-    except Exception as e:
-        print(f"Masraf ekleme hatası: {str(e)}")
-        db.session.rollback()
-
-def save_uyap_documents(case_id, documents, user_id):
-    """UYAP evrak bilgilerini kaydeder - Mock veriler için uyarlanmış"""
-    try:
-        print(f"Evrak kaydetme başlıyor - Case ID: {case_id}, Document count: {len(documents)}")
-        
-        for doc_data in documents:
-            # Mock veri dict formatında geliyor
-            if isinstance(doc_data, dict):
-                doc_name = doc_data.get('name', 'Unknown_Document.pdf')
-                doc_type = doc_data.get('type', 'PDF')
-            else:
-                # Eğer dataclass ise (gerçek UYAP'tan geliyorsa)
-                doc_name = getattr(doc_data, 'name', 'Unknown_Document.pdf')
-                doc_type = getattr(doc_data, 'type', 'PDF')
-            
-            # Dosya adını güvenli hale getir
-            safe_filename = secure_filename(doc_name)
-            
-            # Mevcut evrak kontrolü (duplicate önleme)
-            existing_doc = Document.query.filter_by(
-                case_id=case_id,
-                filename=safe_filename
-            ).first()
-            
-            if existing_doc:
-                print(f"Evrak zaten mevcut, atlandı: {safe_filename}")
-                continue
-            
-            # Evrak kaydını oluştur
-            document = Document(
-                case_id=case_id,
-                document_type=f'UYAP {doc_type}',
-                filename=safe_filename,
-                filepath=f"uyap/{datetime.now().year}/{case_id}/{safe_filename}",
-                user_id=user_id
-            )
-            db.session.add(document)
-            print(f"Evrak kaydedildi: {safe_filename}")
-        
-        db.session.commit()
-        print("Evraklar başarıyla kaydedildi")
-        
-    except Exception as e:
-        print(f"Evrak kaydetme hatası: {str(e)}")
-        db.session.rollback()
+    return UYAPBulkImporter(user_id, settings).import_files([file_details])[0]
 
 def ensure_upload_directories():
     """
@@ -11846,7 +7713,13 @@ def ensure_upload_directories():
         os.makedirs(directory, exist_ok=True)
         print(f"Upload dizini kontrol edildi: {directory}")
 
-if __name__ == '__main__':
+def prepare_app():
+    """
+    Sunucu istek almadan önce bir kez çalışır
+
+    Geliştirme sunucusu (__main__) ve üretim girişi (wsgi.py) tarafından
+    kullanılır; preload ile tüm worker'lar için ana süreçte bir kez yapılır.
+    """
     with app.app_context():
         # Gerekli upload dizinlerini oluştur
         ensure_upload_directories()
@@ -11857,5 +7730,36 @@ if __name__ == '__main__':
         
         # Admin kullanıcısını kontrol et/oluştur
         create_admin_user()
+
+def start_background_services():
+    """
+    Arka plan iş kuyruğunu ve zamanlayıcıları başlatır
+
+    Her sunucu sürecinde bir kez çağrılır: geliştirme sunucusu (__main__),
+    gunicorn (post_fork) ve waitress (wsgi.py). İşleri ve zamanlayıcıları
+    yalnızca iş kuyruğunun kilidini alan süreç çalıştırır; o süreç
+    kapanınca başka bir worker devralır.
+    """
+    if uyap_jobs.is_started:
+        return
+    
+    # Faiz oranlarını zamanlanmış olarak güncelle
+    uyap_jobs.when_leader(faiz_oranlari.start_scheduler)
+    
+    # Oturumu açık avukatların UYAP dosyalarını günde bir eşitle
+    from uyap_config import SYNC_CONFIG
+    if SYNC_CONFIG['enabled']:
+        from uyap_sync import start_scheduler as start_uyap_sync
+        uyap_jobs.when_leader(start_uyap_sync)
+    
+    # Yeniden başlatmadan önce kuyruğa alınmış UYAP işlerini çalıştır
+    uyap_jobs.start()
+
+if __name__ == '__main__':
+    prepare_app()
+
+    # Debug yeniden yükleyicisinin ana sürecinde değil, uygulama sürecinde
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services()
         
     app.run(debug=True)
\ No newline at end of file
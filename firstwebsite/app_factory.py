@@ -0,0 +1,109 @@
+"""
+Uygulama fabrikası
+
+Flask uygulamasını yapılandırma ve veritabanı bağlantısıyla kurar. Rotalar,
+Flask-Admin ve ağır alt sistemler (PDF/DOCX dönüştürücüler, UYAP/selenium,
+içtihat istemcileri) burada yüklenmez; web uygulaması (app.py) kendi rotalarını
+bu çekirdeğin üzerine ekler, event_reminder.py gibi CLI işleri ise yalnızca
+çekirdeği kurarak saniyenin altında açılır.
+
+Kullanım:
+    from app_factory import create_app
+    app = create_app()
+    with app.app_context():
+        ...
+"""
+
+import os
+
+from dotenv import load_dotenv
+from flask import Flask
+from sqlalchemy import event
+
+from models import db
+
+load_dotenv()
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# Eşzamanlı worker'lar için SQLite ayarları: WAL kipinde okuyucular yazıcıyı
+# beklemez, kilitli veritabanında hata yerine busy_timeout kadar beklenir.
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 30))  # saniye
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000}',
+)
+
+
+def configure_app(app):
+    """Uygulama yapılandırmasını (veritabanı, yükleme klasörleri, e-posta) uygular"""
+    app.config['SECRET_KEY'] = 'your_secret_key'
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(BASE_DIR, 'instance', 'database.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['UPLOAD_FOLDER'] = 'uploads/'
+    app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'ornek_dilekceler')
+    app.config['UYAP_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'uyap') # UYAP dosyaları için
+    app.config['UDF_PDF_CACHE_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'udf_pdf') # UDF->PDF önbelleği
+    app.config['ORNEK_DILEKCE_PREVIEW_FOLDER'] = os.path.join(app.config['ORNEK_DILEKCE_UPLOAD_FOLDER'], 'onizleme') # Dilekçe önizleme önbelleği
+    app.config['SOZLESME_PDF_CACHE_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'sozlesme_pdf') # Sözleşme PDF önbelleği
+    # CSRF için WTF_CSRF_ENABLED=True (SECRET_KEY CSRF için de kullanılır)
+    app.config['WTF_CSRF_ENABLED'] = True
+
+    # E-posta konfigürasyonu (.env dosyasından) - Gmail kullan
+    app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
+    app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
+    app.config['MAIL_USE_TLS'] = True
+    app.config['MAIL_USE_SSL'] = False
+    app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
+    app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
+    app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
+    app.config['MAIL_ASCII_ATTACHMENTS'] = False  # Türkçe karakter desteği için
+    app.config['MAIL_DEFAULT_CHARSET'] = 'utf-8'  # UTF-8 charset ayarla
+    app.config['MAIL_SUPPRESS_SEND'] = False
+    app.config['MAIL_DEBUG'] = True  # Debug modunu aç
+
+
+def is_sqlite_file(uri):
+    """Bağlantı adresi dosya tabanlı bir SQLite veritabanını mı gösteriyor"""
+    return uri.startswith('sqlite:') and uri not in ('sqlite://', 'sqlite:///:memory:') and 'mode=memory' not in uri
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Her yeni SQLite bağlantısında WAL ve bekleme ayarlarını uygular"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def configure_sqlite(app):
+    """Dosya tabanlı SQLite için bağlantı seçeneklerini ayarlar (db.init_app'ten önce)"""
+    if not is_sqlite_file(app.config['SQLALCHEMY_DATABASE_URI']):
+        return False
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    options.setdefault('connect_args', {}).setdefault('timeout', SQLITE_BUSY_TIMEOUT)
+    return True
+
+
+def create_app(import_name='app', config=None):
+    """
+    Yapılandırılmış ve veritabanı bağlanmış Flask uygulaması döndürür
+
+    Args:
+        import_name: Flask uygulamasının import adı (şablon/static kökü buna göre bulunur)
+        config: Varsayılanların üzerine yazılacak ayarlar (ör. test veritabanı)
+
+    Returns:
+        Flask: Rotası olmayan çekirdek uygulama
+    """
+    app = Flask(import_name, static_url_path='/static', root_path=BASE_DIR)
+    configure_app(app)
+    if config:
+        app.config.update(config)
+    sqlite_file = configure_sqlite(app)
+    db.init_app(app)
+    if sqlite_file:
+        with app.app_context():
+            event.listen(db.engine, 'connect', apply_sqlite_pragmas)
+    return app
@@ -0,0 +1,357 @@
+"""
+Ceza infaz hesaplama motoru
+
+Hapis cezası, suç türü, tutukluluk (mahsup) süresi ve tarihlerden koşullu
+salıverilme, denetimli serbestlik ve hak ederek tahliye tarihlerini
+hesaplar (5275 sayılı Kanun md. 107, 105/A ve geçici md. 6).
+
+Girdiler hükümlü kimliğinden bağımsız, normalize edilmiş bir anahtara
+(InfazGirdisi) çevrilir ve sonuçlar bu anahtarla önbellekte tutulur. Aynı
+ceza durumundaki hükümlüler tek kez hesaplanır. Kurallar değiştiğinde
+(kanun değişikliği) set_rules() önbelleği boşaltır; tüm müvekkil listesi
+tek toplu çağrıyla yeniden hesaplanır.
+"""
+
+import io
+import csv
+import math
+import threading
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from fractions import Fraction
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional
+
+# Tek çağrıda hesaplanabilecek en fazla hükümlü sayısı
+MAX_ITEMS = 10000
+
+# Süre hesabında ay 30, yıl 365 gün sayılır
+GUN_AY = 30
+GUN_YIL = 365
+
+CEZA_TURLERI = ('sureli', 'muebbet', 'agirlastirilmis')
+OZEL_DURUMLAR = ('yok', '0-6_cocuk', '65_yas', '70_yas')
+
+CSV_COLUMNS = ('id', 'suc_turu', 'toplam_gun', 'mahsup_gun', 'kosullu_saliverilme_gun', 'denetimli_serbestlik_gun',
+               'yatar_gun', 'denetimli_serbestlik_tarihi', 'kosullu_saliverilme_tarihi', 'tahliye_tarihi')
+
+
+class CezaInfazError(ValueError):
+    """Geçersiz hesaplama girdisi"""
+    pass
+
+
+@dataclass(frozen=True)
+class SucTuru:
+    ad: str
+    oran: Fraction
+    agir_muebbet: bool = False  # Müebbette koşullu salıverilme 30/36 yıl (md. 107/4)
+    gecici_madde: bool = True  # 30.03.2020 öncesi suçlarda geçici md. 6 uygulanır mı
+
+
+SUC_TURLERI = MappingProxyType({
+    'adi': SucTuru('Adî suçlar', Fraction(1, 2)),
+    'kasten_oldurme': SucTuru('Kasten öldürme (TCK 81, 82, 83)', Fraction(2, 3), gecici_madde=False),
+    'agir_yaralama': SucTuru('Neticesi sebebiyle ağırlaşmış yaralama (TCK 86, 87/2-d)', Fraction(2, 3)),
+    'yakina_yaralama': SucTuru('Eşe, üstsoya-altsoya, kardeşe veya savunmasız kişiye karşı kasten yaralama',
+                               Fraction(2, 3)),
+    'iskence_eziyet': SucTuru('İşkence ve eziyet (TCK 94, 95, 96)', Fraction(2, 3)),
+    'basit_cinsel_saldiri': SucTuru('Basit cinsel saldırı (TCK 102/1)', Fraction(2, 3), gecici_madde=False),
+    'nitelikli_cinsel_saldiri': SucTuru('Nitelikli cinsel saldırı (TCK 102/2)', Fraction(3, 4), gecici_madde=False),
+    'cocuk_istismari': SucTuru('Çocuğun cinsel istismarı (TCK 103)', Fraction(3, 4), gecici_madde=False),
+    'resit_olmayanla_iliski': SucTuru('Reşit olmayanla cinsel ilişki (TCK 104)', Fraction(3, 4),
+                                      gecici_madde=False),
+    'cinsel_taciz': SucTuru('Cinsel taciz (TCK 105)', Fraction(2, 3), gecici_madde=False),
+    'teror': SucTuru('Terör suçları (3713 sayılı Kanun)', Fraction(3, 4), agir_muebbet=True, gecici_madde=False),
+    'ozel_hayat': SucTuru('Özel hayata karşı suçlar (TCK 132-138)', Fraction(2, 3), gecici_madde=False),
+    'devlet_guvenligi': SucTuru('Devletin güvenliğine karşı suçlar (TCK 302-339)', Fraction(3, 4),
+                                agir_muebbet=True, gecici_madde=False),
+    'uyusturucu_ticareti': SucTuru('Uyuşturucu ticareti (TCK 188)', Fraction(3, 4), gecici_madde=False),
+    'mit_kanunu': SucTuru('MİT Kanunu kapsamındaki suçlar (2937 sayılı Kanun)', Fraction(2, 3),
+                          gecici_madde=False),
+})
+
+# Sayfadaki oran değerleri (0.5, 0.66, 0.75) -> kesir
+ORAN_DEGERLERI = {'0.5': Fraction(1, 2), '0.66': Fraction(2, 3), '0.67': Fraction(2, 3), '0.75': Fraction(3, 4)}
+
+
+@dataclass(frozen=True)
+class InfazKurallari:
+    """Kanun değişikliğiyle güncellenen infaz kuralları"""
+    surum: str = '7242'
+    # Müebbet hapiste koşullu salıverilme için infaz edilecek yıl: (normal, md. 107/4 kapsamı)
+    muebbet_yil: tuple = (24, 30)
+    agirlastirilmis_yil: tuple = (30, 36)
+    # Denetimli serbestlik: koşullu salıverilmeye kalan süre (gün)
+    denetimli_serbestlik_gun: int = 365
+    gecici_madde_tarihi: date = date(2020, 3, 30)
+    gecici_madde_gun: int = 3 * GUN_YIL
+    gecici_madde_ozel_gun: int = 4 * GUN_YIL  # 0-6 yaş çocuklu kadın ve 70 yaşını bitirmiş hükümlü
+    # Koşullu salıverilme süresinin kapalı kurumda geçirilecek asgari oranı
+    kapali_oran: Fraction = Fraction(1, 10)
+
+
+VARSAYILAN_KURALLAR = InfazKurallari()
+
+
+@dataclass(frozen=True)
+class InfazGirdisi:
+    """Önbellek anahtarı: hükümlü kimliği içermeyen, normalize edilmiş girdi"""
+    ceza_turu: str
+    ceza_gun: int
+    oran: Fraction
+    agir_muebbet: bool
+    gecici_madde: bool
+    suc_tarihi: date
+    ozel_durum: str = 'yok'
+    mahsup_gun: int = 0
+    infaz_baslangic: Optional[date] = None
+
+
+def _parse_date(value, field_name, index=0, required=True):
+    if value in (None, ''):
+        if required:
+            raise CezaInfazError(f"{index + 1}. kayıt: '{field_name}' zorunludur.")
+        return None
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()[:10]
+    for fmt in ('%Y-%m-%d', '%d.%m.%Y'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise CezaInfazError(f"{index + 1}. kayıt: '{field_name}' YYYY-AA-GG veya GG.AA.YYYY biçiminde olmalıdır.")
+
+
+def _parse_int(value, field_name, index=0):
+    if value in (None, ''):
+        return 0
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise CezaInfazError(f"{index + 1}. kayıt: '{field_name}' tam sayı olmalıdır.")
+    if number < 0:
+        raise CezaInfazError(f"{index + 1}. kayıt: '{field_name}' negatif olamaz.")
+    return number
+
+
+def girdi_from_dict(data, index=0) -> InfazGirdisi:
+    """
+    API / form verisini normalize edilmiş girdiye çevirir
+
+    data: {'suc_turu': 'adi' | 0.5, 'ceza_turu': 'sureli', 'ceza_yil', 'ceza_ay', 'ceza_gun',
+           'suc_tarihi', 'mahsup_gun', 'ozel_durum', 'infaz_baslangic'}
+    """
+    if not isinstance(data, dict):
+        raise CezaInfazError(f"{index + 1}. kayıt nesne olmalıdır.")
+
+    suc_turu = data.get('suc_turu')
+    category = SUC_TURLERI.get(suc_turu) if isinstance(suc_turu, str) else None
+    if category is not None:
+        oran, agir_muebbet, gecici_madde = category.oran, category.agir_muebbet, category.gecici_madde
+    else:
+        oran = ORAN_DEGERLERI.get(str(suc_turu))
+        if oran is None:
+            raise CezaInfazError(f"{index + 1}. kayıt: bilinmeyen suç türü: {suc_turu}")
+        agir_muebbet, gecici_madde = False, oran == Fraction(1, 2)
+
+    ceza_turu = data.get('ceza_turu') or 'sureli'
+    if ceza_turu not in CEZA_TURLERI:
+        raise CezaInfazError(f"{index + 1}. kayıt: bilinmeyen ceza türü: {ceza_turu}")
+    ceza_gun = 0
+    if ceza_turu == 'sureli':
+        ceza_gun = (_parse_int(data.get('ceza_yil'), 'ceza_yil', index) * GUN_YIL
+                    + _parse_int(data.get('ceza_ay'), 'ceza_ay', index) * GUN_AY
+                    + _parse_int(data.get('ceza_gun'), 'ceza_gun', index))
+        if ceza_gun == 0:
+            raise CezaInfazError(f"{index + 1}. kayıt: ceza süresi girilmelidir.")
+
+    ozel_durum = data.get('ozel_durum') or 'yok'
+    if ozel_durum not in OZEL_DURUMLAR:
+        raise CezaInfazError(f"{index + 1}. kayıt: bilinmeyen özel durum: {ozel_durum}")
+    if not gecici_madde:
+        # Özel durum yalnızca geçici madde kapsamında sonucu etkiler; anahtar sade tutulur
+        ozel_durum = 'yok'
+
+    return InfazGirdisi(
+        ceza_turu=ceza_turu,
+        ceza_gun=ceza_gun,
+        oran=oran,
+        agir_muebbet=agir_muebbet,
+        gecici_madde=gecici_madde,
+        suc_tarihi=_parse_date(data.get('suc_tarihi'), 'suc_tarihi', index),
+        ozel_durum=ozel_durum,
+        mahsup_gun=_parse_int(data.get('mahsup_gun'), 'mahsup_gun', index),
+        infaz_baslangic=_parse_date(data.get('infaz_baslangic'), 'infaz_baslangic', index, required=False)
+    )
+
+
+@dataclass(frozen=True)
+class InfazSonucu:
+    toplam_gun: int
+    kosullu_saliverilme_gun: int
+    denetimli_serbestlik_gun: int
+    yatar_gun: int
+    kapali_gun: int
+    acik_gun: int
+    mahsup_gun: int
+    uyarilar: tuple = ()
+    denetimli_serbestlik_tarihi: Optional[date] = None
+    kosullu_saliverilme_tarihi: Optional[date] = None
+    tahliye_tarihi: Optional[date] = None
+
+    def to_dict(self):
+        data = {
+            'toplam_gun': self.toplam_gun,
+            'mahsup_gun': self.mahsup_gun,
+            'kosullu_saliverilme_gun': self.kosullu_saliverilme_gun,
+            'denetimli_serbestlik_gun': self.denetimli_serbestlik_gun,
+            'yatar_gun': self.yatar_gun,
+            'kapali_gun': self.kapali_gun,
+            'acik_gun': self.acik_gun,
+            'denetimli_serbestlik_tarihi': None,
+            'kosullu_saliverilme_tarihi': None,
+            'tahliye_tarihi': None,
+            'uyarilar': list(self.uyarilar)
+        }
+        for name in ('denetimli_serbestlik_tarihi', 'kosullu_saliverilme_tarihi', 'tahliye_tarihi'):
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value.isoformat()
+        return data
+
+
+def format_sure(gun):
+    """Gün sayısını 'X yıl Y ay Z gün' biçiminde yazar"""
+    yil, kalan = divmod(max(gun, 0), GUN_YIL)
+    ay, gun = divmod(kalan, GUN_AY)
+    parts = [f"{value} {unit}" for value, unit in ((yil, 'yıl'), (ay, 'ay'), (gun, 'gün')) if value]
+    return ' '.join(parts) or '0 gün'
+
+
+def _compute(girdi: InfazGirdisi, kurallar: InfazKurallari) -> InfazSonucu:
+    uyarilar = []
+    if girdi.ceza_turu == 'sureli':
+        toplam = girdi.ceza_gun
+        kosullu = math.ceil(toplam * girdi.oran)
+    else:
+        years = kurallar.agirlastirilmis_yil if girdi.ceza_turu == 'agirlastirilmis' else kurallar.muebbet_yil
+        kosullu = years[1 if girdi.agir_muebbet else 0] * GUN_YIL
+        toplam = kosullu
+
+    # Tutuklulukta geçen süre koşullu salıverilme süresinden düşülür
+    kalan = kosullu - girdi.mahsup_gun
+    if kalan < 0:
+        uyarilar.append("Mahsup süresi koşullu salıverilme süresini aşıyor.")
+        kalan = 0
+
+    denetimli = kurallar.denetimli_serbestlik_gun
+    if girdi.gecici_madde and girdi.suc_tarihi < kurallar.gecici_madde_tarihi:
+        denetimli = (kurallar.gecici_madde_ozel_gun if girdi.ozel_durum in ('0-6_cocuk', '70_yas')
+                     else kurallar.gecici_madde_gun)
+    denetimli = min(denetimli, kalan)
+    yatar = kalan - denetimli
+
+    kapali = math.ceil(toplam * kurallar.kapali_oran)
+    acik = max(kosullu - kapali, 0)
+
+    dates = {}
+    if girdi.infaz_baslangic is not None:
+        start = girdi.infaz_baslangic
+        dates = {
+            'denetimli_serbestlik_tarihi': start + timedelta(days=yatar),
+            'kosullu_saliverilme_tarihi': start + timedelta(days=kalan),
+            'tahliye_tarihi': (start + timedelta(days=max(toplam - girdi.mahsup_gun, 0))
+                               if girdi.ceza_turu == 'sureli' else None)
+        }
+
+    return InfazSonucu(
+        toplam_gun=toplam,
+        kosullu_saliverilme_gun=kosullu,
+        denetimli_serbestlik_gun=denetimli,
+        yatar_gun=yatar,
+        kapali_gun=kapali,
+        acik_gun=acik,
+        mahsup_gun=girdi.mahsup_gun,
+        uyarilar=tuple(uyarilar),
+        **dates
+    )
+
+
+class InfazMotoru:
+    """
+    Önbellekli ceza infaz hesaplama motoru
+
+    Sonuçlar (girdi, kural sürümü) anahtarıyla saklanır; kurallar
+    değiştirildiğinde önbellek boşaltılır.
+    """
+
+    def __init__(self, kurallar: InfazKurallari = VARSAYILAN_KURALLAR, cache_size=8192):
+        self._lock = threading.Lock()
+        self.kurallar = kurallar
+        self._cached = lru_cache(maxsize=cache_size)(_compute)
+
+    def set_rules(self, kurallar: InfazKurallari):
+        """Kanun değişikliğinden sonra yeni kuralları etkinleştirir"""
+        with self._lock:
+            self.kurallar = kurallar
+            self._cached.cache_clear()
+
+    def update_rules(self, **changes):
+        self.set_rules(replace(self.kurallar, **changes))
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def hesapla(self, girdi: InfazGirdisi) -> InfazSonucu:
+        return self._cached(girdi, self.kurallar)
+
+    def hesapla_toplu(self, items) -> List[dict]:
+        """
+        Hükümlü listesini tek geçişte hesaplar
+
+        Hatalı kayıtlar diğerlerini durdurmaz; sonuç listesinde 'hata' alanıyla
+        döner.
+        """
+        if not isinstance(items, (list, tuple)):
+            raise CezaInfazError("Hükümlüler liste olarak gönderilmelidir.")
+        if len(items) > MAX_ITEMS:
+            raise CezaInfazError(f"Tek seferde en fazla {MAX_ITEMS} hükümlü hesaplanabilir.")
+        results = []
+        for index, item in enumerate(items):
+            item_id = item.get('id') if isinstance(item, dict) else None
+            try:
+                result = self.hesapla(girdi_from_dict(item, index)).to_dict()
+            except CezaInfazError as e:
+                results.append({'id': item_id, 'hata': str(e)})
+                continue
+            result['id'] = item_id
+            result['suc_turu'] = item.get('suc_turu')
+            results.append(result)
+        return results
+
+
+def summarize(results):
+    valid = [r for r in results if 'hata' not in r]
+    return {
+        'adet': len(results),
+        'hatali': len(results) - len(valid),
+        'en_yakin_denetimli_serbestlik': min((r['denetimli_serbestlik_tarihi'] for r in valid
+                                              if r.get('denetimli_serbestlik_tarihi')), default=None)
+    }
+
+
+def results_to_csv(results):
+    """Sonuçları Excel'in Türkçe ayarlarıyla açılabilen CSV'ye çevirir (';' ayırıcı, UTF-8 BOM)"""
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=';')
+    writer.writerow(CSV_COLUMNS + ('hata',))
+    for row in results:
+        writer.writerow(['' if row.get(column) is None else row.get(column) for column in CSV_COLUMNS]
+                        + [row.get('hata', '')])
+    return '\ufeff' + output.getvalue()
+
+
+infaz_motoru = InfazMotoru()
@@ -1,2 +0,0 @@
-
- 2a68348c2ca0c50ad315d43d90f5a986
\ No newline at end of file
@@ -1 +0,0 @@
-霞 
\ No newline at end of file
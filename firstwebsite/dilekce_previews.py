@@ -0,0 +1,245 @@
+"""
+Örnek dilekçeler için HTML önizleme (rendition) önbelleği
+
+DOCX örnek dilekçeler mammoth ile HTML'e çevrilir ve sonuç, dilekçe kimliği,
+kaynak dosyanın değişiklik zamanı/boyutu ve başlığın özetinden oluşan
+anahtarla hem bellekte hem de diskte saklanır (başlık HTML'de yer alır):
+
+    uploads/ornek_dilekceler/onizleme/
+        12_1750944232123456789_48213_3f2a9c1e_v1.html
+
+Önizleme dilekçe yüklenirken arka planda hazırlanır; önizleme isteği
+yalnızca hazır HTML'i sunar. Dilekçe düzenlendiğinde veya silindiğinde
+invalidate_renditions ile ilgili kayıtlar temizlenir.
+"""
+
+import os
+import glob
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+
+logger = logging.getLogger(__name__)
+
+# Önizleme HTML'ini etkileyen değişikliklerde artırılır; anahtara dahildir
+RENDITION_VERSION = 1
+
+# Bellekte tutulacak en fazla önizleme sayısı
+MEMORY_CACHE_SIZE = 64
+
+DOCX_PREVIEW_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title} - Önizleme</title>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            line-height: 1.6;
+            background-color: #f5f5f5;
+        }}
+        .document-container {{
+            background: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            max-width: 800px;
+            margin: 0 auto;
+        }}
+        .document-header {{
+            border-bottom: 2px solid #007bff;
+            padding-bottom: 15px;
+            margin-bottom: 25px;
+        }}
+        .document-title {{
+            color: #007bff;
+            font-size: 24px;
+            font-weight: bold;
+            margin: 0;
+        }}
+        .document-info {{
+            color: #666;
+            font-size: 14px;
+            margin-top: 5px;
+        }}
+        .document-content {{
+            color: #333;
+        }}
+        .document-content p {{
+            margin-bottom: 15px;
+        }}
+        .document-content h1, .document-content h2, .document-content h3 {{
+            color: #007bff;
+            margin-top: 25px;
+            margin-bottom: 15px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="document-container">
+        <div class="document-header">
+            <div class="document-title">{title}</div>
+            <div class="document-info">Word Belgesi Önizlemesi</div>
+        </div>
+        <div class="document-content">
+            {content}
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+_memory_cache = OrderedDict()
+_lock = threading.Lock()
+_pending = set()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dilekce-onizleme')
+
+
+def rendition_key(dilekce_id, title, source_path):
+    """
+    Önizleme anahtarını döndürür: (dilekçe, değişiklik zamanı, boyut, başlık, sürüm)
+
+    Returns:
+        str: Anahtar, kaynak dosya yoksa None
+    """
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return None
+    title_hash = hashlib.sha1((title or '').encode('utf-8')).hexdigest()[:8]
+    return f"{dilekce_id}_{stat.st_mtime_ns}_{stat.st_size}_{title_hash}_v{RENDITION_VERSION}"
+
+
+def build_docx_preview(title, source_path):
+    """
+    DOCX dosyasını önizleme HTML sayfasına çevirir
+
+    Raises:
+        ImportError: mammoth kurulu değilse
+    """
+    import mammoth
+
+    with open(source_path, 'rb') as f:
+        result = mammoth.convert_to_html(f)
+    return DOCX_PREVIEW_TEMPLATE.format(title=escape(title), content=result.value)
+
+
+def get_rendition(cache_dir, dilekce_id, title, source_path):
+    """
+    Hazır önizlemeyi döndürür
+
+    Returns:
+        Tuple[str, str]: (anahtar, HTML) veya önizleme yoksa None
+    """
+    key = rendition_key(dilekce_id, title, source_path)
+    if key is None:
+        return None
+
+    with _lock:
+        html = _memory_cache.get(key)
+        if html is not None:
+            _memory_cache.move_to_end(key)
+            return key, html
+
+    try:
+        with open(os.path.join(cache_dir, f"{key}.html"), 'r', encoding='utf-8') as f:
+            html = f.read()
+    except OSError:
+        return None
+
+    _remember(key, html)
+    return key, html
+
+
+def prepare_rendition(cache_dir, dilekce_id, title, source_path):
+    """
+    Önizlemeyi üretir ve önbelleğe yazar
+
+    Dilekçenin eski anahtarlı önizlemeleri (önceki dosya sürümü ya da başlık) silinir.
+
+    Returns:
+        Tuple[str, str]: (anahtar, HTML) veya dosya DOCX değilse None
+    """
+    if os.path.splitext(source_path)[1].lower() != '.docx':
+        return None
+    key = rendition_key(dilekce_id, title, source_path)
+    if key is None:
+        return None
+
+    html = build_docx_preview(title, source_path)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    invalidate_renditions(cache_dir, dilekce_id)
+    fd, temp_path = tempfile.mkstemp(suffix='.html', dir=cache_dir)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(temp_path, os.path.join(cache_dir, f"{key}.html"))
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    _remember(key, html)
+    logger.info(f"Örnek dilekçe önizlemesi hazırlandı: {dilekce_id} ({key})")
+    return key, html
+
+
+def schedule_rendition(cache_dir, dilekce_id, title, source_path):
+    """
+    Önizleme üretimini arka plan işçisine gönderir
+
+    Returns:
+        bool: Yeni iş kuyruğa eklendiyse True
+    """
+    if os.path.splitext(source_path)[1].lower() != '.docx':
+        return False
+    key = rendition_key(dilekce_id, title, source_path)
+    if key is None:
+        return False
+    # Aynı sürüm zaten hazırlanıyorsa yeniden gönderilmez; dosya ya da başlık
+    # değiştiyse (yeni anahtar) eski iş beklenmeden yenisi kuyruğa eklenir
+    with _lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+
+    _executor.submit(_prepare_in_background, cache_dir, dilekce_id, title, source_path, key)
+    return True
+
+
+def _prepare_in_background(cache_dir, dilekce_id, title, source_path, key):
+    try:
+        prepare_rendition(cache_dir, dilekce_id, title, source_path)
+    except Exception as e:
+        logger.error(f"Örnek dilekçe önizlemesi hazırlanamadı {dilekce_id}: {str(e)}")
+    finally:
+        with _lock:
+            _pending.discard(key)
+
+
+def invalidate_renditions(cache_dir, dilekce_id):
+    """Dilekçeye ait tüm önizlemeleri bellekten ve diskten siler"""
+    prefix = f"{dilekce_id}_"
+    with _lock:
+        for key in [k for k in _memory_cache if k.startswith(prefix)]:
+            del _memory_cache[key]
+
+    for path in glob.glob(os.path.join(glob.escape(cache_dir), f"{prefix}*.html")):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Önizleme dosyası silinemedi {path}: {str(e)}")
+
+
+def _remember(key, html):
+    with _lock:
+        _memory_cache[key] = html
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
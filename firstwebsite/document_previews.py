@@ -0,0 +1,333 @@
+"""
+Dava belgeleri için sayfa önizleme (thumbnail) servisi
+
+PDF'ler, PDF sürümü oluşturulmuş DOC/DOCX/UDF belgeleri ve resim dosyaları
+için ilk sayfa küçük resmi ve sayfa bazlı önizleme görüntüleri bir kez,
+arka plan işçisinde üretilir ve belgenin yanında saklanır:
+
+    uploads/12_1750944232_evrak.pdf
+    uploads/12_1750944232_evrak.pdf.onizleme/
+        manifest.json
+        thumb.png
+        page_001.png, page_002.png, ...
+
+Belge listesi bu görüntüleri doğrudan sunar, önizleme için tam dönüşüm
+tetiklenmez.
+"""
+
+import os
+import json
+import shutil
+import logging
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageSequence
+
+logger = logging.getLogger(__name__)
+
+# Önizleme klasörü belgenin yanında bu son ekle oluşturulur
+PREVIEW_DIR_SUFFIX = '.onizleme'
+MANIFEST_NAME = 'manifest.json'
+THUMBNAIL_NAME = 'thumb.png'
+
+# Küçük resim ve sayfa görüntüsü boyutları (piksel, en x boy)
+THUMBNAIL_SIZE = (240, 340)
+PAGE_SIZE = (900, 1273)
+
+# Çok sayfalı belgelerde üretilecek en fazla sayfa görüntüsü
+MAX_PREVIEW_PAGES = 20
+
+# PDF rasterleştirme çözünürlüğü (sayfa görüntüleri PAGE_SIZE'a küçültülür)
+RENDER_DPI = 110
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.tif', '.webp'}
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='belge-onizleme')
+_pending = set()
+_pending_lock = threading.Lock()
+
+# Üretimi başarısız olan belgeler: blob_path -> kaynak dosyanın mtime değeri.
+# Kaynak değişmedikçe aynı belge için tekrar denenmez. _pending_lock ile korunur.
+_failed = {}
+
+# Önizleme klasörünün değiştirilmesi ve silinmesi bu kilit altında yapılır
+_swap_lock = threading.Lock()
+
+
+def get_preview_dir(blob_path):
+    """Belge dosyasının önizleme klasörünün yolunu döndürür"""
+    return blob_path + PREVIEW_DIR_SUFFIX
+
+
+def get_preview_source(upload_folder, filepath, pdf_version=None):
+    """
+    Önizlemenin üretileceği kaynak dosyayı belirler
+
+    UDF/DOC/DOCX belgeleri için yalnızca hazır PDF sürümü kullanılır; önizleme
+    hiçbir zaman tam dönüşüm başlatmaz.
+
+    Returns:
+        str: Kaynak dosya yolu, önizlenemiyorsa None
+    """
+    blob_path = os.path.join(upload_folder, filepath)
+    extension = os.path.splitext(filepath)[1].lower()
+
+    if extension == '.pdf' or extension in IMAGE_EXTENSIONS:
+        return blob_path if os.path.exists(blob_path) else None
+
+    if pdf_version:
+        pdf_path = os.path.join(upload_folder, pdf_version)
+        if os.path.exists(pdf_path):
+            return pdf_path
+
+    return None
+
+
+def get_preview_manifest(blob_path, source_path=None):
+    """
+    Üretilmiş önizleme bilgilerini döndürür
+
+    Args:
+        blob_path: Belgenin uploads altındaki yolu
+        source_path: Verilirse, kaynak dosya önizlemeden yeniyse None döner
+
+    Returns:
+        Dict: manifest içeriği veya None
+    """
+    manifest_path = os.path.join(get_preview_dir(blob_path), MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if source_path and os.path.exists(source_path):
+        if os.path.getmtime(source_path) > manifest.get('source_mtime', 0):
+            return None
+
+    return manifest
+
+
+def is_preview_pending(blob_path):
+    """Belge için önizleme üretimi kuyrukta mı?"""
+    with _pending_lock:
+        return blob_path in _pending
+
+
+def schedule_previews(source_path, blob_path, check_manifest=True):
+    """
+    Önizleme üretimini arka plan işçisine gönderir
+
+    Aynı belge için zaten bekleyen bir iş veya güncel bir önizleme varsa
+    yeni iş açılmaz.
+
+    Args:
+        check_manifest: False ise çağıran manifestin güncel olmadığını zaten
+            bilir; manifest yeniden okunmaz
+
+    Returns:
+        bool: Yeni iş kuyruğa eklendiyse True
+    """
+    if not source_path or not os.path.exists(source_path):
+        return False
+
+    if check_manifest and get_preview_manifest(blob_path, source_path) is not None:
+        return False
+
+    with _pending_lock:
+        if blob_path in _pending:
+            return False
+        if _failed.get(blob_path) == os.path.getmtime(source_path):
+            return False
+        _pending.add(blob_path)
+
+    _executor.submit(_generate_in_background, source_path, blob_path)
+    return True
+
+
+def _generate_in_background(source_path, blob_path):
+    try:
+        generate_previews(source_path, blob_path)
+        with _pending_lock:
+            _failed.pop(blob_path, None)
+    except Exception as e:
+        logger.error(f"Önizleme üretilemedi {blob_path}: {str(e)}")
+        source_mtime = os.path.getmtime(source_path) if os.path.exists(source_path) else None
+        with _pending_lock:
+            _failed[blob_path] = source_mtime
+    finally:
+        with _pending_lock:
+            _pending.discard(blob_path)
+
+
+def generate_previews(source_path, blob_path, max_pages=MAX_PREVIEW_PAGES):
+    """
+    Kaynak dosyadan küçük resim ve sayfa görüntülerini üretir
+
+    Görüntüler önce geçici bir klasörde üretilir, ardından kilit altında eski
+    klasör kenara alınıp yenisi yerine taşınır; yarım kalmış bir önizleme
+    asla sunulmaz ve aynı belge için eşzamanlı iki üretim birbirinin
+    klasörünü silmez.
+
+    Args:
+        source_path: PDF veya resim dosyası
+        blob_path: Önizlemenin yanına yazılacağı belge dosyası
+        max_pages: Üretilecek en fazla sayfa sayısı
+
+    Returns:
+        Dict: Yazılan manifest
+    """
+    extension = os.path.splitext(source_path)[1].lower()
+    source_mtime = os.path.getmtime(source_path)
+
+    if extension in IMAGE_EXTENSIONS:
+        pages = _load_image_pages(source_path, max_pages)
+        page_count = len(pages)
+    elif extension == '.pdf':
+        pages, page_count = _render_pdf_pages(source_path, max_pages)
+    else:
+        raise ValueError(f"Önizleme desteklenmeyen dosya türü: {extension}")
+
+    if not pages:
+        raise ValueError(f"Önizleme için sayfa üretilemedi: {source_path}")
+
+    preview_dir = get_preview_dir(blob_path)
+    work_dir = tempfile.mkdtemp(prefix='onizleme_', dir=os.path.dirname(preview_dir) or None)
+    try:
+        page_files = []
+        for index, page in enumerate(pages, start=1):
+            page = _to_rgb(page)
+            page.thumbnail(PAGE_SIZE)
+            page_name = f"page_{index:03d}.png"
+            page.save(os.path.join(work_dir, page_name), 'PNG', optimize=True)
+            page_files.append(page_name)
+
+            if index == 1:
+                thumb = page.copy()
+                thumb.thumbnail(THUMBNAIL_SIZE)
+                thumb.save(os.path.join(work_dir, THUMBNAIL_NAME), 'PNG', optimize=True)
+
+        manifest = {
+            'source': os.path.basename(source_path),
+            'source_mtime': source_mtime,
+            'page_count': page_count,
+            'thumbnail': THUMBNAIL_NAME,
+            'pages': page_files
+        }
+        with open(os.path.join(work_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+        _swap_in(work_dir, preview_dir)
+        logger.info(f"Önizleme üretildi: {preview_dir} ({len(page_files)} sayfa)")
+        return manifest
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+
+
+def remove_previews(blob_path):
+    """Belgeye ait önizleme klasörünü siler"""
+    preview_dir = get_preview_dir(blob_path)
+    with _swap_lock:
+        old_dir = _move_aside(preview_dir)
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _move_aside(preview_dir):
+    """Kilit altında çağrılır; mevcut klasörü silinmek üzere geçici ada taşır"""
+    if not os.path.isdir(preview_dir):
+        return None
+    old_dir = tempfile.mkdtemp(prefix='onizleme_eski_', dir=os.path.dirname(preview_dir) or None)
+    os.rmdir(old_dir)
+    os.replace(preview_dir, old_dir)
+    return old_dir
+
+
+def _swap_in(work_dir, preview_dir):
+    """Hazır klasörü önizleme klasörünün yerine koyar; eskisi kilit dışında silinir"""
+    with _swap_lock:
+        old_dir = _move_aside(preview_dir)
+        os.replace(work_dir, preview_dir)
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _to_rgb(image):
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, 'white')
+        converted = image.convert('RGBA')
+        background.paste(converted, mask=converted.split()[-1])
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def _load_image_pages(source_path, max_pages):
+    """Resim dosyasının karelerini (çok sayfalı TIFF dahil) yükler"""
+    pages = []
+    with Image.open(source_path) as image:
+        for frame in ImageSequence.Iterator(image):
+            pages.append(frame.copy())
+            if len(pages) >= max_pages:
+                break
+    return pages
+
+
+def _render_pdf_pages(source_path, max_pages):
+    """
+    PDF sayfalarını görüntüye çevirir
+
+    PyMuPDF kuruluysa onu, değilse poppler'ın pdftoppm aracını kullanır.
+
+    Returns:
+        Tuple[List[Image], int]: Sayfa görüntüleri ve toplam sayfa sayısı
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        fitz = None
+
+    if fitz is not None:
+        pages = []
+        with fitz.open(source_path) as pdf:
+            page_count = pdf.page_count
+            zoom = RENDER_DPI / 72.0
+            for page_index in range(min(page_count, max_pages)):
+                pixmap = pdf[page_index].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                pages.append(Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples))
+        return pages, page_count
+
+    pdftoppm = shutil.which('pdftoppm')
+    if not pdftoppm:
+        raise RuntimeError("PDF önizlemesi için PyMuPDF veya pdftoppm bulunamadı")
+
+    page_count = _count_pdf_pages(source_path)
+    temp_dir = tempfile.mkdtemp(prefix='pdftoppm_')
+    try:
+        subprocess.run(
+            [pdftoppm, '-png', '-r', str(RENDER_DPI), '-f', '1', '-l', str(max_pages),
+             source_path, os.path.join(temp_dir, 'page')],
+            check=True,
+            capture_output=True,
+            timeout=120
+        )
+        pages = []
+        for name in sorted(os.listdir(temp_dir)):
+            with Image.open(os.path.join(temp_dir, name)) as image:
+                pages.append(image.copy())
+        return pages, page_count or len(pages)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _count_pdf_pages(source_path):
+    try:
+        from pypdf import PdfReader
+        return len(PdfReader(source_path).pages)
+    except Exception:
+        return 0
@@ -15,7 +15,7 @@ load_dotenv()
 from datetime import datetime, timedelta
 from models import db, CalendarEvent, User
 from email_utils import send_calendar_event_reminder_email
-from app import app
+from app_factory import create_app
 import logging
 
 # Logger ayarla
@@ -29,6 +29,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rotasız çekirdek uygulama yeterli; web uygulamasının ağır bağımlılıkları yüklenmez
+app = create_app()
+
 def send_event_reminders():
     """
     Yarın gerçekleşecek etkinlikler için hatırlatma e-postaları gönder
@@ -0,0 +1,11 @@
+"""
+Flask eklentileri
+
+Eklentiler uygulamadan bağımsız olarak bir kez oluşturulur ve app.py'de
+init_app ile bağlanır; blueprint'ler (ör. @csrf.exempt) bunları buradan
+içe aktarır.
+"""
+
+from flask_wtf.csrf import CSRFProtect
+
+csrf = CSRFProtect()
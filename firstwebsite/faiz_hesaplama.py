@@ -0,0 +1,310 @@
+"""
+Toplu faiz hesaplama motoru
+
+Her oran türü için yürürlük tarihli oranlardan birikimli faiz çarpanı
+tablosu kurulur:
+
+    C(t) = Σ oran_i * gün_i / 36500      (t tarihine kadar)
+
+Böylece bir alacağın [başlangıç, bitiş) aralığındaki basit faizi, oran
+dönemleri kaç kez değişmiş olursa olsun, iki ikili arama ile bulunur:
+
+    faiz = anapara * (C(bitiş) - C(başlangıç))
+
+Binlerce alacak tek çağrıda hesaplanır; istenirse her alacak için dönem
+dökümü de üretilir. Hatalı alacaklar (ör. oranın ilk yürürlük tarihinden
+önce başlayanlar) diğerlerini durdurmaz, sonuç listesinde 'hata' alanıyla
+döner. Sonuçlar CSV olarak dışa aktarılabilir.
+"""
+
+import io
+import csv
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+# Tek çağrıda hesaplanabilecek en fazla alacak sayısı
+MAX_RECEIVABLES = 10000
+
+# Yıllık oranın günlüğe çevrilmesinde kullanılan gün sayısı
+DAY_COUNT = 365
+
+# Oran türü takma adları: ticari temerrüt faizi TCMB avans oranıdır (3095 s.K. md. 2/2)
+RATE_ALIASES = {
+    'ticari': 'avans',
+    'kanuni': 'yasal',
+}
+
+CSV_COLUMNS = ('id', 'anapara', 'baslangic', 'bitis', 'gun', 'oran_turu', 'faiz', 'toplam', 'hata')
+
+
+class FaizHesaplamaError(ValueError):
+    """Geçersiz hesaplama girdisi"""
+    pass
+
+
+def _parse_date(value, field_name, index):
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise FaizHesaplamaError(f"{index + 1}. alacak: '{field_name}' YYYY-AA-GG biçiminde olmalıdır.")
+
+
+def _parse_amount(value, index):
+    if isinstance(value, str):
+        value = value.strip().replace(' ', '')
+        if ',' in value:
+            value = value.replace('.', '').replace(',', '.')
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise FaizHesaplamaError(f"{index + 1}. alacak: anapara sayı olmalıdır.")
+    if amount < 0:
+        raise FaizHesaplamaError(f"{index + 1}. alacak: anapara negatif olamaz.")
+    return amount
+
+
+class RateTable:
+    """
+    Tek oran türü için birikimli faiz çarpanı tablosu
+
+    Args:
+        schedule: [(yürürlük tarihi, yıllık yüzde oran)], tarihe göre sıralı
+    """
+
+    def __init__(self, schedule, day_count=DAY_COUNT):
+        self.day_count = day_count
+        self.starts = [effective.toordinal() for effective, _ in schedule]
+        self.rates = [rate for _, rate in schedule]
+        self.cumulative = []
+        total = 0.0
+        for index, start in enumerate(self.starts):
+            self.cumulative.append(total)
+            if index + 1 < len(self.starts):
+                total += self.rates[index] * (self.starts[index + 1] - start) / (day_count * 100)
+
+    def factor(self, ordinal):
+        """İlk yürürlük tarihinden ordinal güne kadarki birikimli çarpan"""
+        index = bisect_right(self.starts, ordinal) - 1
+        if index < 0:
+            return 0.0
+        return self.cumulative[index] + self.rates[index] * (ordinal - self.starts[index]) / (self.day_count * 100)
+
+    @property
+    def first_effective(self):
+        """İlk oranın yürürlük tarihi (ordinal); tablo boşsa None"""
+        return self.starts[0] if self.starts else None
+
+    def uncovered_days(self, start, end):
+        """Aralığın ilk orandan önceye düşen (oranı tanımsız) gün sayısı"""
+        if not self.starts:
+            return end - start
+        return max(0, min(end, self.starts[0]) - start)
+
+    def periods(self, start, end):
+        """[start, end) aralığının oran dönemleri: [(başlangıç, bitiş, oran, gün)]"""
+        result = []
+        index = max(bisect_right(self.starts, start) - 1, 0)
+        while index < len(self.starts) and self.starts[index] < end:
+            period_start = max(self.starts[index], start)
+            period_end = self.starts[index + 1] if index + 1 < len(self.starts) else end
+            period_end = min(period_end, end)
+            if period_start < period_end:
+                result.append((period_start, period_end, self.rates[index], period_end - period_start))
+            index += 1
+        return result
+
+
+class FixedRateTable(RateTable):
+    """Sözleşmesel sabit oran (tüm tarihlerde aynı oran)"""
+
+    def __init__(self, rate, day_count=DAY_COUNT):
+        super().__init__([(date.min, rate)], day_count=day_count)
+
+
+@dataclass
+class InterestResult:
+    id: Optional[str]
+    anapara: float
+    baslangic: date
+    bitis: date
+    gun: int
+    oran_turu: str
+    faiz: float
+    donemler: Optional[list] = None
+
+    @property
+    def toplam(self):
+        return self.anapara + self.faiz
+
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'anapara': round(self.anapara, 2),
+            'baslangic': self.baslangic.isoformat(),
+            'bitis': self.bitis.isoformat(),
+            'gun': self.gun,
+            'oran_turu': self.oran_turu,
+            'faiz': round(self.faiz, 2),
+            'toplam': round(self.toplam, 2),
+        }
+        if self.donemler is not None:
+            data['donemler'] = self.donemler
+        return data
+
+
+@dataclass
+class InterestFailure:
+    """Hesaplanamayan alacak"""
+    id: Optional[str]
+    hata: str
+
+    def to_dict(self):
+        return {'id': self.id, 'hata': self.hata}
+
+
+class InterestEngine:
+    """
+    Faiz oranları servisinden beslenen toplu hesaplama motoru
+
+    Oran tabloları servis her yeniden yüklendiğinde (revision) yeniden kurulur.
+    """
+
+    def __init__(self, rates_service):
+        self.rates_service = rates_service
+        self._tables = {}
+        self._revision = None
+        self._lock = threading.Lock()
+
+    def table(self, oran_turu):
+        oran_turu = RATE_ALIASES.get(oran_turu, oran_turu)
+        with self._lock:
+            if self._revision != self.rates_service.revision:
+                self._tables = {}
+            table = self._tables.get(oran_turu)
+        if table is None:
+            schedule = self.rates_service.rate_schedule(oran_turu)
+            if not schedule:
+                raise FaizHesaplamaError(f"Bilinmeyen veya tanımsız oran türü: {oran_turu}")
+            table = RateTable(schedule)
+            with self._lock:
+                self._tables[oran_turu] = table
+                self._revision = self.rates_service.revision
+        return table
+
+    def calculate(self, receivables, oran_turu='yasal', end=None, sabit_oran=None,
+                  detay=False) -> List[Union[InterestResult, InterestFailure]]:
+        """
+        Alacak listesi için işlemiş faizi hesaplar
+
+        Hatalı alacaklar diğerlerini durdurmaz; sonuç listesinde
+        InterestFailure ('hata' alanıyla) olarak döner.
+
+        Args:
+            receivables: [{'id', 'anapara', 'baslangic', 'bitis'?, 'oran_turu'?, 'sabit_oran'?}]
+            oran_turu: Varsayılan oran türü (yasal, ticari, reeskont, avans, ...)
+            end: Bitişi verilmemiş alacaklar için bitiş tarihi (varsayılan bugün)
+            sabit_oran: Verilirse tüm alacaklara bu yıllık sabit oran uygulanır
+            detay: Her alacak için oran dönemi dökümü üretilsin mi
+        """
+        if not isinstance(receivables, (list, tuple)):
+            raise FaizHesaplamaError("Alacaklar liste olarak gönderilmelidir.")
+        if len(receivables) > MAX_RECEIVABLES:
+            raise FaizHesaplamaError(f"Tek seferde en fazla {MAX_RECEIVABLES} alacak hesaplanabilir.")
+        end = end or date.today()
+
+        fixed_tables = {}
+        results = []
+        for index, item in enumerate(receivables):
+            try:
+                results.append(self._calculate_one(item, index, oran_turu, end, sabit_oran, detay, fixed_tables))
+            except FaizHesaplamaError as e:
+                results.append(InterestFailure(id=item.get('id') if isinstance(item, dict) else None,
+                                               hata=str(e)))
+        return results
+
+    def _calculate_one(self, item, index, oran_turu, end, sabit_oran, detay, fixed_tables):
+        if not isinstance(item, dict):
+            raise FaizHesaplamaError(f"{index + 1}. alacak nesne olmalıdır.")
+        principal = _parse_amount(item.get('anapara'), index)
+        start_date = _parse_date(item.get('baslangic'), 'baslangic', index)
+        end_date = _parse_date(item['bitis'], 'bitis', index) if item.get('bitis') else end
+        if end_date < start_date:
+            raise FaizHesaplamaError(f"{index + 1}. alacak: bitiş tarihi başlangıçtan önce olamaz.")
+
+        fixed = item.get('sabit_oran', sabit_oran)
+        if fixed is not None:
+            try:
+                fixed = float(fixed)
+            except (TypeError, ValueError):
+                raise FaizHesaplamaError(f"{index + 1}. alacak: sabit oran sayı olmalıdır.")
+            table = fixed_tables.get(fixed)
+            if table is None:
+                table = fixed_tables[fixed] = FixedRateTable(fixed)
+            rate_type = 'sabit'
+        else:
+            rate_type = item.get('oran_turu') or oran_turu
+            try:
+                table = self.table(rate_type)
+            except FaizHesaplamaError as e:
+                raise FaizHesaplamaError(f"{index + 1}. alacak: {e}")
+
+        start, stop = start_date.toordinal(), end_date.toordinal()
+        if table.uncovered_days(start, stop):
+            first = date.fromordinal(table.first_effective).strftime('%d.%m.%Y')
+            raise FaizHesaplamaError(f"{index + 1}. alacak: {rate_type} oranı {first} tarihinden "
+                                     f"önceki dönem için tanımlı değil.")
+        result = InterestResult(
+            id=item.get('id'),
+            anapara=principal,
+            baslangic=start_date,
+            bitis=end_date,
+            gun=stop - start,
+            oran_turu=rate_type,
+            faiz=principal * (table.factor(stop) - table.factor(start))
+        )
+        if detay:
+            result.donemler = [{
+                'baslangic': date.fromordinal(p_start).isoformat(),
+                'bitis': date.fromordinal(p_end).isoformat(),
+                'oran': rate,
+                'gun': days,
+                'faiz': round(principal * rate * days / (table.day_count * 100), 2)
+            } for p_start, p_end, rate, days in table.periods(start, stop)]
+        return result
+
+def summarize(results):
+    """Hesaplanan sonuçların toplam anapara/faiz/alacak değerleri ve hatalı alacak sayısı"""
+    valid = [r for r in results if isinstance(r, InterestResult)]
+    anapara = sum(r.anapara for r in valid)
+    faiz = sum(r.faiz for r in valid)
+    return {
+        'adet': len(results),
+        'hatali': len(results) - len(valid),
+        'anapara': round(anapara, 2),
+        'faiz': round(faiz, 2),
+        'toplam': round(anapara + faiz, 2)
+    }
+
+
+def results_to_csv(results):
+    """
+    Sonuçları Excel'in Türkçe ayarlarıyla açılabilen CSV'ye çevirir
+
+    Ayırıcı ';', ondalık ayırıcı ',' kullanılır ve UTF-8 BOM eklenir.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=';')
+    writer.writerow(CSV_COLUMNS)
+    for result in results:
+        row = result.to_dict()
+        writer.writerow([
+            str(row[column]).replace('.', ',') if isinstance(row.get(column), float) else
+            ('' if row.get(column) is None else row[column])
+            for column in CSV_COLUMNS
+        ])
+    return '\ufeff' + output.getvalue()
@@ -0,0 +1,358 @@
+"""
+TCMB faiz oranları servisi
+
+Reeskont, avans ve yasal faiz oranları yürürlük tarihli olarak FaizOrani
+tablosunda tutulur. Sayfalar ve hesaplamalar oranları bellekteki kopyadan
+okur; TCMB sayfası yalnızca zamanlanmış (veya bayatlamış veride arka planda
+tetiklenen) güncellemelerde, zaman aşımıyla çekilir.
+
+Cron ile güncelleme ve elle oran girişi (temerrüt, mevduat ya da TCMB
+oranının düzeltilmesi; yönetim panelindeki "Faiz Oranları" sayfasından da
+girilebilir):
+
+    python faiz_oranlari.py --refresh
+    python faiz_oranlari.py --set mevduat 2024-01-01 45
+"""
+
+import re
+import logging
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from models import db, FaizOrani
+
+logger = logging.getLogger(__name__)
+
+TCMB_URL = ("https://www.tcmb.gov.tr/wps/wcm/connect/TR/TCMB+TR/Main+Menu/"
+            "Temel+Faaliyetler/Para+Politikasi/Reeskont+ve+Avans+Faiz+Oranlari")
+
+# TCMB isteği için zaman aşımı (saniye)
+REQUEST_TIMEOUT = 10
+
+# Bu süreden eski veriler okunurken arka planda güncelleme başlatılır
+REFRESH_INTERVAL = timedelta(hours=12)
+
+RATE_TYPES = ('reeskont', 'avans', 'temerrut', 'yasal', 'mevduat')
+
+# Tablo boşken yüklenen başlangıç oranları: (tür, yürürlük tarihi, oran).
+# Yalnızca yürürlük tarihi bilinen yasal faiz (3095 sayılı Kanun md. 1)
+# yüklenir. Reeskont ve avans oranları geçmişleriyle birlikte TCMB'den
+# çekilir; temerrüt ve mevduat oranları set_rate (--set) veya yönetim
+# paneliyle 'manuel' kaynaklı olarak girilir. Oranın ilk yürürlük
+# tarihinden önceki dönemler hesaplanmaz.
+DEFAULT_RATES = (
+    ('yasal', date(2006, 1, 1), 9.0),
+    ('yasal', date(2024, 6, 1), 24.0),
+)
+
+_DATE_RE = re.compile(r'^(\d{1,2})[./](\d{1,2})[./](\d{4})$')
+_NUMBER_RE = re.compile(r'^%?\s*(\d+(?:[.,]\d+)?)\s*%?$')
+
+
+def _parse_number(text):
+    match = _NUMBER_RE.match(text.strip())
+    return float(match.group(1).replace(',', '.')) if match else None
+
+
+def parse_tcmb_rates(html):
+    """
+    TCMB reeskont/avans sayfasındaki oran tablosunu ayrıştırır
+
+    Returns:
+        List[Tuple[date, float, float]]: (yürürlük tarihi, reeskont, avans), tarihe göre sıralı
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    rates = {}
+    for row in soup.find_all('tr'):
+        cells = [cell.get_text(' ', strip=True) for cell in row.find_all(['td', 'th'])]
+        for index, cell in enumerate(cells):
+            match = _DATE_RE.match(cell)
+            if not match:
+                continue
+            numbers = [n for n in (_parse_number(c) for c in cells[index + 1:]) if n is not None]
+            if len(numbers) >= 2:
+                day, month, year = (int(part) for part in match.groups())
+                try:
+                    rates[date(year, month, day)] = (numbers[0], numbers[1])
+                except ValueError:
+                    pass
+            break
+    return [(effective, reeskont, avans) for effective, (reeskont, avans) in sorted(rates.items())]
+
+
+def fetch_tcmb_rates(url=TCMB_URL, timeout=REQUEST_TIMEOUT):
+    """TCMB sayfasını zaman aşımıyla indirip oran tablosunu döndürür"""
+    import requests
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return parse_tcmb_rates(response.content)
+
+
+class FaizOranlariService:
+    """
+    Yürürlük tarihli faiz oranlarına bellekten erişim
+
+    Veritabanı yalnızca ilk erişimde ve her güncellemeden sonra okunur.
+    Veritabanı işlemleri uygulama bağlamı (app context) gerektirir.
+    """
+
+    def __init__(self, fetcher=fetch_tcmb_rates, refresh_interval=REFRESH_INTERVAL):
+        self.fetcher = fetcher
+        self.refresh_interval = refresh_interval
+        self.last_refresh_attempt = None
+        self.last_refresh_error = None
+        self.revision = 0  # Her yüklemede artar; oranlardan türetilen önbellekler için
+        self._history = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='faiz-oranlari')
+
+    # --- Okuma ---
+
+    def _ensure_table(self):
+        """Tabloyu gerekirse oluşturur ve boşsa başlangıç oranlarını yükler"""
+        FaizOrani.__table__.create(db.engine, checkfirst=True)
+        if db.session.query(FaizOrani.id).first() is None:
+            for oran_turu, yururluk_tarihi, oran in DEFAULT_RATES:
+                db.session.add(FaizOrani(oran_turu=oran_turu, yururluk_tarihi=yururluk_tarihi,
+                                         oran=oran, kaynak='varsayilan'))
+            db.session.commit()
+
+    def load(self):
+        """Oran tablosunu belleğe yükler"""
+        self._ensure_table()
+        history = {}
+        for record in FaizOrani.query.order_by(FaizOrani.oran_turu, FaizOrani.yururluk_tarihi).all():
+            dates, rates, sources = history.setdefault(record.oran_turu, ([], [], []))
+            dates.append(record.yururluk_tarihi)
+            rates.append(record.oran)
+            sources.append(record.kaynak)
+        with self._lock:
+            self._history = history
+            self.revision += 1
+        return history
+
+    def _get_history(self):
+        history = self._history
+        return history if history is not None else self.load()
+
+    # --- Elle giriş ---
+
+    def set_rate(self, oran_turu, yururluk_tarihi, oran):
+        """
+        Oranı elle girer veya aynı yürürlük tarihli kaydı düzeltir
+
+        Kayıt 'manuel' kaynaklı olarak yazılır; TCMB güncellemesi üzerine yazmaz.
+
+        Returns:
+            FaizOrani: Yazılan kayıt
+
+        Raises:
+            ValueError: Oran türü tanımsız veya oran negatifse
+        """
+        if oran_turu not in RATE_TYPES:
+            raise ValueError(f"Geçersiz oran türü: {oran_turu} (geçerli: {', '.join(RATE_TYPES)})")
+        oran = float(oran)
+        if oran < 0:
+            raise ValueError("Oran negatif olamaz")
+        self._ensure_table()
+        record = FaizOrani.query.filter_by(oran_turu=oran_turu, yururluk_tarihi=yururluk_tarihi).first()
+        if record is None:
+            record = FaizOrani(oran_turu=oran_turu, yururluk_tarihi=yururluk_tarihi)
+            db.session.add(record)
+        record.oran = oran
+        record.kaynak = 'manuel'
+        db.session.commit()
+        self.load()
+        return record
+
+    def rate_on(self, oran_turu, on):
+        """Verilen tarihte yürürlükte olan oranı döndürür; kayıt yoksa None"""
+        entry = self._get_history().get(oran_turu)
+        if not entry:
+            return None
+        dates, rates, _ = entry
+        index = bisect_right(dates, on) - 1
+        return rates[index] if index >= 0 else None
+
+    def current_rates(self, on=None):
+        """Tüm oran türlerinin verilen (varsayılan bugün) tarihteki değerleri"""
+        on = on or date.today()
+        return {oran_turu: self.rate_on(oran_turu, on) for oran_turu in RATE_TYPES}
+
+    def rate_periods(self, oran_turu, start, end):
+        """
+        [start, end) aralığını oran değişikliklerinden böler
+
+        Returns:
+            List[Tuple[date, date, float]]: (başlangıç, bitiş, oran); oranın
+            tanımlı olmadığı kısım atlanır
+        """
+        entry = self._get_history().get(oran_turu)
+        if not entry or start >= end:
+            return []
+        dates, rates, _ = entry
+        periods = []
+        index = max(bisect_right(dates, start) - 1, 0)
+        while index < len(dates) and dates[index] < end:
+            period_start = max(dates[index], start)
+            period_end = dates[index + 1] if index + 1 < len(dates) else end
+            period_end = min(period_end, end)
+            if period_start < period_end:
+                periods.append((period_start, period_end, rates[index]))
+            index += 1
+        return periods
+
+    def rate_schedule(self, oran_turu):
+        """
+        Oran türünün değişiklik takvimi
+
+        Returns:
+            List[Tuple[date, float]]: (yürürlük tarihi, oran), tarihe göre sıralı
+        """
+        entry = self._get_history().get(oran_turu)
+        return list(zip(entry[0], entry[1])) if entry else []
+
+    def history(self, oran_turu=None):
+        """Oran geçmişini [{'oran_turu', 'yururluk_tarihi', 'oran', 'kaynak'}] olarak döndürür"""
+        result = []
+        for tur, (dates, rates, sources) in sorted(self._get_history().items()):
+            if oran_turu and tur != oran_turu:
+                continue
+            result.extend({
+                'oran_turu': tur,
+                'yururluk_tarihi': effective.isoformat(),
+                'oran': rate,
+                'kaynak': source
+            } for effective, rate, source in zip(dates, rates, sources))
+        return result
+
+    # --- Güncelleme ---
+
+    def refresh(self):
+        """
+        TCMB'den oranları çekip tabloya işler
+
+        Yeni yürürlük tarihleri eklenir; TCMB kaynaklı kayıtlar değiştiyse
+        güncellenir, elle girilen kayıtlara dokunulmaz.
+
+        Returns:
+            int: Eklenen veya güncellenen kayıt sayısı
+        """
+        self.last_refresh_attempt = datetime.now()
+        try:
+            fetched = self.fetcher()
+        except Exception as e:
+            self.last_refresh_error = str(e)
+            logger.warning(f"TCMB faiz oranları alınamadı: {str(e)}")
+            return 0
+        if not fetched:
+            self.last_refresh_error = "TCMB sayfasında oran tablosu bulunamadı"
+            logger.warning(self.last_refresh_error)
+            return 0
+
+        self._ensure_table()
+        existing = {(r.oran_turu, r.yururluk_tarihi): r for r in
+                    FaizOrani.query.filter(FaizOrani.oran_turu.in_(('reeskont', 'avans'))).all()}
+        changed = 0
+        for effective, reeskont, avans in fetched:
+            for oran_turu, oran in (('reeskont', reeskont), ('avans', avans)):
+                record = existing.get((oran_turu, effective))
+                if record is None:
+                    db.session.add(FaizOrani(oran_turu=oran_turu, yururluk_tarihi=effective,
+                                             oran=oran, kaynak='tcmb'))
+                    changed += 1
+                elif record.kaynak != 'manuel' and record.oran != oran:
+                    record.oran = oran
+                    record.kaynak = 'tcmb'
+                    changed += 1
+        db.session.commit()
+
+        self.last_refresh_error = None
+        self.load()
+        if changed:
+            logger.info(f"TCMB faiz oranları güncellendi: {changed} kayıt")
+        return changed
+
+    def is_stale(self):
+        attempt = self.last_refresh_attempt
+        return attempt is None or datetime.now() - attempt >= self.refresh_interval
+
+    def refresh_in_background(self, app):
+        """Veri bayatsa güncellemeyi isteği bekletmeden arka planda başlatır"""
+        with self._lock:
+            if self._refreshing or not self.is_stale():
+                return False
+            self._refreshing = True
+            self.last_refresh_attempt = datetime.now()
+        self._executor.submit(self._refresh_with_context, app)
+        return True
+
+    def _refresh_with_context(self, app):
+        try:
+            with app.app_context():
+                self.refresh()
+        except Exception as e:
+            logger.error(f"Faiz oranı güncellemesi başarısız: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def start_scheduler(self, app, interval=None):
+        """Oranları belirli aralıklarla güncelleyen arka plan iş parçacığını başlatır"""
+        interval = (interval or self.refresh_interval).total_seconds()
+        stop_event = threading.Event()
+
+        def run():
+            while not stop_event.is_set():
+                self._refresh_with_context(app)
+                stop_event.wait(interval)
+
+        thread = threading.Thread(target=run, name='faiz-oranlari-zamanlayici', daemon=True)
+        thread.start()
+        return stop_event
+
+
+faiz_oranlari = FaizOranlariService()
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    import argparse
+
+    sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+    parser = argparse.ArgumentParser(description="TCMB faiz oranlarını günceller")
+    parser.add_argument('--refresh', action='store_true', help="TCMB'den oranları çek ve tabloya yaz")
+    parser.add_argument('--set', nargs=3, metavar=('TUR', 'TARIH', 'ORAN'),
+                        help=f"Oranı elle gir (TUR: {', '.join(RATE_TYPES)}; TARIH: YYYY-AA-GG)")
+    args = parser.parse_args()
+
+    manual = None
+    if args.set:
+        oran_turu, tarih, oran = args.set
+        try:
+            manual = (oran_turu, date.fromisoformat(tarih), float(oran.replace(',', '.')))
+        except ValueError as e:
+            parser.error(f"Geçersiz --set değeri: {e}")
+
+    from app_factory import create_app
+    app = create_app()
+
+    logging.basicConfig(level=logging.INFO)
+    with app.app_context():
+        if args.refresh:
+            print(f"Güncellenen kayıt: {faiz_oranlari.refresh()}")
+        if manual:
+            try:
+                print(f"Kaydedildi: {faiz_oranlari.set_rate(*manual)}")
+            except ValueError as e:
+                parser.error(str(e))
+        faiz_oranlari.load()
+        for oran_turu, oran in faiz_oranlari.current_rates().items():
+            print(f"{oran_turu}: %{oran}")
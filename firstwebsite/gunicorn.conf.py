@@ -0,0 +1,56 @@
+"""
+gunicorn ayarları
+
+Ayarlar ortam değişkenleriyle değiştirilebilir:
+    WEB_BIND         Dinlenecek adres (varsayılan 127.0.0.1:8000)
+    WEB_CONCURRENCY  Worker süreç sayısı (varsayılan: 2 x CPU + 1, en fazla 8)
+    WEB_THREADS      Worker başına iş parçacığı (varsayılan 4)
+    WEB_TIMEOUT      İstek zaman aşımı, sn (varsayılan 120; UYAP aktarımları uzun sürebilir)
+    WEB_PRELOAD      Uygulamayı ana süreçte bir kez yükle (varsayılan 1)
+
+Kesintisiz yeniden yükleme: kill -HUP $(cat instance/gunicorn.pid)
+Yeni worker'lar başlatılır, eskileri ellerindeki istekleri bitirdikten sonra
+(graceful_timeout) kapanır. preload açıkken HUP kodu yeniden yüklemez; kod
+güncellemesinde WEB_PRELOAD=0 ile çalışın ya da kill -USR2 ile yeni ana süreç
+başlatıp eskisini kill -TERM ile kapatın.
+"""
+
+import os
+import multiprocessing
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+wsgi_app = 'wsgi:application'
+chdir = BASE_DIR  # uploads/ gibi göreli yollar uygulama klasörüne göre çözülür
+bind = os.getenv('WEB_BIND', '127.0.0.1:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', 4))
+timeout = int(os.getenv('WEB_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Uygulama ana süreçte bir kez yüklenir; worker'lar hazır kopyayla başlar
+preload_app = os.getenv('WEB_PRELOAD', '1') != '0'
+# Bellek sızıntılarına karşı worker'lar belirli istek sayısından sonra yenilenir
+max_requests = 1000
+max_requests_jitter = 100
+
+pidfile = os.path.join(BASE_DIR, 'instance', 'gunicorn.pid')
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('WEB_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """
+    Ana süreçte açılmış veritabanı bağlantıları worker'lar arasında paylaşılmaz.
+    Arka plan işleri ana süreçte değil worker'da başlatılır; iş parçacıkları
+    ve kilit dosyası fork ile aktarılamaz.
+    """
+    from app import app, start_background_services
+    from models import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    start_background_services()
@@ -0,0 +1,352 @@
+"""
+Hesaplama araçları blueprint'i
+
+Faiz, işçi alacakları, harç / vekalet ücreti ve ceza infaz hesaplama sayfaları
+ile API'leri. Hesaplama motorları modül düzeyinde bir kez kurulur ve
+app.register_blueprint ile uygulamaya bağlanır.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, Response, current_app, jsonify, render_template, request
+from flask_login import current_user, login_required
+
+import ceza_infaz
+import isci_alacaklari
+from extensions import csrf
+from faiz_hesaplama import InterestEngine, FaizHesaplamaError, summarize, results_to_csv
+from faiz_oranlari import faiz_oranlari, RATE_TYPES
+from models import db, CaseFile, IsciGorusmeTutanagi
+from permissions import permission_required
+from ucret_hesaplama import (UcretMotoru, UcretHesaplamaError, dosya_ucreti_kaydet,
+                             acik_dosyalari_yeniden_hesapla, summarize as ucret_ozeti)
+
+hesaplama_bp = Blueprint('hesaplama', __name__)
+
+
+def get_current_rates():
+    """
+    Güncel faiz oranlarını yerel tablodan döndürür
+
+    TCMB'ye istek atılmaz; veri bayatsa güncelleme arka planda başlatılır.
+    """
+    try:
+        faiz_oranlari.refresh_in_background(current_app._get_current_object())
+        return faiz_oranlari.current_rates()
+    except Exception as e:
+        print(f"Faiz oranları okunamadı: {str(e)}")
+        return {oran_turu: None for oran_turu in RATE_TYPES}
+
+@hesaplama_bp.route('/api/faiz_oranlari')
+@login_required
+def api_faiz_oranlari():
+    """
+    Faiz oranlarını döndürür
+
+    ?tarih=YYYY-MM-DD ile o tarihte yürürlükte olan oranlar, ?tur=reeskont ile
+    yalnızca o türün geçmişi döner.
+    """
+    try:
+        tarih_str = request.args.get('tarih')
+        on = datetime.strptime(tarih_str, '%Y-%m-%d').date() if tarih_str else None
+    except ValueError:
+        return jsonify(success=False, message="Tarih YYYY-AA-GG biçiminde olmalıdır."), 400
+
+    oran_turu = request.args.get('tur')
+    if oran_turu and oran_turu not in RATE_TYPES:
+        return jsonify(success=False, message=f"Bilinmeyen oran türü: {oran_turu}"), 400
+
+    try:
+        faiz_oranlari.refresh_in_background(current_app._get_current_object())
+        last_attempt = faiz_oranlari.last_refresh_attempt
+        return jsonify(
+            success=True,
+            tarih=(on or datetime.now().date()).isoformat(),
+            oranlar=faiz_oranlari.current_rates(on),
+            gecmis=faiz_oranlari.history(oran_turu),
+            son_guncelleme_denemesi=last_attempt.isoformat() if last_attempt else None,
+            son_hata=faiz_oranlari.last_refresh_error
+        )
+    except Exception as e:
+        print(f"Faiz oranları API hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+faiz_motoru = InterestEngine(faiz_oranlari)
+
+@hesaplama_bp.route('/api/faiz_hesapla', methods=['POST'])
+@login_required
+@csrf.exempt
+@permission_required('faiz_hesaplama')
+def api_faiz_hesapla():
+    """
+    Alacak listesi için yürürlük tarihli oranlarla işlemiş faizi hesaplar
+
+    Gövde: {"oran_turu": "yasal", "bitis": "YYYY-AA-GG", "sabit_oran": null,
+            "detay": false, "alacaklar": [{"id", "anapara", "baslangic", "bitis"}]}
+    Hatalı alacaklar {"id", "hata"} olarak döner, diğerleri hesaplanır.
+    ?format=csv ile sonuçlar CSV dosyası olarak indirilir.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        end = None
+        if data.get('bitis'):
+            try:
+                end = datetime.strptime(str(data['bitis'])[:10], '%Y-%m-%d').date()
+            except ValueError:
+                raise FaizHesaplamaError("Bitiş tarihi YYYY-AA-GG biçiminde olmalıdır.")
+        results = faiz_motoru.calculate(
+            data.get('alacaklar', []),
+            oran_turu=data.get('oran_turu') or 'yasal',
+            end=end,
+            sabit_oran=data.get('sabit_oran'),
+            detay=bool(data.get('detay'))
+        )
+    except FaizHesaplamaError as e:
+        return jsonify(success=False, message=str(e)), 400
+    except Exception as e:
+        print(f"Toplu faiz hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+    if request.args.get('format') == 'csv':
+        response = Response(results_to_csv(results), mimetype='text/csv')
+        response.headers['Content-Disposition'] = (
+            f"attachment; filename=faiz_hesaplama_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        return response
+
+    return jsonify(
+        success=True,
+        sonuclar=[result.to_dict() for result in results],
+        ozet=summarize(results)
+    )
+
+@hesaplama_bp.route('/hesaplamalar/<type>')
+@login_required  
+@permission_required('panel_goruntule')
+def hesaplamalar(type):
+    if type == 'faiz':
+        current_rates = get_current_rates()
+        return render_template('faiz_hesaplama.html', rates=current_rates)
+    elif type == 'harc':
+        # Sayfa harçları sunucudaki harç tarifesinden (harc_tarifeleri.txt) hesaplar
+        try:
+            tarife_yili, harc_tarifesi = ucret_motoru.harc.tablo(datetime.now().year)
+        except UcretHesaplamaError as e:
+            print(f"Harç tarifesi okunamadı: {str(e)}")
+            tarife_yili, harc_tarifesi = None, {}
+        return render_template('harc_hesaplama.html', tarife_yili=tarife_yili, harc_tarifesi=harc_tarifesi)
+    elif type == 'isci':
+        return render_template('isci_alacagi_hesaplama.html')
+    elif type == 'vekalet':
+        return render_template('vekalet_hesaplama.html')
+    elif type == 'ceza_infaz':
+        return render_template('ceza_infaz_hesaplama.html')
+
+@hesaplama_bp.route("/isci-alacagi-hesaplama")
+def isci_alacagi_hesaplama():
+    return render_template("isci_alacagi_hesaplama.html")
+
+@hesaplama_bp.route('/api/isci_alacaklari/hesapla', methods=['POST'])
+@login_required
+@csrf.exempt
+@permission_required('isci_hesaplama')
+def api_isci_alacaklari_hesapla():
+    """
+    Kıdem, ihbar, fazla mesai, yıllık izin ve UBGT alacaklarını hesaplar
+
+    Gövde tek işçi nesnesi ya da {"isciler": [...]} listesi olabilir:
+    {"baslangic", "bitis", "brut_ucret", "yan_haklar", "haftalik_fazla_mesai_saat",
+     "kullanilan_izin_gun", "ubgt_gun_yillik", "hakkaniyet_indirimi", "talepler"}
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('isciler') if 'isciler' in data else [data]
+    if not isinstance(items, list) or not items:
+        return jsonify(success=False, message="Hesaplanacak işçi bilgisi gönderilmedi."), 400
+
+    try:
+        if len(items) == 1:
+            result = isci_alacaklari.calculate(isci_alacaklari.isci_from_dict(items[0]))
+            return jsonify(success=True, sonuc=result.to_dict())
+
+        isciler = []
+        for index, item in enumerate(items):
+            try:
+                isciler.append(isci_alacaklari.isci_from_dict(item, index))
+            except isci_alacaklari.IsciAlacagiError as e:
+                isciler.append(e)
+        results = isci_alacaklari.calculate_batch(isciler)
+        return jsonify(success=True, sonuclar=results, ozet=isci_alacaklari.summarize(results))
+    except isci_alacaklari.IsciAlacagiError as e:
+        return jsonify(success=False, message=str(e)), 400
+    except Exception as e:
+        print(f"İşçi alacakları hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+@hesaplama_bp.route('/api/isci_alacaklari/tutanaklar', methods=['GET', 'POST'])
+@login_required
+@csrf.exempt
+@permission_required('isci_hesaplama')
+def api_isci_alacaklari_tutanaklar():
+    """
+    Kayıtlı işçi görüşme tutanakları için alacakları toplu hesaplar
+
+    ?ids=1,2,3 (veya gövdede {"ids": [...]}); verilmezse kullanıcının tüm tutanakları.
+    """
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if ids is None and request.args.get('ids'):
+        ids = request.args.get('ids').split(',')
+    try:
+        ids = [int(i) for i in ids] if ids else None
+    except (TypeError, ValueError):
+        return jsonify(success=False, message="Geçersiz tutanak numarası."), 400
+
+    query = IsciGorusmeTutanagi.query
+    if not current_user.is_admin:
+        query = query.filter_by(user_id=current_user.id)
+    if ids:
+        query = query.filter(IsciGorusmeTutanagi.id.in_(ids))
+
+    try:
+        isciler = []
+        for tutanak in query.order_by(IsciGorusmeTutanagi.id).all():
+            try:
+                isciler.append(isci_alacaklari.isci_from_tutanak(tutanak))
+            except isci_alacaklari.IsciAlacagiError as e:
+                isciler.append(e)
+        results = isci_alacaklari.calculate_batch(isciler)
+        return jsonify(success=True, sonuclar=results, ozet=isci_alacaklari.summarize(results))
+    except Exception as e:
+        print(f"Tutanak alacak hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+@hesaplama_bp.route('/api/isci_alacaklari/kidem_tavanlari')
+@login_required
+def api_kidem_tavanlari():
+    """Dönem bazında kıdem tazminatı tavanları"""
+    return jsonify(success=True, tavanlar=[
+        {'yururluk_tarihi': effective.isoformat(), 'tavan': amount}
+        for effective, amount in isci_alacaklari.kidem_tavanlari.periods()
+    ])
+
+ucret_motoru = UcretMotoru()
+
+@hesaplama_bp.route('/api/ucret_hesapla', methods=['POST'])
+@login_required
+@csrf.exempt
+@permission_required('harc_hesaplama')
+def api_ucret_hesapla():
+    """
+    Dava değerine göre harç ve AAÜT vekalet ücretini hesaplar
+
+    Gövde tek kayıt ya da {"yil": 2025, "kayitlar": [...]} listesi olabilir:
+    {"id", "dava_degeri", "islem": "dava|istinaf|temyiz|icra", "mahkeme": "asliye|sulh|...",
+     "yil", "asgari_vekalet": tutar veya hizmet kodu, "harc": true, "vekalet": true}
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        if 'kayitlar' not in data:
+            return jsonify(success=True, sonuc=ucret_motoru.hesapla(data))
+        results = ucret_motoru.hesapla_toplu(data.get('kayitlar'), data.get('yil'))
+        return jsonify(success=True, sonuclar=results, ozet=ucret_ozeti(results))
+    except UcretHesaplamaError as e:
+        return jsonify(success=False, message=str(e)), 400
+    except Exception as e:
+        print(f"Ücret hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+@hesaplama_bp.route('/api/ucret_hesapla/dosya/<int:case_id>', methods=['POST'])
+@login_required
+@csrf.exempt
+@permission_required('harc_hesaplama')
+def api_dosya_ucret_hesapla(case_id):
+    """
+    Dosyanın dava değerini kaydeder ve harç / vekalet ücretini hesaplar
+
+    Gövde: {"dava_degeri", "islem"?, "mahkeme"?, "yil"?}; işlem ve mahkeme
+    verilmezse dosya türü ve biriminden belirlenir.
+    """
+    case_file = CaseFile.query.get_or_404(case_id)
+    if case_file.user_id != current_user.id and not current_user.is_admin:
+        return jsonify(success=False, message="Bu dosyaya erişim yetkiniz yok."), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        result = dosya_ucreti_kaydet(ucret_motoru, case_file, data.get('dava_degeri'),
+                                     islem=data.get('islem'), mahkeme=data.get('mahkeme'), yil=data.get('yil'))
+        return jsonify(success=True, sonuc=result)
+    except UcretHesaplamaError as e:
+        return jsonify(success=False, message=str(e)), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Dosya ücret hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+@hesaplama_bp.route('/api/ucret_hesapla/dosyalar', methods=['POST'])
+@login_required
+@csrf.exempt
+@permission_required('harc_hesaplama')
+def api_dosya_ucretleri_yeniden_hesapla():
+    """
+    Dava değeri kayıtlı tüm açık dosyaların ücretlerini yeniden hesaplar
+
+    Yeni tarife yılı yayımlandığında kullanılır. Gövde: {"yil": 2026}
+    (varsayılan içinde bulunulan yıl). Yönetici tüm dosyaları, diğer
+    kullanıcılar kendi dosyalarını günceller.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        results = acik_dosyalari_yeniden_hesapla(
+            ucret_motoru,
+            yil=data.get('yil'),
+            user_id=None if current_user.is_admin else current_user.id
+        )
+        return jsonify(success=True, sonuclar=results, ozet=ucret_ozeti(results))
+    except UcretHesaplamaError as e:
+        return jsonify(success=False, message=str(e)), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Toplu dosya ücret hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+@hesaplama_bp.route('/api/ceza_infaz/hesapla', methods=['POST'])
+@login_required
+@csrf.exempt
+@permission_required('ceza_infaz_hesaplama')
+def api_ceza_infaz_hesapla():
+    """
+    Koşullu salıverilme ve denetimli serbestlik tarihlerini hesaplar
+
+    Gövde tek hükümlü nesnesi ya da {"hukumluler": [...]} listesi olabilir:
+    {"id", "suc_turu", "ceza_turu", "ceza_yil", "ceza_ay", "ceza_gun", "suc_tarihi",
+     "mahsup_gun", "ozel_durum", "infaz_baslangic"}
+    ?format=csv ile toplu sonuçlar CSV dosyası olarak indirilir.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        if 'hukumluler' not in data:
+            result = ceza_infaz.infaz_motoru.hesapla(ceza_infaz.girdi_from_dict(data))
+            return jsonify(success=True, sonuc=result.to_dict())
+
+        results = ceza_infaz.infaz_motoru.hesapla_toplu(data.get('hukumluler'))
+    except ceza_infaz.CezaInfazError as e:
+        return jsonify(success=False, message=str(e)), 400
+    except Exception as e:
+        print(f"Ceza infaz hesaplama hatası: {str(e)}")
+        return jsonify(success=False, message=str(e)), 500
+
+    if request.args.get('format') == 'csv':
+        response = Response(ceza_infaz.results_to_csv(results), mimetype='text/csv')
+        response.headers['Content-Disposition'] = (
+            f"attachment; filename=ceza_infaz_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        return response
+
+    return jsonify(success=True, sonuclar=results, ozet=ceza_infaz.summarize(results))
+
+@hesaplama_bp.route('/api/ceza_infaz/suc_turleri')
+@login_required
+def api_ceza_infaz_suc_turleri():
+    """Suç türleri, koşullu salıverilme oranları ve geçerli kural sürümü"""
+    return jsonify(success=True, kural_surumu=ceza_infaz.infaz_motoru.kurallar.surum, suc_turleri=[
+        {'kod': code, 'ad': suc.ad, 'oran': str(suc.oran)}
+        for code, suc in ceza_infaz.SUC_TURLERI.items()
+    ])
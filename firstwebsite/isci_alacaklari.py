@@ -0,0 +1,443 @@
+"""
+İşçi alacakları hesaplama motoru
+
+Kıdem, ihbar, fazla mesai, yıllık izin ve UBGT (ulusal bayram ve genel
+tatil) alacaklarını brüt/net olarak hesaplar. Kıdem tazminatı tavanları
+kidem_tavanlari.txt dosyasından bir kez okunur, dosya değişince yeniden
+yüklenir; dönem (yürürlük tarihi) bazında bellekte tutulur.
+
+Toplu hesaplamada tüm kayıtlar tek geçişte işlenir; tavan aramaları aynı
+dönem için tekrarlanmaz.
+"""
+
+import os
+import re
+import logging
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAVAN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'kidem_tavanlari.txt')
+
+CLAIM_TYPES = ('kidem', 'ihbar', 'fazla_mesai', 'yillik_izin', 'ubgt')
+
+# Kesinti oranları
+DAMGA_VERGISI = 0.00759
+GELIR_VERGISI = 0.15  # İlk dilim; yüksek ücretlerde gerçek kesinti daha fazla olabilir
+SGK_ISCI_PAYI = 0.14
+ISSIZLIK_ISCI_PAYI = 0.01
+
+# Aylık çalışma saati (4857 s.K. md. 63: haftalık 45 saat)
+AYLIK_CALISMA_SAATI = 225
+FAZLA_MESAI_ZAMMI = 1.5
+
+# Yılda ulusal bayram ve genel tatil gün sayısı (arife yarım günleri dahil)
+UBGT_GUN_YILLIK = 15.5
+
+# Tutanaktaki alacak seçenekleri -> hesaplanacak alacak türü
+TUTANAK_CLAIM_OPTIONS = {
+    'severancePayOption': 'kidem',
+    'noticePayOption': 'ihbar',
+    'overtimePayOption': 'fazla_mesai',
+    'annualLeavePayOption': 'yillik_izin',
+    'ubgtPayOption': 'ubgt',
+}
+
+
+class IsciAlacagiError(ValueError):
+    """Geçersiz hesaplama girdisi"""
+    pass
+
+
+# --- Kıdem tavanları ---
+
+class CeilingTable:
+    """
+    Kıdem tazminatı tavanı tablosu
+
+    Dosya değişiklik zamanı her erişimde kontrol edilir; dönem araması
+    (yürürlük tarihi -> tavan) ikili arama ile yapılır ve sonuçları önbellekte
+    tutulur.
+    """
+
+    def __init__(self, filepath=DEFAULT_TAVAN_FILE):
+        self.filepath = filepath
+        self._signature = False
+        self._starts = []
+        self._amounts = []
+        self._lock = threading.Lock()
+
+    def _current_signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _ensure_loaded(self):
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            periods = {}
+            if signature is None:
+                logger.error(f"Kıdem tavanı dosyası bulunamadı: {self.filepath}")
+            else:
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    for line_num, line in enumerate(f, 1):
+                        line = line.strip()
+                        if not line or line.startswith('#'):
+                            continue
+                        try:
+                            effective, amount = (part.strip() for part in line.split('|')[:2])
+                            periods[datetime.strptime(effective, '%Y-%m-%d').date()] = float(amount)
+                        except ValueError:
+                            logger.warning(f"Kıdem tavanı satırı atlandı ({self.filepath}:{line_num}): {line}")
+            ordered = sorted(periods.items())
+            self._starts = [effective for effective, _ in ordered]
+            self._amounts = [amount for _, amount in ordered]
+            self._lookup.cache_clear()
+            self._signature = signature
+
+    @lru_cache(maxsize=256)
+    def _lookup(self, on):
+        index = bisect_right(self._starts, on) - 1
+        if index < 0:
+            return None, None
+        return self._starts[index], self._amounts[index]
+
+    def period_on(self, on):
+        """
+        Tarihte yürürlükte olan tavan dönemi
+
+        Returns:
+            Tuple[date, float]: (yürürlük tarihi, tavan) veya tablo o tarihi kapsamıyorsa (None, None)
+        """
+        self._ensure_loaded()
+        return self._lookup(on)
+
+    def ceiling_on(self, on):
+        return self.period_on(on)[1]
+
+    def periods(self):
+        """Tüm tavan dönemleri [(yürürlük tarihi, tavan)]"""
+        self._ensure_loaded()
+        return list(zip(self._starts, self._amounts))
+
+
+kidem_tavanlari = CeilingTable()
+
+
+# --- Girdi ---
+
+@dataclass
+class IsciBilgisi:
+    """Hesaplamaya esas çalışma bilgileri"""
+    baslangic: date
+    bitis: date
+    brut_ucret: float  # Aylık brüt çıplak ücret
+    yan_haklar: float = 0.0  # Aylık düzenli yan ödemeler (yol, yemek, ...); giydirilmiş ücrete eklenir
+    haftalik_fazla_mesai_saat: float = 0.0
+    kullanilan_izin_gun: float = 0.0
+    ubgt_gun_yillik: Optional[float] = None
+    hakkaniyet_indirimi: float = 0.0  # Fazla mesai ve UBGT için yüzde
+    talepler: tuple = CLAIM_TYPES
+    id: Optional[object] = None
+    ad: Optional[str] = None
+
+
+def parse_amount(value):
+    """'25.000 TL', '25000,50' gibi tutarları sayıya çevirir; tutar yoksa None"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r'\d[\d.,]*', str(value or ''))
+    if not match:
+        return None
+    text = match.group(0).rstrip('.,')
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    elif re.fullmatch(r'\d{1,3}(\.\d{3})+', text):
+        text = text.replace('.', '')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_date(value):
+    """'GG.AA.YYYY', 'GG.AA.YYYY/GG.AA.YYYY' veya 'YYYY-AA-GG' değerinin ilk tarihini döndürür"""
+    if isinstance(value, date):
+        return value
+    text = str(value or '')
+    match = re.search(r'(\d{2})\.(\d{2})\.(\d{4})', text)
+    try:
+        if match:
+            day, month, year = (int(part) for part in match.groups())
+            return date(year, month, day)
+        match = re.search(r'\d{4}-\d{2}-\d{2}', text)
+        if match:
+            return datetime.strptime(match.group(0), '%Y-%m-%d').date()
+    except ValueError:
+        pass
+    return None
+
+
+def isci_from_dict(data, index=0):
+    """API gövdesindeki işçi nesnesini IsciBilgisi'ne çevirir"""
+    if not isinstance(data, dict):
+        raise IsciAlacagiError(f"{index + 1}. kayıt nesne olmalıdır.")
+    baslangic = parse_date(data.get('baslangic'))
+    bitis = parse_date(data.get('bitis'))
+    brut_ucret = parse_amount(data.get('brut_ucret'))
+    if baslangic is None or bitis is None:
+        raise IsciAlacagiError(f"{index + 1}. kayıt: başlangıç ve bitiş tarihi zorunludur.")
+    if brut_ucret is None:
+        raise IsciAlacagiError(f"{index + 1}. kayıt: brüt ücret zorunludur.")
+
+    talepler = data.get('talepler') or CLAIM_TYPES
+    unknown = [t for t in talepler if t not in CLAIM_TYPES]
+    if unknown:
+        raise IsciAlacagiError(f"{index + 1}. kayıt: bilinmeyen alacak türü: {', '.join(unknown)}")
+
+    ubgt = data.get('ubgt_gun_yillik')
+    return IsciBilgisi(
+        baslangic=baslangic,
+        bitis=bitis,
+        brut_ucret=brut_ucret,
+        yan_haklar=parse_amount(data.get('yan_haklar')) or 0.0,
+        haftalik_fazla_mesai_saat=parse_amount(data.get('haftalik_fazla_mesai_saat')) or 0.0,
+        kullanilan_izin_gun=parse_amount(data.get('kullanilan_izin_gun')) or 0.0,
+        ubgt_gun_yillik=parse_amount(ubgt) if ubgt not in (None, '') else None,
+        hakkaniyet_indirimi=parse_amount(data.get('hakkaniyet_indirimi')) or 0.0,
+        talepler=tuple(talepler),
+        id=data.get('id'),
+        ad=data.get('ad')
+    )
+
+
+def isci_from_tutanak(tutanak):
+    """
+    Kayıtlı IsciGorusmeTutanagi kaydını IsciBilgisi'ne çevirir
+
+    Formda ücret 'department' ("Ücret") alanında, tarihler 'GG.AA.YYYY' veya
+    'GG.AA.YYYY/GG.AA.YYYY' (işe giriş / SGK giriş) biçimindedir. Fazla mesai
+    ve yıllık izin metinlerindeki ilk sayı sırasıyla haftalık saat ve
+    kullanılan izin günü kabul edilir.
+    """
+    baslangic = parse_date(tutanak.startDate)
+    bitis = parse_date(tutanak.endDate)
+    brut_ucret = parse_amount(tutanak.department)
+    if baslangic is None or bitis is None or brut_ucret is None:
+        raise IsciAlacagiError(f"Tutanak {tutanak.id}: işe giriş/çıkış tarihi ve ücret bilgisi okunamadı.")
+
+    talepler = tuple(claim for option, claim in TUTANAK_CLAIM_OPTIONS.items()
+                     if getattr(tutanak, option, None) == 'yes') or CLAIM_TYPES
+    annual_leave_text = (tutanak.annualLeave or '').lower()
+    return IsciBilgisi(
+        baslangic=baslangic,
+        bitis=bitis,
+        brut_ucret=brut_ucret,
+        haftalik_fazla_mesai_saat=parse_amount(tutanak.overtime) or 0.0,
+        kullanilan_izin_gun=0.0 if 'kullanmad' in annual_leave_text else (parse_amount(annual_leave_text) or 0.0),
+        talepler=talepler,
+        id=tutanak.id,
+        ad=tutanak.name
+    )
+
+
+# --- Hesaplama ---
+
+def service_duration(start, end):
+    """
+    Hizmet süresini (yıl, ay, gün) olarak döndürür; bitiş günü dahildir
+    """
+    end = end + timedelta(days=1)
+    years = end.year - start.year
+    months = end.month - start.month
+    days = end.day - start.day
+    if days < 0:
+        months -= 1
+        previous_month_end = date(end.year, end.month, 1) - timedelta(days=1)
+        days += previous_month_end.day
+    if months < 0:
+        years -= 1
+        months += 12
+    return years, months, days
+
+
+def notice_weeks(total_days):
+    """4857 s.K. md. 17'ye göre ihbar süresi (hafta)"""
+    if total_days < 182:
+        return 2
+    if total_days < 547:
+        return 4
+    if total_days < 1095:
+        return 6
+    return 8
+
+
+def annual_leave_entitlement(completed_years):
+    """4857 s.K. md. 53'e göre tamamlanan yıllar için toplam yıllık izin günü"""
+    total = 0
+    for year in range(1, completed_years + 1):
+        if year <= 5:
+            total += 14
+        elif year < 15:
+            total += 20
+        else:
+            total += 26
+    return total
+
+
+def _claim(brut, sgk=False, gelir_vergisi=False):
+    deductions = {}
+    base = brut
+    if sgk:
+        deductions['sgk'] = round(brut * (SGK_ISCI_PAYI + ISSIZLIK_ISCI_PAYI), 2)
+        base = brut - deductions['sgk']
+    if gelir_vergisi:
+        deductions['gelir_vergisi'] = round(base * GELIR_VERGISI, 2)
+    deductions['damga_vergisi'] = round(brut * DAMGA_VERGISI, 2)
+    return {
+        'brut': round(brut, 2),
+        'kesintiler': deductions,
+        'net': round(brut - sum(deductions.values()), 2)
+    }
+
+
+@dataclass
+class AlacakSonucu:
+    id: Optional[object]
+    ad: Optional[str]
+    hizmet_suresi: dict
+    alacaklar: dict = field(default_factory=dict)
+    uyarilar: List[str] = field(default_factory=list)
+
+    @property
+    def toplam_brut(self):
+        return round(sum(a['brut'] for a in self.alacaklar.values()), 2)
+
+    @property
+    def toplam_net(self):
+        return round(sum(a['net'] for a in self.alacaklar.values()), 2)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'ad': self.ad,
+            'hizmet_suresi': self.hizmet_suresi,
+            'alacaklar': self.alacaklar,
+            'toplam_brut': self.toplam_brut,
+            'toplam_net': self.toplam_net,
+            'uyarilar': self.uyarilar
+        }
+
+
+def calculate(isci: IsciBilgisi, ceilings: CeilingTable = None) -> AlacakSonucu:
+    """Tek işçinin alacaklarını hesaplar"""
+    ceilings = ceilings or kidem_tavanlari
+    if isci.bitis < isci.baslangic:
+        raise IsciAlacagiError("Bitiş tarihi başlangıçtan önce olamaz.")
+
+    years, months, days = service_duration(isci.baslangic, isci.bitis)
+    total_days = (isci.bitis - isci.baslangic).days + 1
+    service_years = years + months / 12 + days / 365
+    daily_wage = isci.brut_ucret / 30
+    dressed_wage = isci.brut_ucret + isci.yan_haklar
+    equity = 1 - isci.hakkaniyet_indirimi / 100
+
+    result = AlacakSonucu(
+        id=isci.id,
+        ad=isci.ad,
+        hizmet_suresi={'yil': years, 'ay': months, 'gun': days, 'toplam_gun': total_days}
+    )
+
+    if 'kidem' in isci.talepler:
+        if years < 1:
+            result.uyarilar.append("Hizmet süresi 1 yıldan az olduğu için kıdem tazminatı hesaplanmadı.")
+        else:
+            period_start, ceiling = ceilings.period_on(isci.bitis)
+            base = dressed_wage
+            if ceiling is None:
+                result.uyarilar.append("Çıkış tarihi için kıdem tavanı tanımlı değil; tavan uygulanmadı.")
+            elif dressed_wage > ceiling:
+                base = ceiling
+            claim = _claim(base * service_years)
+            claim.update({
+                'esas_ucret': round(base, 2),
+                'tavan': ceiling,
+                'tavan_donemi': period_start.isoformat() if period_start else None,
+                'tavan_uygulandi': ceiling is not None and dressed_wage > ceiling
+            })
+            result.alacaklar['kidem'] = claim
+
+    if 'ihbar' in isci.talepler:
+        weeks = notice_weeks(total_days)
+        claim = _claim(dressed_wage / 30 * weeks * 7, gelir_vergisi=True)
+        claim['hafta'] = weeks
+        result.alacaklar['ihbar'] = claim
+
+    if 'fazla_mesai' in isci.talepler and isci.haftalik_fazla_mesai_saat > 0:
+        weeks_worked = total_days / 7
+        hourly = isci.brut_ucret / AYLIK_CALISMA_SAATI
+        brut = isci.haftalik_fazla_mesai_saat * weeks_worked * hourly * FAZLA_MESAI_ZAMMI * equity
+        claim = _claim(brut, sgk=True, gelir_vergisi=True)
+        claim.update({'haftalik_saat': isci.haftalik_fazla_mesai_saat, 'saatlik_ucret': round(hourly, 2)})
+        result.alacaklar['fazla_mesai'] = claim
+
+    if 'yillik_izin' in isci.talepler:
+        entitled = annual_leave_entitlement(years)
+        remaining = max(entitled - isci.kullanilan_izin_gun, 0)
+        if remaining:
+            claim = _claim(remaining * daily_wage, sgk=True, gelir_vergisi=True)
+            claim.update({'hak_edilen_gun': entitled, 'kullanilan_gun': isci.kullanilan_izin_gun,
+                          'kalan_gun': remaining})
+            result.alacaklar['yillik_izin'] = claim
+
+    if 'ubgt' in isci.talepler:
+        per_year = UBGT_GUN_YILLIK if isci.ubgt_gun_yillik is None else isci.ubgt_gun_yillik
+        holiday_days = per_year * total_days / 365
+        if holiday_days > 0:
+            claim = _claim(holiday_days * daily_wage * equity, sgk=True, gelir_vergisi=True)
+            claim['gun'] = round(holiday_days, 1)
+            result.alacaklar['ubgt'] = claim
+
+    return result
+
+
+def calculate_batch(isciler, ceilings: CeilingTable = None):
+    """
+    Birden fazla işçinin alacaklarını tek geçişte hesaplar
+
+    Hatalı kayıtlar diğerlerini durdurmaz; sonuç listesinde 'hata' alanıyla
+    döner.
+    """
+    ceilings = ceilings or kidem_tavanlari
+    results = []
+    for isci in isciler:
+        if isinstance(isci, IsciAlacagiError):
+            results.append({'hata': str(isci)})
+            continue
+        try:
+            results.append(calculate(isci, ceilings).to_dict())
+        except IsciAlacagiError as e:
+            results.append({'id': isci.id, 'ad': isci.ad, 'hata': str(e)})
+    return results
+
+
+def summarize(results):
+    """Toplu sonuçların brüt/net toplamları"""
+    valid = [r for r in results if 'hata' not in r]
+    return {
+        'adet': len(results),
+        'hatali': len(results) - len(valid),
+        'toplam_brut': round(sum(r['toplam_brut'] for r in valid), 2),
+        'toplam_net': round(sum(r['toplam_net'] for r in valid), 2)
+    }
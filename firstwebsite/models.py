@@ -633,6 +633,132 @@ class OrnekSozlesme(db.Model):
     def __repr__(self):
         return f'<OrnekSozlesme {self.sozlesme_adi}>'
 
+class FaizOrani(db.Model):
+    """Yürürlük tarihli faiz oranı kaydı (reeskont, avans, yasal, ...)"""
+    __table_args__ = (db.UniqueConstraint('oran_turu', 'yururluk_tarihi', name='uq_faiz_orani_tur_tarih'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    oran_turu = db.Column(db.String(20), nullable=False, index=True)
+    yururluk_tarihi = db.Column(db.Date, nullable=False)
+    oran = db.Column(db.Float, nullable=False)  # Yıllık yüzde
+    kaynak = db.Column(db.String(20), nullable=False, default='tcmb')  # tcmb, varsayilan, manuel
+    kayit_tarihi = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<FaizOrani {self.oran_turu} {self.yururluk_tarihi} %{self.oran}>'
+
+class DosyaUcretHesabi(db.Model):
+    """Dosyanın dava değeri ve bu değerle hesaplanan harç / vekalet ücreti"""
+    id = db.Column(db.Integer, primary_key=True)
+    case_file_id = db.Column(db.Integer, db.ForeignKey('case_file.id'), nullable=False, unique=True)
+    dava_degeri = db.Column(db.Float, nullable=False)
+    islem = db.Column(db.String(20), default='dava')  # dava, istinaf, temyiz, icra
+    mahkeme_turu = db.Column(db.String(20), default='asliye')  # sulh, asliye, aile, is, ticaret, tuketici
+    tarife_yili = db.Column(db.Integer)  # Hesaplamanın esas alındığı yıl
+    harc_toplam = db.Column(db.Float)
+    vekalet_ucreti = db.Column(db.Float)
+    sonuc = db.Column(db.Text)  # JSON formatında hesaplama dökümü
+    hesaplama_tarihi = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<DosyaUcretHesabi {self.case_file_id} {self.dava_degeri}>'
+
+class UyapDosyaSenkron(db.Model):
+    """UYAP dosyasının yerel kayıtla son eşitlenme durumu"""
+    __table_args__ = (db.UniqueConstraint('user_id', 'dosya_anahtari', name='uq_uyap_senkron_kullanici_dosya'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    dosya_anahtari = db.Column(db.String(200), nullable=False)  # Birim + esas no
+    uyap_dosya_id = db.Column(db.String(64))  # Portalın dosyaId değeri
+    case_id = db.Column(db.Integer, db.ForeignKey('case_file.id'))
+    liste_izi = db.Column(db.String(64))  # Liste satırının SHA-256 özeti
+    detay_izi = db.Column(db.String(64))  # Detayların (taraf, masraf, evrak) SHA-256 özeti
+    son_gorulme = db.Column(db.DateTime)  # Listede en son görüldüğü eşitleme
+    detay_tarihi = db.Column(db.DateTime)  # Detayların en son çekildiği zaman
+    hata = db.Column(db.Text)
+
+    def __repr__(self):
+        return f'<UyapDosyaSenkron {self.dosya_anahtari}>'
+
+class UyapSenkronImleci(db.Model):
+    """Kullanıcının UYAP eşitleme çalışmalarının durumu"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True)
+    durum = db.Column(db.String(20), default='bekliyor')  # bekliyor, calisiyor, tamamlandi, hata
+    son_baslangic = db.Column(db.DateTime)
+    son_bitis = db.Column(db.DateTime)
+    son_basarili = db.Column(db.DateTime)  # Hatasız tamamlanan son eşitleme
+    ozet = db.Column(db.Text)  # JSON formatında son çalışmanın sayıları
+    hata = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            'durum': self.durum,
+            'son_baslangic': self.son_baslangic.strftime('%Y-%m-%d %H:%M:%S') if self.son_baslangic else None,
+            'son_bitis': self.son_bitis.strftime('%Y-%m-%d %H:%M:%S') if self.son_bitis else None,
+            'son_basarili': self.son_basarili.strftime('%Y-%m-%d %H:%M:%S') if self.son_basarili else None,
+            'ozet': json.loads(self.ozet) if self.ozet else {},
+            'hata': self.hata
+        }
+
+    def __repr__(self):
+        return f'<UyapSenkronImleci {self.user_id} {self.durum}>'
+
+class UyapDosyaOnbellek(db.Model):
+    """UYAP dosyasının son görülen liste satırı ve detaylarının yerel kopyası"""
+    __table_args__ = (db.UniqueConstraint('user_id', 'dosya_kimligi', name='uq_uyap_onbellek_kullanici_dosya'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    dosya_kimligi = db.Column(db.String(40), nullable=False)  # Birim + esas no'dan üretilen kalıcı kimlik
+    uyap_dosya_id = db.Column(db.String(64), index=True)  # Portalın son görülen dosyaId değeri
+    esas_no = db.Column(db.String(50))
+    mahkeme = db.Column(db.String(200))
+    satir = db.Column(db.Text)  # JSON formatında son liste satırı
+    detaylar = db.Column(db.Text)  # JSON formatında taraflar, masraflar, evraklar, duruşmalar
+    detay_izi = db.Column(db.String(64))  # Detayların SHA-256 özeti
+    satir_tarihi = db.Column(db.DateTime)  # Listede en son görüldüğü zaman
+    detay_tarihi = db.Column(db.DateTime)  # Detayların en son çekildiği zaman
+    degisme_tarihi = db.Column(db.DateTime)  # Detayların en son değiştiği zaman
+
+    def __repr__(self):
+        return f'<UyapDosyaOnbellek {self.dosya_kimligi} {self.esas_no}>'
+
+class UyapIs(db.Model):
+    """Arka planda çalışan UYAP işi (dosya arama, detay, aktarım, eşitleme)"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    tur = db.Column(db.String(30), nullable=False)  # dosya_arama, dosya_detay, aktarim, toplu_aktarim, senkron
+    durum = db.Column(db.String(20), nullable=False, default='bekliyor', index=True)  # bekliyor, calisiyor, tamamlandi, hata, iptal
+    parametreler = db.Column(db.Text)  # JSON formatında iş parametreleri
+    ilerleme = db.Column(db.Integer, default=0)  # Yüzde
+    mesaj = db.Column(db.String(250))  # Son ilerleme mesajı
+    sonuc = db.Column(db.Text)  # JSON formatında iş sonucu
+    hata = db.Column(db.Text)
+    calisan = db.Column(db.String(100))  # İşi alan süreç (sunucu:pid)
+    kalp_atisi = db.Column(db.DateTime)  # Çalışan sürecin son canlılık bildirimi
+    olusturma = db.Column(db.DateTime, default=datetime.utcnow)
+    baslangic = db.Column(db.DateTime)
+    bitis = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'tur': self.tur,
+            'durum': self.durum,
+            'ilerleme': self.ilerleme or 0,
+            'mesaj': self.mesaj,
+            'sonuc': json.loads(self.sonuc) if self.sonuc else None,
+            'hata': self.hata,
+            'olusturma': self.olusturma.strftime('%Y-%m-%d %H:%M:%S') if self.olusturma else None,
+            'baslangic': self.baslangic.strftime('%Y-%m-%d %H:%M:%S') if self.baslangic else None,
+            'bitis': self.bitis.strftime('%Y-%m-%d %H:%M:%S') if self.bitis else None
+        }
+
+    def __repr__(self):
+        return f'<UyapIs {self.id} {self.tur} {self.durum}>'
+
 class AISohbetGecmisi(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     baslik = db.Column(db.String(200), nullable=False)
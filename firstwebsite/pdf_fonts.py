@@ -0,0 +1,158 @@
+"""
+PDF üretimi için Türkçe karakter destekli yazı tipi kaydı
+
+reportlab'ın standart yazı tipleri (Times-Roman, Helvetica) ğ, ş, ı, İ gibi
+karakterleri içermez. Bu modül sistemdeki TrueType yazı tiplerini (Windows'ta
+Times New Roman / Arial, Linux'ta Liberation veya DejaVu) bir kez bulup
+reportlab'a kaydeder ve tüm PDF üreticilerinin aynı yazı tipi setini
+kullanmasını sağlar.
+
+PDF_FONT_DIR ortam değişkeni ile ek bir yazı tipi klasörü verilebilir.
+"""
+
+import os
+import threading
+import logging
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
+
+logger = logging.getLogger(__name__)
+
+_FONT_DIRS = [
+    os.environ.get('PDF_FONT_DIR', ''),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'fonts'),
+    r'C:\Windows\Fonts',
+    '/usr/share/fonts/truetype/msttcorefonts',
+    '/usr/share/fonts/truetype/liberation',
+    '/usr/share/fonts/truetype/liberation2',
+    '/usr/share/fonts/truetype/dejavu',
+    '/usr/share/fonts/TTF',
+    '/Library/Fonts',
+]
+
+# Her yazı tipi türü için (normal, kalın, italik, kalın-italik) dosya adı adayları
+_FONT_CANDIDATES = {
+    'serif': [
+        ('times.ttf', 'timesbd.ttf', 'timesi.ttf', 'timesbi.ttf'),
+        ('Times_New_Roman.ttf', 'Times_New_Roman_Bold.ttf', 'Times_New_Roman_Italic.ttf', 'Times_New_Roman_Bold_Italic.ttf'),
+        ('LiberationSerif-Regular.ttf', 'LiberationSerif-Bold.ttf', 'LiberationSerif-Italic.ttf', 'LiberationSerif-BoldItalic.ttf'),
+        ('DejaVuSerif.ttf', 'DejaVuSerif-Bold.ttf', 'DejaVuSerif-Italic.ttf', 'DejaVuSerif-BoldItalic.ttf'),
+    ],
+    'sans': [
+        ('arial.ttf', 'arialbd.ttf', 'ariali.ttf', 'arialbi.ttf'),
+        ('Arial.ttf', 'Arial_Bold.ttf', 'Arial_Italic.ttf', 'Arial_Bold_Italic.ttf'),
+        ('LiberationSans-Regular.ttf', 'LiberationSans-Bold.ttf', 'LiberationSans-Italic.ttf', 'LiberationSans-BoldItalic.ttf'),
+        ('DejaVuSans.ttf', 'DejaVuSans-Bold.ttf', 'DejaVuSans-Oblique.ttf', 'DejaVuSans-BoldOblique.ttf'),
+    ],
+    'mono': [
+        ('cour.ttf', 'courbd.ttf', 'couri.ttf', 'courbi.ttf'),
+        ('LiberationMono-Regular.ttf', 'LiberationMono-Bold.ttf', 'LiberationMono-Italic.ttf', 'LiberationMono-BoldItalic.ttf'),
+        ('DejaVuSansMono.ttf', 'DejaVuSansMono-Bold.ttf', 'DejaVuSansMono-Oblique.ttf', 'DejaVuSansMono-BoldOblique.ttf'),
+    ],
+}
+
+# TrueType bulunamazsa kullanılacak standart yazı tipleri (Türkçe karakterler eksik kalır)
+_BUILTIN_FAMILIES = {
+    'serif': ('Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic'),
+    'sans': ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique'),
+    'mono': ('Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique'),
+}
+
+# Belgelerde geçen yazı tipi adlarının türleri
+_FAMILY_KINDS = {
+    'times new roman': 'serif',
+    'times': 'serif',
+    'georgia': 'serif',
+    'cambria': 'serif',
+    'garamond': 'serif',
+    'courier new': 'mono',
+    'courier': 'mono',
+    'consolas': 'mono',
+    'monospaced': 'mono',
+}
+
+_registered = {}
+_lock = threading.Lock()
+
+
+def _find_font_file(filename):
+    for directory in _FONT_DIRS:
+        if directory:
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def _register_kind(kind):
+    """Bir yazı tipi türünü kaydeder ve dört varyantın reportlab adlarını döndürür"""
+    for candidate in _FONT_CANDIDATES[kind]:
+        regular_path = _find_font_file(candidate[0])
+        if not regular_path:
+            continue
+
+        base_name = f"TR{kind.capitalize()}"
+        names = []
+        for suffix, filename in zip(('', '-Bold', '-Italic', '-BoldItalic'), candidate):
+            path = _find_font_file(filename) or regular_path
+            font_name = base_name + suffix
+            try:
+                pdfmetrics.registerFont(TTFont(font_name, path))
+            except Exception as e:
+                logger.warning(f"Yazı tipi kaydedilemedi {path}: {str(e)}")
+                font_name = base_name if names else None
+                if font_name is None:
+                    break
+            names.append(font_name)
+
+        if len(names) == 4:
+            pdfmetrics.registerFontFamily(base_name, normal=names[0], bold=names[1],
+                                          italic=names[2], boldItalic=names[3])
+            for bold, italic, name in ((0, 0, names[0]), (1, 0, names[1]), (0, 1, names[2]), (1, 1, names[3])):
+                addMapping(base_name, bold, italic, name)
+            logger.info(f"PDF yazı tipi kaydedildi: {kind} -> {regular_path}")
+            return tuple(names)
+
+    logger.warning(f"{kind} için TrueType yazı tipi bulunamadı, standart yazı tipi kullanılacak")
+    return _BUILTIN_FAMILIES[kind]
+
+
+def register_fonts():
+    """Tüm yazı tipi türlerini (bir kez) kaydeder"""
+    for kind in _FONT_CANDIDATES:
+        get_font_family(kind)
+
+
+def get_font_family(kind='serif'):
+    """
+    Yazı tipi türü için reportlab yazı tipi adlarını döndürür
+
+    Returns:
+        Tuple[str, str, str, str]: (normal, kalın, italik, kalın-italik)
+    """
+    if kind not in _FONT_CANDIDATES:
+        kind = 'sans'
+    names = _registered.get(kind)
+    if names is None:
+        with _lock:
+            names = _registered.get(kind)
+            if names is None:
+                names = _register_kind(kind)
+                _registered[kind] = names
+    return names
+
+
+def resolve_font(family, bold=False, italic=False):
+    """
+    Belgedeki yazı tipi adına karşılık gelen kayıtlı yazı tipini döndürür
+
+    Args:
+        family: Belgede geçen yazı tipi adı (örn. 'Times New Roman', 'Tahoma')
+        bold: Kalın mı?
+        italic: İtalik mi?
+    """
+    kind = _FAMILY_KINDS.get((family or '').strip().lower(), 'sans')
+    names = get_font_family(kind)
+    return names[(1 if bold else 0) + (2 if italic else 0)]
@@ -0,0 +1,82 @@
+"""
+Sayfa ve API yetki kontrolü
+
+permission_required hem app.py'deki rotalar hem de blueprint'ler tarafından
+kullanılır; tek yerde tanımlıdır.
+"""
+
+from functools import wraps
+
+from flask import flash, jsonify, redirect, request, url_for
+from flask_login import current_user
+
+
+def permission_required(permission):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_user.is_authenticated:
+                flash('Bu işlem için giriş yapmanız gerekmektedir.', 'error')
+                return redirect(url_for('login', next=request.url))
+            
+            # Admin kontrolü ekle - Admin her şeyi yapabilir
+            if current_user.is_admin:
+                return f(*args, **kwargs)
+                
+            # Normal kullanıcılar için yetki kontrolü yap
+            if not current_user.has_permission(permission):
+                # Hangi yetkiye ihtiyaç duyulduğunu belirten bir hata mesajı
+                permission_names = {
+                    'dosya_sorgula': 'Dosya Sorgulama',
+                    'dosya_ekle': 'Dosya Ekleme', 
+                    'dosya_duzenle': 'Dosya Düzenleme',
+                    'dosya_sil': 'Dosya Silme',
+                    'takvim_goruntule': 'Takvim Görüntüleme',
+                    'etkinlik_goruntule': 'Etkinlik Görüntüleme',
+                    'etkinlik_ekle': 'Etkinlik Ekleme',
+                    'etkinlik_duzenle': 'Etkinlik Düzenleme',
+                    'etkinlik_sil': 'Etkinlik Silme',
+                    'duyuru_goruntule': 'Duyuru Görüntüleme',
+                    'duyuru_ekle': 'Duyuru Ekleme',
+                    'duyuru_duzenle': 'Duyuru Düzenleme',
+                    'duyuru_sil': 'Duyuru Silme',
+                    'odeme_goruntule': 'Ödeme Görüntüleme',
+                    'odeme_ekle': 'Ödeme Ekleme',
+                    'odeme_duzenle': 'Ödeme Düzenleme',
+                    'odeme_sil': 'Ödeme Silme',
+                    'faiz_hesaplama': 'Faiz Hesaplama',
+                    'harc_hesaplama': 'Harç Hesaplama',
+                    'isci_hesaplama': 'İşçi Alacağı Hesaplama',
+                    'vekalet_hesaplama': 'Vekalet Ücreti Hesaplama',
+                    'ceza_infaz_hesaplama': 'Ceza İnfaz Hesaplama',
+                    'rapor_goruntule': 'Rapor Görüntüleme',
+                    'rapor_olustur': 'Rapor Oluşturma',
+                    'musteri_goruntule': 'Müşteri Görüntüleme',
+                    'musteri_ekle': 'Müşteri Ekleme',
+                    'musteri_duzenle': 'Müşteri Düzenleme',
+                    'musteri_sil': 'Müşteri Silme',
+                    'panel_goruntule': 'Panel Görüntüleme',
+                    'ayarlar': 'Ayarlar Erişimi',
+                    'isci_gorusme_goruntule': 'İşçi Görüşme Görüntüleme',
+                    'isci_gorusme_ekle': 'İşçi Görüşme Ekleme',
+                    'isci_gorusme_duzenle': 'İşçi Görüşme Düzenleme',
+                    'isci_gorusme_sil': 'İşçi Görüşme Silme',
+                    'ornek_dilekceler': 'Örnek Dilekçeler',
+                    'ornek_sozlesmeler': 'Örnek Sözleşmeler',
+                    'ucret_tarifeleri': 'Ücret Tarifeleri',
+                    'yargi_kararlari_arama': 'Yargı Kararları Arama',
+                    'veritabani_yonetimi': 'Veritabanı Yönetimi'
+                }
+                
+                permission_name = permission_names.get(permission, permission)
+                flash(f'Bu işlem için "{permission_name}" yetkisine sahip olmanız gerekiyor.', 'error')
+                
+                # API isteklerinde JSON yanıtı döndür, sayfa isteklerinde anasayfaya yönlendir
+                if request.is_json:
+                    return jsonify({'success': False, 'error': f'Yetkiniz yok: {permission_name}'}), 403
+                    
+                return redirect(url_for('anasayfa'))
+                
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,478 @@
+"""
+Kayıtlı sözleşmeler için sunucu tarafı PDF üretimi
+
+OrnekSozlesme.icerik_json, tarayıcıda pdfmake ile kullanılan belge tanımını
+(content, styles, defaultStyle, pageMargins ...) içerir. Bu modül aynı
+tanımı reportlab ile PDF'e çevirir:
+
+    - Türkçe karakterli yazı tipleri pdf_fonts üzerinden bir kez kaydedilir,
+    - sayfa şablonları (kenar boşlukları + sayfa numarası) geometriye göre
+      önbelleğe alınır ve her belgede yeniden kullanılır,
+    - üretilen PDF baytları içerik özetine göre bellekte ve diskte saklanır;
+      aynı sözleşme ikinci kez işlenmez.
+
+Desteklenen pdfmake düğümleri: metin (dize, satır içi parça listesi),
+columns, stack, ul/ol, table, pageBreak.
+"""
+
+import os
+import io
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from html import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+from reportlab.lib.pagesizes import A4, A3, A5, LETTER, LEGAL, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import (BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer,
+                                Table, TableStyle, PageBreak, ListFlowable, ListItem)
+
+from pdf_fonts import register_fonts, resolve_font
+
+logger = logging.getLogger(__name__)
+
+# Çıktıyı etkileyen değişikliklerde artırılır; önbellek anahtarına dahildir
+RENDERER_VERSION = 1
+
+# Bellekte tutulacak PDF baytlarının toplam üst sınırı
+MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+
+# pdfmake varsayılanları
+DEFAULT_FONT_SIZE = 12.0
+DEFAULT_LINE_HEIGHT = 1.0
+DEFAULT_PAGE_MARGINS = [40, 40, 40, 40]
+
+_ALIGNMENTS = {'left': TA_LEFT, 'center': TA_CENTER, 'right': TA_RIGHT, 'justify': TA_JUSTIFY}
+_PAGE_SIZES = {'A4': A4, 'A3': A3, 'A5': A5, 'LETTER': LETTER, 'LEGAL': LEGAL}
+
+# Metin biçimine ait pdfmake nitelikleri (stil birleştirmede miras alınır)
+_TEXT_PROPERTIES = ('font', 'fontSize', 'bold', 'italics', 'alignment', 'lineHeight',
+                    'color', 'decoration')
+
+_memory_cache = OrderedDict()
+_memory_cache_size = 0
+_cache_lock = threading.Lock()
+# Önbellek anahtarı -> [kilit, bekleyen sayısı]; aynı sözleşme bir kez üretilir
+_key_locks = {}
+# Sayfa şablonları iş parçacığı başına tutulur
+_templates = threading.local()
+
+
+@contextmanager
+def _key_lock(key):
+    """
+    Aynı anahtar için üretim ve silmeyi sıraya sokar
+
+    Farklı sözleşmeler birbirini beklemez; kilit son kullanıcı bıraktığında
+    sözlükten çıkarılır.
+    """
+    with _cache_lock:
+        entry = _key_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _cache_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _key_locks[key]
+
+
+def contract_cache_key(icerik_json, title=''):
+    """
+    Sözleşme içeriğinin önbellek anahtarını döndürür
+
+    Args:
+        icerik_json: pdfmake belge tanımı (JSON metni veya sözlük)
+        title: PDF başlığı (üst veri)
+    """
+    if not isinstance(icerik_json, str):
+        icerik_json = json.dumps(icerik_json, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256()
+    digest.update(f"{RENDERER_VERSION}\0{title or ''}\0".encode('utf-8'))
+    digest.update(icerik_json.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _normalize_margin(value):
+    """pdfmake kenar boşluğunu [sol, üst, sağ, alt] listesine çevirir"""
+    if value is None:
+        return [0, 0, 0, 0]
+    if isinstance(value, (int, float)):
+        return [value] * 4
+    if isinstance(value, list):
+        if len(value) == 2:
+            return [value[0], value[1], value[0], value[1]]
+        if len(value) == 4:
+            return list(value)
+    return [0, 0, 0, 0]
+
+
+class _ContractBuilder:
+    """pdfmake belge tanımını reportlab flowable'larına çevirir"""
+
+    def __init__(self, definition, frame_width):
+        self.styles = definition.get('styles') or {}
+        self.frame_width = frame_width
+        self.base = {'fontSize': DEFAULT_FONT_SIZE, 'lineHeight': DEFAULT_LINE_HEIGHT,
+                     'alignment': 'left'}
+        self.base.update({k: v for k, v in (definition.get('defaultStyle') or {}).items()
+                          if k in _TEXT_PROPERTIES})
+        self._paragraph_styles = {}
+
+    def resolve(self, node, inherited):
+        """Miras alınan, adlandırılmış stil ve düğüm niteliklerini birleştirir"""
+        props = dict(inherited)
+        names = node.get('style')
+        for name in ([names] if isinstance(names, str) else names or []):
+            props.update(self.styles.get(name, {}))
+        props.update({k: v for k, v in node.items() if k in _TEXT_PROPERTIES or k == 'margin'})
+        return props
+
+    def paragraph_style(self, props):
+        size = float(props.get('fontSize') or DEFAULT_FONT_SIZE)
+        line_height = float(props.get('lineHeight') or DEFAULT_LINE_HEIGHT)
+        key = (props.get('font'), size, line_height, props.get('alignment'),
+               bool(props.get('bold')), bool(props.get('italics')), props.get('color'))
+        style = self._paragraph_styles.get(key)
+        if style is None:
+            style = ParagraphStyle(
+                name=f"sozlesme_{len(self._paragraph_styles)}",
+                fontName=resolve_font(props.get('font'), props.get('bold'), props.get('italics')),
+                fontSize=size,
+                leading=size * 1.2 * line_height,
+                alignment=_ALIGNMENTS.get(props.get('alignment'), TA_LEFT),
+                textColor=props.get('color') or colors.black,
+                splitLongWords=True
+            )
+            self._paragraph_styles[key] = style
+        return style
+
+    def inline_markup(self, value, props):
+        """Metin düğümünü (dize veya parça listesi) paragraf işaretlemesine çevirir"""
+        if isinstance(value, (int, float)):
+            value = str(value)
+        if isinstance(value, str):
+            return escape(value, quote=False).replace('\n', '<br/>')
+        if isinstance(value, dict):
+            span = self.resolve(value, props)
+            markup = self.inline_markup(value.get('text', ''), span)
+            if span.get('bold') != props.get('bold') or span.get('italics') != props.get('italics'):
+                markup = f'<font name="{resolve_font(span.get("font"), span.get("bold"), span.get("italics"))}">{markup}</font>'
+            if span.get('fontSize') != props.get('fontSize'):
+                markup = f'<font size="{float(span.get("fontSize")):g}">{markup}</font>'
+            if span.get('color') and span.get('color') != props.get('color'):
+                markup = f'<font color="{span.get("color")}">{markup}</font>'
+            if span.get('decoration') == 'underline':
+                markup = f'<u>{markup}</u>'
+            return markup
+        if isinstance(value, list):
+            return ''.join(self.inline_markup(part, props) for part in value)
+        return ''
+
+    def text(self, node, props):
+        value = node.get('text', '') if isinstance(node, dict) else node
+        style = self.paragraph_style(props)
+        if isinstance(value, str):
+            # pdfmake'te sondaki satır sonu yeni bir boş satır açmaz
+            if value.endswith('\n'):
+                value = value[:-1]
+            if not value.strip('\n'):
+                return [Spacer(1, style.leading * (value.count('\n') + 1))]
+        markup = self.inline_markup(value, props)
+        if props.get('decoration') == 'underline':
+            markup = f'<u>{markup}</u>'
+        return [Paragraph(markup, style)]
+
+    def columns(self, node, props, available_width):
+        columns = node.get('columns') or []
+        if not columns:
+            return []
+        gap = float(node.get('columnGap') or 0)
+        fixed = [c.get('width') for c in columns if isinstance(c, dict)]
+        fixed_total = sum(w for w in fixed if isinstance(w, (int, float)))
+        star_count = sum(1 for c in columns if not isinstance(c, dict) or
+                         not isinstance(c.get('width'), (int, float))) or 1
+        remaining = available_width - fixed_total - gap * (len(columns) - 1)
+        widths = []
+        for column in columns:
+            width = column.get('width') if isinstance(column, dict) else None
+            widths.append(float(width) if isinstance(width, (int, float)) else max(remaining / star_count, 10))
+
+        cells = [self.node(column, props, width) for column, width in zip(columns, widths)]
+        table = Table([cells], colWidths=[w + (gap if i < len(widths) - 1 else 0) for i, w in enumerate(widths)],
+                      hAlign='LEFT')
+        table.setStyle(TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-2, -1), gap),
+            ('RIGHTPADDING', (-1, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ]))
+        return [table]
+
+    def table(self, node, props, available_width):
+        spec = node.get('table') or {}
+        body = spec.get('body') or []
+        if not body:
+            return []
+        column_count = max(len(row) for row in body)
+        width = available_width / column_count
+        data = []
+        for row in body:
+            cells = [self.node(cell, props, width) for cell in row]
+            cells.extend([''] * (column_count - len(cells)))
+            data.append(cells)
+        table = Table(data, colWidths=[width] * column_count, repeatRows=int(spec.get('headerRows') or 0),
+                      hAlign='LEFT')
+        commands = [('VALIGN', (0, 0), (-1, -1), 'TOP')]
+        if node.get('layout') != 'noBorders':
+            commands.append(('GRID', (0, 0), (-1, -1), 0.5, colors.black))
+        table.setStyle(TableStyle(commands))
+        return [table]
+
+    def list(self, node, props, available_width, ordered):
+        items = node.get('ol' if ordered else 'ul') or []
+        flowables = [ListItem(self.node(item, props, available_width - 18)) for item in items]
+        style = self.paragraph_style(props)
+        return [ListFlowable(flowables, bulletType='1' if ordered else 'bullet', start=None if ordered else '•',
+                             bulletFontName=style.fontName, bulletFontSize=style.fontSize, leftIndent=18)]
+
+    def node(self, node, inherited, available_width):
+        """Tek bir pdfmake düğümünü flowable listesine çevirir"""
+        if isinstance(node, (str, int, float)):
+            return self.text(str(node), inherited)
+        if isinstance(node, list):
+            return self.nodes(node, inherited, available_width)
+        if not isinstance(node, dict):
+            return []
+
+        props = self.resolve(node, inherited)
+        flowables = []
+        if node.get('pageBreak') == 'before':
+            flowables.append(PageBreak())
+
+        if 'columns' in node:
+            body = self.columns(node, props, available_width)
+        elif 'stack' in node:
+            body = self.nodes(node['stack'], props, available_width)
+        elif 'ul' in node or 'ol' in node:
+            body = self.list(node, props, available_width, ordered='ol' in node)
+        elif 'table' in node:
+            body = self.table(node, props, available_width)
+        elif 'text' in node:
+            body = self.text(node, props)
+        else:
+            body = []
+
+        left, top, right, bottom = _normalize_margin(props.get('margin'))
+        if top:
+            flowables.append(Spacer(1, top))
+        if left or right:
+            for flowable in body:
+                if isinstance(flowable, Paragraph):
+                    flowable.style = ParagraphStyle(name=f"{flowable.style.name}_m", parent=flowable.style,
+                                                    leftIndent=left, rightIndent=right)
+        flowables.extend(body)
+        if bottom:
+            flowables.append(Spacer(1, bottom))
+
+        if node.get('pageBreak') == 'after':
+            flowables.append(PageBreak())
+        return flowables
+
+    def nodes(self, nodes, inherited, available_width):
+        flowables = []
+        for child in nodes if isinstance(nodes, list) else [nodes]:
+            # margin yalnızca tanımlandığı düğüme uygulanır, alt düğümlere geçmez
+            child_inherited = {k: v for k, v in inherited.items() if k != 'margin'}
+            flowables.extend(self.node(child, child_inherited, available_width))
+        return flowables
+
+
+def _page_geometry(definition):
+    page_size = _PAGE_SIZES.get(str(definition.get('pageSize') or 'A4').upper(), A4)
+    if definition.get('pageOrientation') == 'landscape':
+        page_size = landscape(page_size)
+    margins = _normalize_margin(definition.get('pageMargins', DEFAULT_PAGE_MARGINS))
+    return tuple(page_size), tuple(float(m) for m in margins)
+
+
+def _draw_page_number(canvas, doc):
+    canvas.saveState()
+    canvas.setFont(resolve_font('Arial'), 8)
+    canvas.setFillColor(colors.grey)
+    canvas.drawCentredString(doc.pagesize[0] / 2.0, 20, f"{canvas.getPageNumber()}")
+    canvas.restoreState()
+
+
+def get_page_template(page_size, margins):
+    """
+    Sayfa geometrisi için hazır sayfa şablonunu döndürür
+
+    Şablonlar geometri başına bir kez oluşturulur. reportlab derleme
+    sırasında çerçeve durumunu değiştirdiğinden her iş parçacığı kendi
+    şablonlarını kullanır; eşzamanlı üretimler birbirini beklemez.
+    """
+    cache = getattr(_templates, 'cache', None)
+    if cache is None:
+        cache = _templates.cache = {}
+    key = (page_size, margins)
+    template = cache.get(key)
+    if template is None:
+        left, top, right, bottom = margins
+        frame = Frame(left, bottom, page_size[0] - left - right, page_size[1] - top - bottom,
+                      leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0, id='govde')
+        template = PageTemplate(id='sozlesme', frames=[frame], onPage=_draw_page_number,
+                                pagesize=page_size)
+        cache[key] = template
+    return template
+
+
+def render_contract_pdf(definition, title=''):
+    """
+    pdfmake belge tanımını PDF'e çevirir
+
+    Args:
+        definition: pdfmake belge tanımı (JSON metni veya sözlük)
+        title: PDF başlığı
+
+    Returns:
+        bytes: PDF içeriği
+    """
+    if isinstance(definition, str):
+        definition = json.loads(definition) if definition.strip() else {}
+    definition = definition or {}
+    register_fonts()
+
+    page_size, margins = _page_geometry(definition)
+    frame_width = page_size[0] - margins[0] - margins[2]
+    builder = _ContractBuilder(definition, frame_width)
+    story = builder.nodes(definition.get('content') or [], builder.base, frame_width) or [Spacer(1, 1)]
+
+    buffer = io.BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=page_size, title=title or 'Sözleşme',
+                          author='Kaplan Hukuk Bürosu', creator='LawAutoTRY')
+    doc.addPageTemplates([get_page_template(page_size, margins)])
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def render_contract_pdf_cached(icerik_json, title, cache_dir):
+    """
+    Sözleşme PDF'ini önbellekten döndürür, yoksa üretip önbelleğe yazar
+
+    Aynı sözleşme için eşzamanlı istekler anahtar kilidinde bekleyip tek
+    üretimin sonucunu kullanır.
+
+    Returns:
+        Tuple[str, bytes]: (önbellek anahtarı, PDF içeriği)
+    """
+    key = contract_cache_key(icerik_json, title)
+    data = _cached(key)
+    if data is not None:
+        return key, data
+
+    cached_path = os.path.join(cache_dir, f"{key}.pdf")
+    with _key_lock(key):
+        data = _cached(key)
+        if data is not None:
+            return key, data
+        try:
+            with open(cached_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = render_contract_pdf(icerik_json, title)
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix='.pdf', dir=cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, cached_path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            logger.info(f"Sözleşme PDF'i üretildi: {title} ({key[:12]})")
+        _remember(key, data)
+    return key, data
+
+
+def discard_contract_pdf(icerik_json, title, cache_dir):
+    """
+    Sözleşmenin önbellekteki PDF'ini siler (güncelleme/silme sonrası)
+
+    Sürmekte olan bir üretim varsa bitmesi beklenir; böylece silinen
+    PDF üretim tarafından yeniden yazılmaz.
+    """
+    key = contract_cache_key(icerik_json, title)
+    global _memory_cache_size
+    with _key_lock(key):
+        with _cache_lock:
+            data = _memory_cache.pop(key, None)
+            if data is not None:
+                _memory_cache_size -= len(data)
+        try:
+            os.remove(os.path.join(cache_dir, f"{key}.pdf"))
+        except OSError:
+            pass
+
+
+def build_contracts_zip(contracts, cache_dir):
+    """
+    Birden çok sözleşmeyi tek ZIP arşivinde toplar
+
+    PDF'ler zaten sıkıştırılmış olduğundan arşive sıkıştırmadan (ZIP_STORED)
+    eklenir; önbellekteki sözleşmeler yeniden üretilmez.
+
+    Args:
+        contracts: (dosya adı, icerik_json, başlık) üçlüleri
+        cache_dir: PDF önbellek klasörü
+
+    Returns:
+        io.BytesIO: ZIP içeriği
+    """
+    buffer = io.BytesIO()
+    used_names = set()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for filename, icerik_json, title in contracts:
+            _, data = render_contract_pdf_cached(icerik_json, title, cache_dir)
+            name = filename if filename.lower().endswith('.pdf') else f"{filename}.pdf"
+            base, counter = name[:-4], 2
+            while name in used_names:
+                name = f"{base}_{counter}.pdf"
+                counter += 1
+            used_names.add(name)
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _cached(key):
+    """Bellekteki PDF baytları; yoksa None"""
+    with _cache_lock:
+        data = _memory_cache.get(key)
+        if data is not None:
+            _memory_cache.move_to_end(key)
+        return data
+
+
+def _remember(key, data):
+    global _memory_cache_size
+    with _cache_lock:
+        if key in _memory_cache:
+            return
+        _memory_cache[key] = data
+        _memory_cache_size += len(data)
+        while _memory_cache_size > MEMORY_CACHE_BYTES and len(_memory_cache) > 1:
+            _, evicted = _memory_cache.popitem(last=False)
+            _memory_cache_size -= len(evicted)
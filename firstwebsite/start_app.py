@@ -2,10 +2,19 @@
 # -*- coding: utf-8 -*-
 """
 Flask uygulamasını ASCII-safe environment ile başlatma scripti
+
+Kullanım:
+    python start_app.py                  # Geliştirme sunucusu (debug, yeniden yükleyici)
+    python start_app.py --production     # Üretim: gunicorn (Linux/macOS) veya waitress (Windows)
+    python start_app.py --production --workers 4 --threads 8 --bind 0.0.0.0:8000
 """
 
 import os
 import sys
+import argparse
+import importlib.util
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Environment variables'daki Türkçe karakterleri temizle
 def clean_environment():
@@ -21,10 +30,51 @@ def clean_environment():
             os.environ[var] = clean_value
             print(f"Temizlendi: {var} = {clean_value}")
 
+def run_production(args):
+    """
+    Uygulamayı üretim WSGI sunucusuyla başlatır
+
+    gunicorn varsa (Windows dışında) çok süreçli çalışılır, ayarlar
+    gunicorn.conf.py'den okunur; yoksa waitress tek süreçte çok iş
+    parçacığıyla sunar.
+    """
+    if args.workers:
+        os.environ['WEB_CONCURRENCY'] = str(args.workers)
+    if args.threads:
+        os.environ['WEB_THREADS'] = str(args.threads)
+    if args.bind:
+        os.environ['WEB_BIND'] = args.bind
+
+    os.chdir(BASE_DIR)
+    if os.name != 'nt' and importlib.util.find_spec('gunicorn'):
+        print("gunicorn başlatılıyor (ayarlar: gunicorn.conf.py)...")
+        os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'])
+
+    from waitress import serve
+    sys.path.insert(0, BASE_DIR)
+    from wsgi import application
+
+    bind = os.getenv('WEB_BIND', '127.0.0.1:8000')
+    threads = int(os.getenv('WEB_THREADS', 8))
+    print(f"waitress başlatılıyor: {bind}, {threads} iş parçacığı...")
+    serve(application, listen=bind, threads=threads)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LawAutomation sunucusunu başlatır")
+    parser.add_argument('--production', action='store_true', help="Üretim WSGI sunucusuyla başlat")
+    parser.add_argument('--workers', type=int, help="Worker süreç sayısı (gunicorn)")
+    parser.add_argument('--threads', type=int, help="Worker başına iş parçacığı")
+    parser.add_argument('--bind', help="Dinlenecek adres, ör. 0.0.0.0:8000")
+    args = parser.parse_args()
+
     print("Environment variables temizleniyor...")
     clean_environment()
     
+    if args.production:
+        run_production(args)
+        sys.exit(0)
+
     print("\nFlask uygulaması başlatılıyor...")
     
     # Flask uygulamasını import et ve başlat
@@ -0,0 +1,99 @@
+"""
+Uygulama açılış süresi ölçümü
+
+Her senaryo ayrı bir Python sürecinde çalıştırılır (önceden yüklenmiş modüller
+ölçümü etkilemesin diye); içe aktarma süresi ve açılışta yüklenen ağır
+modüller raporlanır. Testler süreye değil, imported_modules ile hangi
+modüllerin yüklendiğine bakar.
+
+Kullanım:
+    python startup_benchmark.py
+    python startup_benchmark.py --repeat 5 app event_reminder
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Açılışta yüklenmemesi gereken ağır paketler
+HEAVY_MODULES = ('reportlab', 'fpdf', 'xhtml2pdf', 'mammoth', 'pdfkit', 'PIL', 'bs4',
+                 'selenium', 'webdriver_manager', 'playwright', 'httpx', 'aiohttp',
+                 'yargi_integration', 'uyap_integration_advanced')
+
+# Web katmanı: rotalar ve yönetim paneli; çekirdek uygulama ve CLI işleri bunları yüklemez
+WEB_MODULES = ('app', 'hesaplama_routes', 'flask_admin')
+
+SCENARIOS = {
+    'app_factory': "from app_factory import create_app; create_app()",
+    'event_reminder': "import event_reminder",
+    'app': "import app",
+}
+
+PROBE = """
+import sys, time, json
+sys.path.insert(0, {base!r})
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+loaded = sorted(m for m in {modules!r} if m in sys.modules)
+print(json.dumps({{'sure': elapsed, 'agir_moduller': loaded, 'rapor': {report}}}))
+"""
+
+
+def _probe(code, modules, report, base_dir):
+    script = PROBE.format(base=base_dir, code=code, modules=tuple(modules), report=report)
+    completed = subprocess.run([sys.executable, '-c', script], cwd=base_dir,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(code, report='None', base_dir=BASE_DIR):
+    """
+    Kodu temiz bir süreçte çalıştırıp süreyi ve yüklenen ağır modülleri döndürür
+
+    Args:
+        code: Ölçülecek kod
+        report: Ölçümden sonra aynı süreçte değerlendirilecek ifade (JSON'a çevrilebilir olmalı)
+
+    Returns:
+        dict: {'sure': saniye, 'agir_moduller': [...], 'rapor': ifadenin değeri}
+    """
+    return _probe(code, HEAVY_MODULES, report, base_dir)
+
+
+def imported_modules(code, modules=HEAVY_MODULES, report='None', base_dir=BASE_DIR):
+    """
+    Kodu temiz bir süreçte çalıştırıp verilen modüllerden yüklenenleri döndürür
+
+    Süre döndürülmez; açılışın yapısını (neyin yüklendiğini) denetleyen
+    testler için.
+
+    Returns:
+        dict: {'moduller': [...], 'rapor': ifadenin değeri}
+    """
+    result = _probe(code, modules, report, base_dir)
+    return {'moduller': result['agir_moduller'], 'rapor': result['rapor']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uygulama açılış süresi ölçümü")
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS),
+                        help=f"Ölçülecek senaryolar ({', '.join(SCENARIOS)})")
+    parser.add_argument('--repeat', type=int, default=3, help="Senaryo başına tekrar sayısı")
+    args = parser.parse_args()
+
+    print(f"{'Senaryo':<16}{'Medyan (sn)':>12}{'En iyi (sn)':>12}  Ağır modüller")
+    for name in args.scenarios:
+        runs = [measure(SCENARIOS[name]) for _ in range(args.repeat)]
+        times = [run['sure'] for run in runs]
+        heavy = ', '.join(runs[-1]['agir_moduller']) or '-'
+        print(f"{name:<16}{statistics.median(times):>12.3f}{min(times):>12.3f}  {heavy}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""
+Ücret tarifesi kataloğu
+
+tarifeler.txt bir kez derlenir ve dosya değişene (mtime/boyut) ya da
+Kaplan Danışmanlık tarifesi kaydedilene kadar bellekten sunulur. Derleme
+sonucunda:
+
+    - /api/tarifeler yanıtı (aynı yapı) ve bunun önceden serileştirilmiş
+      JSON'u ile ETag'i
+    - tarife grubu + kategori dizini
+    - hizmet kodu dizini (IB_A_1, TBB_1_1_5a, KH_DV_01, ...)
+    - tüm satırların listesi (TBB_2026 gibi listelenmeyen tarife yılları dahil)
+
+elde edilir. Hizmet koduyla ücret sorgusu tek sözlük erişimidir. Katalog
+paylaşımlı olduğundan derleme sonunda dondurulur: sözlükler
+MappingProxyType, listeler tuple olarak sunulur.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARIFE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tarifeler.txt')
+
+KAPLAN_START_MARKER = "KAPLAN HUKUK DANIŞMANLIK ÜCRET TARİFESİ START"
+KAPLAN_END_MARKER = "KAPLAN HUKUK DANIŞMANLIK ÜCRET TARİFESİ END"
+KAPLAN_KEY = "kaplan_danismanlik_tarifesi"
+
+GRUP_MAP = {
+    "ISTBARO_2025": "İstanbul Barosu",
+    "TBB_2025": "TBB"
+}
+
+# GRUP_MAP dışındaki tarife yılları (ör. TBB_2026)
+YEARLY_GROUP_PATTERN = re.compile(r'^(ISTBARO|TBB)_\d{4}$')
+
+
+def parse_amount(value):
+    """'57000', '1.250,50' gibi ücret metnini sayıya çevirir; çevrilemezse None"""
+    text = str(value or '').strip().replace(' ', '')
+    if not text:
+        return None
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _freeze(value):
+    """İç içe sözlük ve listeleri salt okunur karşılıklarına çevirir"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class TarifeCatalogue:
+    """Derlenmiş, değişmez tarife kataloğu"""
+    tarifeler: Mapping
+    categories: Mapping
+    services: Mapping
+    json_bytes: bytes
+    etag: str
+    signature: tuple = None
+    rows: tuple = ()  # Tüm tarife satırları (diğer tarife yılları dahil), dosya sırasıyla
+
+    def get_service(self, code) -> Optional[dict]:
+        """Hizmet koduna göre ücret kaydını döndürür"""
+        return self.services.get(code)
+
+
+def compile_tarifeler(lines, source='tarifeler.txt', signature=None):
+    """
+    tarifeler.txt satırlarını kataloğa derler
+
+    /api/tarifeler yanıtı (tarifeler) baro adına göre kategori listeleridir:
+    {"İstanbul Barosu": [{"kategori", "items": [...]}], "TBB": [...],
+    KAPLAN_KEY: {"kategoriler": [...]}}. Kalemler hizmet_adi,
+    temel_ucret, original_ucret_str ve varsa hizmet_kodu, birim, ek_not
+    alanlarını taşır.
+    """
+    tarifeler = {
+        "İstanbul Barosu": [],
+        "TBB": [],
+        KAPLAN_KEY: {"kategoriler": []}
+    }
+    categories = {}
+    services = {}
+    rows = []
+
+    kaplan_json_str = ""
+    in_kaplan_block = False
+
+    for line_num, line_content_raw in enumerate(lines):
+        line_content = line_content_raw.strip()
+
+        if line_content.startswith(KAPLAN_START_MARKER):
+            in_kaplan_block = True
+            kaplan_json_str = ""
+            continue
+        elif line_content.startswith(KAPLAN_END_MARKER):
+            in_kaplan_block = False
+            if kaplan_json_str:
+                try:
+                    parsed_json = json.loads(kaplan_json_str)
+                    if isinstance(parsed_json, dict) and isinstance(parsed_json.get("kategoriler"), list):
+                        tarifeler[KAPLAN_KEY] = parsed_json
+                    else:
+                        logger.warning(
+                            f"Kaplan Danışmanlık JSON formatı beklenmiyor (kategoriler listesi yok) {source} okunurken. "
+                            f"Satır: ~{line_num}. İçerik başlangıcı: {kaplan_json_str[:200]}..."
+                        )
+                except json.JSONDecodeError as e:
+                    logger.error(
+                        f"Kaplan Danışmanlık JSON parse edilemedi {source} okunurken: {e}. Satır: ~{line_num}. "
+                        f"İçerik başlangıcı: {kaplan_json_str[:200]}..."
+                    )
+            kaplan_json_str = ""
+            continue
+
+        if in_kaplan_block:
+            kaplan_json_str += line_content_raw
+            continue
+
+        if not line_content or line_content.startswith("#"):
+            continue
+
+        parts = [part.strip() for part in line_content.split('|')]
+        if len(parts) < 7:
+            logger.warning(f"Uyarı: Satır {line_num + 1} ({source}) yetersiz bölüm içeriyor ({len(parts)}), atlanıyor: {line_content}")
+            continue
+
+        tarife_grubu, kategori_adi, hizmet_kodu, hizmet_adi, temel_ucret, ucret_turu, birim, *ek_not_parts = parts
+        ek_not = ek_not_parts[0] if ek_not_parts and ek_not_parts[0] else None
+
+        item = {
+            "hizmet_adi": hizmet_adi,
+            "temel_ucret": temel_ucret,
+            "original_ucret_str": temel_ucret  # JS'nin parse etmesi için orijinal string
+        }
+        if hizmet_kodu:
+            item["hizmet_kodu"] = hizmet_kodu
+        if birim and birim.upper() not in ["TL", "TRY", ""]:
+            item["birim"] = birim
+        if ek_not:
+            item["ek_not"] = ek_not
+
+        group_key = GRUP_MAP.get(tarife_grubu)
+        other_year = group_key is None and YEARLY_GROUP_PATTERN.match(tarife_grubu) is not None
+        if not group_key and not other_year and tarife_grubu.upper() != 'KAPLAN_OZEL':
+            # KAPLAN_OZEL satırları listede START/END bloğundaki JSON ile yönetilir, yalnızca kodla sorgulanır
+            logger.warning(f"Uyarı: Satır {line_num + 1} ({source})'deki tarife grubu '{tarife_grubu}' tanınmıyor, atlanıyor.")
+            continue
+
+        row = MappingProxyType({
+            "hizmet_kodu": hizmet_kodu,
+            "tarife_grubu": group_key or tarife_grubu,
+            "tarife_kodu": tarife_grubu,
+            "kategori": kategori_adi,
+            "hizmet_adi": hizmet_adi,
+            "temel_ucret": temel_ucret,
+            "tutar": parse_amount(temel_ucret),
+            "ucret_turu": ucret_turu,
+            "birim": birim,
+            "ek_not": ek_not
+        })
+        rows.append(row)
+        if other_year:
+            # Diğer tarife yılları listede gösterilmez ve hizmet kodu dizinine girmez; rows üzerinden okunur
+            continue
+
+        if group_key:
+            category_key = (group_key, kategori_adi)
+            kategori_obj = categories.get(category_key)
+            if kategori_obj is None:
+                kategori_obj = {"kategori": kategori_adi, "items": []}
+                categories[category_key] = kategori_obj
+                tarifeler[group_key].append(kategori_obj)
+            kategori_obj["items"].append(item)
+
+        if hizmet_kodu:
+            if hizmet_kodu in services:
+                logger.warning(f"Uyarı: Satır {line_num + 1} ({source})'deki hizmet kodu '{hizmet_kodu}' tekrar ediyor, ilk kayıt kullanılacak.")
+            else:
+                services[hizmet_kodu] = row
+
+    for kategori in tarifeler[KAPLAN_KEY].get("kategoriler", []):
+        if not isinstance(kategori, dict):
+            continue
+        for hizmet in kategori.get("hizmetler", []) or []:
+            code = hizmet.get("id") if isinstance(hizmet, dict) else None
+            if code and code not in services:
+                services[code] = MappingProxyType({
+                    "hizmet_kodu": code,
+                    "tarife_grubu": KAPLAN_KEY,
+                    "tarife_kodu": KAPLAN_KEY,
+                    "kategori": kategori.get("kategoriAdi"),
+                    "hizmet_adi": hizmet.get("hizmetAdi"),
+                    "temel_ucret": hizmet.get("temelUcret"),
+                    "tutar": parse_amount(hizmet.get("temelUcret")),
+                    "ucret_turu": None,
+                    "birim": None,
+                    "ek_not": hizmet.get("ekNot") or None
+                })
+
+    json_bytes = json.dumps(tarifeler, ensure_ascii=False).encode('utf-8')
+    tarifeler = _freeze(tarifeler)
+    # Kategori dizini dondurulmuş yapıdaki kategorilere işaret eder
+    categories = {(group_key, kategori["kategori"]): kategori
+                  for group_key in GRUP_MAP.values() for kategori in tarifeler[group_key]}
+    return TarifeCatalogue(
+        tarifeler=tarifeler,
+        categories=MappingProxyType(categories),
+        services=MappingProxyType(services),
+        json_bytes=json_bytes,
+        etag=hashlib.sha1(json_bytes).hexdigest(),
+        signature=signature,
+        rows=tuple(rows)
+    )
+
+
+class TarifeRegistry:
+    """
+    tarifeler.txt için yeniden yüklenebilir katalog
+
+    Dosyanın değişiklik zamanı ve boyutu her erişimde kontrol edilir; yalnızca
+    değiştiğinde yeniden derlenir. Dosyaya yazan kod invalidate() çağırır.
+    """
+
+    def __init__(self, filepath=DEFAULT_TARIFE_FILE):
+        self.filepath = filepath
+        self._catalogue = None
+        self._lock = threading.Lock()
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def catalogue(self) -> TarifeCatalogue:
+        """Güncel kataloğu döndürür; dosya değiştiyse yeniden derler"""
+        signature = self._signature()
+        catalogue = self._catalogue
+        if catalogue is not None and catalogue.signature == signature:
+            return catalogue
+
+        with self._lock:
+            catalogue = self._catalogue
+            if catalogue is None or catalogue.signature != signature:
+                catalogue = self._load(signature)
+                self._catalogue = catalogue
+        return catalogue
+
+    def _load(self, signature):
+        if signature is None:
+            logger.error(f"Hata: Tarife dosyası bulunamadı: {self.filepath}")
+            return compile_tarifeler([], source=self.filepath)
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except Exception as e:
+            logger.error(f"Hata: Tarife dosyası okunamadı ({self.filepath}): {e}")
+            return compile_tarifeler([], source=self.filepath, signature=signature)
+        catalogue = compile_tarifeler(lines, source=self.filepath, signature=signature)
+        logger.info(f"Tarife kataloğu derlendi: {len(catalogue.services)} hizmet kodu")
+        return catalogue
+
+    def invalidate(self):
+        """Bir sonraki erişimde kataloğun yeniden derlenmesini sağlar"""
+        with self._lock:
+            self._catalogue = None
+
+    def get_service(self, code) -> Optional[dict]:
+        """Hizmet koduna göre ücret kaydını döndürür"""
+        return self.catalogue().get_service(code)
+
+
+tarife_registry = TarifeRegistry()
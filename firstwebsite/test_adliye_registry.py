@@ -0,0 +1,94 @@
+"""
+Adliye listesi kayıt defteri testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from adliye_registry import AdliyeRegistry, normalize_name
+
+ADLIYE_LISTESI = """İl\tFaal Adliyeler
+Adıyaman\tAdıyaman (Merkez ACM), Besni, Gölbaşı (Adıyaman), Kâhta
+Ankara\tAnkara (1 ACM), Balâ, Gölbaşı (Ankara) • Ankara Batı (1 ACM), Sincan
+İzmir\tİzmir Adliyesi (Bayraklı), Bornova
+Isparta\tIsparta (ACM), Eğirdir
+___
+"""
+
+
+class TestAdliyeRegistry(unittest.TestCase):
+    """Adliye listesinin ayrıştırılması ve dizinleri"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.work_dir, 'adliyelist.txt')
+        self.write_list(ADLIYE_LISTESI)
+        self.registry = AdliyeRegistry(self.filepath)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def write_list(self, content, mtime=None):
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(self.filepath, (mtime, mtime))
+
+    def test_parse_and_order(self):
+        """Şehirler İstanbul başta, İzmir Isparta'dan sonra gelecek şekilde sıralanır"""
+        cities_courthouses, cities = self.registry.cities_and_courthouses()
+
+        self.assertEqual(cities, ['İstanbul', 'Adıyaman', 'Ankara', 'Isparta', 'İzmir'])
+        self.assertEqual(cities_courthouses['İstanbul'], [])
+        self.assertEqual(cities_courthouses['Ankara'],
+                         ['Ankara (1 ACM)', 'Balâ', 'Gölbaşı (Ankara)', 'Ankara Batı (1 ACM)', 'Sincan'])
+
+    def test_parsed_once(self):
+        """Dosya değişmedikçe aynı görüntü döndürülür"""
+        self.assertIs(self.registry.snapshot(), self.registry.snapshot())
+
+    def test_find_city(self):
+        """Adliyeden şehir tam ad, normalize ad ve parantezsiz ad ile bulunur"""
+        self.assertEqual(self.registry.find_city('Gölbaşı (Ankara)'), 'Ankara')
+        self.assertEqual(self.registry.find_city('Gölbaşı (Adıyaman)'), 'Adıyaman')
+        self.assertEqual(self.registry.find_city('KAHTA'), 'Adıyaman')
+        self.assertEqual(self.registry.find_city('Ankara Batı'), 'Ankara')
+        self.assertEqual(self.registry.find_city('izmir adliyesi'), 'İzmir')
+        self.assertIsNone(self.registry.find_city('Olmayan Adliye'))
+        self.assertIsNone(self.registry.find_city(''))
+
+    def test_prefix_search(self):
+        """Normalize edilmiş ad önekiyle arama"""
+        self.assertEqual(self.registry.search('ankara'),
+                         [('Ankara (1 ACM)', 'Ankara'), ('Ankara Batı (1 ACM)', 'Ankara')])
+        self.assertEqual(self.registry.search('GÖL'),
+                         [('Gölbaşı (Adıyaman)', 'Adıyaman'), ('Gölbaşı (Ankara)', 'Ankara')])
+        self.assertEqual(len(self.registry.search('a', limit=2)), 2)
+        self.assertEqual(self.registry.search('xyz'), [])
+        self.assertEqual(normalize_name('  İZMİR  Bayraklı '), 'izmir bayraklı')
+
+    def test_reload_on_mtime_change(self):
+        """Dosya değişince liste ve ETag yenilenir"""
+        old = self.registry.snapshot()
+        self.write_list(ADLIYE_LISTESI + "Bolu\tBolu (ACM), Mudurnu\n", mtime=time.time() + 60)
+
+        new = self.registry.snapshot()
+        self.assertIsNot(old, new)
+        self.assertNotEqual(old.etag, new.etag)
+        self.assertEqual(self.registry.find_city('Mudurnu'), 'Bolu')
+        self.assertIn('"Bolu"', new.json_bytes.decode('utf-8'))
+
+    def test_missing_file(self):
+        """Dosya yoksa boş liste döner"""
+        registry = AdliyeRegistry(os.path.join(self.work_dir, 'yok.txt'))
+        self.assertEqual(registry.cities_and_courthouses(), ({}, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
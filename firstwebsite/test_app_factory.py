@@ -0,0 +1,73 @@
+"""
+Uygulama fabrikası ve tembel yükleme testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from sqlalchemy import text
+
+from app_factory import create_app, is_sqlite_file
+from models import db, User
+from startup_benchmark import HEAVY_MODULES, SCENARIOS, WEB_MODULES, imported_modules
+
+
+class TestAppFactory(unittest.TestCase):
+
+    def test_config_override(self):
+        app = create_app(config={'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'TESTING': True})
+        self.assertTrue(app.config['TESTING'])
+        self.assertEqual(app.config['UDF_PDF_CACHE_FOLDER'], os.path.join('uploads/', 'udf_pdf'))
+        self.assertTrue(app.template_folder)
+        with app.app_context():
+            db.create_all()
+            self.assertEqual(User.query.count(), 0)
+
+    def test_core_starts_without_heavy_modules(self):
+        """Çekirdek uygulama ve CLI işleri PDF/UYAP/içtihat bağımlılıklarını ve web katmanını yüklemez"""
+        modules = HEAVY_MODULES + WEB_MODULES
+        for code in (SCENARIOS['app_factory'], SCENARIOS['event_reminder'], "import app_factory, faiz_oranlari"):
+            self.assertEqual(imported_modules(code, modules)['moduller'], [], code)
+
+    def test_heavy_modules_load_on_first_use(self):
+        """Tembel yüklenen bağımlılık ilk kullanımda görünür; boş sonuçlar kendiliğinden geçmez"""
+        code = "from app_factory import create_app; create_app(); import sozlesme_pdf"
+        self.assertEqual(imported_modules(code, ('reportlab', 'selenium'))['moduller'], ['reportlab'])
+
+    def test_sqlite_file_uses_wal(self):
+        """Dosya veritabanında WAL ve bekleme süresi her bağlantıda ayarlanır"""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        app = create_app(config={'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(work_dir, 'test.db')})
+        self.assertEqual(app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args']['timeout'], 30)
+        with app.app_context():
+            self.assertEqual(db.session.execute(text('PRAGMA journal_mode')).scalar(), 'wal')
+            self.assertEqual(db.session.execute(text('PRAGMA busy_timeout')).scalar(), 30000)
+            db.session.remove()
+            db.engine.dispose()
+
+        self.assertFalse(is_sqlite_file('sqlite://'))
+        self.assertFalse(is_sqlite_file('sqlite:///:memory:'))
+        self.assertTrue(is_sqlite_file('sqlite:///instance/database.db'))
+
+
+class TestLazyCourtClients(unittest.TestCase):
+
+    def test_clients_built_on_first_use(self):
+        from yargi_integration import YargiFlaskIntegration
+
+        integration = YargiFlaskIntegration()
+        self.assertEqual(integration.created_clients(), [])
+
+        client = integration.kik_client
+        self.assertIs(integration.kik_client, client)
+        self.assertEqual(integration.created_clients(), [client])
+
+
+if __name__ == '__main__':
+    unittest.main()
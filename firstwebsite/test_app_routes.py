@@ -0,0 +1,60 @@
+"""
+Uygulama yapısı testleri: her rota ve alt sistem bir kez tanımlanır
+"""
+
+import os
+import re
+import ast
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from startup_benchmark import HEAVY_MODULES, imported_modules
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROUTE_MODULES = ('app.py', 'hesaplama_routes.py')
+
+# Flask-Admin görünümleri dışındaki rotalar (uygulama ve hesaplama blueprint'i)
+ROUTE_REPORT = ("sorted(r.endpoint for r in app.app.url_map.iter_rules() if r.endpoint != 'static' "
+                "and r.endpoint.rpartition('.')[0] in ('', 'hesaplama'))")
+
+# app içe aktarılırken yüklenmemesi gereken modüller: PDF, tarayıcı ve içtihat katmanı
+# ilk kullanımda yüklenir. PIL, Flask-Admin (flask_admin.form.upload) tarafından yüklendiği
+# için listede yoktur.
+LAZY_MODULES = tuple(m for m in HEAVY_MODULES if m != 'PIL') + (
+    'udf_renderer', 'sozlesme_pdf', 'uyap_browser', 'uyap_session_pool')
+
+
+def read_source(name):
+    with open(os.path.join(BASE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class TestAppStructure(unittest.TestCase):
+
+    def test_top_level_names_defined_once(self):
+        for name in ROUTE_MODULES:
+            tree = ast.parse(read_source(name))
+            counts = Counter(node.name for node in tree.body
+                             if isinstance(node, (ast.FunctionDef, ast.ClassDef)))
+            self.assertEqual([n for n, c in counts.items() if c > 1], [], name)
+
+        source = read_source('app.py')
+        for statement in ('app = ', 'csrf.init_app(', 'login_manager.init_app(', 'admin = Admin('):
+            self.assertEqual(len(re.findall('^' + re.escape(statement), source, re.M)), 1, statement)
+
+    def test_lazy_imports_and_route_count(self):
+        """Her route dekoratörü tam olarak bir kural kaydeder; ağır modüller açılışta yüklenmez"""
+        decorators = sum(len(re.findall(r'^@\w+\.route\(', read_source(name), re.M))
+                         for name in ROUTE_MODULES)
+        result = imported_modules("import app", LAZY_MODULES, report=ROUTE_REPORT)
+
+        self.assertEqual(len(result['rapor']), decorators)
+        self.assertIn('hesaplama.hesaplamalar', result['rapor'])
+        self.assertEqual(result['moduller'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Ceza infaz hesaplama motoru testleri
+"""
+
+import os
+import sys
+import csv
+import io
+import unittest
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from ceza_infaz import (CezaInfazError, InfazMotoru, format_sure, girdi_from_dict, results_to_csv,
+                        summarize)
+
+
+class TestCezaInfaz(unittest.TestCase):
+
+    def setUp(self):
+        self.motor = InfazMotoru()
+
+    def test_adi_suc_after_2020(self):
+        """Adî suçta cezanın yarısı, denetimli serbestlik 1 yıl; mahsup yatardan düşülür"""
+        girdi = girdi_from_dict({'suc_turu': 'adi', 'ceza_yil': 6, 'suc_tarihi': '2021-05-01',
+                                 'mahsup_gun': 65, 'infaz_baslangic': '2024-01-01'})
+        sonuc = self.motor.hesapla(girdi)
+
+        self.assertEqual(sonuc.toplam_gun, 6 * 365)
+        self.assertEqual(sonuc.kosullu_saliverilme_gun, 3 * 365)
+        self.assertEqual(sonuc.denetimli_serbestlik_gun, 365)
+        self.assertEqual(sonuc.yatar_gun, 3 * 365 - 65 - 365)
+        self.assertEqual(sonuc.kosullu_saliverilme_tarihi, date(2024, 1, 1) + timedelta(days=3 * 365 - 65))
+        self.assertEqual(sonuc.denetimli_serbestlik_tarihi, date(2024, 1, 1) + timedelta(days=sonuc.yatar_gun))
+        self.assertEqual(sonuc.kapali_gun, 219)
+
+    def test_gecici_madde_before_2020(self):
+        """30.03.2020 öncesi suçlarda denetimli serbestlik 3 yıl, özel durumda 4 yıl"""
+        base = {'suc_turu': 'adi', 'ceza_yil': 12, 'suc_tarihi': '29.03.2020'}
+        self.assertEqual(self.motor.hesapla(girdi_from_dict(base)).denetimli_serbestlik_gun, 3 * 365)
+        ozel = dict(base, ozel_durum='70_yas')
+        self.assertEqual(self.motor.hesapla(girdi_from_dict(ozel)).denetimli_serbestlik_gun, 4 * 365)
+        # Kapsam dışı suçlarda geçici madde uygulanmaz
+        teror = dict(base, suc_turu='teror')
+        sonuc = self.motor.hesapla(girdi_from_dict(teror))
+        self.assertEqual((sonuc.kosullu_saliverilme_gun, sonuc.denetimli_serbestlik_gun), (9 * 365, 365))
+
+    def test_muebbet_and_form_ratio(self):
+        sonuc = self.motor.hesapla(girdi_from_dict({'suc_turu': 'teror', 'ceza_turu': 'agirlastirilmis',
+                                                    'suc_tarihi': '2022-01-01'}))
+        self.assertEqual(sonuc.kosullu_saliverilme_gun, 36 * 365)
+        self.assertIsNone(sonuc.tahliye_tarihi)
+        # Sayfadaki oran değerleri de kabul edilir (0.66 = 2/3)
+        girdi = girdi_from_dict({'suc_turu': 0.66, 'ceza_yil': 3, 'suc_tarihi': '2022-01-01'})
+        self.assertEqual(self.motor.hesapla(girdi).kosullu_saliverilme_gun, 730)
+
+    def test_cache_keyed_by_normalized_input(self):
+        """Aynı ceza durumundaki hükümlüler bir kez hesaplanır"""
+        items = [{'id': i, 'suc_turu': 'adi', 'ceza_yil': 2, 'ceza_ay': i % 3, 'suc_tarihi': '2021-01-01'}
+                 for i in range(3000)]
+        results = self.motor.hesapla_toplu(items)
+
+        self.assertEqual(len(results), 3000)
+        self.assertEqual(results[5]['id'], 5)
+        info = self.motor.cache_info()
+        self.assertEqual((info.misses, info.hits), (3, 2997))
+
+    def test_rule_change_recalculates(self):
+        items = [{'suc_turu': 'adi', 'ceza_yil': 4, 'suc_tarihi': '2023-01-01'}]
+        self.assertEqual(self.motor.hesapla_toplu(items)[0]['denetimli_serbestlik_gun'], 365)
+        self.motor.update_rules(surum='yeni', denetimli_serbestlik_gun=2 * 365)
+        self.assertEqual(self.motor.hesapla_toplu(items)[0]['denetimli_serbestlik_gun'], 2 * 365)
+        self.assertEqual(self.motor.cache_info().currsize, 1)
+
+    def test_errors_and_export(self):
+        results = self.motor.hesapla_toplu([
+            {'id': 'A', 'suc_turu': 'adi', 'ceza_ay': 8, 'suc_tarihi': '2023-01-01', 'infaz_baslangic': '2024-01-01'},
+            {'id': 'B', 'suc_turu': 'yok', 'ceza_yil': 1, 'suc_tarihi': '2023-01-01'},
+            {'id': 'C', 'suc_turu': 'adi', 'suc_tarihi': '2023-01-01'},
+        ])
+        self.assertEqual(summarize(results)['hatali'], 2)
+        self.assertEqual(summarize(results)['en_yakin_denetimli_serbestlik'], '2024-01-01')
+
+        content = results_to_csv(results)
+        self.assertTrue(content.startswith('\ufeff'))
+        rows = list(csv.reader(io.StringIO(content[1:]), delimiter=';'))
+        self.assertEqual(rows[1][:3], ['A', 'adi', '240'])
+        self.assertIn('bilinmeyen suç türü', rows[2][-1])
+
+        with self.assertRaises(CezaInfazError):
+            self.motor.hesapla_toplu({'suc_turu': 'adi'})
+        self.assertEqual(format_sure(400), '1 yıl 1 ay 5 gün')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Örnek dilekçe önizleme önbelleği testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import unittest
+import zipfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import dilekce_previews
+from dilekce_previews import get_rendition, invalidate_renditions, prepare_rendition, schedule_rendition
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml"
+ ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="word/document.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>
+</Relationships>"""
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body>
+</w:document>"""
+
+
+def write_docx(path, text):
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        archive.writestr('word/document.xml', DOCUMENT.format(text=text))
+
+
+class TestDilekcePreviews(unittest.TestCase):
+    """DOCX önizleme önbelleği testleri"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.work_dir, 'onizleme')
+        self.docx_path = os.path.join(self.work_dir, 'ihtarname_1700000000_ornek.docx')
+        write_docx(self.docx_path, 'Keşide edilen ihtarname')
+        dilekce_previews._memory_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_prepare_and_get_rendition(self):
+        """Hazırlanan önizleme bellekten ve diskten okunabilir"""
+        key, html = prepare_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path)
+
+        self.assertIn('Keşide edilen ihtarname', html)
+        self.assertIn('ornek.docx', html)
+        self.assertEqual(get_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path), (key, html))
+
+        dilekce_previews._memory_cache.clear()
+        self.assertEqual(get_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path), (key, html))
+
+    def test_changed_file_misses_cache(self):
+        """Kaynak dosya değişince eski önizleme kullanılmaz ve yenisiyle değiştirilir"""
+        old_key, _ = prepare_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path)
+
+        write_docx(self.docx_path, 'Yeni metin')
+        future = time.time() + 60
+        os.utime(self.docx_path, (future, future))
+        self.assertIsNone(get_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path))
+
+        new_key, html = prepare_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path)
+        self.assertNotEqual(old_key, new_key)
+        self.assertIn('Yeni metin', html)
+        self.assertEqual(os.listdir(self.cache_dir), [f"{new_key}.html"])
+
+    def test_renamed_petition_misses_cache(self):
+        """Başlık değişince eski başlıklı önizleme sunulmaz ve silinir"""
+        old_key, _ = prepare_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path)
+        self.assertIsNone(get_rendition(self.cache_dir, 7, 'ihtarname.docx', self.docx_path))
+
+        new_key, html = prepare_rendition(self.cache_dir, 7, 'ihtarname.docx', self.docx_path)
+        self.assertNotEqual(old_key, new_key)
+        self.assertIn('ihtarname.docx', html)
+        self.assertEqual(os.listdir(self.cache_dir), [f"{new_key}.html"])
+
+    def test_new_version_is_scheduled_while_old_one_is_pending(self):
+        """Bekleyen iş yalnızca aynı anahtar için tekrar gönderilmeyi engeller"""
+        self.addCleanup(dilekce_previews._pending.clear)
+        with patch.object(dilekce_previews, '_executor') as executor:
+            self.assertTrue(schedule_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path))
+            self.assertFalse(schedule_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path))
+            self.assertTrue(schedule_rendition(self.cache_dir, 7, 'ihtarname.docx', self.docx_path))
+        self.assertEqual(executor.submit.call_count, 2)
+
+    def test_invalidate_renditions(self):
+        """Dilekçe düzenlenince/silinince yalnızca onun önizlemeleri silinir"""
+        prepare_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path)
+        other_key, _ = prepare_rendition(self.cache_dir, 70, 'diger.docx', self.docx_path)
+
+        invalidate_renditions(self.cache_dir, 7)
+
+        self.assertIsNone(get_rendition(self.cache_dir, 7, 'ornek.docx', self.docx_path))
+        self.assertIsNotNone(get_rendition(self.cache_dir, 70, 'diger.docx', self.docx_path))
+        self.assertEqual(os.listdir(self.cache_dir), [f"{other_key}.html"])
+
+    def test_non_docx_is_not_prepared(self):
+        """DOCX dışındaki dosyalar için önizleme üretilmez"""
+        pdf_path = os.path.join(self.work_dir, 'ornek.pdf')
+        open(pdf_path, 'wb').close()
+        self.assertIsNone(prepare_rendition(self.cache_dir, 8, 'ornek.pdf', pdf_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
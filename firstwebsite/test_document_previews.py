@@ -0,0 +1,162 @@
+"""
+Belge önizleme servisi testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from PIL import Image
+
+import document_previews
+from document_previews import (generate_previews, get_preview_dir, get_preview_manifest,
+                               get_preview_source, remove_previews)
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+class TestDocumentPreviews(unittest.TestCase):
+    """Küçük resim ve sayfa önizleme testleri"""
+
+    def setUp(self):
+        self.upload_folder = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.upload_folder, '1_1700000000_tebligat.png')
+        Image.new('RGB', (1240, 1754), 'white').save(self.image_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.upload_folder, ignore_errors=True)
+
+    def test_image_preview_generation(self):
+        """Resim dosyası için küçük resim ve sayfa görüntüsü üretilir"""
+        manifest = generate_previews(self.image_path, self.image_path)
+
+        preview_dir = get_preview_dir(self.image_path)
+        self.assertEqual(manifest['page_count'], 1)
+        self.assertEqual(manifest['pages'], ['page_001.png'])
+
+        with Image.open(os.path.join(preview_dir, manifest['thumbnail'])) as thumb:
+            self.assertLessEqual(thumb.size[0], document_previews.THUMBNAIL_SIZE[0])
+            self.assertLessEqual(thumb.size[1], document_previews.THUMBNAIL_SIZE[1])
+
+        self.assertEqual(get_preview_manifest(self.image_path), manifest)
+
+    def test_multipage_tiff_preview(self):
+        """Çok sayfalı TIFF her sayfa için görüntü üretir"""
+        tiff_path = os.path.join(self.upload_folder, '1_1700000000_evrak.tif')
+        frames = [Image.new('RGB', (600, 800), color) for color in ('white', 'gray', 'black')]
+        frames[0].save(tiff_path, save_all=True, append_images=frames[1:])
+
+        manifest = generate_previews(tiff_path, tiff_path)
+        self.assertEqual(manifest['page_count'], 3)
+        self.assertEqual(len(manifest['pages']), 3)
+
+    def test_stale_preview_is_ignored(self):
+        """Kaynak dosya önizlemeden yeniyse manifest geçersiz sayılır"""
+        generate_previews(self.image_path, self.image_path)
+        future = time.time() + 60
+        os.utime(self.image_path, (future, future))
+
+        self.assertIsNone(get_preview_manifest(self.image_path, self.image_path))
+
+    def test_preview_source_never_converts(self):
+        """PDF sürümü olmayan UDF için önizleme kaynağı yoktur"""
+        udf_path = os.path.join(self.upload_folder, '1_1700000000_dilekce.udf')
+        open(udf_path, 'wb').close()
+        pdf_name = '1_1700000001_converted_dilekce.pdf'
+
+        self.assertIsNone(get_preview_source(self.upload_folder, os.path.basename(udf_path)))
+        self.assertIsNone(get_preview_source(self.upload_folder, os.path.basename(udf_path), pdf_name))
+
+        open(os.path.join(self.upload_folder, pdf_name), 'wb').close()
+        self.assertEqual(
+            get_preview_source(self.upload_folder, os.path.basename(udf_path), pdf_name),
+            os.path.join(self.upload_folder, pdf_name)
+        )
+
+    def test_pdf_pages_are_rasterized(self):
+        """PDF sayfaları pdftoppm ile görüntüye çevrilir, sayfa sayısı PDF'ten okunur"""
+        pdf_path = self.write_pdf(3)
+        # pdftoppm yerine geçen betik: verilen sayfa aralığı için boş PNG yazar
+        fake = os.path.join(self.upload_folder, 'pdftoppm')
+        with open(fake, 'w') as f:
+            f.write(f"#!{sys.executable}\n"
+                    "import sys\n"
+                    "from PIL import Image\n"
+                    "args = sys.argv[1:]\n"
+                    "first, last = int(args[args.index('-f') + 1]), int(args[args.index('-l') + 1])\n"
+                    "for page in range(first, last + 1):\n"
+                    "    Image.new('RGB', (935, 1285), 'white').save(f'{args[-1]}-{page}.png')\n")
+        os.chmod(fake, 0o755)
+
+        with patch.dict(sys.modules, {'fitz': None}), \
+                patch('document_previews.shutil.which', return_value=fake):
+            manifest = generate_previews(pdf_path, pdf_path, max_pages=2)
+
+        self.assertEqual(manifest['page_count'], 3)
+        self.assertEqual(manifest['pages'], ['page_001.png', 'page_002.png'])
+        with Image.open(os.path.join(get_preview_dir(pdf_path), 'page_001.png')) as page:
+            self.assertLessEqual(page.size[1], document_previews.PAGE_SIZE[1])
+
+    @unittest.skipUnless(document_previews.shutil.which('pdftoppm') or _has_module('fitz'),
+                         "PyMuPDF veya pdftoppm kurulu değil")
+    def test_pdf_rendering(self):
+        """Kurulu PDF işleyicisiyle gerçek sayfa görüntüsü üretilir"""
+        pdf_path = self.write_pdf(2)
+        manifest = generate_previews(pdf_path, pdf_path)
+        self.assertEqual((manifest['page_count'], len(manifest['pages'])), (2, 2))
+
+    def test_concurrent_generation_keeps_complete_preview(self):
+        """Aynı belge için eşzamanlı üretimler tam bir önizleme klasörü bırakır"""
+        errors = []
+
+        def generate():
+            try:
+                generate_previews(self.image_path, self.image_path)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=generate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(os.listdir(get_preview_dir(self.image_path))),
+                         ['manifest.json', 'page_001.png', 'thumb.png'])
+        self.assertEqual(sorted(os.listdir(self.upload_folder)),
+                         sorted([os.path.basename(self.image_path), os.path.basename(get_preview_dir(self.image_path))]))
+
+    def write_pdf(self, pages):
+        from reportlab.pdfgen import canvas
+
+        pdf_path = os.path.join(self.upload_folder, '1_1700000000_evrak.pdf')
+        pdf = canvas.Canvas(pdf_path)
+        for page in range(pages):
+            pdf.drawString(72, 720, f"Sayfa {page + 1}")
+            pdf.showPage()
+        pdf.save()
+        return pdf_path
+
+    def test_remove_previews(self):
+        """Belge silinince önizleme klasörü de silinir"""
+        generate_previews(self.image_path, self.image_path)
+        remove_previews(self.image_path)
+        self.assertFalse(os.path.exists(get_preview_dir(self.image_path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
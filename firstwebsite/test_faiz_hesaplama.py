@@ -0,0 +1,145 @@
+"""
+Toplu faiz hesaplama motoru testleri
+"""
+
+import os
+import sys
+import csv
+import io
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from faiz_hesaplama import (FaizHesaplamaError, InterestEngine, RateTable, results_to_csv,
+                            summarize)
+
+
+class RateSchedules:
+    """Faiz oranları servisinin hesaplama motorunun kullandığı kısmı"""
+
+    def __init__(self, schedules):
+        self.schedules = schedules
+        self.revision = 1
+
+    def rate_schedule(self, oran_turu):
+        return self.schedules.get(oran_turu, [])
+
+
+SCHEDULES = {
+    'yasal': [(date(2006, 1, 1), 9.0), (date(2024, 6, 1), 24.0)],
+    'avans': [(date(2000, 1, 1), 14.75), (date(2024, 6, 21), 49.25), (date(2024, 12, 27), 46.75)],
+}
+
+
+class TestRateTable(unittest.TestCase):
+
+    def test_factor_matches_period_sum(self):
+        """Birikimli çarpan farkı dönem dönem hesaplanan faize eşittir"""
+        table = RateTable(SCHEDULES['avans'])
+        start, end = date(2024, 1, 1).toordinal(), date(2025, 2, 1).toordinal()
+
+        by_periods = sum(rate * days / 36500 for _, _, rate, days in table.periods(start, end))
+        self.assertAlmostEqual(table.factor(end) - table.factor(start), by_periods)
+        self.assertEqual([rate for _, _, rate, _ in table.periods(start, end)], [14.75, 49.25, 46.75])
+
+    def test_before_first_rate(self):
+        table = RateTable(SCHEDULES['yasal'])
+        start, end = date(2005, 12, 1).toordinal(), date(2006, 1, 31).toordinal()
+        self.assertEqual(table.uncovered_days(start, end), 31)
+        self.assertAlmostEqual(table.factor(end) - table.factor(start), 9.0 * 30 / 36500)
+
+
+class TestInterestEngine(unittest.TestCase):
+    """Toplu hesaplama"""
+
+    def setUp(self):
+        self.rates = RateSchedules(SCHEDULES)
+        self.engine = InterestEngine(self.rates)
+
+    def test_single_rate_period(self):
+        """Tek oran döneminde faiz = anapara * oran * gün / 36500"""
+        [result] = self.engine.calculate([{'id': 'A1', 'anapara': '100.000,00', 'baslangic': '2023-01-01',
+                                           'bitis': '2024-01-01'}])
+        self.assertEqual(result.gun, 365)
+        self.assertAlmostEqual(result.faiz, 9000.0)
+        self.assertEqual(result.to_dict()['toplam'], 109000.0)
+
+    def test_split_by_rate_change(self):
+        """Oran değişikliğini kapsayan aralık dönemlere bölünür"""
+        [result] = self.engine.calculate([{'anapara': 36500, 'baslangic': '2024-05-22', 'bitis': '2024-06-11'}],
+                                         detay=True)
+        # 10 gün %9 + 10 gün %24
+        self.assertAlmostEqual(result.faiz, 90.0 + 240.0)
+        self.assertEqual([(d['oran'], d['gun'], d['faiz']) for d in result.donemler],
+                         [(9.0, 10, 90.0), (24.0, 10, 240.0)])
+
+    def test_bulk_mixed_rate_types(self):
+        """Alacak bazında oran türü, ticari takma adı ve sabit oran"""
+        receivables = [{'id': i, 'anapara': 1000 * (i + 1), 'baslangic': '2024-01-01'} for i in range(2000)]
+        receivables.append({'id': 'ticari', 'anapara': 36500, 'baslangic': '2024-12-26',
+                            'bitis': '2024-12-28', 'oran_turu': 'ticari'})
+        receivables.append({'id': 'sabit', 'anapara': 36500, 'baslangic': '2024-01-01',
+                            'bitis': '2024-01-11', 'sabit_oran': 50})
+
+        results = self.engine.calculate(receivables, end=date(2025, 1, 1))
+
+        self.assertEqual(len(results), 2002)
+        self.assertAlmostEqual(results[-2].faiz, 49.25 + 46.75)
+        self.assertAlmostEqual(results[-1].faiz, 500.0)
+        self.assertEqual(results[-1].oran_turu, 'sabit')
+        self.assertEqual(results[1].faiz, results[0].faiz * 2)
+        self.assertEqual(summarize(results)['adet'], 2002)
+
+    def test_tables_rebuilt_on_revision(self):
+        self.engine.calculate([{'anapara': 1, 'baslangic': '2024-01-01'}])
+        self.rates.schedules = {'yasal': [(date(2006, 1, 1), 12.0)]}
+        self.rates.revision += 1
+        [result] = self.engine.calculate([{'anapara': 36500, 'baslangic': '2024-01-01', 'bitis': '2024-01-02'}])
+        self.assertAlmostEqual(result.faiz, 12.0)
+
+    def test_invalid_input(self):
+        """Hatalı alacaklar diğerlerini durdurmaz, 'hata' alanıyla döner"""
+        results = self.engine.calculate([
+            {'id': 'A1', 'anapara': 100, 'baslangic': '01.01.2024'},
+            {'id': 'A2', 'anapara': 100, 'baslangic': '2024-02-01', 'bitis': '2024-01-01'},
+            {'id': 'A3', 'anapara': 100, 'baslangic': '2024-01-01', 'oran_turu': 'yok'},
+            'alacak',
+            {'id': 'A5', 'anapara': 36500, 'baslangic': '2024-01-01', 'bitis': '2024-01-02'},
+        ])
+
+        errors = [result.to_dict() for result in results[:4]]
+        self.assertEqual([error['id'] for error in errors], ['A1', 'A2', 'A3', None])
+        self.assertIn('1. alacak', errors[0]['hata'])
+        self.assertIn('3. alacak', errors[2]['hata'])
+        self.assertAlmostEqual(results[4].faiz, 9.0)
+        self.assertEqual(summarize(results), {'adet': 5, 'hatali': 4, 'anapara': 36500.0,
+                                              'faiz': 9.0, 'toplam': 36509.0})
+        with self.assertRaises(FaizHesaplamaError):
+            self.engine.calculate({'anapara': 100})
+
+    def test_period_before_first_rate_is_refused(self):
+        """Oranın tanımlı olmadığı döneme faiz yürütülmez"""
+        [error] = self.engine.calculate([{'anapara': 100, 'baslangic': '2005-06-01', 'bitis': '2006-06-01'}])
+        self.assertIn('01.01.2006', error.hata)
+        [result] = self.engine.calculate([{'anapara': 100, 'baslangic': '2005-06-01', 'sabit_oran': 10}],
+                                         end=date(2006, 6, 1))
+        self.assertGreater(result.faiz, 0)
+
+    def test_csv_export(self):
+        results = self.engine.calculate([{'id': 'A1', 'anapara': 1000.5, 'baslangic': '2023-01-01',
+                                          'bitis': '2024-01-01'},
+                                         {'id': 'A2', 'anapara': 'yok', 'baslangic': '2023-01-01'}])
+        content = results_to_csv(results)
+
+        self.assertTrue(content.startswith('\ufeff'))
+        rows = list(csv.reader(io.StringIO(content[1:]), delimiter=';'))
+        self.assertEqual((rows[0][0], rows[0][-1]), ('id', 'hata'))
+        self.assertEqual(rows[1][:3], ['A1', '1000,5', '2023-01-01'])
+        self.assertEqual(rows[1][-1], '')
+        self.assertEqual(rows[2][:2], ['A2', ''])
+        self.assertIn('anapara', rows[2][-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
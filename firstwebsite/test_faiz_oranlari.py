@@ -0,0 +1,124 @@
+"""
+TCMB faiz oranları servisi testleri
+"""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import Flask
+
+from models import db, FaizOrani
+from faiz_oranlari import FaizOranlariService, parse_tcmb_rates
+
+TCMB_HTML = """
+<html><body>
+<table>
+  <tr><th>Yürürlük Tarihi</th><th>Reeskont İşlemlerinde (%)</th><th>Avans İşlemlerinde (%)</th></tr>
+  <tr><td>21.06.2024</td><td>48,25</td><td>49,25</td></tr>
+  <tr><td>27.12.2024</td><td>45,75</td><td>46,75</td></tr>
+  <tr><td>Açıklama</td><td>-</td><td>-</td></tr>
+</table>
+</body></html>
+"""
+
+
+class TestParseTcmbRates(unittest.TestCase):
+
+    def test_parse_table(self):
+        """Tarihli satırlar (tarih, reeskont, avans) olarak sıralı döner"""
+        self.assertEqual(parse_tcmb_rates(TCMB_HTML), [
+            (date(2024, 6, 21), 48.25, 49.25),
+            (date(2024, 12, 27), 45.75, 46.75),
+        ])
+
+    def test_no_table(self):
+        self.assertEqual(parse_tcmb_rates("<html><p>Bakımda</p></html>"), [])
+
+
+class TestFaizOranlariService(unittest.TestCase):
+    """Yürürlük tarihli oran tablosu"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        self.fetched = parse_tcmb_rates(TCMB_HTML)
+        self.service = FaizOranlariService(fetcher=lambda: self.fetched)
+
+    def tearDown(self):
+        db.session.remove()
+        self.context.pop()
+
+    def test_seeded_defaults(self):
+        """Boş tabloya başlangıç oranları yüklenir"""
+        self.assertEqual(self.service.rate_on('yasal', date(2020, 1, 1)), 9.0)
+        self.assertEqual(self.service.rate_on('yasal', date(2024, 6, 1)), 24.0)
+        self.assertIsNone(self.service.rate_on('yasal', date(2005, 12, 31)))
+        # TCMB verisi gelmeden reeskont için uydurma oran kullanılmaz
+        self.assertIsNone(self.service.current_rates(date(2024, 1, 1))['reeskont'])
+
+    def test_refresh_adds_effective_dated_rates(self):
+        """TCMB oranları yürürlük tarihleriyle eklenir, tekrar çekmek kayıt çoğaltmaz"""
+        self.assertEqual(self.service.refresh(), 4)
+        self.assertEqual(self.service.refresh(), 0)
+
+        self.assertIsNone(self.service.rate_on('reeskont', date(2024, 6, 20)))
+        self.assertEqual(self.service.rate_on('reeskont', date(2024, 6, 21)), 48.25)
+        self.assertEqual(self.service.rate_on('avans', date(2025, 3, 1)), 46.75)
+        self.assertEqual(FaizOrani.query.filter_by(kaynak='tcmb').count(), 4)
+
+    def test_refresh_keeps_manual_rates(self):
+        """Elle girilen oranın üzerine TCMB verisi yazılmaz"""
+        self.service.load()
+        db.session.add(FaizOrani(oran_turu='avans', yururluk_tarihi=date(2024, 6, 21), oran=50.0, kaynak='manuel'))
+        db.session.commit()
+
+        self.service.refresh()
+        self.assertEqual(self.service.rate_on('avans', date(2024, 7, 1)), 50.0)
+
+    def test_set_rate(self):
+        """Temerrüt ve mevduat oranları elle girilir, aynı tarihli kayıt düzeltilir"""
+        self.service.set_rate('mevduat', date(2024, 1, 1), 45.0)
+        self.service.set_rate('temerrut', date(2024, 1, 1), 50.0)
+        self.service.set_rate('temerrut', date(2024, 1, 1), 51.5)
+
+        rates = self.service.current_rates(date(2024, 6, 1))
+        self.assertEqual(rates['mevduat'], 45.0)
+        self.assertEqual(rates['temerrut'], 51.5)
+        self.assertEqual(FaizOrani.query.filter_by(oran_turu='temerrut', kaynak='manuel').count(), 1)
+        with self.assertRaises(ValueError):
+            self.service.set_rate('bilinmeyen', date(2024, 1, 1), 10.0)
+        with self.assertRaises(ValueError):
+            self.service.set_rate('mevduat', date(2024, 1, 1), -1)
+
+    def test_failed_refresh_keeps_local_rates(self):
+        """TCMB'ye ulaşılamazsa yerel oranlar kullanılmaya devam eder"""
+        def fail():
+            raise ConnectionError("zaman aşımı")
+        service = FaizOranlariService(fetcher=fail)
+
+        self.assertEqual(service.refresh(), 0)
+        self.assertIn("zaman aşımı", service.last_refresh_error)
+        self.assertFalse(service.is_stale())
+        self.assertEqual(service.current_rates(date(2025, 1, 1))['yasal'], 24.0)
+
+    def test_rate_periods(self):
+        """Aralık oran değişikliklerinden bölünür"""
+        self.service.refresh()
+        self.assertEqual(self.service.rate_periods('reeskont', date(2024, 6, 1), date(2025, 1, 1)), [
+            (date(2024, 6, 21), date(2024, 12, 27), 48.25),
+            (date(2024, 12, 27), date(2025, 1, 1), 45.75),
+        ])
+        self.assertEqual(self.service.rate_periods('yasal', date(2005, 6, 1), date(2006, 6, 1)),
+                         [(date(2006, 1, 1), date(2006, 6, 1), 9.0)])
+        self.assertEqual(self.service.rate_periods('yasal', date(2006, 6, 1), date(2006, 6, 1)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
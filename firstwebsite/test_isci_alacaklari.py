@@ -0,0 +1,126 @@
+"""
+İşçi alacakları hesaplama motoru testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from isci_alacaklari import (CeilingTable, IsciAlacagiError, IsciBilgisi, annual_leave_entitlement,
+                             calculate, calculate_batch, isci_from_dict, isci_from_tutanak,
+                             notice_weeks, parse_amount, service_duration, summarize)
+
+TAVANLAR = """# Test tavanları
+2024-01-01|35058.58
+2024-07-01|41828.42
+hatalı satır
+"""
+
+
+class TestIsciAlacaklari(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.tavan_file = os.path.join(self.work_dir, 'kidem_tavanlari.txt')
+        with open(self.tavan_file, 'w', encoding='utf-8') as f:
+            f.write(TAVANLAR)
+        self.ceilings = CeilingTable(self.tavan_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_helpers(self):
+        self.assertEqual(service_duration(date(2020, 1, 1), date(2024, 12, 31)), (5, 0, 0))
+        self.assertEqual(service_duration(date(2020, 1, 15), date(2020, 3, 20)), (0, 2, 6))
+        self.assertEqual([notice_weeks(d) for d in (100, 200, 600, 2000)], [2, 4, 6, 8])
+        self.assertEqual(annual_leave_entitlement(6), 5 * 14 + 20)
+        self.assertEqual(annual_leave_entitlement(16), 5 * 14 + 9 * 20 + 2 * 26)
+        self.assertEqual(parse_amount('25.000 TL'), 25000.0)
+        self.assertEqual(parse_amount('haftada 10 saat'), 10.0)
+        self.assertEqual(parse_amount('17.002,12'), 17002.12)
+
+    def test_ceiling_periods(self):
+        """Tavan, çıkış tarihinde yürürlükte olan dönemden alınır"""
+        self.assertEqual(self.ceilings.period_on(date(2024, 6, 30)), (date(2024, 1, 1), 35058.58))
+        self.assertEqual(self.ceilings.ceiling_on(date(2025, 1, 1)), 41828.42)
+        self.assertEqual(self.ceilings.period_on(date(2023, 12, 31)), (None, None))
+
+    def test_ceiling_reload_on_change(self):
+        self.ceilings.ceiling_on(date(2025, 1, 1))
+        with open(self.tavan_file, 'a', encoding='utf-8') as f:
+            f.write("2025-01-01|46655.43\n")
+        self.assertEqual(self.ceilings.ceiling_on(date(2025, 1, 1)), 46655.43)
+
+    def test_kidem_with_ceiling(self):
+        """Giydirilmiş ücret tavanı aşarsa tavan esas alınır"""
+        isci = IsciBilgisi(baslangic=date(2020, 1, 1), bitis=date(2024, 12, 31), brut_ucret=40000,
+                           yan_haklar=5000, talepler=('kidem', 'ihbar'))
+        result = calculate(isci, self.ceilings)
+
+        kidem = result.alacaklar['kidem']
+        self.assertTrue(kidem['tavan_uygulandi'])
+        self.assertEqual(kidem['tavan_donemi'], '2024-07-01')
+        self.assertAlmostEqual(kidem['brut'], 41828.42 * 5, places=2)
+        self.assertAlmostEqual(kidem['net'], round(41828.42 * 5 * (1 - 0.00759), 2), places=1)
+        self.assertNotIn('gelir_vergisi', kidem['kesintiler'])
+
+        ihbar = result.alacaklar['ihbar']
+        self.assertEqual(ihbar['hafta'], 8)
+        self.assertAlmostEqual(ihbar['brut'], 45000 / 30 * 56)
+        self.assertIn('gelir_vergisi', ihbar['kesintiler'])
+
+    def test_short_service_has_no_kidem(self):
+        isci = IsciBilgisi(baslangic=date(2024, 3, 1), bitis=date(2024, 10, 1), brut_ucret=30000)
+        result = calculate(isci, self.ceilings)
+        self.assertNotIn('kidem', result.alacaklar)
+        self.assertEqual(len(result.uyarilar), 1)
+        self.assertEqual(result.alacaklar['ihbar']['hafta'], 4)
+
+    def test_overtime_leave_and_ubgt(self):
+        isci = IsciBilgisi(baslangic=date(2022, 1, 1), bitis=date(2023, 12, 31), brut_ucret=22500,
+                           haftalik_fazla_mesai_saat=10, kullanilan_izin_gun=4, ubgt_gun_yillik=10,
+                           talepler=('fazla_mesai', 'yillik_izin', 'ubgt'))
+        result = calculate(isci, self.ceilings)
+
+        self.assertAlmostEqual(result.alacaklar['fazla_mesai']['brut'], round(10 * 730 / 7 * 100 * 1.5, 2))
+        self.assertEqual(result.alacaklar['yillik_izin']['kalan_gun'], 24)
+        self.assertAlmostEqual(result.alacaklar['yillik_izin']['brut'], 24 * 750)
+        self.assertAlmostEqual(result.alacaklar['ubgt']['brut'], round(10 * 730 / 365 * 750, 2))
+        self.assertLess(result.toplam_net, result.toplam_brut)
+
+    def test_batch_and_tutanak(self):
+        """Kayıtlı tutanaklar ve hatalı kayıtlar tek geçişte işlenir"""
+        tutanak = SimpleNamespace(
+            id=7, name='Ali Veli', startDate='01.01.2020/05.01.2020', endDate='31.12.2024',
+            department='50.000 TL', overtime='Haftada 12 saat', annualLeave='Hiç kullanmadı',
+            severancePayOption='yes', noticePayOption='no', overtimePayOption='yes',
+            annualLeavePayOption='no', ubgtPayOption='no')
+        isci = isci_from_tutanak(tutanak)
+        self.assertEqual((isci.baslangic, isci.brut_ucret, isci.haftalik_fazla_mesai_saat),
+                         (date(2020, 1, 1), 50000.0, 12.0))
+        self.assertEqual(isci.talepler, ('kidem', 'fazla_mesai'))
+
+        items = [isci, isci_from_dict({'baslangic': '2023-01-01', 'bitis': '2024-06-30', 'brut_ucret': 30000})]
+        try:
+            isci_from_dict({'baslangic': '2023-01-01'}, 2)
+        except IsciAlacagiError as e:
+            items.append(e)
+
+        results = calculate_batch(items, self.ceilings)
+        self.assertEqual(sorted(results[0]['alacaklar']), ['fazla_mesai', 'kidem'])
+        self.assertEqual(results[1]['alacaklar']['kidem']['tavan_donemi'], '2024-01-01')
+        self.assertIn('hata', results[2])
+        self.assertEqual(summarize(results)['hatali'], 1)
+
+        with self.assertRaises(IsciAlacagiError):
+            isci_from_dict({'baslangic': '2023-01-01', 'bitis': '2024-01-01', 'brut_ucret': 1, 'talepler': ['yok']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Sözleşme PDF üretimi ve önbellek testleri
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from pypdf import PdfReader
+
+import sozlesme_pdf
+from sozlesme_pdf import (build_contracts_zip, contract_cache_key, discard_contract_pdf,
+                          render_contract_pdf, render_contract_pdf_cached)
+
+DEFINITION = {
+    'content': [
+        {'text': 'AVUKATLIK ÜCRET SÖZLEŞMESİ', 'style': 'header', 'alignment': 'center'},
+        {'text': '\n'},
+        {'columns': [
+            {'width': '*', 'text': 'İŞ SAHİBİ: Ayşe Yılmaz\nADRESİ: Güneşli/İstanbul'},
+            {'width': '*', 'text': 'AVUKAT: Av. Mustafa KAPLAN'}
+        ], 'columnGap': 20},
+        {'text': ['MADDE 1) ', {'text': 'boşanma davası', 'bold': True}, '\n'], 'style': 'paragraph'},
+        {'ul': ['birinci', 'ikinci']},
+        {'table': {'body': [['Kalem', 'Tutar'], ['Ücret', '50.000 TL']]}},
+    ],
+    'styles': {
+        'header': {'fontSize': 14, 'bold': True, 'margin': [0, 0, 0, 10]},
+        'paragraph': {'fontSize': 9, 'alignment': 'justify', 'margin': [0, 2, 0, 2], 'lineHeight': 1.1},
+    },
+    'defaultStyle': {'font': 'Roboto', 'fontSize': 9, 'lineHeight': 1.1},
+}
+
+
+class TestSozlesmePdf(unittest.TestCase):
+    """pdfmake tanımından PDF üretimi"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.icerik_json = json.dumps(DEFINITION, ensure_ascii=False)
+        sozlesme_pdf._memory_cache.clear()
+        sozlesme_pdf._memory_cache_size = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_render_contract_pdf(self):
+        """Türkçe karakterli metin PDF'e aktarılır"""
+        data = render_contract_pdf(self.icerik_json, 'Ayşe Yılmaz Sözleşmesi')
+
+        self.assertTrue(data.startswith(b'%PDF-'))
+        text = PdfReader(io.BytesIO(data)).pages[0].extract_text()
+        self.assertIn('AVUKATLIK ÜCRET SÖZLEŞMESİ', text)
+        self.assertIn('boşanma davası', text)
+        self.assertIn('50.000 TL', text)
+
+    def test_cache_by_content_hash(self):
+        """Aynı içerik ikinci kez üretilmez, farklı içerik farklı anahtar alır"""
+        key, data = render_contract_pdf_cached(self.icerik_json, 'Sözleşme', self.cache_dir)
+        self.assertEqual(os.listdir(self.cache_dir), [f"{key}.pdf"])
+
+        sozlesme_pdf._memory_cache.clear()
+        self.assertEqual(render_contract_pdf_cached(self.icerik_json, 'Sözleşme', self.cache_dir), (key, data))
+
+        changed = self.icerik_json.replace('Ayşe', 'Fatma')
+        self.assertNotEqual(contract_cache_key(changed, 'Sözleşme'), key)
+
+        discard_contract_pdf(self.icerik_json, 'Sözleşme', self.cache_dir)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_title_change_discards_old_pdf(self):
+        """Başlık değişince eski anahtarın PDF'i silinir, yenisi kalır"""
+        render_contract_pdf_cached(self.icerik_json, 'Eski Başlık', self.cache_dir)
+        new_key, _ = render_contract_pdf_cached(self.icerik_json, 'Yeni Başlık', self.cache_dir)
+
+        discard_contract_pdf(self.icerik_json, 'Eski Başlık', self.cache_dir)
+        self.assertEqual(os.listdir(self.cache_dir), [f"{new_key}.pdf"])
+        self.assertEqual(list(sozlesme_pdf._memory_cache), [new_key])
+
+    def test_renders_lock_per_key(self):
+        """Aynı sözleşme bir kez üretilir; farklı sözleşmeler birbirini beklemez"""
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_render(icerik_json, title=''):
+            calls.append(title)
+            if title == 'Yavaş':
+                started.set()
+                release.wait(10)
+            return b'%PDF-' + title.encode('utf-8')
+
+        with patch.object(sozlesme_pdf, 'render_contract_pdf', side_effect=slow_render):
+            threads = [threading.Thread(target=render_contract_pdf_cached,
+                                        args=(self.icerik_json, 'Yavaş', self.cache_dir)) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(started.wait(10))
+
+            # Yavaş üretim sürerken başka bir sözleşme beklemeden üretilir
+            _, data = render_contract_pdf_cached(self.icerik_json, 'Hızlı', self.cache_dir)
+            self.assertEqual(data, '%PDF-Hızlı'.encode('utf-8'))
+
+            release.set()
+            for thread in threads:
+                thread.join(10)
+
+        self.assertEqual(sorted(calls), ['Hızlı', 'Yavaş'])
+        self.assertEqual(sozlesme_pdf._key_locks, {})
+
+    def test_bulk_zip_export(self):
+        """Toplu dışa aktarımda her sözleşme ayrı PDF olarak arşive eklenir"""
+        contracts = [
+            ('ayse_sozlesme', self.icerik_json, 'Ayşe'),
+            ('ayse_sozlesme', self.icerik_json, 'Ayşe'),
+            ('fatma_sozlesme.pdf', self.icerik_json.replace('Ayşe', 'Fatma'), 'Fatma'),
+        ]
+        archive = zipfile.ZipFile(build_contracts_zip(contracts, self.cache_dir))
+
+        self.assertEqual(archive.namelist(),
+                         ['ayse_sozlesme.pdf', 'ayse_sozlesme_2.pdf', 'fatma_sozlesme.pdf'])
+        for name in archive.namelist():
+            self.assertTrue(archive.read(name).startswith(b'%PDF-'))
+        # Aynı içerikli iki sözleşme tek kez üretilir
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
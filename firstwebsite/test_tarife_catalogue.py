@@ -0,0 +1,133 @@
+"""
+Ücret tarifesi kataloğu testleri
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tarife_catalogue import KAPLAN_KEY, TarifeRegistry, compile_tarifeler, parse_amount
+
+KAPLAN_JSON = {
+    "kategoriler": [
+        {"id": "kategori_1", "kategoriAdi": "Danışma", "sira": 1, "hizmetler": [
+            {"id": "hizmet_1", "hizmetAdi": "Danışma Ücreti", "temelUcret": "2500", "ekNot": "deneme", "sira": 1}
+        ]}
+    ]
+}
+
+TARIFE_DOSYASI = """# TARIFE DOSYASI
+ISTBARO_2025|A- Sulh Hukuk Mahkemelerinde Görülen Davalar|IB_A_1|Kat Mülkiyeti Yasasından Kaynaklanan Uyuşmazlıklar|57000|Sabit|TL||
+ISTBARO_2025|A- Sulh Hukuk Mahkemelerinde Görülen Davalar|IB_A_3|Tahliye Davası|55000|Sabit|TL|'den az olmamak üzere yıllık kira bedelinin %10'u|
+ISTBARO_2025|B- Asliye Hukuk Mahkemelerinde Görülen Davalar|IB_B_1|İsim düzeltme davaları|75000|Sabit|TL||
+TBB_2025|Üçüncü Kısım|TBB_3_6|Yüzdelik ücret|5|Yüzdelik|%||
+KAPLAN_OZEL|Dava|KH_DV_01|Marka Hakkına Tecavüz Davası|60000|Sabit|TL||
+BILINMEYEN|Kategori|X_1|Tanınmayan grup|1|Sabit|TL||
+eksik|satır
+KAPLAN HUKUK DANIŞMANLIK ÜCRET TARİFESİ START
+{json}
+KAPLAN HUKUK DANIŞMANLIK ÜCRET TARİFESİ END
+""".replace('{json}', json.dumps(KAPLAN_JSON, ensure_ascii=False, indent=2))
+
+
+class TestTarifeCatalogue(unittest.TestCase):
+    """tarifeler.txt derleme ve hizmet kodu dizini"""
+
+    def setUp(self):
+        self.catalogue = compile_tarifeler(TARIFE_DOSYASI.splitlines(keepends=True))
+
+    def test_api_structure(self):
+        """Tarife grupları ve kategoriler dosyadaki sırayla oluşturulur"""
+        tarifeler = self.catalogue.tarifeler
+
+        self.assertEqual([k["kategori"] for k in tarifeler["İstanbul Barosu"]],
+                         ["A- Sulh Hukuk Mahkemelerinde Görülen Davalar", "B- Asliye Hukuk Mahkemelerinde Görülen Davalar"])
+        tahliye = tarifeler["İstanbul Barosu"][0]["items"][1]
+        self.assertEqual(tahliye["hizmet_adi"], "Tahliye Davası")
+        self.assertEqual(tahliye["original_ucret_str"], "55000")
+        self.assertIn("yıllık kira bedelinin", tahliye["ek_not"])
+        self.assertNotIn("birim", tahliye)
+        self.assertEqual(tarifeler["TBB"][0]["items"][0]["birim"], "%")
+        api = json.loads(self.catalogue.json_bytes)
+        self.assertEqual(api[KAPLAN_KEY], KAPLAN_JSON)
+        self.assertEqual(api["İstanbul Barosu"][0]["items"][1], dict(tahliye))
+
+    def test_catalogue_is_read_only(self):
+        """Paylaşılan katalog yapısı değiştirilemez"""
+        tarifeler = self.catalogue.tarifeler
+        with self.assertRaises(TypeError):
+            tarifeler["TBB"] = []
+        with self.assertRaises(AttributeError):
+            tarifeler["İstanbul Barosu"].append({})
+        with self.assertRaises(TypeError):
+            tarifeler["İstanbul Barosu"][0]["items"][0]["temel_ucret"] = "0"
+        with self.assertRaises(TypeError):
+            tarifeler[KAPLAN_KEY]["kategoriler"][0]["hizmetler"][0]["temelUcret"] = "0"
+        kategori = self.catalogue.categories[("TBB", "Üçüncü Kısım")]
+        self.assertIs(kategori, tarifeler["TBB"][0])
+
+    def test_service_code_lookup(self):
+        """Hizmet koduyla ücret kaydı doğrudan bulunur"""
+        hizmet = self.catalogue.get_service("IB_A_1")
+        self.assertEqual(hizmet["tutar"], 57000.0)
+        self.assertEqual(hizmet["tarife_grubu"], "İstanbul Barosu")
+        self.assertEqual(hizmet["kategori"], "A- Sulh Hukuk Mahkemelerinde Görülen Davalar")
+
+        self.assertEqual(self.catalogue.get_service("KH_DV_01")["hizmet_adi"], "Marka Hakkına Tecavüz Davası")
+        self.assertEqual(self.catalogue.get_service("hizmet_1")["tutar"], 2500.0)
+        self.assertIsNone(self.catalogue.get_service("X_1"))
+        self.assertIsNone(self.catalogue.get_service("YOK"))
+        with self.assertRaises(TypeError):
+            self.catalogue.services["IB_A_1"]["tutar"] = 0
+
+    def test_parse_amount(self):
+        self.assertEqual(parse_amount("1.250,50"), 1250.5)
+        self.assertEqual(parse_amount("57000"), 57000.0)
+        self.assertIsNone(parse_amount("belirsiz"))
+
+
+class TestTarifeRegistry(unittest.TestCase):
+    """Dosya değişikliğinde yeniden derleme"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.work_dir, 'tarifeler.txt')
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            f.write(TARIFE_DOSYASI)
+        self.registry = TarifeRegistry(self.filepath)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_compiled_once(self):
+        self.assertIs(self.registry.catalogue(), self.registry.catalogue())
+
+    def test_reload_on_change(self):
+        """Dosya değişince katalog ve ETag yenilenir"""
+        old = self.registry.catalogue()
+        with open(self.filepath, 'a', encoding='utf-8') as f:
+            f.write("TBB_2025|Birinci Kısım|TBB_1_1|Sözlü danışma|4000|Sabit|TL||\n")
+
+        new = self.registry.catalogue()
+        self.assertIsNot(old, new)
+        self.assertNotEqual(old.etag, new.etag)
+        self.assertEqual(self.registry.get_service("TBB_1_1")["tutar"], 4000.0)
+
+    def test_invalidate(self):
+        old = self.registry.catalogue()
+        self.registry.invalidate()
+        self.assertIsNot(old, self.registry.catalogue())
+
+    def test_missing_file(self):
+        registry = TarifeRegistry(os.path.join(self.work_dir, 'yok.txt'))
+        self.assertEqual(registry.catalogue().tarifeler["TBB"], ())
+        self.assertIsNone(registry.get_service("IB_A_1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
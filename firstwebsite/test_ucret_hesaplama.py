@@ -0,0 +1,202 @@
+"""
+Harç ve vekalet ücreti hesaplama motoru testleri
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import Flask
+
+from models import db, User, CaseFile, DosyaUcretHesabi
+from tarife_catalogue import TarifeRegistry
+from ucret_hesaplama import (BracketTable, HarcTarifeleri, UcretHesaplamaError, UcretMotoru,
+                             acik_dosyalari_yeniden_hesapla, dosya_ucreti_kaydet, islem_ve_mahkeme,
+                             summarize)
+
+HARC = """# Test harç tarifesi
+2024|dava|basvurma_harci|sulh|195.80|MAKTU|
+2024|dava|basvurma_harci|asliye,aile,is,ticaret,tuketici|427.60|MAKTU|
+2024|dava|pesin_harc|*|68.31|BINDE_PESIN|427.60
+2024|icra|pesin_harc|*|5|BINDE|
+2024|dava|yok|uzay|1|MAKTU|
+"""
+
+KATEGORI = "Üçüncü Kısım: Konusu Para Olan veya Para ile Değerlendirilebilen Hukuki Yardımlar"
+TARIFELER = "\n".join([
+    f"TBB_2025|{KATEGORI}|TBB_3_1|İlk 100.000,00 TL için|16|Yüzdelik|%||",
+    f"TBB_2025|{KATEGORI}|TBB_3_2|Sonra gelen 100.000,00 TL için|10|Yüzdelik|%||",
+    f"TBB_2025|{KATEGORI}|TBB_3_3|200.000,00 TL'dan yukarısı için|1|Yüzdelik|%||",
+    "TBB_2025|İkinci Kısım|TBB_2_1_3|Ortaklığın giderilmesi ve taksim davaları için|28500|Maktu|||",
+]) + "\n"
+
+
+class TestBracketTable(unittest.TestCase):
+
+    def test_fee_matches_bracket_sum(self):
+        """Birikimli dilim ücreti, dilim dilim toplamla aynıdır"""
+        table = BracketTable([(400000, 16), (400000, 15), (800000, 14), (None, 1)])
+        self.assertEqual(table.lowers, [0, 400000, 800000, 1600000])
+        self.assertAlmostEqual(table.fee(300000), 48000)
+        self.assertAlmostEqual(table.fee(1000000), 64000 + 60000 + 28000)
+        self.assertAlmostEqual(table.fee(2000000), 64000 + 60000 + 112000 + 4000)
+        self.assertEqual(table.fee(0), 0)
+
+
+class MotorTestCase(unittest.TestCase):
+    """Geçici tarife dosyalarıyla kurulan motor"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.harc_file = os.path.join(self.work_dir, 'harc_tarifeleri.txt')
+        self.tarife_file = os.path.join(self.work_dir, 'tarifeler.txt')
+        with open(self.harc_file, 'w', encoding='utf-8') as f:
+            f.write(HARC)
+        with open(self.tarife_file, 'w', encoding='utf-8') as f:
+            f.write(TARIFELER)
+        self.motor = UcretMotoru(HarcTarifeleri(self.harc_file), TarifeRegistry(self.tarife_file))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class TestUcretMotoru(MotorTestCase):
+
+    def test_harc_by_court_and_year(self):
+        """Sonraki yıllar için yayımlanmış son tarife kullanılır"""
+        result = self.motor.harc_hesapla(1000000, 'dava', 'asliye', 2026)
+        self.assertEqual(result['tarife_yili'], 2024)
+        self.assertEqual(result['kalemler'], {'basvurma_harci': 427.6, 'pesin_harc': 17077.5})
+
+        # Asgari: küçük değerlerde peşin harç maktu tutardan az olamaz
+        small = self.motor.harc_hesapla(10000, 'dava', 'sulh', 2024)
+        self.assertEqual(small['kalemler'], {'basvurma_harci': 195.8, 'pesin_harc': 427.6})
+        self.assertEqual(self.motor.harc_hesapla(200000, 'icra', 'sulh', 2024)['toplam'], 1000.0)
+
+        with self.assertRaises(UcretHesaplamaError):
+            self.motor.harc_hesapla(1000, 'dava', 'asliye', 2023)
+
+    def test_vekalet_from_catalogue(self):
+        self.assertEqual(self.motor.vekalet_hesapla(250000, 2026),
+                         {'tarife_yili': 2025, 'nispi': 16000 + 10000 + 500, 'ucret': 26500})
+        result = self.motor.vekalet_hesapla(50000, 2025, asgari='TBB_2_1_3')
+        self.assertEqual((result['ucret'], result['asgari_uygulandi']), (28500, True))
+
+        with self.assertRaises(UcretHesaplamaError):
+            self.motor.vekalet_hesapla(50000, 2025, asgari='YOK_1')
+        with self.assertRaisesRegex(UcretHesaplamaError, 'tanımlı tarife yılları: 2025'):
+            self.motor.vekalet_hesapla(50000, 2024)
+
+    def test_page_table_matches_engine(self):
+        """Harç hesaplama sayfasına verilen tablo motorla aynı kalemleri taşır"""
+        tarife_yili, tablo = self.motor.harc.tablo(2026)
+        self.assertEqual(tarife_yili, 2024)
+        self.assertEqual(tablo['dava']['sulh'], {
+            'basvurma_harci': {'deger': 195.8, 'tur': 'MAKTU', 'asgari': None},
+            'pesin_harc': {'deger': 68.31, 'tur': 'BINDE_PESIN', 'asgari': 427.6},
+        })
+        self.assertNotIn('uzay', tablo['dava'])
+
+    def test_tables_rebuilt_on_file_change(self):
+        self.motor.hesapla({'dava_degeri': 1000}, 2025)
+        with open(self.harc_file, 'a', encoding='utf-8') as f:
+            f.write("2025|dava|basvurma_harci|asliye|615.40|MAKTU|\n")
+        with open(self.tarife_file, 'a', encoding='utf-8') as f:
+            f.write(f"TBB_2026|{KATEGORI}|TBB_3_1|İlk 100.000,00 TL için|20|Yüzdelik|%||\n")
+            f.write(f"TBB_2026|{KATEGORI}|TBB_3_2|100.000,00 TL'dan yukarısı için|2|Yüzdelik|%||\n")
+
+        result = self.motor.hesapla({'dava_degeri': 200000}, 2026)
+        self.assertEqual(result['harc']['kalemler'], {'basvurma_harci': 615.4})
+        self.assertEqual(result['vekalet'], {'tarife_yili': 2026, 'nispi': 22000, 'ucret': 22000})
+        # Yeni yıl satırları listelenen kataloğu ve hizmet kodlarını değiştirmez
+        self.assertEqual(self.motor.catalogue_registry.get_service('TBB_3_1')['tutar'], 16)
+
+    def test_batch(self):
+        """Hatalı kayıtlar diğerlerini durdurmaz"""
+        items = [{'id': i, 'dava_degeri': 1000 * (i + 1), 'mahkeme': 'aile'} for i in range(1000)]
+        items += [{'id': 'x', 'dava_degeri': 'abc'}, {'id': 'y', 'dava_degeri': 1, 'islem': 'yok'}]
+        results = self.motor.hesapla_toplu(items, 2025)
+
+        self.assertEqual(len(results), 1002)
+        self.assertEqual(results[99]['vekalet']['ucret'], 16000)
+        self.assertEqual(results[999]['vekalet']['ucret'], 16000 + 10000 + 8000)
+        self.assertIn('hata', results[-1])
+        ozet = summarize(results)
+        self.assertEqual((ozet['adet'], ozet['hatali']), (1002, 2))
+        with self.assertRaises(UcretHesaplamaError):
+            self.motor.hesapla_toplu({'dava_degeri': 1})
+
+    def test_case_classification(self):
+        cases = [('hukuk', '3. İş Mahkemesi'), ('hukuk', 'Sulh Hukuk Mahkemesi'),
+                 ('icra', '5. İcra Dairesi'), ('ceza', 'Asliye Ceza Mahkemesi'), ('hukuk', 'Bilinmeyen')]
+        self.assertEqual([islem_ve_mahkeme(SimpleNamespace(file_type=t, department=d)) for t, d in cases],
+                         [('dava', 'is'), ('dava', 'sulh'), ('icra', 'asliye'), (None, None), (None, None)])
+
+
+class TestYayimlananTarifeler(unittest.TestCase):
+    """Depodaki harc_tarifeleri.txt ve tarifeler.txt"""
+
+    def test_2024_calculation(self):
+        motor = UcretMotoru(HarcTarifeleri(), TarifeRegistry())
+        result = motor.hesapla({'dava_degeri': 10000, 'mahkeme': 'sulh'}, 2024)
+
+        self.assertEqual(result['harc']['kalemler']['pesin_harc'], 427.6)
+        self.assertEqual(result['vekalet'], {'tarife_yili': 2024, 'nispi': 1600, 'ucret': 1600})
+
+
+class TestDosyaUcretleri(MotorTestCase):
+    """Açık dosyaların ücretlerinin toplu yeniden hesaplanması"""
+
+    def setUp(self):
+        super().setUp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        user = User(username='avukat', email='avukat@example.com', first_name='A', last_name='B',
+                    phone='5550000000')
+        user.password_hash = 'x'
+        db.session.add(user)
+        db.session.commit()
+        self.cases = []
+        for status in ('Aktif', 'Aktif', 'Kapalı'):
+            case = CaseFile(file_type='hukuk', courthouse='İstanbul', department='1. Asliye Hukuk Mahkemesi',
+                            year=2024, case_number='1', client_name='Müvekkil', status=status, user_id=user.id)
+            db.session.add(case)
+            self.cases.append(case)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+        super().tearDown()
+
+    def test_recompute_open_cases(self):
+        for case in self.cases:
+            dosya_ucreti_kaydet(self.motor, case, 100000, yil=2025)
+        record = DosyaUcretHesabi.query.filter_by(case_file_id=self.cases[0].id).one()
+        self.assertEqual((record.islem, record.mahkeme_turu, record.vekalet_ucreti), ('dava', 'asliye', 16000))
+
+        with open(self.tarife_file, 'a', encoding='utf-8') as f:
+            f.write(f"TBB_2026|{KATEGORI}|TBB_3_1|100.000,00 TL'dan yukarısı için|20|Yüzdelik|%||\n")
+        results = acik_dosyalari_yeniden_hesapla(self.motor, 2026)
+
+        self.assertEqual([r['id'] for r in results], [self.cases[0].id, self.cases[1].id])
+        records = {r.case_file_id: r for r in DosyaUcretHesabi.query.all()}
+        self.assertEqual(records[self.cases[1].id].vekalet_ucreti, 20000)
+        self.assertEqual(json.loads(records[self.cases[1].id].sonuc)['vekalet']['tarife_yili'], 2026)
+        # Kapalı dosyanın hesabı değişmez
+        self.assertEqual(records[self.cases[2].id].vekalet_ucreti, 16000)
+
+
+if __name__ == '__main__':
+    unittest.main()
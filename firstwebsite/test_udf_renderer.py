@@ -0,0 +1,165 @@
+"""
+Yerel UDF -> PDF işleyici testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from udf_renderer import (UdfFormatError, UdfTable, clear_udf_cache, load_udf, parse_udf,
+                          render_udf_to_pdf, render_udf_to_pdf_cached)
+
+TEXT = "T.C.\nİSTANBUL 3. İCRA DAİRESİ\nDosya No\t: 2024/1234\nAlacak\n100 TL\n"
+
+CONTENT_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<template format_id="1.8">
+<content><![CDATA[{TEXT}]]></content>
+<properties><pageFormat mediaSizeName="1" leftMargin="70.0" rightMargin="40.0" topMargin="40.0"
+ bottomMargin="40.0" paperOrientation="1" headerFOffset="20.0" footerFOffset="20.0"/></properties>
+<elements resolver="hvl-default">
+<paragraph Alignment="1"><content startOffset="0" length="5" bold="true"/></paragraph>
+<paragraph Alignment="1" resolver="baslik"><content startOffset="5" length="24"/></paragraph>
+<paragraph TabSet="120.0:0:0"><content startOffset="30" length="8"/><tab startOffset="38" length="1"/>
+<content startOffset="39" length="12"/></paragraph>
+<table columnCount="2" border="borderNone"><row>
+<cell><paragraph><content startOffset="51" length="7"/></paragraph></cell>
+<cell><paragraph><content startOffset="58" length="7"/></paragraph></cell>
+</row></table>
+</elements>
+<styles><style name="hvl-default" family="Times New Roman" size="12"/>
+<style name="baslik" family="Arial" size="14" bold="true"/></styles>
+</template>"""
+
+
+class TestUdfRenderer(unittest.TestCase):
+    """UDF ayrıştırma ve PDF üretim testleri"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.udf_path = os.path.join(self.work_dir, 'dilekce.udf')
+        with zipfile.ZipFile(self.udf_path, 'w') as archive:
+            archive.writestr('content.xml', CONTENT_XML)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_parse_text_and_styles(self):
+        """Metin parçaları ofsetlerden, biçim stillerden çözülür"""
+        document = parse_udf(self.udf_path)
+
+        self.assertEqual(len(document.body), 4)
+        first, second, third, table = document.body
+        self.assertEqual(first.text, "T.C.\n")
+        self.assertTrue(first.runs[0].bold)
+        self.assertEqual(first.alignment, '1')
+
+        self.assertEqual(second.text, "İSTANBUL 3. İCRA DAİRESİ")
+        self.assertEqual(second.runs[0].family, 'Arial')
+        self.assertEqual(second.runs[0].size, 14.0)
+        self.assertTrue(second.runs[0].bold)
+
+        self.assertEqual(third.tab_stops, [120.0])
+        self.assertTrue(third.runs[1].is_tab)
+
+        self.assertIsInstance(table, UdfTable)
+        self.assertFalse(table.border)
+        self.assertEqual(table.rows[0][1][0].text, "100 TL\n")
+        self.assertIn("Dosya No", document.plain_text)
+        self.assertIn("Alacak\t100 TL", document.plain_text)
+
+    def test_render_pdf(self):
+        """Belge geçerli bir PDF olarak üretilir"""
+        output_path = os.path.join(self.work_dir, 'cikti.pdf')
+        render_udf_to_pdf(self.udf_path, output_path)
+
+        with open(output_path, 'rb') as f:
+            self.assertEqual(f.read(5), b'%PDF-')
+
+    def test_cached_render_reuses_output(self):
+        """Aynı içerikli UDF ikinci kez işlenmez"""
+        cache_dir = os.path.join(self.work_dir, 'onbellek')
+        first = render_udf_to_pdf_cached(self.udf_path, cache_dir)
+        mtime = os.path.getmtime(first)
+
+        copy_path = os.path.join(self.work_dir, 'kopya.udf')
+        shutil.copy(self.udf_path, copy_path)
+        second = render_udf_to_pdf_cached(copy_path, cache_dir)
+
+        self.assertEqual(first, second)
+        self.assertEqual(os.path.getmtime(second), mtime)
+        self.assertEqual(os.listdir(cache_dir), [os.path.basename(first)])
+
+    def test_load_udf_uses_hash_cache(self):
+        """Aynı içerik tek kez ayrıştırılır, değişen dosya yeniden ayrıştırılır"""
+        clear_udf_cache()
+        first = load_udf(self.udf_path)
+
+        copy_path = os.path.join(self.work_dir, 'kopya.udf')
+        shutil.copy(self.udf_path, copy_path)
+        self.assertIs(load_udf(copy_path), first)
+
+        with zipfile.ZipFile(copy_path, 'w') as archive:
+            archive.writestr('content.xml', CONTENT_XML.replace('100 TL', '200 TL'))
+        changed = load_udf(copy_path)
+        self.assertIsNot(changed, first)
+        self.assertIn("200 TL", changed.text)
+
+    def test_invalid_udf(self):
+        """content.xml içermeyen arşiv için UdfFormatError fırlatılır"""
+        broken_path = os.path.join(self.work_dir, 'bozuk.udf')
+        with zipfile.ZipFile(broken_path, 'w') as archive:
+            archive.writestr('sign.sgn', b'imza')
+
+        with self.assertRaises(UdfFormatError):
+            parse_udf(broken_path)
+
+
+class TestUdfContentHtml(unittest.TestCase):
+    """Görüntüleme sayfası: <template> yapısına uymayan dosyalar için yedek metin"""
+
+    @classmethod
+    def setUpClass(cls):
+        from app import render_udf_content_html
+        cls.render = staticmethod(render_udf_content_html)
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        clear_udf_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def write_udf(self, members):
+        path = os.path.join(self.work_dir, 'belge.udf')
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+        return path
+
+    def test_other_xml_root(self):
+        """Kökü <template> olmayan content.xml'in metni gösterilir"""
+        path = self.write_udf({'content.xml': '<?xml version="1.0" encoding="UTF-8"?>'
+                                              f'<UYAP><belge><content><![CDATA[{TEXT}]]></content></belge></UYAP>'})
+
+        self.assertEqual(load_udf(path).text, '')
+        self.assertIn('2024/1234', self.render(path))
+
+    def test_archive_without_content_xml(self):
+        """content.xml yoksa anlamlı metin içeren diğer XML üyesi kullanılır"""
+        body = 'Davacı vekili olarak mahkemenize sunulan dilekçedir. ' * 3
+        path = self.write_udf({'sign.sgn': b'imza', 'documentproperties.xml': '<p>özellik metni</p>' * 20,
+                               'kisa.xml': '<a>kısa</a>', 'metin.xml': f'<belge><p>{body}</p></belge>'})
+
+        html = self.render(path)
+        self.assertIn('Davacı vekili', html)
+        self.assertNotIn('özellik metni', html)
+        self.assertNotIn('<h2>', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+UYAP veri servisi istemcisi testleri
+
+Portal yerine kaydedilmiş yanıtları sunan yerel sunucu (uyap_api_stub) kullanılır.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from uyap_config import API_CONFIG
+from uyap_api_client import UYAPApiClient, UYAPSessionExpired
+from uyap_api_stub import UYAPStubServer
+from uyap_integration_advanced import UYAPAdvancedIntegration
+
+
+class FakeBrowser:
+    def __init__(self, cookies):
+        self.cookies = cookies
+
+    def get_cookies(self):
+        return [{'name': name, 'value': value} for name, value in self.cookies.items()]
+
+    def execute_script(self, script, *args):
+        return 'Mozilla/5.0 (test)'
+
+
+class TestUYAPApiClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = UYAPStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def client(self, **kwargs):
+        return UYAPApiClient(base_url=self.server.base_url, cookies=self.server.cookies, **kwargs)
+
+    def test_search_reads_one_request_per_page(self):
+        before = self.server.request_count()
+        files = self.client(page_size=2).search_files({'yargi_turu': 'Hukuk'})
+
+        self.assertEqual([f.esas_no for f in files], ['2024/15', '2024/208', '2023/1190'])
+        self.assertEqual(files[0].id, '1f4c9a20')
+        self.assertEqual(files[0].subject, 'İşçilik Alacağı')
+        self.assertEqual(files[2].durum, 'Kapalı')
+        self.assertEqual(self.server.request_count() - before, 2)
+
+    def test_file_details(self):
+        details = self.client().get_file_details('1f4c9a20')
+
+        self.assertEqual(details['basic_info']['esas_no'], '2024/15')
+        self.assertEqual(details['basic_info']['year'], 2024)
+        self.assertEqual(details['basic_info']['next_hearing'], '12.06.2024 10:30')
+        self.assertEqual([p.capacity for p in details['parties']], ['Davacı', 'Davalı'])
+        self.assertEqual(details['parties'][0].lawyer_bar_number, '12345')
+        self.assertEqual([e.amount for e in details['expenses']], [427.6, 1500.0])
+        self.assertTrue(all(e.is_paid for e in details['expenses']))
+
+        documents = details['documents']
+        self.assertEqual([d.type for d in documents], ['PDF', 'UDF'])
+        self.assertIn('evrakId=e-5001', documents[0].download_url)
+        self.assertTrue(documents[0].download_url.startswith(self.server.base_url))
+
+    def test_missing_cookie_means_expired_session(self):
+        client = UYAPApiClient(base_url=self.server.base_url)
+        with self.assertRaises(UYAPSessionExpired):
+            client.search_files({'yargi_turu': 'Hukuk'})
+
+    def test_integration_refreshes_browser_cookies(self):
+        """Çerez değiştiyse istemci tarayıcıdan yeniden oluşturulur"""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        uyap = UYAPAdvancedIntegration(downloads_path=work_dir)
+        uyap.session_active = True
+        uyap.driver = FakeBrowser({'JSESSIONID': 'eski'})
+
+        with patch.dict(API_CONFIG, {'base_url': self.server.base_url}):
+            uyap.api_client()
+            uyap.driver.cookies = dict(self.server.cookies)
+            details = uyap.fetch_file_details('1f4c9a20')
+
+        self.assertEqual(details['basic_info']['mahkeme'], 'İstanbul 3. İş Mahkemesi')
+        self.assertEqual(uyap.session_cookies, self.server.cookies)
+        self.assertIn('api_detay', uyap.timer.summary())
+
+        # Portal oturumu kapandı: ne mevcut ne de yenilenen çerezler geçerli
+        uyap.api_client().http.cookies.clear()
+        uyap.driver.cookies = {}
+        with patch.dict(API_CONFIG, {'base_url': self.server.base_url}):
+            with self.assertRaises(UYAPSessionExpired):
+                uyap.fetch_file_details('1f4c9a20')
+        self.assertFalse(uyap.session_active)
+
+
+if __name__ == '__main__':
+    unittest.main()
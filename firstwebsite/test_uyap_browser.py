@@ -0,0 +1,135 @@
+"""
+UYAP tarayıcı çalışma ortamı testleri
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import uyap_browser
+from uyap_browser import BrowserRuntime, chromedriver_path, tree_usage
+from uyap_config import WEBDRIVER_CONFIG
+
+
+def config(**overrides):
+    return dict(WEBDRIVER_CONFIG, **overrides)
+
+
+class TestBrowserRuntime(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+
+    def runtime(self, **overrides):
+        runtime = BrowserRuntime(self.work_dir, config(**overrides))
+        self.addCleanup(runtime.cleanup)
+        return runtime
+
+    def test_headless_options(self):
+        runtime = self.runtime(headless=True, block_images=True, restart_memory_mb=1024)
+        options = runtime.options()
+
+        self.assertIn('--headless=new', options.arguments)
+        self.assertNotIn('--start-maximized', options.arguments)
+        self.assertIn('--js-flags=--max-old-space-size=512', options.arguments)
+        prefs = options.experimental_options['prefs']
+        self.assertEqual(prefs['profile.managed_default_content_settings.images'], 2)
+        self.assertEqual(prefs['download.default_directory'], self.work_dir)
+        self.assertIsNone(runtime.debugger_options())
+
+        # Oturuma özel geçici profil kapanınca silinir
+        self.assertIn(f'--user-data-dir={runtime.profile_dir}', options.arguments)
+        self.assertTrue(os.path.isdir(runtime.profile_dir))
+        profile_dir = runtime.profile_dir
+        runtime.cleanup()
+        self.assertFalse(os.path.exists(profile_dir))
+
+    def test_visible_options(self):
+        runtime = self.runtime(headless=False, profile_dir=self.work_dir)
+        options = runtime.options()
+
+        self.assertIn('--start-maximized', options.arguments)
+        self.assertNotIn('profile.managed_default_content_settings.images', options.experimental_options['prefs'])
+        self.assertIsNotNone(runtime.debugger_options())
+        runtime.cleanup()
+        # Yapılandırılmış kalıcı profil silinmez
+        self.assertTrue(os.path.isdir(self.work_dir))
+
+    def test_driver_path_is_resolved_without_network(self):
+        driver = os.path.join(self.work_dir, 'chromedriver')
+        open(driver, 'w').close()
+        cache_file = os.path.join(self.work_dir, 'chromedriver.json')
+        with open(cache_file, 'w') as f:
+            json.dump({'path': driver}, f)
+
+        with patch('uyap_browser._driver_path', None), \
+                patch('uyap_browser.DRIVER_CACHE_FILE', cache_file), \
+                patch('uyap_browser.shutil.which', return_value=None), \
+                patch.dict(WEBDRIVER_CONFIG, driver_path=None), \
+                patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+            self.assertEqual(chromedriver_path(), driver)
+            os.remove(driver)
+            # Önbellekteki sürücü silinince bir kez indirme denenir, hata Selenium Manager'a bırakılır
+            manager.return_value.install.side_effect = OSError('çevrimdışı')
+            self.assertIsNone(chromedriver_path())
+            self.assertIsNone(chromedriver_path())
+            self.assertEqual(manager.return_value.install.call_count, 1)
+
+    @unittest.skipUnless(os.path.isdir('/proc') or uyap_browser.os.name != 'posix', "Süreç ölçümü yok")
+    def test_usage_and_limits_are_reported(self):
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+
+        usage = tree_usage(os.getpid())
+        self.assertGreaterEqual(usage['surec'], 2)
+        self.assertGreater(usage['bellek_bayt'], 0)
+
+        runtime = self.runtime(restart_memory_mb=1, cpu_cores=1, nice=0)
+        runtime.pid = os.getpid()
+        first = runtime.usage()
+        self.assertIsNone(first['cpu_yuzde'])
+        self.assertTrue(first['esik_asildi'])
+        self.assertIsNotNone(runtime.usage()['cpu_yuzde'])
+        self.assertFalse(self.runtime(restart_memory_mb=0).usage())
+
+    @unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "CPU çekirdeği sınırı yalnızca Linux'ta")
+    def test_process_limits(self):
+        # Sınırlar başlatılmış sürecin tüm iş parçacıklarına ve alt süreçlerine uygulanır
+        script = ('import subprocess, sys, threading, time; '
+                  'threading.Thread(target=time.sleep, args=(5,), daemon=True).start(); '
+                  'subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"]); time.sleep(5)')
+        parent = subprocess.Popen([sys.executable, '-c', script])
+        self.addCleanup(parent.wait)
+        self.addCleanup(parent.kill)
+        deadline = time.monotonic() + 5
+        while len(uyap_browser.process_tree(parent.pid)) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        runtime = self.runtime(nice=5, cpu_cores=1)
+        with patch('uyap_browser.chromedriver_path', return_value=None):
+            self.assertFalse(runtime.service().popen_kw)
+        runtime.pid = parent.pid
+        pids = uyap_browser.process_tree(parent.pid)
+        self.addCleanup(lambda: [os.kill(pid, 9) for pid in pids[1:] if os.path.isdir(f'/proc/{pid}')])
+
+        self.assertEqual(runtime.limit_processes(), len(pids))
+        self.assertEqual(runtime.limit_processes(), 0)
+        expected = min(19, os.getpriority(os.PRIO_PROCESS, 0) + 5)
+        for pid in pids:
+            for tid in uyap_browser._threads(pid):
+                self.assertEqual(os.getpriority(os.PRIO_PROCESS, tid), expected)
+                self.assertEqual(len(os.sched_getaffinity(tid)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+UYAP toplu aktarım testleri
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import Flask
+from sqlalchemy import event
+
+from models import db, ActivityLog, CaseFile, Document, Expense
+from uyap_bulk_import import EXISTS_ERROR, UYAPBulkImporter
+from uyap_integration_advanced import UyapDocument, UyapExpense, UyapParty
+from uyap_import_benchmark import build_files
+
+USER_ID = 1
+ALL = {'include_expenses': True, 'include_documents': True}
+
+
+class TestUYAPBulkImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        self.commits = 0
+
+        def count_commit(conn):
+            self.commits += 1
+        event.listen(db.engine, 'commit', count_commit)
+        self.addCleanup(event.remove, db.engine, 'commit', count_commit)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def test_one_commit_per_batch(self):
+        files = build_files(10, expenses=3, documents=4)
+        results = UYAPBulkImporter(USER_ID, ALL, batch_size=5).import_files(files)
+
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(self.commits, 2)
+        self.assertEqual(CaseFile.query.count(), 10)
+        self.assertEqual(Expense.query.count(), 30)
+        self.assertEqual(Document.query.count(), 40)
+        self.assertEqual(ActivityLog.query.filter_by(activity_type='uyap_import').count(), 10)
+        self.assertEqual(results[3]['file_info']['esas_no'], '2024/4')
+
+    def test_dataclass_details(self):
+        details = {
+            'basic_info': {'esas_no': '2024/15', 'mahkeme': 'İstanbul 3. İş Mahkemesi', 'year': 2024,
+                           'yargi_turu': 'Hukuk', 'acilis_tarihi': '01.02.2024'},
+            'parties': [UyapParty('A*** Y***', 'Davacı', '12345678901'),
+                        UyapParty('B*** A.Ş.', 'Davalı', '9876543210', lawyer='Av. G*** H***')],
+            'expenses': [UyapExpense('Başvurma Harcı', 427.6, '01.02.2024', True)],
+            'documents': [UyapDocument('Dava Dilekçesi.pdf', '', '', 'PDF', '')],
+        }
+        importer = UYAPBulkImporter(USER_ID, ALL)
+        self.assertTrue(importer.import_files([details])[0]['success'])
+
+        case = CaseFile.query.one()
+        self.assertEqual((case.client_name, case.client_entity_type), ('A*** Y***', 'person'))
+        self.assertEqual((case.opponent_name, case.opponent_entity_type), ('B*** A.Ş.', 'company'))
+        self.assertEqual(case.opponent_lawyer, 'Av. G*** H***')
+        self.assertEqual(case.file_type, 'hukuk')
+        self.assertEqual([e.amount for e in case.expenses], [427.6])
+        self.assertEqual([d.filename for d in case.documents], ['Dava_Dilekcesi.pdf'])
+        self.assertEqual((importer.ozet['masraf'], importer.ozet['evrak']), (1, 1))
+
+    def test_existing_files_and_conflicts(self):
+        files = build_files(3, expenses=2, documents=2)
+        UYAPBulkImporter(USER_ID, ALL).import_files(files)
+
+        results = UYAPBulkImporter(USER_ID, ALL).import_files(files)
+        self.assertEqual([result.get('error') for result in results], [EXISTS_ERROR] * 3)
+
+        files[0]['expenses'][0]['amount'] = 999.0
+        files[0]['documents'].append({'name': 'Yeni Evrak.pdf', 'type': 'PDF'})
+        settings = dict(ALL, overwrite_existing=True, expense_conflict='overwrite')
+        importer = UYAPBulkImporter(USER_ID, settings)
+        self.assertTrue(all(result['success'] for result in importer.import_files(files)))
+
+        self.assertEqual(CaseFile.query.count(), 3)
+        self.assertEqual(Expense.query.count(), 6)
+        self.assertEqual(Document.query.count(), 7)
+        self.assertEqual(Expense.query.filter_by(amount=999.0).count(), 1)
+
+        UYAPBulkImporter(USER_ID, dict(settings, expense_conflict='create-new')).import_files(files[:1])
+        self.assertEqual(Expense.query.count(), 8)
+
+    def test_failing_file_does_not_block_batch(self):
+        files = build_files(4, expenses=1, documents=0)
+        files[2]['expenses'][0]['amount'] = 'okunamadı'
+        files.append({'basic_info': {}, 'parties': [], 'expenses': [], 'documents': []})
+
+        importer = UYAPBulkImporter(USER_ID, ALL, batch_size=10)
+        results = importer.import_files(files)
+
+        self.assertEqual([result['success'] for result in results], [True, True, False, True, False])
+        self.assertEqual((importer.ozet['aktarilan'], importer.ozet['hatali']), (3, 2))
+        self.assertEqual(CaseFile.query.count(), 3)
+        self.assertEqual(Expense.query.count(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
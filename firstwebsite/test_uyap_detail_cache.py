@@ -0,0 +1,165 @@
+"""
+UYAP dosya kimliği ve detay önbelleği testleri
+"""
+
+import os
+import sys
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import Flask
+
+from models import db, UyapDosyaOnbellek
+from uyap_api_client import UYAPApiClient
+from uyap_api_stub import UYAPStubServer
+from uyap_detail_cache import ONBELLEK, UYAP, UYAPDetailCache
+from uyap_integration_advanced import UyapFile, stable_file_id
+from uyap_sync import UYAPSync
+
+DETAIL_PATH = '/dosya_detay_bilgileri_brd.ajx'
+USER_ID = 1
+
+
+class TestStableFileId(unittest.TestCase):
+
+    def test_same_file_same_id(self):
+        first = UyapFile(id='1f4c9a20', esas_no='2024/15', mahkeme='İstanbul 3. İş Mahkemesi',
+                         yargi_turu='Hukuk', yargi_birimi='', durum='Açık', acilis_tarihi='', taraflar='')
+        again = replace(first, id='9d0e1f2a', mahkeme='  İstanbul 3.  İş Mahkemesi ')
+
+        self.assertEqual(first.key, again.key)
+        self.assertEqual(first.key, stable_file_id('İstanbul 3. İş Mahkemesi', '2024/15'))
+        self.assertNotEqual(first.key, stable_file_id('İstanbul 4. İş Mahkemesi', '2024/15'))
+        self.assertNotEqual(first.key, stable_file_id('İstanbul 3. İş Mahkemesi', '2024/16'))
+        self.assertRegex(first.key, r'^uyap_[0-9a-f]{20}$')
+
+
+class TestUYAPDetailCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = UYAPStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        self.client = UYAPApiClient(base_url=self.server.base_url, cookies=self.server.cookies, page_size=2)
+        self.now = datetime(2024, 6, 1, 9, 0)
+        self.cache = UYAPDetailCache(USER_ID, max_age=timedelta(hours=12), clock=lambda: self.now)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def search(self):
+        files = self.client.search_files({'yargi_turu': 'Hukuk'})
+        self.cache.store_files(files)
+        db.session.commit()
+        return {row.esas_no: row for row in files}
+
+    def details(self, file_id, **kwargs):
+        return self.cache.details(file_id, lambda: self.client.get_file_details(file_id), **kwargs)
+
+    def test_reopened_file_is_served_from_cache(self):
+        row = self.search()['2024/15']
+        before = self.server.request_count(DETAIL_PATH)
+
+        details, meta = self.details(row.id)
+        self.assertEqual(meta['kaynak'], UYAP)
+        self.assertEqual(meta['dosya_kimligi'], row.key)
+
+        self.now += timedelta(hours=1)
+        cached, meta = self.details(row.id)
+        self.assertEqual(self.server.request_count(DETAIL_PATH), before + 1)
+        self.assertEqual((meta['kaynak'], meta['yas_saniye'], meta['taze']), (ONBELLEK, 3600, True))
+        self.assertEqual(cached, details)
+        self.assertEqual([party['name'] for party in cached['parties']][:1], ['A*** Y***'])
+        self.assertEqual(len(cached['expenses']), 2)
+        self.assertEqual(cached['hearings'], [{'date': '12.06.2024 10:30'}])
+
+        # Kalıcı kimlikle de aynı kayda ulaşılır
+        self.assertEqual(self.details(row.key)[1]['kaynak'], ONBELLEK)
+
+    def test_stale_or_refreshed_details_are_fetched_again(self):
+        row = self.search()['2024/15']
+        self.details(row.id)
+        first = UyapDosyaOnbellek.query.filter_by(dosya_kimligi=row.key).one()
+        changed_at = first.degisme_tarihi
+        before = self.server.request_count(DETAIL_PATH)
+
+        self.assertEqual(self.details(row.id, refresh=True)[1]['kaynak'], UYAP)
+        self.assertEqual(self.cache.cached(row.id)[1]['kaynak'], ONBELLEK)
+        self.now += timedelta(hours=13)
+        self.assertIsNone(self.cache.cached(row.id))
+        _, meta = self.details(row.id)
+
+        self.assertEqual(meta['kaynak'], UYAP)
+        self.assertEqual(self.server.request_count(DETAIL_PATH), before + 2)
+        # İçerik değişmediği için değişme zamanı ilk çekimde kalır
+        self.assertEqual(meta['degisme_tarihi'], changed_at.strftime('%Y-%m-%d %H:%M:%S'))
+
+    def test_new_portal_id_maps_to_same_entry(self):
+        row = self.search()['2024/15']
+        self.details(row.id)
+
+        # Yeni oturumda portal aynı dosyaya başka dosyaId verir
+        moved = replace(row, id='yeni-oturum-id')
+        self.cache.store_files([moved])
+        db.session.commit()
+
+        _, meta = self.cache.details('yeni-oturum-id', lambda: self.fail("Önbellek kullanılmadı"))
+        self.assertEqual((meta['kaynak'], meta['dosya_kimligi']), (ONBELLEK, row.key))
+        self.assertEqual(UyapDosyaOnbellek.query.filter_by(dosya_kimligi=row.key).count(), 1)
+
+    def test_many_files_fetch_only_missing(self):
+        rows = self.search()
+        self.details(rows['2024/15'].id)
+        file_ids = [rows['2024/15'].id, rows['2024/208'].id, 'bilinmeyen']
+        requested = []
+
+        def fetch_many(missing):
+            requested.extend(missing)
+            return [self.client.get_file_details(missing[0]), RuntimeError('UYAP oturumu kapalı')]
+
+        results = self.cache.details_many(file_ids, fetch_many)
+
+        self.assertEqual(requested, file_ids[1:])
+        self.assertEqual(results[0][1]['kaynak'], ONBELLEK)
+        self.assertEqual((results[1][1]['kaynak'], results[1][1]['dosya_kimligi']), (UYAP, rows['2024/208'].key))
+        self.assertIsInstance(results[2], RuntimeError)
+        self.assertEqual(self.cache.details(rows['2024/208'].id, lambda: None)[1]['kaynak'], ONBELLEK)
+
+    def test_unknown_file_without_basic_info_is_not_cached(self):
+        details, meta = self.cache.details('bilinmeyen', lambda: {'basic_info': {}, 'parties': [],
+                                                                  'expenses': [], 'documents': []})
+
+        self.assertEqual(meta, {'kaynak': UYAP, 'taze': True})
+        self.assertEqual(details['hearings'], [])
+        self.assertEqual(UyapDosyaOnbellek.query.count(), 0)
+
+    def test_sync_fills_cache(self):
+        UYAPSync(USER_ID, self.client.search_files, self.client.get_file_details,
+                 yargi_turleri=['Hukuk'], clock=lambda: self.now).run()
+        before = self.server.request_count(DETAIL_PATH)
+
+        rows = self.client.search_files({'yargi_turu': 'Hukuk'})
+        for row in rows:
+            self.assertEqual(self.details(row.id)[1]['kaynak'], ONBELLEK)
+        self.assertEqual(self.server.request_count(DETAIL_PATH), before)
+        self.assertEqual(UyapDosyaOnbellek.query.count(), len(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
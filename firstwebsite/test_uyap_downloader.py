@@ -0,0 +1,210 @@
+"""
+UYAP paralel evrak indirme testleri
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import shutil
+import hashlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from uyap_api_client import UYAPApiClient
+from uyap_api_stub import UYAPStubServer
+from uyap_downloader import MANIFEST_NAME, DocumentDownloader
+from uyap_integration_advanced import UyapDocument
+
+DOWNLOAD_PATH = '/download_document_brd.uyap'
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+
+class SlowHttp:
+    """Her isteği belirli süre bekleten sahte HTTP oturumu"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.cookies = {}
+
+    def get(self, url, **kwargs):
+        time.sleep(self.delay)
+        return FakeResponse(url.encode('utf-8'))
+
+
+class RecordingHttp(requests.Session):
+    """İstenen adresleri kaydeden HTTP oturumu"""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return super().get(url, **kwargs)
+
+
+def document(name, url):
+    return UyapDocument(name=name, date='', size='', type='', url=url, download_url=url)
+
+
+class TestDocumentDownloader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = UYAPStubServer().start()
+        cls.documents = UYAPApiClient(base_url=cls.server.base_url, cookies=cls.server.cookies) \
+            .get_documents('1f4c9a20')
+        cls.contents = {entry['dosya_adi']: base64.b64decode(entry['icerik_base64'])
+                        for entry in cls.server.recording['yanitlar'][DOWNLOAD_PATH]}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.target = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target, True)
+
+    def downloader(self, **kwargs):
+        kwargs.setdefault('cookies', self.server.cookies)
+        kwargs.setdefault('base_url', self.server.base_url)
+        return DocumentDownloader(retry_delay=0, **kwargs)
+
+    def test_downloads_with_checksums_and_progress(self):
+        events = []
+        results = self.downloader(on_progress=lambda progress, result: events.append(progress)) \
+            .download_all(self.documents, self.target)
+
+        self.assertEqual([r.status for r in results], ['indirildi', 'indirildi'])
+        for result in results:
+            content = self.contents[result.document.name]
+            with open(result.path, 'rb') as f:
+                self.assertEqual(f.read(), content)
+            self.assertEqual(result.checksum, hashlib.sha256(content).hexdigest())
+            self.assertEqual(result.size, len(content))
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[-1]['yuzde'], 100.0)
+        self.assertEqual(events[-1]['indirilen'], 2)
+        with open(os.path.join(self.target, MANIFEST_NAME), encoding='utf-8') as f:
+            self.assertEqual(sorted(json.load(f).values()), ['Dava Dilekçesi.pdf', 'Tensip Zaptı.udf'])
+
+    def test_already_stored_content_is_not_duplicated(self):
+        self.downloader().download_all(self.documents, self.target)
+        # Aynı içerik farklı adla daha önce elle kaydedilmiş olabilir
+        os.remove(os.path.join(self.target, MANIFEST_NAME))
+        os.rename(os.path.join(self.target, 'Dava Dilekçesi.pdf'), os.path.join(self.target, 'dilekce.pdf'))
+
+        results = self.downloader().download_all(self.documents, self.target)
+        self.assertEqual([r.status for r in results], ['mevcut', 'mevcut'])
+        self.assertEqual(os.path.basename(results[0].path), 'dilekce.pdf')
+        self.assertEqual(sorted(name for name in os.listdir(self.target) if not name.startswith('.')),
+                         ['Tensip Zaptı.udf', 'dilekce.pdf'])
+
+    def test_same_name_different_content_is_renamed(self):
+        with open(os.path.join(self.target, 'Dava Dilekçesi.pdf'), 'wb') as f:
+            f.write(b'eski surum')
+        result = self.downloader().download_all(self.documents[:1], self.target)[0]
+        self.assertEqual(result.status, 'indirildi')
+        self.assertEqual(os.path.basename(result.path), 'Dava Dilekçesi (1).pdf')
+
+    def test_transient_errors_are_retried(self):
+        self.server.fail_next(DOWNLOAD_PATH, count=2)
+        result = self.downloader(max_workers=1).download_all(self.documents[:1], self.target)[0]
+        self.assertEqual(result.status, 'indirildi')
+        self.assertEqual(result.attempts, 3)
+
+        self.server.fail_next(DOWNLOAD_PATH, count=5)
+        result = self.downloader(max_retries=1).download_all(self.documents[1:], self.target)[0]
+        self.assertEqual(result.status, 'hata')
+        self.assertEqual(result.attempts, 2)
+        self.server.fail_next(DOWNLOAD_PATH, count=0)
+
+    def test_expired_session_is_not_retried(self):
+        result = self.downloader(cookies={}).download_all(self.documents[:1], self.target)[0]
+        self.assertEqual(result.status, 'hata')
+        self.assertEqual(result.attempts, 1)
+        self.assertIn('oturum', result.error)
+        self.assertEqual([name for name in os.listdir(self.target) if not name.startswith('.')], [])
+
+    def test_disallowed_type_is_skipped(self):
+        result = self.downloader().download_all([document('kurulum.exe', 'http://127.0.0.1/x')], self.target)[0]
+        self.assertEqual(result.status, 'atlandi')
+
+    def test_links_outside_portal_are_rejected(self):
+        http = RecordingHttp()
+        downloader = self.downloader(http=http)
+        relative = self.documents[0].download_url[len(self.server.base_url):]
+        documents = [document('dis.pdf', 'http://169.254.169.254/latest/meta-data'),
+                     document('sema.pdf', self.server.base_url.replace('http:', 'file:') + '/x'),
+                     document('goreli.pdf', relative)]
+
+        results = downloader.download_all(documents, self.target)
+
+        self.assertEqual([r.status for r in results], ['hata', 'hata', 'indirildi'])
+        self.assertIn('portal', results[0].error)
+        self.assertEqual(http.urls, [self.documents[0].download_url])
+        # Çerezler yalnızca portal sunucusuna bağlı
+        self.assertEqual({cookie.domain for cookie in http.cookies}, {'127.0.0.1'})
+
+    def test_write_errors_fail_only_that_document(self):
+        downloader = self.downloader()
+        real_replace = os.replace
+
+        def replace(source, target):
+            if target.endswith('.pdf'):
+                raise OSError(28, 'Aygıtta yer kalmadı')
+            return real_replace(source, target)
+
+        with patch('uyap_downloader.os.replace', side_effect=replace):
+            results = downloader.download_all(self.documents, self.target)
+
+        self.assertEqual([(r.document.name, r.status) for r in results],
+                         [('Dava Dilekçesi.pdf', 'hata'), ('Tensip Zaptı.udf', 'indirildi')])
+        self.assertIn('yer kalmadı', results[0].error)
+        self.assertEqual(downloader.progress.to_dict()['hatali'], 1)
+        with open(os.path.join(self.target, MANIFEST_NAME), encoding='utf-8') as f:
+            self.assertEqual(list(json.load(f).values()), ['Tensip Zaptı.udf'])
+        self.assertEqual([name for name in os.listdir(self.target) if name.endswith('.part')], [])
+
+    def test_parallelism_is_bounded(self):
+        documents = [document(f'evrak{i}.pdf', f'http://uyap.test/evrak/{i}') for i in range(4)]
+
+        start = time.perf_counter()
+        results = DocumentDownloader(http=SlowHttp(0.2), max_workers=4, base_url='http://uyap.test') \
+            .download_all(documents, self.target)
+        parallel = time.perf_counter() - start
+        self.assertEqual({r.status for r in results}, {'indirildi'})
+        self.assertLess(parallel, 0.6)
+
+        shutil.rmtree(self.target)
+        start = time.perf_counter()
+        DocumentDownloader(http=SlowHttp(0.2), max_workers=2, base_url='http://uyap.test') \
+            .download_all(documents, self.target)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+UYAP iş kuyruğu testleri
+"""
+
+import os
+import sys
+import time
+import shutil
+import socket
+import tempfile
+import threading
+import subprocess
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import Flask
+
+from models import db, UyapIs
+from uyap_config import JOB_CONFIG
+from uyap_jobs import BEKLIYOR, CALISIYOR, FINISHED, HATA, IPTAL, TAMAMLANDI, UYAPJobQueue
+
+
+class TestUYAPJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        # İş parçacıkları aynı veritabanını kendi bağlantılarıyla kullanır
+        self.work_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(self.work_dir, 'jobs.db')
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        self.lock_path = os.path.join(self.work_dir, 'uyap_jobs.lock')
+        self.queue = UYAPJobQueue(self.app, workers=3, poll_interval=0.1, lock_path=self.lock_path)
+
+    def tearDown(self):
+        self.queue.stop(timeout=5)
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.context.pop()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def wait_for(self, job_ids, timeout=10):
+        """İşler bitene kadar bekler; son durumlarını sözlük olarak döndürür"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            jobs = [db.session.get(UyapIs, job_id).to_dict() for job_id in job_ids]
+            # Okuma işlemini kapat, iş parçacıklarının yazmasını engellemesin
+            db.session.rollback()
+            if all(job['durum'] in FINISHED for job in jobs):
+                return jobs
+            time.sleep(0.05)
+        self.fail(f"İşler zamanında bitmedi: {jobs}")
+
+    def test_job_completes_with_result(self):
+        def add(job):
+            job.progress(50, 'Toplanıyor')
+            return {'toplam': sum(job.params['sayilar'])}
+
+        self.queue.register('topla', add)
+        job_id = self.queue.submit(1, 'topla', {'sayilar': [1, 2, 3]}).id
+
+        job = self.wait_for([job_id])[0]
+        self.assertEqual(job['durum'], TAMAMLANDI)
+        self.assertEqual(job['ilerleme'], 100)
+        self.assertEqual(job['mesaj'], 'Toplanıyor')
+        self.assertEqual(job['sonuc'], {'toplam': 6})
+        self.assertIsNotNone(job['bitis'])
+
+    def test_failing_handler_marks_job(self):
+        @self.queue.register('bozuk')
+        def broken(job):
+            raise RuntimeError('UYAP oturumu kapalı')
+
+        job_id = self.queue.submit(1, 'bozuk').id
+
+        job = self.wait_for([job_id])[0]
+        self.assertEqual(job['durum'], HATA)
+        self.assertEqual(job['hata'], 'UYAP oturumu kapalı')
+        self.assertIsNone(job['sonuc'])
+        with self.assertRaises(ValueError):
+            self.queue.submit(1, 'bilinmeyen')
+
+    def test_jobs_of_same_user_run_in_order(self):
+        lock = threading.Lock()
+        running = {}
+        peaks = {'kullanici': 0, 'toplam': 0}
+
+        def wait(job):
+            with lock:
+                running[job.user_id] = running.get(job.user_id, 0) + 1
+                peaks['kullanici'] = max(peaks['kullanici'], running[job.user_id])
+                peaks['toplam'] = max(peaks['toplam'], sum(running.values()))
+            time.sleep(0.3)
+            with lock:
+                running[job.user_id] -= 1
+            return {'bitis': time.monotonic()}
+
+        self.queue.register('bekle', wait)
+        job_ids = [self.queue.submit(user_id, 'bekle').id for user_id in (1, 1, 1, 2)]
+
+        jobs = self.wait_for(job_ids)
+        self.assertTrue(all(job['durum'] == TAMAMLANDI for job in jobs))
+        self.assertEqual(peaks['kullanici'], 1)
+        self.assertEqual(peaks['toplam'], 2)
+        finished = [job['sonuc']['bitis'] for job in jobs[:3]]
+        self.assertEqual(finished, sorted(finished))
+
+    def test_cancel_pending_job(self):
+        job = UyapIs(user_id=1, tur='topla', durum=BEKLIYOR)
+        db.session.add(job)
+        db.session.commit()
+
+        self.assertFalse(self.queue.cancel(job.id, user_id=2))
+        self.assertTrue(self.queue.cancel(job.id, user_id=1))
+        self.assertEqual(db.session.get(UyapIs, job.id).durum, IPTAL)
+        self.assertFalse(self.queue.cancel(job.id, user_id=1))
+        self.assertIsNone(self.queue.get(job.id, user_id=2))
+
+    def test_recover_after_restart(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        host = socket.gethostname()
+        old = datetime.utcnow() - timedelta(days=30)
+        dead = UyapIs(user_id=1, tur='senkron', durum=CALISIYOR, calisan=f"{host}:{process.pid}")
+        alive = UyapIs(user_id=2, tur='senkron', durum=CALISIYOR, calisan=f"{host}:{os.getpid()}")
+        other_host = UyapIs(user_id=3, tur='senkron', durum=CALISIYOR, calisan='baska-sunucu:1')
+        expired = UyapIs(user_id=1, tur='aktarim', durum=TAMAMLANDI, olusturma=old, bitis=old)
+        db.session.add_all([dead, alive, other_host, expired])
+        db.session.commit()
+        ids = [dead.id, alive.id, other_host.id, expired.id]
+
+        self.queue.recover()
+
+        self.assertEqual(db.session.get(UyapIs, ids[0]).durum, HATA)
+        self.assertEqual(db.session.get(UyapIs, ids[1]).durum, CALISIYOR)
+        self.assertEqual(db.session.get(UyapIs, ids[2]).durum, CALISIYOR)
+        self.assertIsNone(db.session.get(UyapIs, ids[3]))
+
+    def test_jobs_without_heartbeat_are_failed(self):
+        now = datetime.utcnow()
+        stale = UyapIs(user_id=1, tur='senkron', durum=CALISIYOR, calisan='baska-sunucu:1',
+                       baslangic=now - timedelta(hours=1), kalp_atisi=now - timedelta(seconds=300))
+        fresh = UyapIs(user_id=2, tur='senkron', durum=CALISIYOR, calisan='baska-sunucu:2',
+                       baslangic=now - timedelta(hours=1), kalp_atisi=now)
+        waiting = UyapIs(user_id=1, tur='topla', durum=BEKLIYOR)
+        db.session.add_all([stale, fresh, waiting])
+        db.session.commit()
+        ids = [stale.id, fresh.id, waiting.id]
+
+        with patch.dict(JOB_CONFIG, stale_after=120):
+            self.queue.recover()
+
+        self.assertEqual(db.session.get(UyapIs, ids[0]).durum, HATA)
+        self.assertEqual(db.session.get(UyapIs, ids[1]).durum, CALISIYOR)
+
+        # Kullanıcının sıradaki işi artık çalışabilir
+        self.queue.register('topla', lambda job: {'toplam': 0})
+        self.queue.start()
+        self.assertEqual(self.wait_for([ids[2]])[0]['durum'], TAMAMLANDI)
+
+    def test_only_one_process_runs_jobs(self):
+        other = UYAPJobQueue(self.app, workers=1, poll_interval=0.1, lock_path=self.lock_path)
+        self.addCleanup(other.stop, 5)
+        hooks = []
+        self.queue.when_leader(lambda app: hooks.append('birinci'))
+        other.when_leader(lambda app: hooks.append('ikinci'))
+
+        self.queue.start()
+        deadline = time.monotonic() + 5
+        while not self.queue.is_leader and time.monotonic() < deadline:
+            time.sleep(0.05)
+        other.start()
+        time.sleep(0.2)
+
+        self.assertTrue(self.queue.is_leader)
+        self.assertFalse(other.is_leader)
+        self.assertEqual(hooks, ['birinci'])
+
+
+if __name__ == '__main__':
+    unittest.main()
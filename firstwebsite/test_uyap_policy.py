@@ -0,0 +1,170 @@
+"""
+UYAP hız sınırı ve yeniden deneme politikası testleri
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from uyap_config import API_CONFIG, ERROR_CONFIG, PERFORMANCE_CONFIG
+from uyap_api_client import UYAPApiError
+from uyap_api_stub import UYAPStubServer
+from uyap_integration_advanced import UYAPAdvancedIntegration
+from uyap_policy import OperationMetrics, Throttle, UYAPPolicy, backoff_delay, batches
+
+DETAIL_PATH = '/dosya_detay_bilgileri_brd.ajx'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeBrowser:
+    def __init__(self, cookies):
+        self.cookies = cookies
+
+    def get_cookies(self):
+        return [{'name': name, 'value': value} for name, value in self.cookies.items()]
+
+    def execute_script(self, script, *args):
+        return 'Mozilla/5.0 (test)'
+
+
+class TestUYAPPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.policy = UYAPPolicy(throttle=Throttle(clock=self.clock, sleep=self.clock.sleep), sleep=self.clock.sleep)
+
+    def flaky(self, failures, error=TimeoutException):
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise error("Sayfa hazır olmadı")
+            return 'tamam'
+        return func, calls
+
+    def test_backoff_grows_and_is_capped(self):
+        with patch.dict(ERROR_CONFIG, retry_delay=2, backoff_factor=3, max_retry_delay=30, retry_jitter=0):
+            self.assertEqual([backoff_delay(attempt) for attempt in range(1, 5)], [2, 6, 18, 30])
+        for _ in range(20):
+            self.assertTrue(10 <= backoff_delay(1, base=10, factor=2, jitter=0.1) <= 11)
+
+    def test_batches_follow_config(self):
+        with patch.dict(PERFORMANCE_CONFIG, batch_size=2):
+            self.assertEqual(list(batches(range(5))), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(batches([1, 2], size=1)), [[1], [2]])
+        self.assertEqual(list(batches([])), [])
+
+    def test_throttle_spaces_operations(self):
+        with patch.dict(PERFORMANCE_CONFIG, operation_delay=1.5):
+            self.assertEqual(self.policy.throttle.wait(), 0)
+            self.clock.now += 0.5
+            self.assertEqual(self.policy.throttle.wait(), 1.0)
+            self.clock.now += 2
+            self.assertEqual(self.policy.throttle.wait(), 0)
+
+    def test_transient_errors_are_retried_with_metrics(self):
+        func, calls = self.flaky(2)
+        with patch.dict(ERROR_CONFIG, max_retries=3, retry_delay=1, backoff_factor=2, retry_jitter=0), \
+                patch.dict(PERFORMANCE_CONFIG, operation_delay=0):
+            self.assertEqual(self.policy.call('sorgu', func), 'tamam')
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.clock.sleeps, [1, 2])
+        stats = self.policy.metrics.summary()['sorgu']
+        self.assertEqual((stats['adet'], stats['basarili'], stats['deneme'], stats['yeniden_deneme']), (1, 1, 3, 2))
+        self.assertEqual(stats['bekleme'], 3)
+
+    def test_retry_limit_comes_from_config(self):
+        func, calls = self.flaky(5)
+        with patch.dict(ERROR_CONFIG, max_retries=1, retry_delay=0), \
+                patch.dict(PERFORMANCE_CONFIG, operation_delay=0):
+            with self.assertRaises(TimeoutException):
+                self.policy.call('sorgu', func)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.policy.metrics.summary()['sorgu']['hatali'], 1)
+
+    @patch.dict(PERFORMANCE_CONFIG, operation_delay=0)
+    def test_permanent_errors_are_not_retried(self):
+        missing, missing_calls = self.flaky(1, NoSuchElementException)
+        with self.assertRaises(NoSuchElementException):
+            self.policy.call('detay_sayfasi', missing)
+
+        expired, expired_calls = self.flaky(1, lambda message: UYAPApiError(message, retryable=False))
+        with self.assertRaises(UYAPApiError):
+            self.policy.call('api_detay', expired, retry_on=(UYAPApiError,))
+
+        self.assertEqual((len(missing_calls), len(expired_calls)), (1, 1))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_metrics_are_shared(self):
+        metrics = OperationMetrics()
+        for policy in (UYAPPolicy(metrics=metrics), UYAPPolicy(metrics=metrics)):
+            policy.call('api_sorgu', lambda: None)
+
+        self.assertEqual(metrics.summary()['api_sorgu']['adet'], 2)
+        metrics.reset()
+        self.assertEqual(metrics.summary(), {})
+
+
+class TestIntegrationUsesPolicy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = UYAPStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        self.uyap = UYAPAdvancedIntegration(downloads_path=work_dir)
+        self.uyap.session_active = True
+        self.uyap.driver = FakeBrowser(dict(self.server.cookies))
+        for config, values in ((API_CONFIG, {'base_url': self.server.base_url}),
+                               (ERROR_CONFIG, {'retry_delay': 0, 'retry_jitter': 0}),
+                               (PERFORMANCE_CONFIG, {'operation_delay': 0})):
+            patcher = patch.dict(config, values)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_server_errors_are_retried(self):
+        self.server.fail_next(DETAIL_PATH, count=2, status=503)
+        details = self.uyap.fetch_file_details('1f4c9a20')
+
+        self.assertEqual(details['basic_info']['esas_no'], '2024/15')
+        self.assertEqual(self.uyap.policy.metrics.summary()['api_detay']['yeniden_deneme'], 2)
+
+    def test_client_errors_fall_through(self):
+        before = self.server.request_count(DETAIL_PATH)
+        with self.assertRaises(UYAPApiError):
+            self.uyap.fetch_file_details('bilinmeyen-dosya')
+
+        self.assertEqual(self.server.request_count(DETAIL_PATH), before + 1)
+        self.assertEqual(self.uyap.policy.metrics.summary()['api_detay']['hatali'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
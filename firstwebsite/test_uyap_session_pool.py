@@ -0,0 +1,185 @@
+"""
+UYAP oturum havuzu testleri
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from selenium.common.exceptions import WebDriverException
+
+from uyap_session_pool import UYAPPoolExhausted, UYAPSessionPool
+
+
+class FakeDriver:
+    def __init__(self, alive=True):
+        self.alive = alive
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise WebDriverException("sürücü kapandı")
+        return 'complete'
+
+    def find_elements(self, by, value):
+        return [object()] * 5
+
+
+class FakeIntegration:
+    created = 0
+
+    def __init__(self):
+        FakeIntegration.created += 1
+        self.driver = FakeDriver()
+        self.session_active = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestSessionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = UYAPSessionPool(FakeIntegration, max_sessions=2, idle_timeout=60, lease_timeout=0.2)
+        self.addCleanup(self.pool.close)
+
+    def test_owner_gets_own_session_back(self):
+        with self.pool.session(owner=1) as first:
+            pass
+        with self.pool.session(owner=1) as again:
+            self.assertIs(again, first)
+        with self.pool.session(owner=2) as other:
+            self.assertIsNot(other, first)
+        self.assertEqual(self.pool.stats(), {'toplam': 2, 'kullanimda': 0, 'bosta': 2, 'en_fazla': 2})
+
+    def test_leased_session_is_exclusive(self):
+        first = self.pool.lease(owner=1)
+        second = self.pool.lease(owner=1)
+        self.assertIsNot(first.integration, second.integration)
+
+        # Havuz dolu ve iki oturum da kullanımda
+        with self.assertRaises(UYAPPoolExhausted):
+            self.pool.lease(owner=3)
+
+        self.pool.release(first)
+        self.pool.release(second)
+
+    def test_waiting_lease_gets_returned_session(self):
+        sessions = [self.pool.lease(owner=1), self.pool.lease(owner=2)]
+        threading.Timer(0.05, self.pool.release, args=(sessions[0],)).start()
+
+        pooled = self.pool.lease(owner=3, timeout=2)
+        # Başka kullanıcının oturumu kapatılıp yeni oturum açılır
+        self.assertTrue(sessions[0].integration.closed)
+        self.assertEqual(pooled.owner, 3)
+        self.pool.release(pooled)
+        self.pool.release(sessions[1])
+
+    def test_unhealthy_session_is_replaced(self):
+        with self.pool.session(owner=1) as uyap:
+            uyap.driver.alive = False
+        with self.pool.session(owner=1) as fresh:
+            self.assertIsNot(fresh, uyap)
+        self.assertTrue(uyap.closed)
+
+    def test_expired_portal_login_is_detected(self):
+        with self.pool.session(owner=1) as uyap:
+            uyap.driver.find_elements = lambda by, value: []
+        with self.pool.session(owner=1) as same:
+            self.assertIs(same, uyap)
+            self.assertFalse(same.session_active)
+
+    def test_idle_sessions_are_evicted(self):
+        with self.pool.session(owner=1) as uyap:
+            pass
+        self.assertEqual(self.pool.evict_idle(), 0)
+        self.assertEqual(self.pool.evict_idle(now=time.monotonic() + 61), 1)
+        self.assertTrue(uyap.closed)
+        self.assertEqual(self.pool.stats()['toplam'], 0)
+
+    def test_memory_limit_trims_then_restarts(self):
+        def usage(memory_mb):
+            return lambda: {'bellek_mb': memory_mb, 'esik_bellek_mb': 100, 'esik_asildi': memory_mb > 100}
+
+        with self.pool.session(owner=1) as trimmed:
+            pass
+        with self.pool.session(owner=2) as heavy:
+            pass
+        # Bellek azaltma ilk oturumu sınırın altına indirir, ikincisini indiremez
+        trimmed.resource_usage = usage(150)
+        trimmed.trim_memory = lambda: setattr(trimmed, 'resource_usage', usage(60))
+        heavy.resource_usage = usage(150)
+        heavy.trim_memory = lambda: None
+
+        self.assertEqual(self.pool.enforce_limits(), 1)
+        self.assertFalse(trimmed.closed)
+        self.assertTrue(heavy.closed)
+        self.assertEqual([item['bellek_mb'] for item in self.pool.resource_usage()], [60])
+        self.assertEqual(self.pool.stats()['toplam'], 1)
+
+        # Kiralanırken sınırı aşan oturum yenisiyle değiştirilir
+        trimmed.resource_usage = usage(150)
+        trimmed.trim_memory = lambda: None
+        with self.pool.session(owner=1) as fresh:
+            self.assertIsNot(fresh, trimmed)
+        self.assertTrue(trimmed.closed)
+
+    def test_failed_replacement_releases_session(self):
+        with self.pool.session(owner=1) as uyap:
+            uyap.driver.alive = False
+        self.pool.factory = lambda: (_ for _ in ()).throw(WebDriverException("chromedriver başlamadı"))
+
+        with self.assertRaises(WebDriverException):
+            self.pool.lease(owner=1)
+        self.assertEqual(self.pool.stats(), {'toplam': 0, 'kullanimda': 0, 'bosta': 0, 'en_fazla': 2})
+
+        self.pool.factory = FakeIntegration
+        with self.pool.session(owner=1) as fresh:
+            self.assertIsNot(fresh, uyap)
+
+    def test_parallel_owners(self):
+        """Farklı kullanıcıların işlemleri birbirini beklemez"""
+        pool = UYAPSessionPool(FakeIntegration, max_sessions=3, idle_timeout=60, lease_timeout=5)
+        self.addCleanup(pool.close)
+
+        def work(owner):
+            with pool.session(owner):
+                time.sleep(0.2)
+
+        threads = [threading.Thread(target=work, args=(owner,)) for owner in range(3)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+class TestManagerUsesPool(unittest.TestCase):
+
+    def test_manager_is_singleton_with_pool(self):
+        from uyap_integration_advanced import UYAPManager
+
+        manager = UYAPManager()
+        self.assertIs(UYAPManager().pool, manager.pool)
+        self.assertEqual(manager.get_pool_status()['kullanimda'], 0)
+
+    def test_pooled_sessions_do_not_share_debugger_chrome(self):
+        from uyap_integration_advanced import UYAPManager
+
+        manager = UYAPManager()
+        max_sessions = manager.pool.max_sessions
+        self.addCleanup(setattr, manager.pool, 'max_sessions', max_sessions)
+
+        manager.pool.max_sessions = 3
+        self.assertFalse(manager._create_integration().attach_debugger)
+        manager.pool.max_sessions = 1
+        self.assertTrue(manager._create_integration().attach_debugger)
+
+
+if __name__ == '__main__':
+    unittest.main()
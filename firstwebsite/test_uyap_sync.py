@@ -0,0 +1,177 @@
+"""
+UYAP artımlı dosya eşitleme testleri
+
+Portal yerine kaydedilmiş yanıtları sunan yerel sunucu (uyap_api_stub) kullanılır.
+"""
+
+import os
+import sys
+import unittest
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import Flask
+
+from models import db, CalendarEvent, CaseFile, Document, Expense, UyapDosyaSenkron, UyapSenkronImleci
+from uyap_api_client import UYAPApiClient, UYAPSessionExpired
+from uyap_api_stub import UYAPStubServer
+from uyap_bulk_import import UYAPBulkImporter
+from uyap_integration_advanced import UyapExpense
+from uyap_sync import UYAPSync, is_due
+
+DETAIL_PATH = '/dosya_detay_bilgileri_brd.ajx'
+USER_ID = 1
+
+
+class TestUYAPSync(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = UYAPStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        self.client = UYAPApiClient(base_url=self.server.base_url, cookies=self.server.cookies, page_size=2)
+        self.now = datetime(2024, 6, 1, 2, 0)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def sync(self, list_files=None, get_details=None, **kwargs):
+        return UYAPSync(USER_ID, list_files or self.client.search_files,
+                        get_details or self.client.get_file_details,
+                        yargi_turleri=['Hukuk'], clock=lambda: self.now).run(**kwargs)
+
+    def case(self, esas_no):
+        return CaseFile.query.filter_by(case_number=esas_no).one()
+
+    def test_first_sync_creates_local_records(self):
+        ozet = self.sync()
+
+        self.assertEqual((ozet['toplam'], ozet['yeni'], ozet['detay_istegi'], ozet['hata']), (3, 3, 3, 0))
+        case = self.case('2024/15')
+        self.assertEqual(case.courthouse, 'İstanbul 3. İş Mahkemesi')
+        self.assertEqual(case.year, 2024)
+        self.assertEqual(case.client_name, 'A*** Y***')
+        self.assertEqual(case.opponent_name, 'B*** Lojistik A.Ş.')
+        self.assertEqual(case.open_date, date(2024, 2, 1))
+        self.assertEqual(sorted(e.amount for e in case.expenses), [427.6, 1500.0])
+        self.assertEqual(len(case.documents), 2)
+        self.assertEqual((case.next_hearing, case.hearing_time), (date(2024, 6, 12), '10:30'))
+
+        event = CalendarEvent.query.filter_by(case_id=case.id).one()
+        self.assertEqual((event.date, event.time, event.event_type), (date(2024, 6, 12), time(10, 30), 'durusma'))
+
+        cursor = UyapSenkronImleci.query.filter_by(user_id=USER_ID).one()
+        self.assertEqual(cursor.durum, 'tamamlandi')
+        self.assertEqual(cursor.son_basarili, self.now)
+        self.assertEqual(cursor.to_dict()['ozet']['yeni'], 3)
+
+    def test_unchanged_files_fetch_no_details(self):
+        self.sync()
+        before = self.server.request_count(DETAIL_PATH)
+        ozet = self.sync()
+
+        self.assertEqual((ozet['ayni'], ozet['detay_istegi']), (3, 0))
+        self.assertEqual(self.server.request_count(DETAIL_PATH), before)
+        self.assertEqual(CaseFile.query.count(), 3)
+        self.assertEqual(Expense.query.count(), 3)
+        self.assertEqual(Document.query.count(), 2)
+        self.assertEqual(CalendarEvent.query.count(), 1)
+
+    def test_changed_file_is_updated_by_stable_keys(self):
+        self.sync()
+        case = self.case('2024/15')
+        db.session.add(Expense(case_id=case.id, expense_type='Yol', amount=80, date=date(2024, 3, 1)))
+        db.session.commit()
+
+        def list_files(filters):
+            return [replace(row, last_action='Duruşma ertelendi') if row.id == '1f4c9a20' else row
+                    for row in self.client.search_files(filters)]
+
+        def get_details(dosya_id):
+            details = self.client.get_file_details(dosya_id)
+            details['basic_info']['next_hearing'] = '03.09.2024 14:00'
+            details['expenses'].append(UyapExpense('Bilirkişi Ücreti', 2000.0, '20.06.2024', False))
+            return details
+
+        ozet = self.sync(list_files, get_details)
+
+        self.assertEqual((ozet['degisen'], ozet['ayni'], ozet['detay_istegi']), (1, 2, 1))
+        case = self.case('2024/15')
+        self.assertEqual(sorted(e.expense_type for e in case.expenses),
+                         ['Başvurma Harcı', 'Bilirkişi Ücreti', 'Gider Avansı', 'Yol'])
+        self.assertEqual(len(case.documents), 2)
+        # Ertelenen duruşmanın etkinliği yeni tarihe taşınır
+        event = CalendarEvent.query.filter_by(case_id=case.id).one()
+        self.assertEqual((event.date, event.time), (date(2024, 9, 3), time(14, 0)))
+
+    def test_existing_case_is_matched_not_duplicated(self):
+        db.session.add(CaseFile(file_type='hukuk', courthouse='İzmir 2. Aile Mahkemesi', department='Aile',
+                                year=2023, case_number='2023/1190', client_name='Müvekkil', user_id=USER_ID))
+        db.session.commit()
+        self.sync()
+
+        case = self.case('2023/1190')
+        self.assertEqual(case.client_name, 'Müvekkil')
+        self.assertEqual(case.status, 'Kapalı')
+        self.assertEqual(UyapDosyaSenkron.query.filter_by(case_id=case.id).count(), 1)
+
+    def test_bulk_imported_case_is_matched(self):
+        """Yılı verilmeden toplu aktarılan dosya eşitlemede aynı anahtarla bulunur"""
+        details = {'basic_info': {'esas_no': '2023/1190', 'mahkeme': 'İzmir 2. Aile Mahkemesi'},
+                   'parties': [], 'expenses': [], 'documents': []}
+        self.assertTrue(UYAPBulkImporter(USER_ID).import_files([details])[0]['success'])
+        self.assertEqual(self.case('2023/1190').year, 2023)
+
+        ozet = self.sync()
+        self.assertEqual((ozet['toplam'], ozet['hata']), (3, 0))
+        self.assertEqual(CaseFile.query.count(), 3)
+        self.assertEqual(UyapDosyaSenkron.query.filter_by(case_id=self.case('2023/1190').id).count(), 1)
+
+    def test_failed_file_is_retried_next_run(self):
+        self.server.fail_next(DETAIL_PATH, count=1)
+        ozet = self.sync()
+        self.assertEqual((ozet['yeni'], ozet['hata']), (2, 1))
+        self.assertEqual(UyapSenkronImleci.query.one().durum, 'tamamlandi')
+
+        ozet = self.sync()
+        self.assertEqual((ozet['yeni'], ozet['ayni'], ozet['detay_istegi']), (1, 2, 1))
+        self.assertIsNone(UyapDosyaSenkron.query.filter_by(uyap_dosya_id='1f4c9a20').one().hata)
+
+    def test_old_details_are_rechecked(self):
+        self.sync()
+        self.now += timedelta(days=8)
+        ozet = self.sync()
+        self.assertEqual((ozet['ayni'], ozet['detay_istegi']), (3, 3))
+
+    def test_expired_session_marks_cursor(self):
+        expired = UYAPApiClient(base_url=self.server.base_url)
+        with self.assertRaises(UYAPSessionExpired):
+            self.sync(expired.search_files, expired.get_file_details)
+        cursor = UyapSenkronImleci.query.one()
+        self.assertEqual(cursor.durum, 'hata')
+        self.assertIsNone(cursor.son_basarili)
+
+    def test_is_due(self):
+        self.assertTrue(is_due(USER_ID))
+        self.sync()
+        self.assertFalse(is_due(USER_ID, self.now + timedelta(hours=1)))
+        self.assertTrue(is_due(USER_ID, self.now + timedelta(hours=24)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+UYAP olay tabanlı bekleme koşulları testleri
+
+Gerçek tarayıcı yerine portal durumunu taklit eden sahte sürücü kullanılır.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from uyap_waits import (
+    GRID_STATE_JS, NETWORK_STATE_JS, StepTimer, download_complete, grid_loaded,
+    network_idle, wait_for_download, wait_for_grid, wait_until
+)
+from uyap_integration_advanced import UYAPAdvancedIntegration
+
+
+class FakeElement:
+    def __init__(self, text="", children=None):
+        self.text = text
+        self.children = children or []
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def find_elements(self, by, value):
+        return self.children
+
+
+class FakePortal:
+    """Sorgula tıklandıktan sonra belirli sayıda yoklama boyunca yükleniyor görünen portal"""
+
+    def __init__(self, loading_polls=3, rows=None):
+        self.loading_polls = loading_polls
+        self.remaining = 0
+        self.pending = 0
+        rows = rows or []
+        header = FakeElement()
+        self.table = FakeElement(children=[header] + [
+            FakeElement(children=[FakeElement(value) for value in row]) for row in rows
+        ])
+
+    def find_element(self, by, value):
+        if 'dx-datagrid-table' in value:
+            return self.table
+        return FakeElement()
+
+    def find_elements(self, by, value):
+        return [FakeElement()]
+
+    def execute_script(self, script, *args):
+        if script == NETWORK_STATE_JS:
+            if self.remaining:
+                self.remaining -= 1
+                return {'ready': 'complete', 'pending': 1, 'idle': 0}
+            return {'ready': 'complete', 'pending': 0, 'idle': 1000}
+        if script == GRID_STATE_JS:
+            return self.table
+        if 'click' in script:
+            self.remaining = self.loading_polls
+        return None
+
+
+class TestConditions(unittest.TestCase):
+
+    def test_network_idle(self):
+        portal = FakePortal(loading_polls=2)
+        portal.remaining = 2
+        condition = network_idle()
+        self.assertFalse(condition(portal))
+        self.assertFalse(condition(portal))
+        self.assertTrue(condition(portal))
+
+    def test_grid_waits_for_load_panel(self):
+        portal = FakePortal(loading_polls=3)
+        portal.remaining = 3
+        start = time.perf_counter()
+        self.assertIs(wait_for_grid(portal), portal.table)
+        self.assertLess(time.perf_counter() - start, 1)
+
+        portal.table = None
+        self.assertFalse(grid_loaded()(portal))
+
+    def test_timeout(self):
+        portal = FakePortal()
+        portal.remaining = 1000
+        with self.assertRaises(TimeoutException):
+            wait_until(portal, network_idle(), timeout=0.3)
+
+
+class TestDownloadComplete(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, True)
+
+    def test_partial_download_is_not_complete(self):
+        path = os.path.join(self.work_dir, 'karar.pdf')
+        condition = download_complete(self.work_dir, 'karar.pdf')
+        with open(path + '.crdownload', 'wb') as f:
+            f.write(b'%PDF')
+        self.assertFalse(condition())
+
+        os.replace(path + '.crdownload', path)
+        self.assertFalse(condition())  # boyut ilk kez görüldü
+        self.assertEqual(condition(), path)
+
+    def test_wait_returns_when_file_lands(self):
+        def finish():
+            with open(os.path.join(self.work_dir, 'dilekce.udf'), 'wb') as f:
+                f.write(b'icerik')
+
+        timer = threading.Timer(0.2, finish)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        start = time.perf_counter()
+        self.assertTrue(wait_for_download(self.work_dir, 'dilekce.udf', timeout=5))
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIsNone(wait_for_download(self.work_dir, 'yok.pdf', timeout=0.2))
+
+
+class TestAdvancedIntegrationWaits(unittest.TestCase):
+
+    def test_search_finishes_when_grid_ready(self):
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        uyap = UYAPAdvancedIntegration(downloads_path=work_dir)
+        uyap.driver = FakePortal(rows=[
+            ('2024/15', 'İstanbul 3. İş Mahkemesi', 'Hukuk', 'Açık', '01.02.2024', 'A - B'),
+        ])
+        uyap.wait = WebDriverWait(uyap.driver, 5)
+
+        start = time.perf_counter()
+        files = uyap.search_files({})
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual([f.esas_no for f in files], ['2024/15'])
+
+        timings = uyap.timer.summary()
+        self.assertEqual(timings['sorgu']['adet'], 1)
+        self.assertIn('sonuc_okuma', timings)
+
+
+class TestStepTimer(unittest.TestCase):
+
+    def test_summary(self):
+        timer = StepTimer()
+        timer.record('sorgu', 0.5)
+        timer.record('sorgu', 1.5)
+        with timer.step('giris'):
+            pass
+        summary = timer.summary()
+        self.assertEqual(summary['sorgu'], {'adet': 2, 'toplam': 2.0, 'ortalama': 1.0, 'son': 1.5, 'en_uzun': 1.5})
+        self.assertEqual(summary['giris']['adet'], 1)
+        timer.reset()
+        self.assertEqual(timer.summary(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
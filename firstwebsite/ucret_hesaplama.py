@@ -0,0 +1,482 @@
+"""
+Harç ve vekalet ücreti hesaplama motoru
+
+Yıllık harç tarifeleri harc_tarifeleri.txt dosyasından, AAÜT (Avukatlık
+Asgari Ücret Tarifesi) Üçüncü Kısım dilimleri ise tarife kataloğundan
+(tarifeler.txt, TBB_3_* satırları) derlenir:
+
+    - Harç tarifesi: her yıl için (işlem, mahkeme türü) -> kalemler sözlüğü
+    - AAÜT: dilim alt sınırları, oranları ve dilim başına birikimli ücret
+
+Böylece dava değerine göre vekalet ücreti, dilim sayısından bağımsız olarak
+tek ikili arama ile bulunur:
+
+    ücret = B(i) + (değer - alt_sınır(i)) * oran(i)
+
+Tarife yılı da sıralı yıl listesinde ikili aramayla seçilir (istenen yıla
+kadar yayımlanmış son tarife). Açık dosyaların ücretleri yeni tarife yılı
+yayımlandığında tek çağrıda yeniden hesaplanır.
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from models import db, CaseFile, DosyaUcretHesabi
+from tarife_catalogue import parse_amount, tarife_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HARC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'harc_tarifeleri.txt')
+
+MAHKEME_TURLERI = ('sulh', 'asliye', 'aile', 'is', 'ticaret', 'tuketici')
+ISLEM_TURLERI = ('dava', 'istinaf', 'temyiz', 'icra')
+KALEM_TURLERI = ('MAKTU', 'BINDE', 'BINDE_PESIN')
+
+# Tek çağrıda hesaplanabilecek en fazla kayıt sayısı
+MAX_ITEMS = 10000
+
+# AAÜT Üçüncü Kısım dilim satırları (TBB_3_1, TBB_3_2, ...)
+AAUT_CODE_PATTERN = re.compile(r'^TBB_3_(\d+)$')
+AAUT_GROUP_PATTERN = re.compile(r'^TBB_(\d{4})$')
+AAUT_WIDTH_PATTERN = re.compile(r'(\d[\d.]*(?:,\d+)?)\s*TL')
+
+
+class UcretHesaplamaError(ValueError):
+    """Geçersiz hesaplama girdisi veya tanımsız tarife"""
+    pass
+
+
+def _parse_value(value, field_name='dava_degeri'):
+    amount = parse_amount(value) if not isinstance(value, (int, float)) else float(value)
+    if amount is None:
+        raise UcretHesaplamaError(f"'{field_name}' sayı olmalıdır.")
+    if amount < 0:
+        raise UcretHesaplamaError(f"'{field_name}' negatif olamaz.")
+    return amount
+
+
+def _pick_year(years, yil):
+    """Sıralı yıl listesinde yil'e kadar yayımlanmış son tarife yılı; yoksa None"""
+    index = bisect_right(years, yil) - 1
+    return years[index] if index >= 0 else None
+
+
+# --- Harç tarifeleri ---
+
+@dataclass(frozen=True)
+class HarcKalemi:
+    kalem: str
+    deger: float
+    tur: str
+    asgari: Optional[float] = None
+
+    def tutar(self, dava_degeri):
+        if self.tur == 'MAKTU':
+            return self.deger
+        amount = dava_degeri * self.deger / 1000
+        if self.tur == 'BINDE_PESIN':
+            amount /= 4
+        if self.asgari is not None:
+            amount = max(amount, self.asgari)
+        return amount
+
+
+class HarcTarifeleri:
+    """
+    Yıllık harç tarifesi tablosu
+
+    Dosya değişiklik zamanı her erişimde kontrol edilir. Her yıl için
+    (işlem, mahkeme türü) anahtarlı kalem listesi önceden kurulur; '*'
+    satırları tüm mahkeme türlerine açılır.
+    """
+
+    def __init__(self, filepath=DEFAULT_HARC_FILE):
+        self.filepath = filepath
+        self._signature = False
+        self._years = []
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _current_signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _parse_line(self, line):
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) < 6:
+            raise ValueError("yetersiz bölüm")
+        yil, islem, kalem, mahkemeler, deger, tur, *rest = parts
+        tur = tur.upper()
+        if islem not in ISLEM_TURLERI or tur not in KALEM_TURLERI:
+            raise ValueError("tanınmayan işlem veya kalem türü")
+        if mahkemeler == '*':
+            courts = MAHKEME_TURLERI
+        else:
+            courts = tuple(c.strip() for c in mahkemeler.split(',') if c.strip())
+            if not courts or any(c not in MAHKEME_TURLERI for c in courts):
+                raise ValueError("tanınmayan mahkeme türü")
+        asgari = float(rest[0]) if rest and rest[0] else None
+        return int(yil), islem, courts, HarcKalemi(kalem=kalem, deger=float(deger), tur=tur, asgari=asgari)
+
+    def _ensure_loaded(self):
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            tables = {}
+            if signature is None:
+                logger.error(f"Harç tarifesi dosyası bulunamadı: {self.filepath}")
+            else:
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    for line_num, line in enumerate(f, 1):
+                        line = line.strip()
+                        if not line or line.startswith('#'):
+                            continue
+                        try:
+                            yil, islem, courts, kalem = self._parse_line(line)
+                        except ValueError:
+                            logger.warning(f"Harç tarifesi satırı atlandı ({self.filepath}:{line_num}): {line}")
+                            continue
+                        table = tables.setdefault(yil, {})
+                        for court in courts:
+                            table.setdefault((islem, court), []).append(kalem)
+            self._tables = {yil: {key: tuple(items) for key, items in table.items()}
+                            for yil, table in tables.items()}
+            self._years = sorted(self._tables)
+            self._signature = signature
+
+    def years(self):
+        self._ensure_loaded()
+        return list(self._years)
+
+    def kalemler(self, yil, islem, mahkeme):
+        """
+        Yıl için geçerli tarifenin kalemleri
+
+        Returns:
+            Tuple[int, tuple]: (tarife yılı, kalemler)
+        """
+        self._ensure_loaded()
+        tarife_yili = _pick_year(self._years, yil)
+        if tarife_yili is None:
+            raise UcretHesaplamaError(f"{yil} yılı için harç tarifesi tanımlı değil.")
+        items = self._tables[tarife_yili].get((islem, mahkeme))
+        if not items:
+            raise UcretHesaplamaError(f"{tarife_yili} harç tarifesinde '{islem}' / '{mahkeme}' tanımlı değil.")
+        return tarife_yili, items
+
+    def tablo(self, yil):
+        """
+        Yıl için geçerli tarifenin tüm kalemleri (harç hesaplama sayfası bu
+        tabloyla hesaplar)
+
+        Returns:
+            Tuple[int, dict]: (tarife yılı, {işlem: {mahkeme: {kalem: {'deger', 'tur', 'asgari'}}}})
+        """
+        self._ensure_loaded()
+        tarife_yili = _pick_year(self._years, yil)
+        if tarife_yili is None:
+            raise UcretHesaplamaError(f"{yil} yılı için harç tarifesi tanımlı değil.")
+        tablo = {}
+        for (islem, mahkeme), items in self._tables[tarife_yili].items():
+            tablo.setdefault(islem, {})[mahkeme] = {
+                item.kalem: {'deger': item.deger, 'tur': item.tur, 'asgari': item.asgari} for item in items
+            }
+        return tarife_yili, tablo
+
+
+harc_tarifeleri = HarcTarifeleri()
+
+
+# --- AAÜT dilimleri ---
+
+class BracketTable:
+    """
+    Artan oranlı dilim tablosu
+
+    Args:
+        brackets: [(dilim genişliği veya son dilim için None, yüzde oran)], sıralı
+    """
+
+    def __init__(self, brackets):
+        self.lowers = []
+        self.rates = []
+        self.cumulative = []
+        lower = total = 0.0
+        for width, rate in brackets:
+            self.lowers.append(lower)
+            self.rates.append(rate)
+            self.cumulative.append(total)
+            if width is None:
+                break
+            lower += width
+            total += width * rate / 100
+
+    def fee(self, value):
+        index = bisect_right(self.lowers, value) - 1
+        if index < 0:
+            return 0.0
+        return self.cumulative[index] + (value - self.lowers[index]) * self.rates[index] / 100
+
+    def to_list(self):
+        return [{'alt_sinir': lower, 'oran': rate} for lower, rate in zip(self.lowers, self.rates)]
+
+
+def compile_aaut(catalogue) -> Dict[int, BracketTable]:
+    """Tarife kataloğundaki AAÜT Üçüncü Kısım satırlarını yıl bazında dilim tablolarına derler"""
+    rows = {}
+    for service in catalogue.rows:
+        code_match = AAUT_CODE_PATTERN.match(service.get('hizmet_kodu') or '')
+        group_match = AAUT_GROUP_PATTERN.match(service.get('tarife_kodu') or '')
+        if not code_match or not group_match or service.get('tutar') is None:
+            continue
+        rows.setdefault(int(group_match.group(1)), []).append((int(code_match.group(1)), service))
+
+    tables = {}
+    for yil, items in rows.items():
+        brackets = []
+        for _, service in sorted(items, key=lambda item: item[0]):
+            name = service['hizmet_adi'] or ''
+            if 'yukarı' in name.lower():
+                brackets.append((None, service['tutar']))
+                break
+            width_match = AAUT_WIDTH_PATTERN.search(name)
+            width = parse_amount(width_match.group(1)) if width_match else None
+            if not width:
+                logger.warning(f"AAÜT dilim genişliği okunamadı ({service['hizmet_kodu']}): {name}")
+                brackets = []
+                break
+            brackets.append((width, service['tutar']))
+        if brackets:
+            tables[yil] = BracketTable(brackets)
+    return tables
+
+
+# --- Hesaplama ---
+
+class UcretMotoru:
+    """
+    Harç ve vekalet ücreti hesaplama motoru
+
+    AAÜT tabloları tarife kataloğu her yeniden derlendiğinde yeniden kurulur.
+    """
+
+    def __init__(self, harc=None, catalogue_registry=None):
+        self.harc = harc or harc_tarifeleri
+        self.catalogue_registry = catalogue_registry or tarife_registry
+        self._aaut = {}
+        self._aaut_years = []
+        self._aaut_catalogue = None
+        self._lock = threading.Lock()
+
+    def _aaut_tables(self):
+        catalogue = self.catalogue_registry.catalogue()
+        with self._lock:
+            if self._aaut_catalogue is not catalogue:
+                self._aaut = compile_aaut(catalogue)
+                self._aaut_years = sorted(self._aaut)
+                self._aaut_catalogue = catalogue
+            return self._aaut, self._aaut_years
+
+    def aaut_table(self, yil):
+        """Returns: Tuple[int, BracketTable]: (tarife yılı, dilim tablosu)"""
+        tables, years = self._aaut_tables()
+        tarife_yili = _pick_year(years, yil)
+        if tarife_yili is None:
+            tanimli = ', '.join(str(y) for y in years) or 'yok'
+            raise UcretHesaplamaError(f"{yil} yılı için AAÜT dilim tablosu tanımlı değil (tanımlı tarife yılları: {tanimli}).")
+        return tarife_yili, tables[tarife_yili]
+
+    def harc_hesapla(self, dava_degeri, islem='dava', mahkeme='asliye', yil=None):
+        tarife_yili, items = self.harc.kalemler(yil or date.today().year, islem, mahkeme)
+        kalemler = {item.kalem: round(item.tutar(dava_degeri), 2) for item in items}
+        return {'tarife_yili': tarife_yili, 'kalemler': kalemler, 'toplam': round(sum(kalemler.values()), 2)}
+
+    def vekalet_hesapla(self, dava_degeri, yil=None, asgari=None):
+        """
+        AAÜT Üçüncü Kısma göre nispi vekalet ücreti
+
+        asgari: Ücretin maktu ücretten az olamayacağı durumlarda alt sınır;
+                tutar ya da katalogdaki hizmet kodu (ör. TBB_2_1_3)
+        """
+        tarife_yili, table = self.aaut_table(yil or date.today().year)
+        ucret = table.fee(dava_degeri)
+        result = {'tarife_yili': tarife_yili, 'nispi': round(ucret, 2)}
+        if asgari not in (None, ''):
+            if isinstance(asgari, str) and parse_amount(asgari) is None:
+                service = self.catalogue_registry.get_service(asgari)
+                if service is None or service.get('tutar') is None:
+                    raise UcretHesaplamaError(f"Asgari ücret için hizmet kodu bulunamadı: {asgari}")
+                asgari = service['tutar']
+            asgari = _parse_value(asgari, 'asgari_vekalet')
+            result['asgari'] = asgari
+            result['asgari_uygulandi'] = ucret < asgari
+            ucret = max(ucret, asgari)
+        result['ucret'] = round(ucret, 2)
+        return result
+
+    def hesapla(self, item, yil=None):
+        """
+        Tek kayıt için harç ve vekalet ücreti
+
+        item: {'id'?, 'dava_degeri', 'islem'?, 'mahkeme'?, 'yil'?, 'asgari_vekalet'?,
+               'harc'?: bool, 'vekalet'?: bool}
+        """
+        if not isinstance(item, dict):
+            raise UcretHesaplamaError("Kayıt nesne olmalıdır.")
+        dava_degeri = _parse_value(item.get('dava_degeri'))
+        islem = item.get('islem') or 'dava'
+        mahkeme = item.get('mahkeme') or 'asliye'
+        if islem not in ISLEM_TURLERI:
+            raise UcretHesaplamaError(f"Bilinmeyen işlem türü: {islem}")
+        if mahkeme not in MAHKEME_TURLERI:
+            raise UcretHesaplamaError(f"Bilinmeyen mahkeme türü: {mahkeme}")
+        try:
+            yil = int(item.get('yil') or yil or date.today().year)
+        except (TypeError, ValueError):
+            raise UcretHesaplamaError("Tarife yılı sayı olmalıdır.")
+
+        result = {'id': item.get('id'), 'dava_degeri': dava_degeri, 'islem': islem, 'mahkeme': mahkeme, 'yil': yil}
+        toplam = 0.0
+        if item.get('harc', True):
+            result['harc'] = self.harc_hesapla(dava_degeri, islem, mahkeme, yil)
+            toplam += result['harc']['toplam']
+        if item.get('vekalet', True):
+            result['vekalet'] = self.vekalet_hesapla(dava_degeri, yil, item.get('asgari_vekalet'))
+            toplam += result['vekalet']['ucret']
+        result['toplam'] = round(toplam, 2)
+        return result
+
+    def hesapla_toplu(self, items, yil=None) -> List[dict]:
+        """
+        Kayıt listesini tek geçişte hesaplar
+
+        Hatalı kayıtlar diğerlerini durdurmaz; sonuç listesinde 'hata' alanıyla
+        döner.
+        """
+        if not isinstance(items, (list, tuple)):
+            raise UcretHesaplamaError("Kayıtlar liste olarak gönderilmelidir.")
+        if len(items) > MAX_ITEMS:
+            raise UcretHesaplamaError(f"Tek seferde en fazla {MAX_ITEMS} kayıt hesaplanabilir.")
+        results = []
+        for index, item in enumerate(items):
+            try:
+                results.append(self.hesapla(item, yil))
+            except UcretHesaplamaError as e:
+                results.append({'id': item.get('id') if isinstance(item, dict) else None,
+                                'hata': f"{index + 1}. kayıt: {e}"})
+        return results
+
+
+def summarize(results):
+    """Toplu sonuçların harç / vekalet toplamları"""
+    valid = [r for r in results if 'hata' not in r]
+    return {
+        'adet': len(results),
+        'hatali': len(results) - len(valid),
+        'harc_toplam': round(sum(r['harc']['toplam'] for r in valid if 'harc' in r), 2),
+        'vekalet_toplam': round(sum(r['vekalet']['ucret'] for r in valid if 'vekalet' in r), 2),
+        'toplam': round(sum(r['toplam'] for r in valid), 2)
+    }
+
+
+# --- Dosyalar ---
+
+def _turkish_lower(text):
+    return (text or '').replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def islem_ve_mahkeme(case_file):
+    """
+    Dosya türü ve biriminden (işlem, mahkeme türü) çıkarır
+
+    Ceza dosyaları ve tanınmayan birimler için (None, None) döner.
+    """
+    file_type = _turkish_lower(case_file.file_type)
+    department = _turkish_lower(case_file.department)
+    if file_type == 'ceza' or 'ceza' in department:
+        return None, None
+    if file_type == 'icra' or 'icra' in department:
+        return 'icra', 'asliye'
+    for keyword, mahkeme in (('sulh', 'sulh'), ('aile', 'aile'), ('iş mahkemesi', 'is'),
+                             ('ticaret', 'ticaret'), ('tüketici', 'tuketici'), ('asliye', 'asliye')):
+        if keyword in department:
+            return 'dava', mahkeme
+    return None, None
+
+
+def _ensure_table():
+    DosyaUcretHesabi.__table__.create(db.engine, checkfirst=True)
+
+
+def _apply_result(record, result):
+    record.tarife_yili = result['yil']
+    record.harc_toplam = result['harc']['toplam']
+    record.vekalet_ucreti = result['vekalet']['ucret']
+    record.sonuc = json.dumps(result, ensure_ascii=False)
+    record.hesaplama_tarihi = datetime.utcnow()
+
+
+def dosya_ucreti_kaydet(motor, case_file, dava_degeri, islem=None, mahkeme=None, yil=None):
+    """Dosyanın dava değerini kaydeder ve ücretlerini hesaplar"""
+    _ensure_table()
+    if not islem or not mahkeme:
+        detected_islem, detected_mahkeme = islem_ve_mahkeme(case_file)
+        islem = islem or detected_islem
+        mahkeme = mahkeme or detected_mahkeme
+        if not islem:
+            raise UcretHesaplamaError("Dosyanın işlem / mahkeme türü belirlenemedi; açıkça belirtilmelidir.")
+
+    result = motor.hesapla({'id': case_file.id, 'dava_degeri': dava_degeri, 'islem': islem,
+                            'mahkeme': mahkeme}, yil)
+    record = DosyaUcretHesabi.query.filter_by(case_file_id=case_file.id).first()
+    if record is None:
+        record = DosyaUcretHesabi(case_file_id=case_file.id)
+        db.session.add(record)
+    record.dava_degeri = result['dava_degeri']
+    record.islem = islem
+    record.mahkeme_turu = mahkeme
+    _apply_result(record, result)
+    db.session.commit()
+    return result
+
+
+def acik_dosyalari_yeniden_hesapla(motor, yil=None, user_id=None):
+    """
+    Dava değeri kayıtlı tüm açık dosyaların ücretlerini yeniden hesaplar
+
+    Yeni tarife yılı yayımlandığında kullanılır; tüm dosyalar tek sorgu ve
+    tek commit ile güncellenir. Hatalı kayıtların önceki hesabı korunur.
+    """
+    _ensure_table()
+    query = db.session.query(DosyaUcretHesabi, CaseFile).join(
+        CaseFile, CaseFile.id == DosyaUcretHesabi.case_file_id
+    ).filter(db.or_(CaseFile.status.is_(None), CaseFile.status != 'Kapalı'))
+    if user_id is not None:
+        query = query.filter(CaseFile.user_id == user_id)
+    rows = query.order_by(CaseFile.id).all()
+
+    results = motor.hesapla_toplu([{
+        'id': case_file.id,
+        'dava_degeri': record.dava_degeri,
+        'islem': record.islem,
+        'mahkeme': record.mahkeme_turu
+    } for record, case_file in rows], yil)
+
+    for (record, _), result in zip(rows, results):
+        if 'hata' not in result:
+            _apply_result(record, result)
+    db.session.commit()
+    return results
@@ -0,0 +1,164 @@
+"""
+Yerel UDF işleyici için performans ölçümü
+
+uploads klasöründeki gerçek UDF dosyaları ve üretilen büyük yapay belgeler
+üzerinde ayrıştırma ve PDF üretim sürelerini ölçer. Çıktılar geçici bir
+klasöre yazılır, uploads klasörüne dokunulmaz.
+
+Kullanım:
+    python udf_benchmark.py
+    python udf_benchmark.py --paragraphs 2000 --repeat 3 uploads/ornek_dilekceler
+"""
+
+import os
+import sys
+import glob
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from udf_renderer import parse_udf, render_udf_to_pdf, render_udf_to_pdf_cached
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = [os.path.join(BASE_DIR, 'uploads')]
+
+SAMPLE_SENTENCE = ("Davacı vekili dilekçesinde özetle; müvekkilinin alacağının ödenmediğini, "
+                   "icra takibine haksız olarak itiraz edildiğini ileri sürmüştür. ")
+
+
+def build_synthetic_udf(path, paragraph_count, table_rows=20):
+    """
+    Verilen sayıda paragraf ve bir tablo içeren yapay UDF dosyası üretir
+
+    Args:
+        path: Yazılacak .udf dosyası
+        paragraph_count: Paragraf sayısı
+        table_rows: Tablodaki satır sayısı
+    """
+    text_parts = []
+    elements = []
+    offset = 0
+
+    def add_text(value):
+        nonlocal offset
+        start = offset
+        text_parts.append(value)
+        offset += len(value)
+        return start, len(value)
+
+    for index in range(paragraph_count):
+        start, length = add_text(f"{index + 1}. {SAMPLE_SENTENCE * 3}\n")
+        bold = 'true' if index % 10 == 0 else 'false'
+        elements.append(
+            f'<paragraph Alignment="3" FirstLineIndent="28.0" SpaceBelow="4.0">'
+            f'<content startOffset="{start}" length="{length}" family="Times New Roman" size="12" bold="{bold}"/>'
+            f'</paragraph>'
+        )
+
+    rows = []
+    for row_index in range(table_rows):
+        cells = []
+        for column in ('Alacak Kalemi', 'Tutar', 'Faiz Başlangıcı'):
+            start, length = add_text(f"{column} {row_index + 1}\n")
+            cells.append(f'<cell><paragraph><content startOffset="{start}" length="{length}"/></paragraph></cell>')
+        rows.append(f'<row>{"".join(cells)}</row>')
+    elements.append(f'<table columnCount="3">{"".join(rows)}</table>')
+
+    content_xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<template format_id="1.8">'
+        f'<content><![CDATA[{"".join(text_parts)}]]></content>'
+        '<properties><pageFormat mediaSizeName="1" leftMargin="70.875" rightMargin="42.525" '
+        'topMargin="42.525" bottomMargin="42.525" paperOrientation="1" headerFOffset="20.0" footerFOffset="20.0"/>'
+        '</properties>'
+        f'<elements resolver="hvl-default">{"".join(elements)}</elements>'
+        '<styles><style name="default" description="Geçerli" family="Dialog" size="12" bold="false" italic="false"/>'
+        '<style name="hvl-default" family="Times New Roman" size="12" description="Gövde"/></styles>'
+        '</template>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('content.xml', content_xml)
+    return path
+
+
+def collect_corpus(paths):
+    """Klasör veya dosya yollarından .udf dosyalarını toplar"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, '**', '*.udf'), recursive=True))
+        elif os.path.isfile(path):
+            files.append(path)
+    return sorted(set(files))
+
+
+def benchmark_file(path, work_dir, repeat):
+    """Tek dosya için ayrıştırma ve PDF üretim sürelerini (ms) ölçer"""
+    parse_times, render_times = [], []
+    output_path = os.path.join(work_dir, 'cikti.pdf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        document = parse_udf(path)
+        parsed = time.perf_counter()
+        render_udf_to_pdf(document, output_path)
+        rendered = time.perf_counter()
+        parse_times.append((parsed - started) * 1000)
+        render_times.append((rendered - parsed) * 1000)
+
+    cache_dir = os.path.join(work_dir, 'onbellek')
+    render_udf_to_pdf_cached(path, cache_dir)
+    started = time.perf_counter()
+    render_udf_to_pdf_cached(path, cache_dir)
+    cached_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        'parse_ms': statistics.median(parse_times),
+        'render_ms': statistics.median(render_times),
+        'cached_ms': cached_ms,
+        'pdf_kb': os.path.getsize(output_path) / 1024.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Yerel UDF->PDF işleyici performans ölçümü')
+    parser.add_argument('paths', nargs='*', default=DEFAULT_CORPUS, help='UDF dosyaları veya klasörleri')
+    parser.add_argument('--repeat', type=int, default=1, help='Her dosya için tekrar sayısı')
+    parser.add_argument('--paragraphs', type=int, default=500, help='Yapay belgedeki paragraf sayısı (0: üretme)')
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix='udf_benchmark_')
+    try:
+        files = collect_corpus(args.paths)
+        if args.paragraphs > 0:
+            files.append(build_synthetic_udf(os.path.join(work_dir, f'yapay_{args.paragraphs}.udf'), args.paragraphs))
+
+        print(f"{'Dosya':<60} {'Ayrıştırma':>11} {'PDF':>9} {'Önbellek':>9} {'Boyut':>9}")
+        failures = 0
+        totals = []
+        for path in files:
+            name = os.path.basename(path)[:60]
+            try:
+                result = benchmark_file(path, work_dir, max(1, args.repeat))
+            except Exception as e:
+                failures += 1
+                print(f"{name:<60} HATA: {str(e)[:80]}")
+                continue
+            totals.append(result['parse_ms'] + result['render_ms'])
+            print(f"{name:<60} {result['parse_ms']:>9.1f}ms {result['render_ms']:>7.1f}ms "
+                  f"{result['cached_ms']:>7.2f}ms {result['pdf_kb']:>7.1f}KB")
+
+        if totals:
+            print(f"\n{len(totals)} dosya, medyan {statistics.median(totals):.1f}ms, "
+                  f"en yavaş {max(totals):.1f}ms, hata {failures}")
+        return 1 if failures else 0
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,766 @@
+"""
+UYAP UDF belgeleri için yerel (harici editör gerektirmeyen) PDF işleyici
+
+UDF dosyası, content.xml içeren bir ZIP arşividir:
+
+    <template format_id="1.8">
+        <content><![CDATA[ ...belgenin tüm düz metni... ]]></content>
+        <properties><pageFormat .../><bgImage .../></properties>
+        <elements>
+            <header>/<footer>/<paragraph>/<table> ...
+                <content|space|field|tab startOffset=".." length=".." bold=".." ... />
+        </elements>
+        <styles><style name=".." family=".." size=".." .../></styles>
+    </template>
+
+Paragraf ve tablolar metne startOffset/length ile başvurur; biçim bilgisi
+eleman niteliklerinden ve <styles> altındaki adlandırılmış stillerden
+(resolver) gelir. Bu modül bu yapıyı reportlab platypus akışına çevirir.
+"""
+
+import os
+import re
+import base64
+import hashlib
+import logging
+import tempfile
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from html import escape
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+from reportlab.lib.pagesizes import A4, A5, A3, LETTER, LEGAL, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage
+
+from pdf_fonts import resolve_font
+
+logger = logging.getLogger(__name__)
+
+# İşleyici çıktısını etkileyen değişikliklerde artırılır; önbellek anahtarına dahildir
+RENDERER_VERSION = 1
+
+_ALIGNMENTS = {'0': TA_LEFT, '1': TA_CENTER, '2': TA_RIGHT, '3': TA_JUSTIFY}
+_IMAGE_ALIGNMENTS = {'0': 'LEFT', '1': 'CENTER', '2': 'RIGHT', '3': 'LEFT'}
+_PAGE_SIZES = {'0': LETTER, '1': A4, '2': A3, '3': A5, '4': LEGAL}
+
+# Metin parçası taşıyan elemanlar
+_RUN_TAGS = {'content', 'space', 'field', 'tab'}
+
+DEFAULT_FONT_FAMILY = 'Times New Roman'
+DEFAULT_FONT_SIZE = 12.0
+DEFAULT_TAB_WIDTH = 36.0
+
+# Bellekte tutulacak en fazla ayrıştırılmış belge ve dosya özeti sayısı
+DOCUMENT_CACHE_SIZE = 32
+HASH_MEMO_SIZE = 1024
+
+# Yedek metin çıkarımında XML'in parça parça okunma boyutu
+XML_READ_CHUNK = 64 * 1024
+# content.xml dışındaki XML üyelerinin kullanılması için gereken en az metin uzunluğu
+MIN_FALLBACK_TEXT = 100
+
+_document_cache = OrderedDict()
+_hash_memo = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class UdfFormatError(Exception):
+    """UDF dosyası okunamadığında fırlatılır"""
+
+
+@dataclass
+class UdfRun:
+    """Aynı biçime sahip metin parçası"""
+    text: str
+    family: str = DEFAULT_FONT_FAMILY
+    size: float = DEFAULT_FONT_SIZE
+    bold: bool = False
+    italic: bool = False
+    underline: bool = False
+    color: Optional[str] = None
+    is_tab: bool = False
+    image_data: Optional[str] = None
+
+
+@dataclass
+class UdfParagraph:
+    """UDF paragrafı"""
+    runs: List[UdfRun] = field(default_factory=list)
+    alignment: str = '0'
+    left_indent: float = 0.0
+    right_indent: float = 0.0
+    first_line_indent: float = 0.0
+    hanging: float = 0.0
+    space_above: float = 0.0
+    space_below: float = 0.0
+    line_spacing: float = 0.0
+    tab_stops: List[float] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return ''.join(run.text for run in self.runs)
+
+
+@dataclass
+class UdfTable:
+    """UDF tablosu; her hücre paragraf listesidir"""
+    rows: List[List[List[UdfParagraph]]] = field(default_factory=list)
+    border: bool = True
+
+
+@dataclass
+class UdfDocument:
+    """Ayrıştırılmış UDF belgesi"""
+    text: str = ''
+    page_size: tuple = A4
+    margins: Dict[str, float] = field(default_factory=lambda: {'left': 70.0, 'right': 42.5, 'top': 42.5, 'bottom': 42.5})
+    header_offset: float = 20.0
+    footer_offset: float = 20.0
+    background_image: Optional[str] = None
+    body: List[object] = field(default_factory=list)
+    header: List[UdfParagraph] = field(default_factory=list)
+    header_start_page: int = 1
+    footer: List[UdfParagraph] = field(default_factory=list)
+    page_number: Optional[Dict[str, str]] = None
+
+    @property
+    def plain_text(self) -> str:
+        """Gövde paragraflarının düz metni"""
+        lines = []
+        for block in self.body:
+            if isinstance(block, UdfParagraph):
+                lines.append(block.text.rstrip('\n'))
+            elif isinstance(block, UdfTable):
+                for row in block.rows:
+                    lines.append('\t'.join(' '.join(p.text.strip() for p in cell) for cell in row))
+        return '\n'.join(lines)
+
+
+def _to_float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_bool(value):
+    return str(value).lower() == 'true'
+
+
+def _java_color(value):
+    """Java'nın işaretli ARGB tamsayısını '#rrggbb' biçimine çevirir"""
+    try:
+        return '#%06x' % (int(value) & 0xFFFFFF)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_tab_stops(value):
+    stops = []
+    for part in (value or '').split(','):
+        position = part.split(':', 1)[0]
+        if position:
+            stops.append(_to_float(position))
+    return sorted(stops)
+
+
+class _UdfBuilder:
+    """
+    Akıştan toplanan ham elemanları UdfDocument bloklarına çevirir
+
+    Ham paragraf (nitelikler, [(etiket, nitelikler), ...]) biçimindedir;
+    <styles> bölümü content.xml'in sonunda yer aldığından stil çözümlemesi
+    akış bittikten sonra yapılır.
+    """
+
+    def __init__(self, text: str, styles: Dict[str, Dict[str, str]]):
+        self.text = text
+        self.styles = styles
+        self.base_style = dict(styles.get('hvl-default') or styles.get('default') or {})
+
+    def style_attrs(self, attrib, inherited=None):
+        attrs = dict(inherited or self.base_style)
+        resolver = attrib.get('resolver')
+        if resolver and resolver in self.styles:
+            attrs.update(self.styles[resolver])
+        attrs.update(attrib)
+        return attrs
+
+    def slice(self, attrib):
+        start = int(_to_float(attrib.get('startOffset'), 0))
+        length = int(_to_float(attrib.get('length'), 0))
+        return self.text[start:start + length]
+
+    def paragraph(self, raw) -> UdfParagraph:
+        attrib, children = raw
+        attrs = self.style_attrs(attrib)
+        paragraph = UdfParagraph(
+            alignment=attrs.get('Alignment', '0'),
+            left_indent=_to_float(attrs.get('LeftIndent')),
+            right_indent=_to_float(attrs.get('RightIndent')),
+            first_line_indent=_to_float(attrs.get('FirstLineIndent')),
+            hanging=_to_float(attrs.get('Hanging')),
+            space_above=_to_float(attrs.get('SpaceAbove')),
+            space_below=_to_float(attrs.get('SpaceBelow')),
+            line_spacing=_to_float(attrs.get('LineSpacing')),
+            tab_stops=_parse_tab_stops(attrs.get('TabSet'))
+        )
+        # Paragraf düzeyindeki yazı tipi bilgisi parçalara miras kalır
+        run_base = {key: value for key, value in attrs.items()
+                    if key in ('family', 'size', 'bold', 'italic', 'underline', 'foreground')}
+        run_base = {**self.base_style, **run_base}
+
+        for tag, child_attrib in children:
+            if tag in _RUN_TAGS:
+                run_attrs = self.style_attrs(child_attrib, run_base)
+                paragraph.runs.append(UdfRun(
+                    text=self.slice(child_attrib),
+                    family=run_attrs.get('family', DEFAULT_FONT_FAMILY),
+                    size=_to_float(run_attrs.get('size'), DEFAULT_FONT_SIZE) or DEFAULT_FONT_SIZE,
+                    bold=_to_bool(run_attrs.get('bold')),
+                    italic=_to_bool(run_attrs.get('italic')),
+                    underline=_to_bool(run_attrs.get('underline')),
+                    color=_java_color(run_attrs.get('foreground')) if 'foreground' in run_attrs else None,
+                    is_tab=tag == 'tab'
+                ))
+            elif tag == 'image' and child_attrib.get('imageData'):
+                paragraph.runs.append(UdfRun(text='', image_data=child_attrib.get('imageData')))
+        return paragraph
+
+    def table(self, raw) -> UdfTable:
+        attrib, rows = raw
+        table = UdfTable(border=attrib.get('border', '') != 'borderNone')
+        for raw_row in rows:
+            row = [[self.paragraph(p) for p in cell] for cell in raw_row]
+            if row:
+                table.rows.append(row)
+        return table
+
+
+def _raw_paragraph(element):
+    return dict(element.attrib), [(child.tag, dict(child.attrib)) for child in element]
+
+
+def _raw_block(element):
+    """Üst düzey elemanı, XML ağacından bağımsız hafif bir yapıya çevirir"""
+    if element.tag == 'paragraph':
+        return _raw_paragraph(element)
+    if element.tag == 'table':
+        rows = []
+        for row_element in element.iter('row'):
+            rows.append([[_raw_paragraph(p) for p in cell_element.findall('paragraph')]
+                         for cell_element in row_element.findall('cell')])
+        return dict(element.attrib), rows
+    # header / footer
+    return dict(element.attrib), [_raw_paragraph(p) for p in element.findall('paragraph')]
+
+
+@contextmanager
+def _open_content_xml(input_path):
+    """
+    UDF arşivindeki content.xml'i akış olarak açar (ZIP değilse düz XML kabul eder)
+
+    Arşiv belleğe okunmaz; ZipFile yalnızca merkez dizini okur ve üye
+    dosya parça parça açılır.
+    """
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            member = next((n for n in archive.namelist()
+                           if n == 'content.xml' or n.endswith('/content.xml')), None)
+            if member is None:
+                raise UdfFormatError("UDF arşivinde content.xml bulunamadı")
+            with archive.open(member) as stream:
+                yield stream
+    else:
+        with open(input_path, 'rb') as stream:
+            yield stream
+
+
+def parse_udf(input_path) -> UdfDocument:
+    """
+    UDF dosyasını artımlı (iterparse) olarak ayrıştırır
+
+    Her üst düzey eleman tamamlandığında hafif bir yapıya çevrilip XML
+    ağacından çıkarılır; tüm belge ağacı hiçbir zaman bellekte tutulmaz.
+
+    Args:
+        input_path: .udf dosyasının yolu
+
+    Returns:
+        UdfDocument: Ayrıştırılmış belge
+    """
+    document = UdfDocument()
+    styles = {}
+    blocks = []
+    stack = []
+    try:
+        with _open_content_xml(input_path) as stream:
+            for event, element in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    stack.append(element)
+                    continue
+                stack.pop()
+                parent = stack[-1] if stack else None
+                parent_tag = parent.tag if parent is not None else None
+
+                if parent_tag == 'template' and element.tag == 'content':
+                    document.text = element.text or ''
+                elif parent_tag == 'properties':
+                    _apply_property(document, element)
+                elif parent_tag == 'styles' and element.tag == 'style':
+                    if element.get('name'):
+                        styles[element.get('name')] = dict(element.attrib)
+                elif parent_tag == 'elements' and element.tag in ('paragraph', 'table', 'header', 'footer'):
+                    blocks.append((element.tag, _raw_block(element)))
+                else:
+                    continue
+                # İşlenen eleman ağaçtan çıkarılır
+                element.clear()
+                parent.remove(element)
+    except (zipfile.BadZipFile, ET.ParseError) as e:
+        raise UdfFormatError(f"UDF dosyası okunamadı: {str(e)}")
+
+    builder = _UdfBuilder(document.text, styles)
+    for tag, raw in blocks:
+        attrib, payload = raw
+        if tag == 'paragraph':
+            document.body.append(builder.paragraph(raw))
+        elif tag == 'table':
+            document.body.append(builder.table(raw))
+        elif tag == 'header':
+            document.header = [builder.paragraph(p) for p in payload]
+            document.header_start_page = int(_to_float(attrib.get('startPage'), 1)) or 1
+        elif tag == 'footer':
+            document.footer = [builder.paragraph(p) for p in payload]
+            if any(key.startswith('pageNumber-') for key in attrib):
+                document.page_number = {key[len('pageNumber-'):]: value
+                                        for key, value in attrib.items()
+                                        if key.startswith('pageNumber-')}
+    return document
+
+
+def _apply_property(document, element):
+    """<properties> altındaki sayfa biçimi ve arka plan bilgisini belgeye işler"""
+    if element.tag == 'pageFormat':
+        page_size = _PAGE_SIZES.get(element.get('mediaSizeName', '1'), A4)
+        if element.get('paperOrientation') in ('0', '2'):
+            page_size = landscape(page_size)
+        document.page_size = page_size
+        document.margins = {
+            'left': _to_float(element.get('leftMargin'), 70.0),
+            'right': _to_float(element.get('rightMargin'), 42.5),
+            'top': _to_float(element.get('topMargin'), 42.5),
+            'bottom': _to_float(element.get('bottomMargin'), 42.5),
+        }
+        document.header_offset = _to_float(element.get('headerFOffset'), 20.0)
+        document.footer_offset = _to_float(element.get('footerFOffset'), 20.0)
+    elif element.tag == 'bgImage' and element.get('bgImageData'):
+        document.background_image = element.get('bgImageData')
+
+
+def udf_file_hash(input_path):
+    """
+    Dosyanın SHA-256 özetini döndürür
+
+    Özet (yol, boyut, değişiklik zamanı) üçlüsüne göre hatırlanır; dosya
+    değişmedikçe tekrar okunmaz.
+    """
+    stat = os.stat(input_path)
+    memo_key = (os.path.abspath(input_path), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        digest = _hash_memo.get(memo_key)
+    if digest is None:
+        digest = file_sha256(input_path)
+        with _cache_lock:
+            _hash_memo[memo_key] = digest
+            while len(_hash_memo) > HASH_MEMO_SIZE:
+                _hash_memo.popitem(last=False)
+    return digest
+
+
+def load_udf(input_path) -> UdfDocument:
+    """
+    UDF dosyasını ayrıştırır; sonuç dosya özetine göre önbelleğe alınır
+
+    Aynı belgenin tekrarlanan görüntülenmesi (veya aynı içerikli kopyası)
+    yeniden ayrıştırılmaz. Dönen belge paylaşımlıdır, değiştirilmemelidir.
+
+    Args:
+        input_path: .udf dosyasının yolu
+
+    Returns:
+        UdfDocument: Ayrıştırılmış belge
+    """
+    digest = udf_file_hash(input_path)
+    with _cache_lock:
+        document = _document_cache.get(digest)
+        if document is not None:
+            _document_cache.move_to_end(digest)
+            return document
+
+    document = parse_udf(input_path)
+    with _cache_lock:
+        _document_cache[digest] = document
+        while len(_document_cache) > DOCUMENT_CACHE_SIZE:
+            _document_cache.popitem(last=False)
+    return document
+
+
+class _XmlTextTarget:
+    """XMLParser hedefi: karakter verisini (CDATA dahil) belge sırasıyla toplar"""
+
+    def __init__(self):
+        self.content_depth = 0
+        self.content = []
+        self.parts = []
+
+    def start(self, tag, attrib):
+        if tag == 'content' or self.content_depth:
+            self.content_depth += 1
+
+    def end(self, tag):
+        if self.content_depth:
+            self.content_depth -= 1
+
+    def data(self, data):
+        self.parts.append(data)
+        if self.content_depth:
+            self.content.append(data)
+
+    def close(self):
+        content = ''.join(self.content)
+        if content.strip():
+            return content
+        return ' '.join(''.join(self.parts).split())
+
+
+def _xml_text(stream):
+    """XML akışındaki metni döndürür: varsa <content> metni, yoksa tüm metin; XML değilse boş"""
+    parser = ET.XMLParser(target=_XmlTextTarget())
+    try:
+        for chunk in iter(lambda: stream.read(XML_READ_CHUNK), b''):
+            parser.feed(chunk)
+        return parser.close()
+    except ET.ParseError:
+        return ''
+
+
+def extract_udf_text(input_path) -> str:
+    """
+    <template> yapısına uymayan UDF dosyalarından düz metin çıkarır
+
+    Önce content.xml (ZIP değilse dosyanın kendisi) okunur; kökü ne olursa
+    olsun <content> elemanının metni, yoksa tüm XML metni alınır. Metin
+    çıkmazsa arşivdeki diğer .xml üyelerinden anlamlı metin içeren ilki
+    kullanılır. Üyeler akış olarak okunur.
+
+    Returns:
+        str: Metin; bulunamazsa boş
+    """
+    if not zipfile.is_zipfile(input_path):
+        with open(input_path, 'rb') as stream:
+            return _xml_text(stream)
+
+    try:
+        with zipfile.ZipFile(input_path) as archive:
+            names = archive.namelist()
+            content_xml = [n for n in names if n == 'content.xml' or n.endswith('/content.xml')]
+            others = [n for n in names if n.endswith('.xml') and n not in content_xml
+                      and not n.startswith('document')]
+            for name in content_xml + others:
+                with archive.open(name) as stream:
+                    text = _xml_text(stream)
+                if text.strip() and (name in content_xml or len(text) > MIN_FALLBACK_TEXT):
+                    return text
+    except zipfile.BadZipFile as e:
+        logger.warning(f"UDF arşivi okunamadı: {str(e)}")
+    return ''
+
+
+def clear_udf_cache():
+    """Ayrıştırılmış belge önbelleğini temizler"""
+    with _cache_lock:
+        _document_cache.clear()
+        _hash_memo.clear()
+
+
+class _FlowableBuilder:
+    """UdfDocument bloklarını reportlab flowable'larına çevirir"""
+
+    def __init__(self, frame_width):
+        self.frame_width = frame_width
+        self._styles = {}
+
+    def paragraph_style(self, paragraph: UdfParagraph, font_size: float) -> ParagraphStyle:
+        leading = font_size * 1.2 * (1.0 + max(paragraph.line_spacing, 0.0))
+        left_indent = paragraph.left_indent + paragraph.hanging
+        first_line = paragraph.first_line_indent - paragraph.hanging
+        key = (paragraph.alignment, left_indent, paragraph.right_indent, first_line,
+               paragraph.space_above, paragraph.space_below, round(leading, 2), font_size)
+        style = self._styles.get(key)
+        if style is None:
+            style = ParagraphStyle(
+                name=f"udf_{len(self._styles)}",
+                fontName=resolve_font(DEFAULT_FONT_FAMILY),
+                fontSize=font_size,
+                leading=leading,
+                alignment=_ALIGNMENTS.get(paragraph.alignment, TA_LEFT),
+                leftIndent=left_indent,
+                rightIndent=paragraph.right_indent,
+                firstLineIndent=first_line,
+                spaceBefore=paragraph.space_above,
+                spaceAfter=paragraph.space_below,
+                wordWrap='LTR',
+                splitLongWords=True
+            )
+            self._styles[key] = style
+        return style
+
+    def _tab_fill(self, paragraph: UdfParagraph, line_width: float, font_name: str, size: float) -> str:
+        """Sekme karakterini bir sonraki sekme durağına kadar boşlukla doldurur"""
+        stops = [stop for stop in paragraph.tab_stops if stop > line_width + 1]
+        if stops:
+            target = stops[0]
+        else:
+            target = (int(line_width // DEFAULT_TAB_WIDTH) + 1) * DEFAULT_TAB_WIDTH
+        space_width = stringWidth(' ', font_name, size) or size * 0.25
+        return ' ' * max(1, int(round((target - line_width) / space_width)))
+
+    def paragraph_markup(self, paragraph: UdfParagraph):
+        parts = []
+        max_size = 0.0
+        line_width = paragraph.first_line_indent
+        for run in paragraph.runs:
+            if run.image_data:
+                continue
+
+            font_name = resolve_font(run.family, run.bold, run.italic)
+            max_size = max(max_size, run.size)
+            text = run.text.replace('\r', '')
+            if run.is_tab:
+                text = '\t'
+
+            segments = []
+            for index, line in enumerate(text.split('\n')):
+                if index:
+                    segments.append('<br/>')
+                    line_width = paragraph.left_indent
+                pieces = line.split('\t')
+                for piece_index, piece in enumerate(pieces):
+                    if piece_index:
+                        fill = self._tab_fill(paragraph, line_width, font_name, run.size)
+                        segments.append(fill)
+                        line_width += stringWidth(fill, font_name, run.size)
+                    if piece:
+                        segments.append(escape(piece, quote=False))
+                        line_width += stringWidth(piece, font_name, run.size)
+
+            body = ''.join(segments)
+            if not body:
+                continue
+            color = f' color="{run.color}"' if run.color and run.color != '#000000' else ''
+            markup = f'<font name="{font_name}" size="{run.size:g}"{color}>{body}</font>'
+            if run.underline:
+                markup = f'<u>{markup}</u>'
+            parts.append(markup)
+
+        markup = ''.join(parts)
+        # Paragraf sonundaki satır sonları ayrı boş satır olarak basılmaz
+        while markup.endswith('<br/></font>'):
+            markup = markup[:-len('<br/></font>')] + '</font>'
+        return markup, (max_size or DEFAULT_FONT_SIZE)
+
+    def inline_image(self, image_data: str, alignment: str):
+        """
+        Gömülü resmi (ör. e-imza simgesi) ayrı bir flowable olarak döndürür
+
+        reportlab paragraf içi <img> etiketi yalnızca dosya yolu kabul ettiğinden
+        resimler paragraf metninin önüne, paragrafla aynı hizada yerleştirilir.
+        """
+        try:
+            raw = base64.b64decode(re.sub(r'\s+', '', image_data))
+            width, height = ImageReader(BytesIO(raw)).getSize()
+        except Exception as e:
+            logger.warning(f"UDF resmi okunamadı: {str(e)}")
+            return None
+        # Piksel -> punto (96 dpi), çerçeveye sığdır
+        width, height = width * 0.75, height * 0.75
+        scale = min(1.0, self.frame_width / width) if width else 1.0
+        return RLImage(BytesIO(raw), width=width * scale, height=height * scale,
+                       hAlign=_IMAGE_ALIGNMENTS.get(alignment, 'LEFT'))
+
+    def paragraph(self, paragraph: UdfParagraph):
+        """Paragrafı flowable listesine çevirir (gömülü resimler dahil)"""
+        flowables = []
+        for run in paragraph.runs:
+            if run.image_data:
+                image = self.inline_image(run.image_data, paragraph.alignment)
+                if image is not None:
+                    flowables.append(image)
+
+        markup, font_size = self.paragraph_markup(paragraph)
+        style = self.paragraph_style(paragraph, font_size)
+        if not markup.strip() or re.fullmatch(r'(<font[^>]*>)?\s*(</font>)?', markup):
+            if not flowables:
+                flowables.append(Spacer(1, style.leading + paragraph.space_above + paragraph.space_below))
+        else:
+            flowables.append(Paragraph(markup, style))
+        return flowables
+
+    def table(self, table: UdfTable, available_width: float):
+        column_count = max(len(row) for row in table.rows)
+        column_width = available_width / column_count
+        data = []
+        for row in table.rows:
+            cells = []
+            for cell in row:
+                cells.append([f for p in cell for f in self.paragraph(p)] or '')
+            cells.extend([''] * (column_count - len(cells)))
+            data.append(cells)
+
+        flowable = Table(data, colWidths=[column_width] * column_count, hAlign='LEFT')
+        commands = [
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+        ]
+        if table.border:
+            commands.append(('GRID', (0, 0), (-1, -1), 0.5, colors.black))
+        flowable.setStyle(TableStyle(commands))
+        return flowable
+
+    def blocks(self, blocks):
+        story = []
+        for block in blocks:
+            if isinstance(block, UdfParagraph):
+                story.extend(self.paragraph(block))
+            elif isinstance(block, UdfTable) and block.rows:
+                story.append(self.table(block, self.frame_width))
+        return story
+
+
+def _draw_paragraphs(canvas, builder, paragraphs, x, y, width, from_top):
+    """Üst/alt bilgi paragraflarını sayfa kenarına çizer"""
+    flowables = [f for p in paragraphs for f in builder.paragraph(p)]
+    heights = [f.wrap(width, 1000)[1] for f in flowables]
+    if from_top:
+        cursor = y
+        for flowable, height in zip(flowables, heights):
+            cursor -= height
+            flowable.drawOn(canvas, x, cursor)
+    else:
+        cursor = y + sum(heights)
+        for flowable, height in zip(flowables, heights):
+            cursor -= height
+            flowable.drawOn(canvas, x, cursor)
+
+
+def render_udf_to_pdf(document, output_path):
+    """
+    UDF belgesini PDF'e çevirir
+
+    Args:
+        document: UdfDocument veya .udf dosya yolu
+        output_path: Oluşturulacak PDF dosyası
+
+    Returns:
+        str: output_path
+    """
+    if not isinstance(document, UdfDocument):
+        document = load_udf(document)
+
+    page_width, page_height = document.page_size
+    margins = document.margins
+    frame_width = page_width - margins['left'] - margins['right']
+    builder = _FlowableBuilder(frame_width)
+
+    background = None
+    if document.background_image:
+        try:
+            background = ImageReader(BytesIO(base64.b64decode(re.sub(r'\s+', '', document.background_image))))
+        except Exception as e:
+            logger.warning(f"UDF arka plan resmi okunamadı: {str(e)}")
+
+    def decorate_page(canvas, doc):
+        canvas.saveState()
+        if background is not None:
+            canvas.drawImage(background, 0, 0, width=page_width, height=page_height, mask='auto')
+        page_number = canvas.getPageNumber()
+        if document.header and page_number >= document.header_start_page:
+            _draw_paragraphs(canvas, builder, document.header, margins['left'],
+                             page_height - document.header_offset, frame_width, from_top=True)
+        if document.footer:
+            _draw_paragraphs(canvas, builder, document.footer, margins['left'],
+                             document.footer_offset, frame_width, from_top=False)
+        if document.page_number is not None:
+            start = int(_to_float(document.page_number.get('pageStartNumStr'), 1))
+            label = f"{document.page_number.get('foreStr', '')}{page_number + start - 1}"
+            size = _to_float(document.page_number.get('fontSize'), 10) or 10
+            canvas.setFont(resolve_font(document.page_number.get('fontFace', 'Arial')), size)
+            canvas.drawCentredString(page_width / 2.0, document.footer_offset / 2.0 + 2, label)
+        canvas.restoreState()
+
+    pdf = SimpleDocTemplate(
+        output_path,
+        pagesize=document.page_size,
+        leftMargin=margins['left'],
+        rightMargin=margins['right'],
+        topMargin=margins['top'],
+        bottomMargin=margins['bottom'],
+        title='UDF Belgesi',
+        creator='LawAutoTRY UDF'
+    )
+    story = builder.blocks(document.body) or [Spacer(1, 1)]
+    pdf.build(story, onFirstPage=decorate_page, onLaterPages=decorate_page)
+    return output_path
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesaplar"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_udf_to_pdf_cached(input_path, cache_dir):
+    """
+    UDF dosyasını PDF'e çevirir; sonuç dosya içeriğinin özetine göre önbelleğe alınır
+
+    Aynı içerikli UDF (ör. aynı evrakın tekrar yüklenmesi) yeniden işlenmez.
+
+    Args:
+        input_path: .udf dosyası
+        cache_dir: PDF önbellek klasörü
+
+    Returns:
+        str: Önbellekteki PDF dosyasının yolu
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_key = f"{udf_file_hash(input_path)}_v{RENDERER_VERSION}"
+    cached_path = os.path.join(cache_dir, f"{cache_key}.pdf")
+    if os.path.exists(cached_path):
+        return cached_path
+
+    fd, temp_path = tempfile.mkstemp(suffix='.pdf', dir=cache_dir)
+    os.close(fd)
+    try:
+        render_udf_to_pdf(input_path, temp_path)
+        os.replace(temp_path, cached_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    logger.info(f"UDF PDF'e çevrildi: {input_path} -> {cached_path}")
+    return cached_path
@@ -0,0 +1,253 @@
+"""
+UYAP Avukat Portalı veri servisi istemcisi
+
+Portal tabloları (dosya listesi, taraflar, masraflar, evraklar) JSON
+servislerinden beslenir. Bu istemci giriş yapılmış tarayıcının çerezleriyle
+aynı servisleri doğrudan HTTP üzerinden çağırır: yüzlerce dosyalık bir
+sorgu, hücre başına WebDriver çağrısı yerine sayfa başına tek istekle
+okunur.
+
+Servis yolları uyap_config.API_CONFIG içindedir. Oturum düşmüşse portal
+JSON yerine giriş sayfasına yönlendirir; bu durumda UYAPSessionExpired
+fırlatılır.
+"""
+
+import logging
+from urllib.parse import urlencode
+
+import requests
+
+from uyap_config import API_CONFIG
+from uyap_integration_advanced import UyapDocument, UyapExpense, UyapFile, UyapParty, file_type_from_name
+
+logger = logging.getLogger(__name__)
+
+# Arama filtresi -> servis parametresi
+FILTER_FIELDS = {
+    'yargi_turu': 'yargiTuru',
+    'yargi_birimi': 'yargiBirimi',
+    'durum': 'dosyaDurumu',
+    'start_date': 'baslangicTarihi',
+    'end_date': 'bitisTarihi',
+    'search': 'dosyaNo',
+}
+
+
+class UYAPApiError(Exception):
+    """Veri servisi beklenen yanıtı vermedi; retryable ise hata geçicidir"""
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class UYAPSessionExpired(UYAPApiError):
+    """Portal oturumu geçersiz; yeniden giriş ya da çerez yenileme gerekir"""
+
+
+def _pick(row, *keys, default=""):
+    """Satırdaki ilk dolu alanı döndürür"""
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def _amount(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value or '0').replace('₺', '').replace('TL', '').strip()
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+class UYAPApiClient:
+    """
+    UYAP portal veri servislerini çağıran HTTP istemcisi
+
+    Kullanım:
+        client = UYAPApiClient.from_driver(uyap.driver)
+        files = client.search_files({'yargi_turu': 'Hukuk'})
+        details = client.get_file_details(files[0].id)
+    """
+
+    def __init__(self, base_url=None, cookies=None, user_agent=None, page_size=None, timeout=None):
+        self.base_url = (base_url or API_CONFIG['base_url']).rstrip('/')
+        self.endpoints = API_CONFIG['endpoints']
+        self.page_size = page_size or API_CONFIG['page_size']
+        self.timeout = timeout or API_CONFIG['timeout']
+        self.http = requests.Session()
+        self.http.headers.update({
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+            'X-Requested-With': 'XMLHttpRequest',
+        })
+        if user_agent:
+            self.http.headers['User-Agent'] = user_agent
+        self.set_cookies(cookies or {})
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Tarayıcının çerezleri ve kullanıcı ajanıyla istemci oluşturur"""
+        client = cls(user_agent=driver.execute_script("return navigator.userAgent"), **kwargs)
+        client.set_cookies(driver.get_cookies())
+        return client
+
+    def set_cookies(self, cookies):
+        """
+        Çerezleri günceller
+
+        Args:
+            cookies: {ad: değer} sözlüğü ya da Selenium get_cookies() listesi
+        """
+        if isinstance(cookies, dict):
+            cookies = [{'name': name, 'value': value} for name, value in cookies.items()]
+        for cookie in cookies:
+            self.http.cookies.set(cookie['name'], cookie['value'],
+                                  domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+    @property
+    def cookies(self):
+        return self.http.cookies.get_dict()
+
+    def _post(self, endpoint, params):
+        url = self.base_url + self.endpoints[endpoint]
+        try:
+            response = self.http.post(url, data=params, timeout=self.timeout, allow_redirects=False)
+        except requests.RequestException as e:
+            raise UYAPApiError(f"{endpoint} servisine ulaşılamadı: {str(e)}", retryable=True)
+
+        if response.status_code in (301, 302, 303, 401, 403):
+            raise UYAPSessionExpired("UYAP oturumu sona ermiş")
+        if response.status_code != 200:
+            raise UYAPApiError(f"{endpoint} servisi {response.status_code} döndürdü",
+                               retryable=response.status_code == 429 or response.status_code >= 500)
+        try:
+            body = response.json()
+        except ValueError:
+            # Oturum düştüğünde portal giriş sayfasının HTML'ini döndürür
+            raise UYAPSessionExpired("UYAP JSON yerine sayfa döndürdü, oturum sona ermiş olabilir")
+        if isinstance(body, dict) and body.get('error'):
+            raise UYAPApiError(f"{endpoint}: {body['error']}")
+        return body
+
+    @staticmethod
+    def _rows(body):
+        if isinstance(body, list):
+            return body, None
+        return body.get('data') or [], body.get('totalCount')
+
+    def search_files(self, filters):
+        """
+        Filtrelere uyan dosyaları sayfa sayfa çeker
+
+        Returns:
+            List[UyapFile]
+        """
+        params = {FILTER_FIELDS[key]: value for key, value in (filters or {}).items()
+                  if key in FILTER_FIELDS and value}
+        files = []
+        page = 1
+        while True:
+            body = self._post('dosya_sorgu', dict(params, pageNumber=page, pageSize=self.page_size))
+            rows, total = self._rows(body)
+            files.extend(self._to_file(row) for row in rows)
+            if not rows or len(rows) < self.page_size or (total is not None and len(files) >= total):
+                break
+            page += 1
+        logger.info(f"UYAP veri servisinden {len(files)} dosya alındı ({page} istek)")
+        return files
+
+    def get_basic_info(self, dosya_id):
+        body = self._post('dosya_detay', {'dosyaId': dosya_id})
+        if isinstance(body, dict) and isinstance(body.get('data'), dict):
+            body = body['data']
+        esas_no = _pick(body, 'dosyaNo')
+        year = esas_no.split('/', 1)[0]
+        return {
+            'esas_no': esas_no,
+            'year': int(year) if year.isdigit() else None,
+            'mahkeme': _pick(body, 'birimAdi'),
+            'yargi_turu': _pick(body, 'yargiTuru', 'yargiTuruAdi'),
+            'yargi_birimi': _pick(body, 'yargiBirimi'),
+            'durum': _pick(body, 'dosyaDurumu'),
+            'acilis_tarihi': _pick(body, 'dosyaAcilisTarihi'),
+            'subject': _pick(body, 'davaKonusu'),
+            'last_action': _pick(body, 'sonIslem'),
+            'next_hearing': _pick(body, 'durusmaTarihi'),
+        }
+
+    def get_parties(self, dosya_id):
+        rows, _ = self._rows(self._post('taraflar', {'dosyaId': dosya_id}))
+        return [UyapParty(
+            name=_pick(row, 'adi', 'adSoyad'),
+            capacity=_pick(row, 'rol', 'sifat'),
+            identity_number=str(_pick(row, 'kimlikNo')),
+            address=_pick(row, 'adres'),
+            lawyer=_pick(row, 'vekil'),
+            lawyer_bar_number=str(_pick(row, 'vekilBaroSicilNo')),
+        ) for row in rows]
+
+    def get_expenses(self, dosya_id):
+        rows, _ = self._rows(self._post('masraflar', {'dosyaId': dosya_id}))
+        return [UyapExpense(
+            expense_type=_pick(row, 'masrafTuru'),
+            amount=_amount(_pick(row, 'tutar', default=0)),
+            date=_pick(row, 'tarih'),
+            is_paid=bool(row.get('odendi')),
+            description=_pick(row, 'aciklama'),
+        ) for row in rows]
+
+    def get_documents(self, dosya_id):
+        rows, _ = self._rows(self._post('evraklar', {'dosyaId': dosya_id}))
+        documents = []
+        for row in rows:
+            name = _pick(row, 'evrakAdi', 'adi')
+            url = self.download_url(dosya_id, _pick(row, 'evrakId'))
+            documents.append(UyapDocument(
+                name=name,
+                date=_pick(row, 'tarih'),
+                size=str(_pick(row, 'boyut')),
+                type=_pick(row, 'tur') or file_type_from_name(name),
+                url=url,
+                download_url=url,
+            ))
+        return documents
+
+    def download_url(self, dosya_id, evrak_id):
+        query = urlencode({'dosyaId': dosya_id, 'evrakId': evrak_id})
+        return f"{self.base_url}{self.endpoints['evrak_indir']}?{query}"
+
+    def get_file_details(self, dosya_id):
+        """
+        UYAPAdvancedIntegration.get_file_details ile aynı yapıda detay döndürür
+        """
+        return {
+            'basic_info': self.get_basic_info(dosya_id),
+            'parties': self.get_parties(dosya_id),
+            'expenses': self.get_expenses(dosya_id),
+            'documents': self.get_documents(dosya_id),
+        }
+
+    @staticmethod
+    def _to_file(row):
+        return UyapFile(
+            id=str(_pick(row, 'dosyaId')),
+            esas_no=_pick(row, 'dosyaNo'),
+            mahkeme=_pick(row, 'birimAdi'),
+            yargi_turu=_pick(row, 'yargiTuru', 'yargiTuruAdi'),
+            yargi_birimi=_pick(row, 'yargiBirimi', 'birimAdi'),
+            durum=_pick(row, 'dosyaDurumu', default="Aktif"),
+            acilis_tarihi=_pick(row, 'dosyaAcilisTarihi'),
+            taraflar=_pick(row, 'taraflar'),
+            davali=_pick(row, 'davali'),
+            davaci=_pick(row, 'davaci'),
+            subject=_pick(row, 'davaKonusu'),
+            last_action=_pick(row, 'sonIslem'),
+            next_hearing=_pick(row, 'durusmaTarihi'),
+        )
+
@@ -0,0 +1,146 @@
+"""
+Kaydedilmiş yanıtlarla çalışan yerel UYAP veri servisi
+
+Testler ve geliştirme için portalın JSON servislerini taklit eder.
+Yanıtlar uyap_api_recording.json dosyasından okunur: her servis yolu için
+istek parametreleri ve portalın verdiği yanıt kayıtlıdır. Gelen istek,
+kayıttaki parametrelerin tümünü içeriyorsa o yanıt döndürülür.
+
+Kayıttaki oturum çerezi gönderilmezse portal gibi giriş sayfasına
+yönlendirir. Evrak indirme kayıtları (icerik_base64) GET ile dosya olarak
+sunulur; fail_next() ile yeniden deneme senaryoları için geçici sunucu
+hatası üretilebilir.
+
+Kullanım:
+    with UYAPStubServer() as server:
+        client = UYAPApiClient(base_url=server.base_url, cookies=server.cookies)
+"""
+
+import os
+import json
+import base64
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote
+
+RECORDING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uyap_api_recording.json')
+
+
+class UYAPStubServer:
+    """Kaydedilmiş UYAP yanıtlarını 127.0.0.1 üzerinde sunan sunucu"""
+
+    def __init__(self, recording_path=RECORDING_PATH):
+        with open(recording_path, encoding='utf-8') as f:
+            self.recording = json.load(f)
+        self.cookie = self.recording['cerez']
+        self.requests = []  # (yol, parametreler)
+        self._failures = {}  # yol -> [kalan hata sayısı, durum kodu]
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def cookies(self):
+        return {self.cookie['name']: self.cookie['value']}
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                params = {key: values[0] for key, values in
+                          parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+                stub._handle(self, params)
+
+            def do_GET(self):
+                query = self.path.split('?', 1)[1] if '?' in self.path else ''
+                stub._handle(self, {key: values[0] for key, values in parse_qs(query).items()})
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def request_count(self, path=None):
+        with self._lock:
+            return sum(1 for logged_path, _ in self.requests if path is None or logged_path == path)
+
+    def fail_next(self, path, count=1, status=503):
+        """Yola gelen sonraki `count` isteğe `status` döndürür"""
+        with self._lock:
+            self._failures[path] = [count, status]
+
+    def _authorized(self, handler):
+        cookie = SimpleCookie(handler.headers.get('Cookie', ''))
+        morsel = cookie.get(self.cookie['name'])
+        return morsel is not None and morsel.value == self.cookie['value']
+
+    def _handle(self, handler, params):
+        path = handler.path.split('?', 1)[0]
+        with self._lock:
+            self.requests.append((path, params))
+            failure = self._failures.get(path)
+            if failure and failure[0] > 0:
+                failure[0] -= 1
+                status = failure[1]
+            else:
+                status = None
+
+        if status is not None:
+            self._send_json(handler, status, {'error': 'Geçici sunucu hatası'})
+            return
+
+        if not self._authorized(handler):
+            handler.send_response(302)
+            handler.send_header('Location', '/giris')
+            handler.end_headers()
+            return
+
+        for entry in self.recording['yanitlar'].get(path, []):
+            if all(params.get(key) == value for key, value in entry['istek'].items()):
+                if 'icerik_base64' in entry:
+                    self._send_file(handler, entry['dosya_adi'], base64.b64decode(entry['icerik_base64']))
+                else:
+                    self._send_json(handler, 200, entry['yanit'])
+                return
+        self._send_json(handler, 404, {'error': 'Kayıtlı yanıt yok'})
+
+    @staticmethod
+    def _send_json(handler, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    @staticmethod
+    def _send_file(handler, filename, content):
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'application/octet-stream')
+        handler.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(filename)}")
+        handler.send_header('Content-Length', str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
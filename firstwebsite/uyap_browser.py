@@ -0,0 +1,386 @@
+"""
+UYAP otomasyonu için tarayıcı çalışma ortamı
+
+WEBDRIVER_CONFIG ayarlarıyla Chrome seçeneklerini, chromedriver servisini
+ve oturum başına kaynak sınırlarını hazırlar:
+
+- headless: Chrome '--headless=new' ile penceresiz çalışır; resim ve yazı
+  tipi yüklemesi kapatılabilir (block_images, block_fonts).
+- chromedriver: driver_path, PATH ya da önceki kurulumun önbelleğe alınmış
+  yolu kullanılır; ChromeDriverManager (ağ gerektirir) yalnızca hiçbiri
+  yoksa bir kez çalışır, o da olmazsa Selenium Manager'a bırakılır.
+- Profil: her oturum kendi geçici profilini kullanır (Linux'ta /dev/shm,
+  yani bellekte); oturum kapanınca silinir.
+- Sınırlar: chromedriver ve Chrome süreçleri başlatıldıktan sonra (ve her
+  ölçümde yeni süreçler için) cpu_cores çekirdeğe bağlanır ve önceliği
+  düşürülür (nice). Bellek için işletim sistemi sınırı uygulanmaz; bellek
+  ölçülür ve restart_memory_mb eşiğini aşan oturum UYAPSessionPool
+  tarafından önce hafifletilir, olmazsa yeniden başlatılır.
+
+Süreç ölçümü psutil varsa onunla, yoksa Linux'ta /proc üzerinden yapılır.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import tempfile
+import itertools
+import threading
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from uyap_config import WEBDRIVER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# İndirilen chromedriver yolunun saklandığı dosya
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'lawautomation', 'chromedriver.json')
+
+# Headless modda engellenen yazı tipi istekleri
+FONT_URL_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+
+_driver_path = None
+_driver_lock = threading.Lock()
+_session_numbers = itertools.count()
+
+
+def _read_driver_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            return json.load(f).get('path')
+    except (OSError, ValueError):
+        return None
+
+
+def _write_driver_cache(path):
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'tarih': time.strftime('%Y-%m-%d %H:%M:%S')}, f)
+    except OSError as e:
+        logger.warning(f"chromedriver yolu önbelleğe yazılamadı: {str(e)}")
+
+
+def chromedriver_path():
+    """
+    chromedriver yolunu döndürür; süreç başına bir kez çözülür
+
+    Returns:
+        str: Sürücü yolu; bulunamazsa None (Selenium Manager kullanılır)
+    """
+    global _driver_path
+    with _driver_lock:
+        if _driver_path is not None and (_driver_path == '' or os.path.isfile(_driver_path)):
+            return _driver_path or None
+
+        for candidate in (WEBDRIVER_CONFIG.get('driver_path'), shutil.which('chromedriver'), _read_driver_cache()):
+            if candidate and os.path.isfile(candidate):
+                _driver_path = candidate
+                return candidate
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+            _write_driver_cache(_driver_path)
+            logger.info(f"chromedriver indirildi: {_driver_path}")
+        except Exception as e:
+            logger.warning(f"chromedriver indirilemedi, Selenium Manager kullanılacak: {str(e)}")
+            _driver_path = ''
+        return _driver_path or None
+
+
+def _tmpfs_dir():
+    """Bellekte tutulan geçici dizin (Linux /dev/shm); yoksa sistem geçici dizini"""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+
+def _proc_children():
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    return children
+
+
+def _proc_usage(pid):
+    with open(f'/proc/{pid}/statm') as f:
+        rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    return rss, cpu
+
+
+def process_tree(pid):
+    """
+    Süreç ve tüm alt süreçlerinin pid listesi
+
+    Returns:
+        list: pid'ler (ilk eleman pid); süreç yoksa boş liste
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            return [pid] + [child.pid for child in root.children(recursive=True)]
+        except psutil.Error:
+            return []
+
+    if not os.path.isdir(f'/proc/{pid}'):
+        return []
+    children = _proc_children()
+    pids, queue = [], [pid]
+    while queue:
+        current = queue.pop()
+        pids.append(current)
+        queue.extend(children.get(current, []))
+    return pids
+
+
+def _threads(pid):
+    """Sürecin iş parçacıkları; Linux'ta öncelik ve çekirdek iş parçacığı başına ayarlanır"""
+    try:
+        return [int(tid) for tid in os.listdir(f'/proc/{pid}/task')]
+    except OSError:
+        return [pid]
+
+
+def tree_usage(pid):
+    """
+    Süreç ve alt süreçlerinin toplam bellek ve CPU kullanımı
+
+    Returns:
+        dict: {'surec', 'bellek_bayt', 'cpu_saniye'}; ölçülemiyorsa None
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        rss = cpu = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                continue
+        return {'surec': len(processes), 'bellek_bayt': rss, 'cpu_saniye': cpu}
+
+    pids = process_tree(pid)
+    if not pids:
+        return None
+    rss = cpu = 0
+    for current in pids:
+        try:
+            process_rss, process_cpu = _proc_usage(current)
+        except (OSError, ValueError, IndexError):
+            continue
+        rss += process_rss
+        cpu += process_cpu
+    return {'surec': len(pids), 'bellek_bayt': rss, 'cpu_saniye': cpu}
+
+
+class BrowserRuntime:
+    """Tek UYAP oturumunun Chrome ayarları, profili ve kaynak ölçümü"""
+
+    def __init__(self, downloads_path, config=None):
+        self.config = config or WEBDRIVER_CONFIG
+        self.downloads_path = downloads_path
+        self.number = next(_session_numbers)
+        self.pid = None
+        self.profile_dir = None
+        self._own_profile = False
+        self._last_sample = None
+        self._limited = set()
+
+    @property
+    def headless(self):
+        return bool(self.config.get('headless'))
+
+    @property
+    def restart_memory_mb(self):
+        return self.config.get('restart_memory_mb') or 0
+
+    def debugger_options(self):
+        """Görünür modda açık Chrome'a bağlanma seçenekleri; kullanılmayacaksa None"""
+        address = self.config.get('debugger_address')
+        if self.headless or not address:
+            return None
+        options = Options()
+        options.add_experimental_option("debuggerAddress", address)
+        return options
+
+    def options(self):
+        """Yeni Chrome için seçenekler"""
+        options = Options()
+        for argument in self.config.get('chrome_options', []):
+            options.add_argument(argument)
+        options.add_argument("--disable-popup-blocking")
+        options.add_argument("--disable-notifications")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={self.config.get('window_size', '1366,900')}")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--mute-audio")
+        else:
+            options.add_argument("--start-maximized")
+
+        if self.restart_memory_mb:
+            # Sayfa başına JavaScript yığını ve renderer süreç sayısı sınırlanır
+            options.add_argument(f"--js-flags=--max-old-space-size={max(128, self.restart_memory_mb // 2)}")
+            options.add_argument("--renderer-process-limit=2")
+
+        options.add_argument(f"--user-data-dir={self._profile()}")
+
+        prefs = {
+            "download.default_directory": self.downloads_path,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "safebrowsing.enabled": True
+        }
+        if self.headless and self.config.get('block_images'):
+            prefs["profile.managed_default_content_settings.images"] = 2
+        options.add_experimental_option("prefs", prefs)
+        return options
+
+    def service(self):
+        """chromedriver servisi; süreç sınırları başlatıldıktan sonra attach() ile uygulanır"""
+        return Service(executable_path=chromedriver_path())
+
+    def attach(self, driver):
+        """
+        Başlatılan sürücünün sürecini kaydeder, süreç sınırlarını ve headless
+        ağ kısıtlarını uygular
+        """
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        self.pid = getattr(process, 'pid', None) if process is not None else None
+        if not isinstance(self.pid, int):
+            self.pid = None
+        self.limit_processes()
+        if self.headless and self.config.get('block_fonts'):
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': FONT_URL_PATTERNS})
+            except Exception as e:
+                logger.warning(f"Yazı tipi yüklemesi kapatılamadı: {str(e)}")
+
+    def usage(self):
+        """
+        Oturumun anlık kaynak kullanımı
+
+        Returns:
+            dict: {'surec', 'bellek_mb', 'cpu_yuzde', 'esik_bellek_mb', 'cekirdek',
+                   'headless', 'esik_asildi'}; süreç ölçülemiyorsa None
+        """
+        if self.pid is None:
+            return None
+        # Sonradan açılan sekme/renderer süreçleri de sınırlansın
+        self.limit_processes()
+        sample = tree_usage(self.pid)
+        if sample is None:
+            return None
+
+        now = time.monotonic()
+        cpu_percent = None
+        if self._last_sample is not None and now > self._last_sample[1]:
+            cpu_percent = round(100 * (sample['cpu_saniye'] - self._last_sample[0]) / (now - self._last_sample[1]), 1)
+        self._last_sample = (sample['cpu_saniye'], now)
+
+        memory_mb = round(sample['bellek_bayt'] / (1024 * 1024), 1)
+        return {
+            'surec': sample['surec'],
+            'bellek_mb': memory_mb,
+            'cpu_yuzde': cpu_percent,
+            'esik_bellek_mb': self.restart_memory_mb or None,
+            'cekirdek': self.config.get('cpu_cores') or None,
+            'headless': self.headless,
+            'esik_asildi': bool(self.restart_memory_mb) and memory_mb > self.restart_memory_mb,
+        }
+
+    def cleanup(self):
+        """Oturuma özel geçici profili siler"""
+        if self._own_profile and self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+        self.pid = None
+        self._last_sample = None
+        self._limited = set()
+
+    def _profile(self):
+        if self.profile_dir is None:
+            if self.config.get('profile_dir'):
+                self.profile_dir = self.config['profile_dir']
+            else:
+                self.profile_dir = tempfile.mkdtemp(prefix='uyap-chrome-', dir=_tmpfs_dir())
+                self._own_profile = True
+        return self.profile_dir
+
+    def limit_processes(self):
+        """
+        Sürücü süreç ağacındaki henüz sınırlanmamış süreçlere öncelik (nice)
+        ve çekirdek sınırını uygular
+
+        Sınırlar süreç başladıktan sonra pid üzerinden uygulanır (preexec_fn
+        iş parçacıklı sunucuda güvenli değildir). Sonradan açılan süreçler
+        sınırları ana süreçten devralır.
+
+        Returns:
+            int: Sınırlanan süreç sayısı
+        """
+        nice = self.config.get('nice') or 0
+        cores = self.config.get('cpu_cores') or 0
+        if self.pid is None or os.name != 'posix' or not (nice or cores):
+            return 0
+
+        priority = min(19, os.getpriority(os.PRIO_PROCESS, 0) + nice) if nice else None
+        affinity = None
+        if cores and hasattr(os, 'sched_setaffinity'):
+            available = sorted(os.sched_getaffinity(0))
+            if cores < len(available):
+                # Oturumlar çekirdeklere sırayla dağıtılır
+                start = (self.number * cores) % len(available)
+                affinity = (available * 2)[start:start + cores]
+
+        limited = 0
+        for pid in process_tree(self.pid):
+            if pid in self._limited:
+                continue
+            try:
+                for tid in _threads(pid):
+                    if priority is not None and os.getpriority(os.PRIO_PROCESS, tid) < priority:
+                        os.setpriority(os.PRIO_PROCESS, tid, priority)
+                    if affinity is not None:
+                        os.sched_setaffinity(tid, affinity)
+            except OSError as e:
+                logger.debug(f"Tarayıcı süreci sınırlanamadı ({pid}): {str(e)}")
+                continue
+            self._limited.add(pid)
+            limited += 1
+        return limited
@@ -0,0 +1,300 @@
+"""
+UYAP dosyalarının toplu veritabanı aktarımı
+
+Dosyalar PERFORMANCE_CONFIG['batch_size'] büyüklüğünde gruplar halinde
+yazılır; her grup tek işlemdir (tek commit):
+
+- Gruptaki dosyaların mevcut kayıtları (dosya, masraf, evrak) tek sorguda okunur.
+- Yeni dosyalar tek flush ile eklenir; masraf, evrak ve işlem kayıtları
+  toplu INSERT (executemany) ile yazılır.
+- Bir grup hata verirse geri alınır ve dosyaları tek tek yeniden denenir;
+  böylece hatalı dosya yalnızca kendisini etkiler.
+
+Taraf, masraf ve evrak bilgileri sözlük ya da veri sınıfı (UyapParty,
+UyapExpense, UyapDocument) olarak gelebilir.
+
+Kullanım:
+    importer = UYAPBulkImporter(current_user.id, {'include_expenses': True})
+    results = importer.import_files([details1, details2])
+    importer.ozet  # {'toplam', 'aktarilan', 'atlanan', 'hatali', ..., 'dosya_saniye'}
+"""
+
+import time
+import logging
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+
+from sqlalchemy import insert, tuple_
+from werkzeug.utils import secure_filename
+
+from models import db, ActivityLog, CaseFile, Document, Expense
+from uyap_config import PERFORMANCE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+EXISTS_ERROR = 'Dosya zaten mevcut. Üzerine yazma seçeneği seçilmedi.'
+
+
+def field_value(item, name, default=""):
+    """Sözlük ya da veri sınıfı alanını okur"""
+    if isinstance(item, dict):
+        value = item.get(name, default)
+    else:
+        value = getattr(item, name, default)
+    return default if value is None else value
+
+
+def parse_date(value):
+    """'01.02.2024' biçimli tarihi çözer; çözülemezse None"""
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%d.%m.%Y').date()
+    except ValueError:
+        return None
+
+
+def esas_year(esas_no):
+    """'2024/15' biçimli esas numarasının yılı; çözülemezse None"""
+    year = str(esas_no or '').split('/', 1)[0].strip()
+    return int(year) if year.isdigit() else None
+
+
+def case_key(info):
+    """
+    Dosyanın yerel kayıt anahtarı: (mahkeme, esas no, yıl)
+
+    Yıl verilmemişse esas numarasından, o da çözülemezse içinde bulunulan
+    yıldan alınır. Toplu aktarım ve eşitleme (uyap_sync) aynı anahtarı
+    kullanır; böylece aynı dosya iki yoldan gelse de tek kayda eşlenir.
+    """
+    esas_no = info['esas_no']
+    return info['mahkeme'], esas_no, info.get('year') or esas_year(esas_no) or datetime.now().year
+
+
+def normalize_details(file_details):
+    """Detaydaki veri sınıflarını sözlüğe çevirir"""
+    def as_dicts(items):
+        return [asdict(item) if is_dataclass(item) else dict(item) for item in items or []]
+
+    return {
+        'basic_info': dict(file_details.get('basic_info') or {}),
+        'parties': as_dicts(file_details.get('parties')),
+        'expenses': as_dicts(file_details.get('expenses')),
+        'documents': as_dicts(file_details.get('documents')),
+    }
+
+
+def _entity_type(identity):
+    return 'person' if len(identity) == 11 and identity.isdigit() else 'company'
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class UYAPBulkImporter:
+    """
+    UYAP dosya detaylarını gruplar halinde LawAutomation veritabanına aktarır
+
+    Ayarlar tek dosya aktarımıyla aynıdır: include_basic_info, include_parties,
+    include_expenses, include_documents, overwrite_existing ve
+    expense_conflict ('skip', 'overwrite', 'create-new').
+    """
+
+    def __init__(self, user_id, settings=None, batch_size=None):
+        self.user_id = user_id
+        self.settings = settings or {}
+        self.batch_size = max(1, batch_size or PERFORMANCE_CONFIG['batch_size'])
+        self.ozet = {}
+
+    def import_files(self, files):
+        """
+        Dosyaları aktarır
+
+        Args:
+            files: get_file_complete_details() biçiminde detay sözlükleri
+
+        Returns:
+            list: Dosya sırasıyla {'success', 'file_info' | 'error'} sonuçları
+        """
+        started = time.perf_counter()
+        self.ozet = {'toplam': len(files), 'aktarilan': 0, 'atlanan': 0, 'hatali': 0,
+                     'masraf': 0, 'evrak': 0, 'islem': 0}
+        results = [None] * len(files)
+
+        pending = []
+        for index, file_details in enumerate(files):
+            details = normalize_details(file_details)
+            info = details['basic_info']
+            if not info.get('esas_no') or not info.get('mahkeme'):
+                results[index] = {'success': False, 'error': 'Esas numarası ve mahkeme bilgisi gerekli'}
+            else:
+                pending.append((index, details))
+
+        for batch in _chunks(pending, self.batch_size):
+            self._commit_batch(batch, results)
+
+        for result in results:
+            if result['success']:
+                self.ozet['aktarilan'] += 1
+            elif result['error'] == EXISTS_ERROR:
+                self.ozet['atlanan'] += 1
+            else:
+                self.ozet['hatali'] += 1
+        elapsed = time.perf_counter() - started
+        self.ozet['sure'] = round(elapsed, 3)
+        self.ozet['dosya_saniye'] = round(len(files) / elapsed, 1) if elapsed else 0.0
+        logger.info(f"UYAP toplu aktarım: {self.ozet['aktarilan']} dosya, {self.ozet['masraf']} masraf, "
+                    f"{self.ozet['evrak']} evrak ({self.ozet['dosya_saniye']} dosya/sn)")
+        return results
+
+    def _commit_batch(self, batch, results):
+        counts = {'masraf': 0, 'evrak': 0, 'islem': 0}
+        try:
+            batch_results = self._write(batch, counts)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if len(batch) == 1:
+                logger.error(f"UYAP dosyası aktarılamadı {batch[0][1]['basic_info'].get('esas_no')}: {str(e)}")
+                results[batch[0][0]] = {'success': False, 'error': str(e)}
+                return
+            # Hatalı dosyayı ayırmak için grubu tek tek yaz
+            for item in batch:
+                self._commit_batch([item], results)
+            return
+
+        for (index, _), result in zip(batch, batch_results):
+            results[index] = result
+        for key, value in counts.items():
+            self.ozet[key] += value
+
+    def _write(self, batch, counts):
+        """Grubu oturuma yazar (commit etmez); dosya sırasıyla sonuçları döndürür"""
+        settings = self.settings
+        keys = [case_key(details['basic_info']) for _, details in batch]
+        existing = {(case.courthouse, case.case_number, case.year): case for case in
+                    CaseFile.query.filter(tuple_(CaseFile.courthouse, CaseFile.case_number, CaseFile.year).in_(keys))}
+        existing_ids = {case.id for case in existing.values()}
+
+        results, imported = [], []
+        for (_, details), key in zip(batch, keys):
+            case = existing.get(key)
+            if case is not None and not settings.get('overwrite_existing', False):
+                results.append({'success': False, 'error': EXISTS_ERROR})
+                continue
+            if case is None:
+                case = CaseFile(courthouse=key[0], case_number=key[1], year=key[2], user_id=self.user_id)
+                db.session.add(case)
+                existing[key] = case
+            self._apply_case(case, details)
+            imported.append((case, details))
+            results.append(None)
+
+        db.session.flush()
+
+        if settings.get('include_expenses', False):
+            self._write_expenses(imported, existing_ids, counts)
+        if settings.get('include_documents', False):
+            self._write_documents(imported, existing_ids, counts)
+
+        logs = [{
+            'activity_type': 'uyap_import',
+            'description': f"UYAP'tan dosya aktarıldı: {case.case_number}"[:250],
+            'details': {'esas_no': case.case_number, 'mahkeme': case.courthouse, 'import_settings': settings},
+            'user_id': self.user_id,
+            'related_case_id': case.id,
+        } for case, _ in imported]
+        if logs:
+            db.session.execute(insert(ActivityLog), logs)
+            counts['islem'] += len(logs)
+
+        infos = iter({'success': True,
+                      'file_info': {'id': case.id, 'esas_no': case.case_number, 'mahkeme': case.courthouse}}
+                     for case, _ in imported)
+        return [result or next(infos) for result in results]
+
+    def _apply_case(self, case, details):
+        info = details['basic_info']
+        settings = self.settings
+        if settings.get('include_basic_info', True) or case.file_type is None:
+            case.file_type = (info.get('yargi_turu') or 'hukuk').lower()
+            case.department = info.get('yargi_birimi', '')
+            case.status = info.get('durum') or 'Aktif'
+            case.open_date = parse_date(info.get('acilis_tarihi') or '') or datetime.now().date()
+            case.user_id = self.user_id
+
+        parties = details['parties']
+        if settings.get('include_parties', True) and parties:
+            # İlk taraf müvekkil, ikinci taraf karşı taraf
+            client = parties[0]
+            case.client_name = field_value(client, 'name')
+            case.client_capacity = field_value(client, 'capacity')
+            case.client_identity_number = field_value(client, 'identity_number')
+            case.client_entity_type = _entity_type(case.client_identity_number)
+            if len(parties) > 1:
+                opponent = parties[1]
+                case.opponent_name = field_value(opponent, 'name')
+                case.opponent_capacity = field_value(opponent, 'capacity')
+                case.opponent_identity_number = field_value(opponent, 'identity_number')
+                case.opponent_entity_type = _entity_type(case.opponent_identity_number)
+                if field_value(opponent, 'lawyer'):
+                    case.opponent_lawyer = field_value(opponent, 'lawyer')
+                    case.opponent_lawyer_bar_number = field_value(opponent, 'lawyer_bar_number')
+        if not case.client_name:
+            case.client_name = 'Belirtilmemiş'
+
+    def _write_expenses(self, imported, existing_ids, counts):
+        strategy = self.settings.get('expense_conflict', 'skip')
+        current = {}
+        case_ids = [case.id for case, _ in imported if case.id in existing_ids]
+        if case_ids:
+            for expense in Expense.query.filter(Expense.case_id.in_(case_ids)):
+                current.setdefault((expense.case_id, expense.expense_type, expense.date), expense)
+
+        rows = []
+        for case, details in imported:
+            for item in details['expenses']:
+                expense_date = parse_date(field_value(item, 'date')) or datetime.now().date()
+                row = {
+                    'case_id': case.id,
+                    'expense_type': field_value(item, 'expense_type'),
+                    'amount': float(field_value(item, 'amount', 0) or 0),
+                    'date': expense_date,
+                    'is_paid': bool(field_value(item, 'is_paid', False)),
+                    'description': field_value(item, 'description'),
+                }
+                match = current.get((case.id, row['expense_type'], expense_date))
+                if match is not None and strategy != 'create-new':
+                    if strategy == 'overwrite':
+                        match.amount, match.description, match.is_paid = row['amount'], row['description'], row['is_paid']
+                    continue
+                rows.append(row)
+        if rows:
+            db.session.execute(insert(Expense), rows)
+            counts['masraf'] += len(rows)
+
+    def _write_documents(self, imported, existing_ids, counts):
+        current = set()
+        case_ids = [case.id for case, _ in imported if case.id in existing_ids]
+        if case_ids:
+            current = set(db.session.query(Document.case_id, Document.filename).filter(Document.case_id.in_(case_ids)))
+
+        rows = []
+        year = datetime.now().year
+        for case, details in imported:
+            for item in details['documents']:
+                filename = secure_filename(field_value(item, 'name') or 'Unknown_Document.pdf')
+                if (case.id, filename) in current:
+                    continue
+                current.add((case.id, filename))
+                rows.append({
+                    'case_id': case.id,
+                    'document_type': f"UYAP {field_value(item, 'type') or 'PDF'}",
+                    'filename': filename,
+                    'filepath': f"uyap/{year}/{case.id}/{filename}",
+                    'user_id': self.user_id,
+                })
+        if rows:
+            db.session.execute(insert(Document), rows)
+            counts['evrak'] += len(rows)
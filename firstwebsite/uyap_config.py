@@ -16,8 +16,37 @@ UYAP_URLS = {
 # Chrome WebDriver Ayarları
 WEBDRIVER_CONFIG = {
     # Headless modu (False = tarayıcı görünür, True = arka planda)
+    # Headless modda e-imza girişi sunucudaki tarayıcıda yapılamaz; oturum
+    # açıkken çerezleri kullanılan API ve eşitleme işleri için uygundur
     'headless': False,
     
+    # Headless modda pencere boyutu
+    'window_size': '1366,900',
+    
+    # Headless modda resim ve yazı tipi yüklenmesin (sayfa verisi etkilenmez)
+    'block_images': True,
+    'block_fonts': True,
+    
+    # chromedriver yolu (None = PATH, önceki kurulumun önbelleği ya da bir kez indirme)
+    'driver_path': None,
+    
+    # Görünür modda bağlanılacak, uzaktan hata ayıklama açık Chrome (None = kapalı);
+    # oturum havuzunda yalnızca max_sessions = 1 iken kullanılır
+    'debugger_address': 'localhost:9222',
+    
+    # Tarayıcı profili (None = oturuma özel geçici profil; Linux'ta /dev/shm üzerinde)
+    'profile_dir': None,
+    
+    # Oturum başına bellek eşiği (MB, 0 = kapalı). İşletim sistemi sınırı değildir:
+    # bellek düzenli ölçülür, eşiği aşan oturum hafifletilir ya da yeniden başlatılır
+    'restart_memory_mb': 1024,
+    
+    # Oturumun kullanabileceği CPU çekirdeği sayısı (0 = sınırsız, Linux)
+    'cpu_cores': 1,
+    
+    # Tarayıcı süreçlerinin öncelik düşürme değeri (nice, 0 = değişmez, Linux/macOS)
+    'nice': 10,
+    
     # Sayfa yükleme zaman aşımı (saniye)
     'page_load_timeout': 30,
     
@@ -87,6 +116,34 @@ DETAIL_CONFIG = {
     'fetch_hearings': True
 }
 
+# Portal Veri Servisi Ayarları
+# Portal tabloları aşağıdaki JSON servislerinden beslenir. Giriş yapılmış
+# tarayıcının çerezleriyle bu servisler doğrudan çağrılır; portal adresleri
+# değişirse tarayıcı geliştirici araçlarının Ağ sekmesinden güncellenebilir.
+API_CONFIG = {
+    # Veri servisi kullanılsın mı? (False = yalnızca sayfa üzerinden okuma)
+    'enabled': True,
+    
+    # Portal adresi
+    'base_url': 'https://avukatbeta.uyap.gov.tr',
+    
+    # Servis yolları
+    'endpoints': {
+        'dosya_sorgu': '/avukat_dosya_sorgula_brd.ajx',
+        'dosya_detay': '/dosya_detay_bilgileri_brd.ajx',
+        'taraflar': '/dosya_taraf_bilgileri_brd.ajx',
+        'masraflar': '/dosya_masraf_bilgileri_brd.ajx',
+        'evraklar': '/list_dosya_evraklar.ajx',
+        'evrak_indir': '/download_document_brd.uyap'
+    },
+    
+    # Sayfa başına kayıt sayısı
+    'page_size': 100,
+    
+    # İstek zaman aşımı (saniye)
+    'timeout': 30
+}
+
 # Evrak İndirme Ayarları
 DOWNLOAD_CONFIG = {
     # İndirme klasörü (uploads klasörü altında)
@@ -96,13 +153,16 @@ DOWNLOAD_CONFIG = {
     'max_file_size_mb': 50,
     
     # İzin verilen dosya türleri
-    'allowed_file_types': ['.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png', '.tiff'],
+    'allowed_file_types': ['.pdf', '.udf', '.doc', '.docx', '.jpg', '.jpeg', '.png', '.tiff'],
     
     # İndirme zaman aşımı (saniye)
     'download_timeout': 120,
     
     # Aynı isimli dosya varsa ne yap? ('skip', 'overwrite', 'rename')
-    'duplicate_handling': 'rename'
+    'duplicate_handling': 'rename',
+    
+    # Aynı anda indirilecek en fazla evrak sayısı
+    'parallel_downloads': 4
 }
 
 # Hata Yönetimi Ayarları
@@ -110,9 +170,16 @@ ERROR_CONFIG = {
     # Maksimum tekrar sayısı
     'max_retries': 3,
     
-    # Tekrar aralığı (saniye)
+    # Tekrar aralığı (saniye); her denemede backoff_factor ile çarpılır
     'retry_delay': 5,
     
+    # Üstel bekleme çarpanı ve en uzun bekleme (saniye)
+    'backoff_factor': 2,
+    'max_retry_delay': 60,
+    
+    # Beklemeye eklenen rastgele pay (0.1 = %10'a kadar)
+    'retry_jitter': 0.1,
+    
     # Log seviyesi ('DEBUG', 'INFO', 'WARNING', 'ERROR')
     'log_level': 'INFO',
     
@@ -128,16 +195,78 @@ PERFORMANCE_CONFIG = {
     # Sayfa elementleri için maksimum bekleme süresi
     'element_wait_timeout': 15,
     
-    # AJAX istekleri için bekleme süresi
+    # Sayfa içi işlemden sonra AJAX isteklerinin bitmesi için en fazla bekleme (saniye)
     'ajax_wait_time': 2,
     
-    # İşlemler arasında bekleme süresi (saniye)
+    # Aynı oturumdaki iki UYAP işlemi arasında en az geçmesi gereken süre (saniye)
     'operation_delay': 1,
     
     # Çoklu dosya işlemi için batch boyutu
     'batch_size': 5
 }
 
+# Oturum Havuzu Ayarları
+POOL_CONFIG = {
+    # Aynı anda açık tutulabilecek en fazla tarayıcı oturumu
+    'max_sessions': 3,
+    
+    # Bu süre (saniye) kullanılmayan oturum kapatılır
+    'idle_timeout': 900,
+    
+    # Boş oturum için en fazla bekleme süresi (saniye)
+    'lease_timeout': 120,
+    
+    # Boşta kalan oturumların kontrol aralığı (saniye)
+    'reaper_interval': 60
+}
+
+# Dosya Eşitleme Ayarları
+SYNC_CONFIG = {
+    # Zamanlanmış eşitleme açık mı?
+    'enabled': True,
+    
+    # Eşitlemede taranacak yargı türleri
+    'yargi_turleri': ['Hukuk', 'Ceza', 'İcra', 'İdari Yargı'],
+    
+    # İki eşitleme arasındaki en az süre (saat)
+    'interval_hours': 24,
+    
+    # Eşitleme zamanı gelen kullanıcıların kontrol aralığı (saniye)
+    'check_interval': 900,
+    
+    # Liste satırı değişmese de detayların yeniden çekileceği süre (gün)
+    'detail_max_age_days': 7
+}
+
+# Dosya Detay Önbelleği Ayarları
+CACHE_CONFIG = {
+    # Dosya detayları yerel önbellekten okunsun mu?
+    'enabled': True,
+    
+    # Önbellekteki detayların UYAP'tan yeniden çekilmeden kullanılacağı süre (saat)
+    'detail_max_age_hours': 12
+}
+
+# Arka Plan İşleri Ayarları
+JOB_CONFIG = {
+    # Her süreçte çalışan iş parçacığı sayısı (aynı kullanıcının işleri sırayla çalışır)
+    'workers': 2,
+    
+    # Yeni iş kontrol aralığı (saniye)
+    'poll_interval': 2,
+    
+    # Çalışan işlerin kalp atışı aralığı ve bu süre (saniye) kalp atışı
+    # gelmeyen işin yarıda kaldığı kabul edilir
+    'heartbeat_interval': 15,
+    'stale_after': 120,
+    
+    # Biten işlerin saklanacağı süre (gün)
+    'keep_days': 7,
+    
+    # İlerleme akışının (event-stream) en uzun süresi (saniye)
+    'stream_timeout': 600
+}
+
 # Güvenlik Ayarları
 SECURITY_CONFIG = {
     # Session süre sınırı (dakika)
@@ -176,9 +305,14 @@ def get_config(section_name):
         'login': LOGIN_CONFIG,
         'search': SEARCH_CONFIG,
         'detail': DETAIL_CONFIG,
+        'api': API_CONFIG,
         'download': DOWNLOAD_CONFIG,
         'error': ERROR_CONFIG,
         'performance': PERFORMANCE_CONFIG,
+        'pool': POOL_CONFIG,
+        'sync': SYNC_CONFIG,
+        'cache': CACHE_CONFIG,
+        'jobs': JOB_CONFIG,
         'security': SECURITY_CONFIG,
         'test': TEST_CONFIG
     }
@@ -193,9 +327,14 @@ def update_config(section_name, key, value):
         'login': LOGIN_CONFIG,
         'search': SEARCH_CONFIG,
         'detail': DETAIL_CONFIG,
+        'api': API_CONFIG,
         'download': DOWNLOAD_CONFIG,
         'error': ERROR_CONFIG,
         'performance': PERFORMANCE_CONFIG,
+        'pool': POOL_CONFIG,
+        'sync': SYNC_CONFIG,
+        'cache': CACHE_CONFIG,
+        'jobs': JOB_CONFIG,
         'security': SECURITY_CONFIG,
         'test': TEST_CONFIG
     }
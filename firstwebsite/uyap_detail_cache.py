@@ -0,0 +1,256 @@
+"""
+UYAP dosya detaylarının yerel önbelleği
+
+Her dosya, birim adı ve esas numarasından üretilen kalıcı kimlikle
+(stable_file_id) UyapDosyaOnbellek tablosunda tutulur. Portalın dosyaId
+değeri oturuma bağlıdır; aramalarda görülen son değer kimlikle eşlenir,
+böylece detay isteği hangi kimlikle gelirse gelsin aynı kayda ulaşır.
+
+- Aramada bulunan dosyaların liste satırları (duruşma tarihi dahil) yazılır.
+- Detaylar (taraflar, masraflar, evraklar) çekildiğinde kopyası saklanır;
+  CACHE_CONFIG['detail_max_age_hours'] saatten yeni kopya UYAP'a gitmeden
+  kullanılır.
+- Her kayıt detayların ne zaman çekildiğini ve en son ne zaman
+  değiştiğini tutar; yanıtla birlikte bu bilgiler de döner.
+
+Kullanım:
+    cache = UYAPDetailCache(current_user.id)
+    details, meta = cache.details(file_id, lambda: manager.get_file_complete_details(file_id, esas_no))
+    meta  # {'kaynak': 'onbellek' | 'uyap', 'detay_tarihi', 'degisme_tarihi', 'yas_saniye', 'taze'}
+"""
+
+import json
+import hashlib
+import logging
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+from models import db, UyapDosyaOnbellek
+from uyap_bulk_import import field_value, normalize_details
+from uyap_config import CACHE_CONFIG
+from uyap_integration_advanced import stable_file_id
+
+logger = logging.getLogger(__name__)
+
+# Detayların kaynağı
+ONBELLEK = 'onbellek'
+UYAP = 'uyap'
+
+
+def detail_fingerprint(details):
+    """Detayların özeti; oturuma bağlı indirme bağlantıları katılmaz"""
+    details = normalize_details(details)
+    for document in details['documents']:
+        document.pop('url', None)
+        document.pop('download_url', None)
+    payload = json.dumps(details, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _format(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+
+class UYAPDetailCache:
+    """
+    Tek kullanıcının UYAP dosya detayları önbelleği
+
+    Uygulama bağlamında kullanılır. store_files() ve store_details() commit
+    etmez; details() çektiği detayları kaydedip commit eder.
+    """
+
+    def __init__(self, user_id, max_age=None, clock=None):
+        """
+        Args:
+            user_id: Önbellek sahibi kullanıcı ID'si
+            max_age: Detayların taze sayılacağı süre (timedelta)
+            clock: Şimdiki zamanı döndüren çağrılabilir (UTC)
+        """
+        self.user_id = user_id
+        self.max_age = max_age or timedelta(hours=CACHE_CONFIG['detail_max_age_hours'])
+        self.clock = clock or datetime.utcnow
+
+    def find(self, file_id):
+        """Kalıcı kimlik ya da portal dosyaId ile kaydı bulur; yoksa None"""
+        if not file_id:
+            return None
+        return UyapDosyaOnbellek.query \
+            .filter(UyapDosyaOnbellek.user_id == self.user_id,
+                    or_(UyapDosyaOnbellek.dosya_kimligi == file_id, UyapDosyaOnbellek.uyap_dosya_id == file_id)) \
+            .order_by(UyapDosyaOnbellek.satir_tarihi.desc()).first()
+
+    def get(self, file_id):
+        """Taze detayları olan kaydı döndürür; yoksa ya da eskiyse None"""
+        entry = self.find(file_id)
+        if entry is None or entry.detaylar is None or not self.is_fresh(entry):
+            return None
+        return entry
+
+    def is_fresh(self, entry, now=None):
+        if entry.detay_tarihi is None:
+            return False
+        return (now or self.clock()) - entry.detay_tarihi < self.max_age
+
+    def store_files(self, files, now=None):
+        """Arama sonucundaki liste satırlarını yazar (tek sorguda mevcut kayıtlar okunur)"""
+        now = now or self.clock()
+        files = list({row.key: row for row in files}.values())
+        if not files:
+            return
+        entries = {entry.dosya_kimligi: entry for entry in UyapDosyaOnbellek.query.filter(
+            UyapDosyaOnbellek.user_id == self.user_id,
+            UyapDosyaOnbellek.dosya_kimligi.in_([row.key for row in files]))}
+        for row in files:
+            entry = entries.get(row.key)
+            if entry is None:
+                entry = UyapDosyaOnbellek(user_id=self.user_id, dosya_kimligi=row.key)
+                db.session.add(entry)
+            self._apply_row(entry, row, now)
+
+    def store_details(self, details, file_id=None, row=None, now=None):
+        """
+        Detayların kopyasını yazar
+
+        Kayıt liste satırından, daha önce aramada görülen file_id'den ya da
+        detaydaki birim ve esas numarasından bulunur.
+
+        Returns:
+            UyapDosyaOnbellek: Yazılan kayıt; dosya tanınamazsa None
+        """
+        now = now or self.clock()
+        snapshot = normalize_details(details)
+        info = snapshot['basic_info']
+
+        known = self.find(file_id) if row is None else None
+        if row is not None:
+            key = row.key
+        elif known is not None:
+            key = known.dosya_kimligi
+        elif info.get('mahkeme') and info.get('esas_no'):
+            key = stable_file_id(info['mahkeme'], info['esas_no'])
+        else:
+            logger.debug(f"UYAP detayları önbelleğe alınamadı, dosya tanınmadı: {file_id}")
+            return None
+
+        entry = UyapDosyaOnbellek.query.filter_by(user_id=self.user_id, dosya_kimligi=key).first()
+        if entry is None:
+            entry = UyapDosyaOnbellek(user_id=self.user_id, dosya_kimligi=key,
+                                      esas_no=info.get('esas_no'), mahkeme=info.get('mahkeme'))
+            db.session.add(entry)
+        if row is not None:
+            self._apply_row(entry, row, now)
+        elif file_id and file_id != key:
+            entry.uyap_dosya_id = file_id
+
+        fingerprint = detail_fingerprint(snapshot)
+        if entry.detay_izi != fingerprint:
+            entry.degisme_tarihi = now
+        entry.detaylar = json.dumps(snapshot, ensure_ascii=False, default=str)
+        entry.detay_izi = fingerprint
+        entry.detay_tarihi = now
+        return entry
+
+    def cached(self, file_id):
+        """
+        Taze kopya varsa (detaylar, önbellek bilgisi); önbellek kapalıysa,
+        kopya yoksa ya da eskiyse None
+        """
+        if not CACHE_CONFIG['enabled']:
+            return None
+        entry = self.get(file_id)
+        if entry is None:
+            return None
+        return self.snapshot(entry), self.meta(entry, ONBELLEK)
+
+    def details(self, file_id, fetch, refresh=False):
+        """
+        Taze kopya varsa onu, yoksa fetch() ile UYAP'tan çekilen detayları döndürür
+
+        Args:
+            file_id: Kalıcı kimlik ya da portal dosyaId
+            fetch: Detay sözlüğü döndüren çağrılabilir
+            refresh: Önbelleği atla ve UYAP'tan yeniden çek
+
+        Returns:
+            tuple: (detaylar, önbellek bilgisi)
+        """
+        hit = None if refresh else self.cached(file_id)
+        if hit is not None:
+            return hit
+
+        details = fetch()
+        if details is None:
+            raise ValueError("UYAP'tan dosya detayları alınamadı")
+        result = self._store_fetched(details, file_id)
+        db.session.commit()
+        return result
+
+    def details_many(self, file_ids, fetch_many, refresh=False):
+        """
+        Birden fazla dosyanın detayları; taze kopyası olmayanlar tek
+        fetch_many() çağrısıyla çekilir ve tek commit ile yazılır
+
+        Args:
+            file_ids: Kalıcı kimlik ya da portal dosyaId listesi
+            fetch_many: Eksik dosya ID'lerini alır; sırasıyla detay sözlüğü ya da hata döndürür
+            refresh: Önbelleği atla ve hepsini UYAP'tan yeniden çek
+
+        Returns:
+            list: Sırasıyla (detaylar, önbellek bilgisi) ya da hata
+        """
+        results, missing = [None] * len(file_ids), []
+        for index, file_id in enumerate(file_ids):
+            entry = self.get(file_id) if CACHE_CONFIG['enabled'] and not refresh else None
+            if entry is None:
+                missing.append(index)
+            else:
+                results[index] = (self.snapshot(entry), self.meta(entry, ONBELLEK))
+
+        if missing:
+            fetched = fetch_many([file_ids[index] for index in missing])
+            for index, details in zip(missing, fetched):
+                if isinstance(details, Exception):
+                    results[index] = details
+                elif details is None:
+                    results[index] = ValueError("UYAP'tan dosya detayları alınamadı")
+                else:
+                    results[index] = self._store_fetched(details, file_ids[index])
+            db.session.commit()
+        return results
+
+    def _store_fetched(self, details, file_id):
+        entry = self.store_details(details, file_id=file_id)
+        if entry is None:
+            return dict(normalize_details(details), hearings=[]), {'kaynak': UYAP, 'taze': True}
+        return self.snapshot(entry), self.meta(entry, UYAP)
+
+    @staticmethod
+    def snapshot(entry):
+        """Kayıttaki detaylar ve duruşma bilgisi (detayda yoksa liste satırından)"""
+        details = json.loads(entry.detaylar) if entry.detaylar else normalize_details({})
+        row = json.loads(entry.satir) if entry.satir else {}
+        next_hearing = details['basic_info'].get('next_hearing') or row.get('next_hearing')
+        details['hearings'] = [{'date': next_hearing}] if next_hearing else []
+        return details
+
+    def meta(self, entry, kaynak):
+        """Yanıtla dönen tazelik bilgisi"""
+        now = self.clock()
+        return {
+            'kaynak': kaynak,
+            'dosya_kimligi': entry.dosya_kimligi,
+            'detay_tarihi': _format(entry.detay_tarihi),
+            'degisme_tarihi': _format(entry.degisme_tarihi),
+            'yas_saniye': int((now - entry.detay_tarihi).total_seconds()) if entry.detay_tarihi else None,
+            'taze': self.is_fresh(entry, now),
+        }
+
+    @staticmethod
+    def _apply_row(entry, row, now):
+        entry.uyap_dosya_id = row.id if row.id != row.key else entry.uyap_dosya_id
+        entry.esas_no = field_value(row, 'esas_no')
+        entry.mahkeme = field_value(row, 'mahkeme')
+        entry.satir = json.dumps(asdict(row), ensure_ascii=False, default=str)
+        entry.satir_tarihi = now
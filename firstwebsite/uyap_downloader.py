@@ -0,0 +1,404 @@
+"""
+UYAP evraklarının paralel HTTP indirmesi
+
+Evraklar tarayıcıda bağlantıya tıklanarak değil, oturum çerezleriyle
+doğrudan HTTP üzerinden indirilir. Aynı anda en fazla
+DOWNLOAD_CONFIG['parallel_downloads'] evrak indirilir.
+
+- Bağlantı hatası ve 5xx yanıtlarda evrak ERROR_CONFIG['max_retries'] kez
+  üstel artan aralıklarla (uyap_policy.backoff_delay) yeniden denenir.
+- İçerik yazılırken SHA-256 özeti hesaplanır; hedef klasördeki özet
+  kaydında (.uyap_checksums.json) aynı içerik varsa yeni dosya silinir ve
+  mevcut dosya döndürülür.
+- Her evrak bittiğinde ilerleme bildirimi (on_progress) çağrılır.
+- Bağlantılar yalnızca API_CONFIG['base_url'] ile aynı şema ve sunucuya
+  gidebilir; oturum çerezleri de yalnızca o sunucuya gönderilir.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from uyap_config import API_CONFIG, DOWNLOAD_CONFIG, ERROR_CONFIG
+from uyap_integration_advanced import UyapDocument, sanitize_filename
+from uyap_policy import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.uyap_checksums.json'
+CHUNK_SIZE = 64 * 1024
+
+# Sonuç durumları
+INDIRILDI = 'indirildi'
+MEVCUT = 'mevcut'
+ATLANDI = 'atlandi'
+HATA = 'hata'
+
+
+class DownloadError(Exception):
+    """Evrak indirilemedi"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+@dataclass
+class DownloadResult:
+    """Tek evrakın indirme sonucu"""
+    document: UyapDocument
+    status: str
+    path: str = ""
+    checksum: str = ""
+    size: int = 0
+    attempts: int = 0
+    error: str = ""
+
+    def to_dict(self):
+        return {
+            'name': self.document.name,
+            'status': self.status,
+            'path': self.path,
+            'checksum': self.checksum,
+            'size': self.size,
+            'attempts': self.attempts,
+            'error': self.error,
+        }
+
+
+@dataclass
+class DownloadProgress:
+    """İndirme işinin anlık durumu"""
+    toplam: int = 0
+    biten: int = 0
+    indirilen: int = 0
+    mevcut: int = 0
+    atlanan: int = 0
+    hatali: int = 0
+    bayt: int = 0
+    baslangic: float = field(default_factory=time.monotonic)
+
+    def to_dict(self):
+        sure = time.monotonic() - self.baslangic
+        return {
+            'toplam': self.toplam,
+            'biten': self.biten,
+            'indirilen': self.indirilen,
+            'mevcut': self.mevcut,
+            'atlanan': self.atlanan,
+            'hatali': self.hatali,
+            'bayt': self.bayt,
+            'sure': round(sure, 2),
+            'yuzde': round(100 * self.biten / self.toplam, 1) if self.toplam else 100.0,
+        }
+
+
+def as_document(document):
+    """API'den sözlük olarak gelen evrakı UyapDocument'e çevirir"""
+    if isinstance(document, UyapDocument):
+        return document
+    url = document.get('download_url') or document.get('url') or ""
+    return UyapDocument(
+        name=document.get('name') or 'evrak',
+        date=document.get('date', ''),
+        size=str(document.get('size', '')),
+        type=document.get('type', ''),
+        url=document.get('url') or url,
+        download_url=url,
+    )
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChecksumIndex:
+    """
+    Klasördeki evrakların içerik özetleri; klasörde JSON olarak saklanır
+
+    Özet kontrolü ve dosyanın yerine taşınması `lock` altında yapılır.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, MANIFEST_NAME)
+        self.lock = threading.Lock()
+        self._by_checksum = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        # Kayıtta olmayan ya da silinmiş dosyalar için kaydı klasörden tamamla
+        index = {checksum: name for checksum, name in index.items()
+                 if os.path.exists(os.path.join(self.folder, name))}
+        known = set(index.values())
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            # Özet kaydı ve yarım indirmeler nokta ile başlar
+            if name in known or name.startswith('.') or not os.path.isfile(path):
+                continue
+            index.setdefault(file_checksum(path), name)
+        return index
+
+    def get(self, checksum):
+        """Aynı içerikli dosyanın adı, yoksa None"""
+        return self._by_checksum.get(checksum)
+
+    def add(self, checksum, name):
+        # Üzerine yazılan dosyanın eski özeti geçersizdir
+        self._by_checksum = {c: n for c, n in self._by_checksum.items() if n != name}
+        self._by_checksum[checksum] = name
+
+    def names(self):
+        with self.lock:
+            return set(self._by_checksum.values())
+
+    def save(self):
+        with self.lock:
+            data = dict(self._by_checksum)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+
+
+class DocumentDownloader:
+    """
+    Evrakları oturum çerezleriyle paralel indirir
+
+    Kullanım:
+        downloader = DocumentDownloader(cookies=uyap.api_client().http.cookies)
+        results = downloader.download_all(documents, target_folder)
+    """
+
+    def __init__(self, cookies=None, http=None, max_workers=None, max_retries=None,
+                 retry_delay=None, timeout=None, on_progress=None, base_url=None):
+        self.base_url = (base_url or API_CONFIG['base_url']).rstrip('/')
+        self.http = http or requests.Session()
+        if cookies:
+            self._set_cookies(cookies)
+        self.max_workers = max_workers or DOWNLOAD_CONFIG.get('parallel_downloads', 4)
+        self.max_retries = ERROR_CONFIG['max_retries'] if max_retries is None else max_retries
+        self.retry_delay = ERROR_CONFIG['retry_delay'] if retry_delay is None else retry_delay
+        self.timeout = timeout or DOWNLOAD_CONFIG['download_timeout']
+        self.max_bytes = DOWNLOAD_CONFIG['max_file_size_mb'] * 1024 * 1024
+        self.allowed_types = {ext.lower() for ext in DOWNLOAD_CONFIG['allowed_file_types']}
+        self.duplicate_handling = DOWNLOAD_CONFIG['duplicate_handling']
+        self.on_progress = on_progress
+        self.progress = DownloadProgress()
+        self._lock = threading.Lock()
+
+    def _set_cookies(self, cookies):
+        """
+        Oturum çerezlerini portal sunucusuyla sınırlı olarak ekler
+
+        Args:
+            cookies: Alan adı korunmuş çerez kavanozu, Selenium get_cookies()
+                listesi ya da {ad: değer} sözlüğü (portal sunucusuna bağlanır)
+        """
+        host = urlsplit(self.base_url).hostname
+        if isinstance(cookies, dict):
+            cookies = [{'name': name, 'value': value} for name, value in cookies.items()]
+        if isinstance(cookies, list):
+            for cookie in cookies:
+                self.http.cookies.set(cookie['name'], cookie['value'],
+                                      domain=cookie.get('domain') or host, path=cookie.get('path', '/'))
+        else:
+            for cookie in cookies:
+                # Alan adı olmayan çerez her sunucuya gönderilir
+                if not cookie.domain:
+                    cookie = requests.cookies.create_cookie(cookie.name, cookie.value, domain=host,
+                                                            path=cookie.path or '/')
+                self.http.cookies.set_cookie(cookie)
+
+    def resolve_url(self, url):
+        """
+        Bağlantıyı portal adresine göre tamamlar
+
+        Raises:
+            DownloadError: Bağlantı portal dışındaki bir sunucuyu gösteriyorsa
+        """
+        resolved = urljoin(self.base_url + '/', url)
+        parts, base = urlsplit(resolved), urlsplit(self.base_url)
+        if parts.scheme != base.scheme or parts.netloc.lower() != base.netloc.lower():
+            raise DownloadError("İndirme bağlantısı UYAP portalına ait değil", retryable=False)
+        return resolved
+
+    def download_all(self, documents, target_folder):
+        """
+        Evrakları indirir
+
+        Returns:
+            List[DownloadResult]: Evrak sırasıyla sonuçlar
+        """
+        documents = [as_document(document) for document in documents]
+        os.makedirs(target_folder, exist_ok=True)
+        index = ChecksumIndex(target_folder)
+        self.progress = DownloadProgress(toplam=len(documents))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='uyap-indirme') as executor:
+                results = list(executor.map(lambda doc: self._download_one(doc, target_folder, index), documents))
+        finally:
+            # Beklenmeyen hatada da o ana kadar indirilenler özet kaydına yazılır
+            index.save()
+        summary = self.progress.to_dict()
+        logger.info(f"UYAP evrak indirme: {summary['indirilen']} indirildi, {summary['mevcut']} mevcut, "
+                    f"{summary['atlanan']} atlandı, {summary['hatali']} hatalı ({summary['sure']} sn)")
+        return results
+
+    def _download_one(self, document, target_folder, index):
+        result = DownloadResult(document=document, status=HATA)
+        temp_path = None
+        try:
+            if not document.download_url:
+                raise DownloadError("İndirme bağlantısı yok", retryable=False)
+            name = sanitize_filename(document.name)
+            ext = os.path.splitext(name)[1].lower()
+            if ext and ext not in self.allowed_types:
+                result.status, result.error = ATLANDI, f"İzin verilmeyen dosya türü: {ext}"
+                return result
+            if self.duplicate_handling == 'skip' and name in index.names():
+                result.status, result.path = ATLANDI, os.path.join(target_folder, name)
+                return result
+
+            url = self.resolve_url(document.download_url)
+            temp_path, checksum, size, name = self._fetch_with_retries(document, url, name, target_folder, result)
+            result.checksum, result.size = checksum, size
+
+            with index.lock:
+                existing = index.get(checksum)
+                if existing is not None:
+                    # Aynı içerik zaten kayıtlı
+                    os.remove(temp_path)
+                    result.status, result.path = MEVCUT, os.path.join(target_folder, existing)
+                    return result
+
+                final_path = self._final_path(target_folder, name)
+                os.replace(temp_path, final_path)
+                index.add(checksum, os.path.basename(final_path))
+            result.status, result.path = INDIRILDI, final_path
+            return result
+
+        except (DownloadError, OSError, requests.RequestException) as e:
+            # Bir evrakın hatası (ör. disk dolu) diğerlerini ve özet kaydını etkilemez
+            result.status, result.error = HATA, str(e)
+            if temp_path:
+                _remove(temp_path)
+            logger.error(f"Evrak indirilemedi {document.name}: {str(e)}")
+            return result
+        finally:
+            self._report(result)
+
+    def _fetch_with_retries(self, document, url, name, target_folder, result):
+        while True:
+            result.attempts += 1
+            try:
+                return self._fetch(url, name, target_folder)
+            except DownloadError as e:
+                if not e.retryable or result.attempts > self.max_retries:
+                    raise
+                delay = backoff_delay(result.attempts, base=self.retry_delay)
+                logger.warning(f"{document.name} yeniden denenecek ({result.attempts}. deneme): {str(e)}")
+                time.sleep(delay)
+
+    def _fetch(self, url, name, target_folder):
+        """Evrakı geçici dosyaya yazar; (geçici yol, özet, boyut, dosya adı) döndürür"""
+        try:
+            response = self.http.get(url, stream=True, timeout=self.timeout, allow_redirects=False)
+        except requests.RequestException as e:
+            raise DownloadError(f"Bağlantı hatası: {str(e)}")
+
+        with response:
+            if response.status_code in (301, 302, 303, 401, 403):
+                raise DownloadError("UYAP oturumu sona ermiş", retryable=False)
+            if response.status_code >= 500 or response.status_code == 429:
+                raise DownloadError(f"Sunucu {response.status_code} döndürdü")
+            if response.status_code != 200:
+                raise DownloadError(f"Sunucu {response.status_code} döndürdü", retryable=False)
+
+            if not os.path.splitext(name)[1]:
+                name += os.path.splitext(_header_filename(response.headers.get('Content-Disposition')))[1]
+
+            digest = hashlib.sha256()
+            size = 0
+            temp_path = os.path.join(target_folder, f".{threading.get_ident()}-{name}.part")
+            try:
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            raise DownloadError(f"Dosya {DOWNLOAD_CONFIG['max_file_size_mb']} MB sınırını aşıyor",
+                                                retryable=False)
+                        digest.update(chunk)
+                        f.write(chunk)
+            except requests.RequestException as e:
+                _remove(temp_path)
+                raise DownloadError(f"Aktarım kesildi: {str(e)}")
+            except (DownloadError, OSError):
+                _remove(temp_path)
+                raise
+
+        return temp_path, digest.hexdigest(), size, name
+
+    def _final_path(self, target_folder, name):
+        """Aynı adlı farklı içerikli dosya varsa ayarlara göre yeni ad verir"""
+        path = os.path.join(target_folder, name)
+        if self.duplicate_handling == 'rename':
+            stem, ext = os.path.splitext(name)
+            counter = 1
+            while os.path.exists(path):
+                path = os.path.join(target_folder, f"{stem} ({counter}){ext}")
+                counter += 1
+        return path
+
+    def _report(self, result):
+        with self._lock:
+            progress = self.progress
+            progress.biten += 1
+            progress.bayt += result.size if result.status == INDIRILDI else 0
+            if result.status == INDIRILDI:
+                progress.indirilen += 1
+            elif result.status == MEVCUT:
+                progress.mevcut += 1
+            elif result.status == ATLANDI:
+                progress.atlanan += 1
+            else:
+                progress.hatali += 1
+            snapshot = progress.to_dict()
+        if self.on_progress:
+            try:
+                self.on_progress(snapshot, result)
+            except Exception as e:
+                logger.warning(f"İlerleme bildirimi başarısız: {str(e)}")
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _header_filename(content_disposition):
+    if not content_disposition:
+        return ""
+    message = Message()
+    message['content-disposition'] = content_disposition
+    return message.get_filename() or ""
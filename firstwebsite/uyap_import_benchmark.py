@@ -0,0 +1,138 @@
+"""
+UYAP toplu aktarım için saniyedeki dosya ölçümü
+
+Yapay UYAP dosya detayları (taraf, masraf, evrak) geçici bir SQLite
+dosyasına (WAL ayarlarıyla) aktarılır. Karşılaştırılan yöntemler:
+
+- satir: eski aktarım gibi her satır için sorgu ve commit
+- dosya: UYAPBulkImporter, dosya başına bir işlem (batch_size=1)
+- toplu: UYAPBulkImporter, --batch dosyada bir işlem
+
+Kullanım:
+    python uyap_import_benchmark.py
+    python uyap_import_benchmark.py --files 500 --expenses 20 --documents 40 --batch 100
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from werkzeug.utils import secure_filename
+
+from app_factory import create_app
+from models import db, ActivityLog, CaseFile, Document, Expense, User
+from uyap_bulk_import import UYAPBulkImporter, parse_date
+
+SETTINGS = {'include_expenses': True, 'include_documents': True, 'expense_conflict': 'skip'}
+
+
+def build_files(count, expenses, documents, offset=0):
+    """Yapay UYAP dosya detayları üretir"""
+    files = []
+    for i in range(offset, offset + count):
+        files.append({
+            'basic_info': {
+                'esas_no': f"2024/{i + 1}",
+                'mahkeme': f"İstanbul {i % 40 + 1}. Asliye Hukuk Mahkemesi",
+                'yargi_turu': 'Hukuk',
+                'yargi_birimi': 'Asliye Hukuk Mahkemesi',
+                'durum': 'Açık',
+                'acilis_tarihi': '01.02.2024',
+                'year': 2024,
+            },
+            'parties': [
+                {'name': f"Davacı {i}", 'capacity': 'Davacı', 'identity_number': '12345678901'},
+                {'name': f"Davalı {i} A.Ş.", 'capacity': 'Davalı', 'identity_number': '1234567890'},
+            ],
+            'expenses': [{'expense_type': f"Masraf {j}", 'amount': 100.0 + j,
+                          'date': f"{j % 28 + 1:02d}.03.2024", 'is_paid': j % 2 == 0}
+                         for j in range(expenses)],
+            'documents': [{'name': f"Evrak {j}.pdf", 'type': 'PDF'} for j in range(documents)],
+        })
+    return files
+
+
+def row_by_row_import(file_details, user_id):
+    """Eski yöntem: her kayıt ayrı sorgulanır ve ayrı commit edilir"""
+    info = file_details['basic_info']
+    case = CaseFile(file_type='hukuk', courthouse=info['mahkeme'], department=info['yargi_birimi'],
+                    year=info['year'], case_number=info['esas_no'], status=info['durum'],
+                    open_date=parse_date(info['acilis_tarihi']),
+                    client_name=file_details['parties'][0]['name'], user_id=user_id)
+    db.session.add(case)
+    db.session.commit()
+    for item in file_details['expenses']:
+        expense_date = parse_date(item['date'])
+        if Expense.query.filter_by(case_id=case.id, expense_type=item['expense_type'], date=expense_date).first():
+            continue
+        db.session.add(Expense(case_id=case.id, expense_type=item['expense_type'], amount=item['amount'],
+                               date=expense_date, is_paid=item['is_paid']))
+        db.session.commit()
+    for item in file_details['documents']:
+        filename = secure_filename(item['name'])
+        if Document.query.filter_by(case_id=case.id, filename=filename).first():
+            continue
+        db.session.add(Document(case_id=case.id, document_type='UYAP PDF', filename=filename,
+                                filepath=f"uyap/{datetime.now().year}/{case.id}/{filename}", user_id=user_id))
+        db.session.commit()
+    db.session.add(ActivityLog(activity_type='uyap_import', description=f"UYAP'tan dosya aktarıldı: {case.case_number}",
+                               user_id=user_id, related_case_id=case.id))
+    db.session.commit()
+
+
+def run(method, files, batch):
+    """Yöntemi boş bir veritabanında çalıştırır; saniyedeki dosya sayısını döndürür"""
+    work_dir = tempfile.mkdtemp()
+    try:
+        app = create_app(config={'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(work_dir, 'bench.db')})
+        with app.app_context():
+            db.create_all()
+            user = User(email='bench@example.com', username='bench', first_name='Bench', last_name='User',
+                        phone='0', role='Avukat', is_approved=True)
+            user.set_password('bench')
+            db.session.add(user)
+            db.session.commit()
+
+            start = time.perf_counter()
+            if method == 'satir':
+                for file_details in files:
+                    row_by_row_import(file_details, user.id)
+            else:
+                importer = UYAPBulkImporter(user.id, SETTINGS, batch_size=1 if method == 'dosya' else batch)
+                results = importer.import_files(files)
+                assert all(result['success'] for result in results), results
+            elapsed = time.perf_counter() - start
+
+            assert Expense.query.count() == sum(len(f['expenses']) for f in files)
+            db.session.remove()
+            db.engine.dispose()
+        return len(files) / elapsed, elapsed
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UYAP toplu aktarım ölçümü")
+    parser.add_argument('--files', type=int, default=200, help="Dosya sayısı")
+    parser.add_argument('--expenses', type=int, default=10, help="Dosya başına masraf")
+    parser.add_argument('--documents', type=int, default=20, help="Dosya başına evrak")
+    parser.add_argument('--batch', type=int, default=50, help="Toplu yöntemde işlem başına dosya")
+    parser.add_argument('methods', nargs='*', default=['satir', 'dosya', 'toplu'], help="Ölçülecek yöntemler")
+    args = parser.parse_args()
+
+    files = build_files(args.files, args.expenses, args.documents)
+    print(f"{args.files} dosya, dosya başına {args.expenses} masraf ve {args.documents} evrak")
+    print(f"{'Yöntem':<10}{'Süre (sn)':>12}{'Dosya/sn':>12}")
+    for method in args.methods:
+        rate, elapsed = run(method, files, args.batch)
+        print(f"{method:<10}{elapsed:>12.2f}{rate:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
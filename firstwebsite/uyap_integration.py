@@ -3,10 +3,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-import time
 import json
 from selenium.webdriver.common.keys import Keys
 import os
@@ -18,8 +16,15 @@ from urllib.parse import urljoin
 import re
 from bs4 import BeautifulSoup
 
+from uyap_browser import chromedriver_path
+from uyap_integration_advanced import UyapFile
+from uyap_waits import StepTimer, install_network_tracker, wait_for_grid, wait_for_page, wait_for_port, wait_until
+
+RESULT_TABLE = "div.dx-datagrid-content table"
+
 class UYAPIntegration:
     def __init__(self):
+        self.timer = StepTimer()
         try:
             # Chrome ayarlarını yapılandır
             chrome_path = r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
@@ -42,7 +47,9 @@ class UYAPIntegration:
                 "--homepage=https://avukatbeta.uyap.gov.tr/giris"
             ])
             
-            time.sleep(3)  # Chrome'un başlaması için bekle
+            # Chrome'un hata ayıklama portunu açmasını bekle
+            with self.timer.step('chrome_baslatma'):
+                wait_for_port('localhost', debug_port)
             
             # Chrome'a bağlan
             chrome_options = Options()
@@ -50,8 +57,9 @@ class UYAPIntegration:
             chrome_options.add_argument("--start-maximized")
             
             # Chrome sürücüsünü başlat
-            service = Service(ChromeDriverManager().install())
+            service = Service(executable_path=chromedriver_path())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            install_network_tracker(self.driver)
             
             # Doğrudan UYAP sayfasına git
             self.driver.get("https://avukatbeta.uyap.gov.tr/giris")
@@ -64,6 +72,9 @@ class UYAPIntegration:
         # İşlenen birimleri takip etmek için sözlük
         self.islenen_birimler = {}
         
+        # Sonuç tablolarından okunan dosyalar (UyapFile)
+        self.bulunan_dosyalar = []
+        
     def login(self):
         """
         UYAP Avukat Portalına giriş yapar ve detaylı arama sayfasına gider
@@ -76,25 +87,18 @@ class UYAPIntegration:
                 print(f"Yanlış sayfaya yönlendirildi: {current_url}")
                 print("UYAP sayfasına yeniden yönlendiriliyor...")
                 self.driver.get("https://avukatbeta.uyap.gov.tr")
-                time.sleep(2)
+                wait_for_page(self.driver)
             
             print("UYAP sayfası açıldı, e-imza ile giriş bekleniyor...")
             
             # Giriş başarılı olana kadar maksimum 30 saniye bekle
-            max_wait = 30
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait:
-                try:
-                    # Ana sayfadaki herhangi bir menü öğesini kontrol et
-                    menu_item = WebDriverWait(self.driver, 1).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "span.dx-menu-item-text"))
-                    )
-                    print("Giriş başarılı! Detaylı arama sayfasına yönlendiriliyor...")
-                    break
-                except:
-                    time.sleep(1)  # 1 saniye bekle ve tekrar kontrol et
-                    continue
+            try:
+                # Ana sayfadaki herhangi bir menü öğesini kontrol et
+                with self.timer.step('giris'):
+                    wait_until(self.driver, EC.presence_of_element_located((By.CSS_SELECTOR, "span.dx-menu-item-text")), 30)
+                print("Giriş başarılı! Detaylı arama sayfasına yönlendiriliyor...")
+            except TimeoutException:
+                pass
             
             # Ana sayfadaki detaylı arama ikonuna tıkla
             try:
@@ -102,8 +106,9 @@ class UYAPIntegration:
                 detayli_arama = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "div.dx-box-item div.dx-box-item:nth-child(2)"))
                 )
-                detayli_arama.click()
-                time.sleep(2)
+                with self.timer.step('arama_sayfasi'):
+                    detayli_arama.click()
+                    wait_for_page(self.driver)
                 print("Detaylı arama sayfası açıldı!")
                 return True
             except Exception as e:
@@ -127,8 +132,8 @@ class UYAPIntegration:
             # Kapatma butonunu bul ve tıkla
             close_button = video_popup.find_element(By.CSS_SELECTOR, "div.dx-closebutton")
             self.driver.execute_script("arguments[0].click();", close_button)
+            WebDriverWait(self.driver, 5).until(EC.invisibility_of_element(video_popup))
             print("Video popup'ı kapatıldı")
-            time.sleep(1)
             return True
         except:
             return False
@@ -161,7 +166,7 @@ class UYAPIntegration:
                     EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Dava Açılış İşlemleri')]"))
                 )
                 self.driver.execute_script("arguments[0].click();", dava_acilis)
-                time.sleep(2)
+                wait_for_page(self.driver)
                 print("Dava Açılış İşlemleri menüsü açıldı")
             
             self.safe_action(click_dava_acilis)
@@ -171,8 +176,9 @@ class UYAPIntegration:
                 sik_kullanilanlar = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Sık Kullanılan Dosyalarım')]"))
                 )
-                self.driver.execute_script("arguments[0].click();", sik_kullanilanlar)
-                time.sleep(2)
+                with self.timer.step('sik_kullanilanlar'):
+                    self.driver.execute_script("arguments[0].click();", sik_kullanilanlar)
+                    wait_for_grid(self.driver, RESULT_TABLE)
                 print("Sık Kullanılan Dosyalarım sayfası açıldı")
             
             self.safe_action(click_sik_kullanilanlar)
@@ -182,7 +188,7 @@ class UYAPIntegration:
                 try:
                     # Tablo elementini bul
                     table = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.dx-datagrid-content table"))
+                        EC.presence_of_element_located((By.CSS_SELECTOR, RESULT_TABLE))
                     )
                     
                     # Tüm satırları al
@@ -226,8 +232,10 @@ class UYAPIntegration:
             dosya_link = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, f"//td[contains(text(), '{dosya_no}')]//ancestor::tr//a[contains(@title, 'Detay')]"))
             )
-            dosya_link.click()
-            time.sleep(2)  # Detayların yüklenmesi için bekle
+            # Detayların yüklenmesini bekle
+            with self.timer.step('detay_sayfasi'):
+                dosya_link.click()
+                wait_for_page(self.driver)
 
             # Detay bilgilerini topla
             details = {
@@ -241,7 +249,7 @@ class UYAPIntegration:
 
             # Önceki sayfaya dön
             self.driver.back()
-            time.sleep(1)
+            wait_for_page(self.driver)
 
             return details
 
@@ -313,7 +321,19 @@ class UYAPIntegration:
                             'yargi_birimi': birim_adi
                         }
                         print(f"Dosya bulundu: {dosya['dosya_no']}")
-                        # TODO: Burada dosyayı veritabanına kaydet
+                        # Veritabanına yazma uyap_sync.UYAPSync ile yapılır:
+                        # UYAPSync(user_id, lambda filtre: uyap.bulunan_dosyalar).run()
+                        self.bulunan_dosyalar.append(UyapFile(
+                            id=dosya['dosya_no'],
+                            esas_no=dosya['dosya_no'],
+                            mahkeme=dosya['mahkeme'],
+                            yargi_turu=yargi_turu,
+                            yargi_birimi=birim_adi,
+                            durum=dosya['durum'],
+                            acilis_tarihi='',
+                            taraflar=dosya['taraflar'],
+                            last_action=dosya['son_islem']
+                        ))
                         
                 except Exception as e:
                     print(f"Satır işlenirken hata: {str(e)}")
@@ -331,45 +351,41 @@ class UYAPIntegration:
             print(f"{yargi_turu} türü için dosya sorgulaması başlatılıyor...")
             
             # Ana sayfaya git
-            self.driver.get("https://avukatbeta.uyap.gov.tr")
-            time.sleep(2)
+            with self.timer.step('ana_sayfa'):
+                self.driver.get("https://avukatbeta.uyap.gov.tr")
+                wait_for_page(self.driver)
             
             # Detaylı Arama butonunu bul ve tıkla
             detayli_arama = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "div.dx-box-item button[title='Detaylı Arama']"))
             )
             detayli_arama.click()
-            time.sleep(2)
             
-            # Yargı türü seçim kutusunu bul
+            # Yargı türü seçim kutusu arama formu açılınca tıklanabilir olur
             yargi_turu_dropdown = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "div[class*='yargiTuru']"))
             )
             yargi_turu_dropdown.click()
-            time.sleep(1)
             
             # Yargı türünü seç
             yargi_turu_secim = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, f"//div[contains(@class, 'dx-item-content') and contains(text(), '{yargi_turu}')]"))
             )
             yargi_turu_secim.click()
-            time.sleep(1)
+            WebDriverWait(self.driver, 10).until(EC.invisibility_of_element(yargi_turu_secim))
             
             # Sorgula butonunu bul ve tıkla
             sorgula_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "div.dx-button-content:has(span:contains('Sorgula'))"))
             )
-            sorgula_button.click()
-            
             print(f"{yargi_turu} türündeki dosyalar sorgulanıyor...")
-            time.sleep(5)  # Sonuçların yüklenmesi için bekle
             
             # Sonuçları kaydet
             try:
-                # Tablo elementini bul
-                table = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.dx-datagrid-content table"))
-                )
+                # Yükleme paneli kapanıp tablo gelene kadar bekle
+                with self.timer.step('sorgu'):
+                    sorgula_button.click()
+                    table = wait_for_grid(self.driver, RESULT_TABLE)
                 
                 # Tüm satırları al
                 rows = table.find_elements(By.TAG_NAME, "tr")
@@ -1,12 +1,7 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-import time
 import json
 from selenium.webdriver.common.keys import Keys
 import os
@@ -19,17 +14,30 @@ import re
 from bs4 import BeautifulSoup
 from pathlib import Path
 import hashlib
+import itertools
 import threading
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
 import zipfile
 import shutil
 
+from uyap_config import API_CONFIG
+from uyap_browser import BrowserRuntime
+from uyap_policy import OperationMetrics, UYAPPolicy, batches
+from uyap_session_pool import UYAPSessionPool
+from uyap_waits import (
+    StepTimer, install_network_tracker, logged_in, wait_for_download, wait_for_grid,
+    wait_for_page, wait_until
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SEARCH_BUTTON = (By.XPATH, "//div[contains(@class, 'dx-button-content')]//span[contains(text(), 'Sorgula')]")
+
 @dataclass
 class UyapFile:
     """UYAP dosya bilgileri için veri sınıfı"""
@@ -46,6 +54,11 @@ class UyapFile:
     subject: str = ""
     last_action: str = ""
     next_hearing: str = ""
+    key: str = ""
+    
+    def __post_init__(self):
+        if not self.key:
+            self.key = stable_file_id(self.mahkeme, self.esas_no)
 
 @dataclass
 class UyapParty:
@@ -76,6 +89,44 @@ class UyapDocument:
     url: str
     download_url: str = ""
 
+FILE_TYPES = {
+    '.pdf': 'PDF',
+    '.doc': 'Word',
+    '.docx': 'Word',
+    '.xls': 'Excel',
+    '.xlsx': 'Excel',
+    '.jpg': 'Image',
+    '.jpeg': 'Image',
+    '.png': 'Image',
+    '.zip': 'Archive'
+}
+
+def file_type_from_name(filename: str) -> str:
+    """Dosya adından dosya türünü çıkarır"""
+    return FILE_TYPES.get(os.path.splitext(filename)[1].lower(), 'Unknown')
+
+def file_key(mahkeme: str, esas_no: str) -> str:
+    """Birim adı ve esas numarasından oturumdan bağımsız dosya anahtarı üretir"""
+    return f"{' '.join((mahkeme or '').split()).casefold()}|{(esas_no or '').strip()}"
+
+def stable_file_id(mahkeme: str, esas_no: str) -> str:
+    """Birim adı ve esas numarasından URL'de kullanılabilen kalıcı dosya kimliği üretir"""
+    return 'uyap_' + hashlib.sha1(file_key(mahkeme, esas_no).encode('utf-8')).hexdigest()[:20]
+
+def sanitize_filename(filename: str) -> str:
+    """Dosya adını güvenli hale getirir"""
+    # Geçersiz karakterleri temizle
+    invalid_chars = '<>:"/\\|?*'
+    for char in invalid_chars:
+        filename = filename.replace(char, '_')
+    
+    # Uzunluğu sınırla
+    if len(filename) > 255:
+        name, ext = os.path.splitext(filename)
+        filename = name[:255-len(ext)] + ext
+    
+    return filename
+
 class UYAPAdvancedIntegration:
     """
     UYAP Avukat Portalı ile gelişmiş entegrasyon sınıfı
@@ -93,8 +144,8 @@ class UYAPAdvancedIntegration:
         self.wait = None
         self.downloads_path = downloads_path or os.path.join(os.getcwd(), "uploads", "uyap")
         self.session_active = False
-        self.max_retries = 3
-        self.retry_delay = 2
+        # Hız sınırı, yeniden deneme ve bekleme süreleri uyap_config'den okunur
+        self.policy = UYAPPolicy()
         
         # İndirme dizinini oluştur
         os.makedirs(self.downloads_path, exist_ok=True)
@@ -102,6 +153,11 @@ class UYAPAdvancedIntegration:
         # İşlenen dosyaları takip etmek için
         self.processed_files = set()
         self.session_cookies = {}
+        self.timer = StepTimer()
+        self._api = None
+        self.runtime = None
+        # Açık Chrome'a bağlanılabilir mi; havuz tek oturumlu değilse kapatır
+        self.attach_debugger = True
         
     def initialize_driver(self) -> bool:
         """
@@ -111,43 +167,31 @@ class UYAPAdvancedIntegration:
             bool: Başlatma başarılı ise True
         """
         try:
-            # Chrome ayarları
-            chrome_options = Options()
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-popup-blocking")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            
-            # İndirme klasörü ayarları
-            prefs = {
-                "download.default_directory": self.downloads_path,
-                "download.prompt_for_download": False,
-                "download.directory_upgrade": True,
-                "safebrowsing.enabled": True
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
+            self.runtime = BrowserRuntime(self.downloads_path)
             
-            # Mevcut Chrome session'ı kullanmaya çalış
-            try:
-                chrome_options.add_experimental_option("debuggerAddress", "localhost:9222")
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("Mevcut Chrome session'ına bağlandı")
-            except Exception:
+            # Görünür modda mevcut Chrome session'ını kullanmaya çalış
+            self.driver = None
+            attach_options = self.runtime.debugger_options() if self.attach_debugger else None
+            if attach_options is not None:
+                try:
+                    self.driver = webdriver.Chrome(service=self.runtime.service(), options=attach_options)
+                    logger.info("Mevcut Chrome session'ına bağlandı")
+                except Exception:
+                    self.driver = None
+            
+            if self.driver is None:
                 # Yeni Chrome session başlat
-                chrome_options = Options()  # Reset options
-                chrome_options.add_argument("--start-maximized")
-                chrome_options.add_experimental_option("prefs", prefs)
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("Yeni Chrome session başlatıldı")
+                self.driver = webdriver.Chrome(service=self.runtime.service(), options=self.runtime.options())
+                logger.info("Yeni Chrome session başlatıldı" + (" (headless)" if self.runtime.headless else ""))
             
-            self.wait = WebDriverWait(self.driver, 30)
+            self.runtime.attach(self.driver)
+            self.wait = self.policy.wait(self.driver)
+            install_network_tracker(self.driver)
             
             # UYAP ana sayfasına git
-            self.driver.get("https://avukatbeta.uyap.gov.tr")
-            time.sleep(3)
+            with self.timer.step('ana_sayfa'):
+                self.driver.get("https://avukatbeta.uyap.gov.tr")
+                wait_for_page(self.driver)
             
             return True
             
@@ -192,14 +236,16 @@ class UYAPAdvancedIntegration:
         """
         logger.info("UYAP'a e-imza ile giriş yapılması bekleniyor...")
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.check_login_status():
-                return True
-            time.sleep(2)
+        try:
+            with self.timer.step('giris'):
+                wait_until(self.driver, logged_in(), timeout, "Giriş yapılmadı")
+        except TimeoutException:
+            logger.error("Giriş işlemi zaman aşımına uğradı")
+            return False
         
-        logger.error("Giriş işlemi zaman aşımına uğradı")
-        return False
+        self.session_active = True
+        logger.info("UYAP'a giriş yapılmış")
+        return True
     
     def navigate_to_file_search(self) -> bool:
         """
@@ -210,11 +256,16 @@ class UYAPAdvancedIntegration:
         """
         try:
             # Detaylı arama sayfasına git
-            search_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'dx-box-item')]//div[contains(text(), 'Detaylı')]"))
-            )
-            self.driver.execute_script("arguments[0].click();", search_button)
-            time.sleep(3)
+            def open_search():
+                search_button = self.wait.until(
+                    EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'dx-box-item')]//div[contains(text(), 'Detaylı')]"))
+                )
+                self.driver.execute_script("arguments[0].click();", search_button)
+                # Arama formu Sorgula butonuyla birlikte hazır olur
+                self.wait.until(EC.element_to_be_clickable(SEARCH_BUTTON))
+            
+            with self.timer.step('arama_sayfasi'):
+                self.policy.call('arama_sayfasi', open_search)
             
             logger.info("Detaylı arama sayfasına geçildi")
             return True
@@ -239,17 +290,18 @@ class UYAPAdvancedIntegration:
                 logger.error("Filtreler uygulanamadı")
                 return []
             
-            # Arama butonuna tıkla
-            search_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'dx-button-content')]//span[contains(text(), 'Sorgula')]"))
-            )
-            self.driver.execute_script("arguments[0].click();", search_btn)
+            # Arama butonuna tıkla ve sonuç tablosunun yüklenmesini bekle
+            def run_query():
+                search_btn = self.wait.until(EC.element_to_be_clickable(SEARCH_BUTTON))
+                self.driver.execute_script("arguments[0].click();", search_btn)
+                wait_for_grid(self.driver)
             
-            # Sonuçların yüklenmesini bekle
-            time.sleep(5)
+            with self.timer.step('sorgu'):
+                self.policy.call('sorgu', run_query)
             
             # Sonuçları parse et
-            files = self._parse_search_results()
+            with self.timer.step('sonuc_okuma'):
+                files = self._parse_search_results()
             logger.info(f"{len(files)} dosya bulundu")
             
             return files
@@ -275,13 +327,15 @@ class UYAPAdvancedIntegration:
                     EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'dx-dropdowneditor-button')]"))
                 )
                 yargi_turu_dropdown.click()
-                time.sleep(1)
                 
+                # Seçenek listesi açılınca tıklanabilir olur
                 yargi_turu_option = self.wait.until(
                     EC.element_to_be_clickable((By.XPATH, f"//div[contains(@class, 'dx-item-content') and contains(text(), '{filters['yargi_turu']}')]"))
                 )
                 yargi_turu_option.click()
-                time.sleep(2)
+                # Liste kapanıp seçime bağlı alanlar yüklenene kadar bekle
+                self.wait.until(EC.invisibility_of_element(yargi_turu_option))
+                self.policy.settle(self.driver)
             
             # Tarih aralığı
             if filters.get('start_date'):
@@ -324,14 +378,16 @@ class UYAPAdvancedIntegration:
             # Tablo satırlarını al
             rows = table.find_elements(By.TAG_NAME, "tr")[1:]  # Header'ı atla
             
-            for i, row in enumerate(rows):
+            for row in rows:
                 try:
                     cells = row.find_elements(By.TAG_NAME, "td")
                     if len(cells) >= 4:
+                        esas_no, mahkeme = cells[0].text.strip(), cells[1].text.strip()
                         file_data = UyapFile(
-                            id=f"uyap_file_{i}_{int(time.time())}",
-                            esas_no=cells[0].text.strip(),
-                            mahkeme=cells[1].text.strip(),
+                            # Sayfadan okunan dosyanın portal kimliği yok; her aramada aynı kalan kimlik
+                            id=stable_file_id(mahkeme, esas_no),
+                            esas_no=esas_no,
+                            mahkeme=mahkeme,
                             yargi_turu=cells[2].text.strip() if len(cells) > 2 else "",
                             yargi_birimi=cells[1].text.strip(),  # Mahkemeden çıkar
                             durum=cells[3].text.strip() if len(cells) > 3 else "Aktif",
@@ -350,6 +406,52 @@ class UYAPAdvancedIntegration:
             logger.error(f"Sonuç parse hatası: {str(e)}")
             return []
     
+    def api_client(self, refresh: bool = False):
+        """
+        Giriş yapılmış tarayıcının çerezleriyle veri servisi istemcisini döndürür
+        
+        Args:
+            refresh: Çerezleri tarayıcıdan yeniden al
+        """
+        from uyap_api_client import UYAPApiClient
+        
+        if self._api is None or refresh:
+            self._api = UYAPApiClient.from_driver(self.driver)
+            self.session_cookies = self._api.cookies
+        return self._api
+    
+    def _call_api(self, step: str, call):
+        """
+        Veri servisini çağırır; oturum hatasında çerezleri bir kez yeniler
+        
+        Raises:
+            UYAPApiError: Servis kullanılamıyorsa
+        """
+        from uyap_api_client import UYAPApiError, UYAPSessionExpired
+        
+        def attempt():
+            try:
+                return call(self.api_client())
+            except UYAPSessionExpired:
+                # Portal oturum çerezini yenilemiş olabilir
+                try:
+                    return call(self.api_client(refresh=True))
+                except UYAPSessionExpired:
+                    self.session_active = False
+                    raise
+        
+        # Geçici servis hataları yeniden denenir, oturum hatası hemen iletilir
+        with self.timer.step(step):
+            return self.policy.call(step, attempt, retry_on=(UYAPApiError,))
+    
+    def fetch_files(self, filters: Dict) -> List[UyapFile]:
+        """Dosyaları veri servisinden sayfa sayfa çeker"""
+        return self._call_api('api_sorgu', lambda client: client.search_files(filters))
+    
+    def fetch_file_details(self, dosya_id: str) -> Dict:
+        """Dosya detaylarını veri servisinden çeker"""
+        return self._call_api('api_detay', lambda client: client.get_file_details(dosya_id))
+    
     def get_file_details(self, file_id: str, esas_no: str) -> Optional[Dict]:
         """
         Belirli bir dosyanın detaylarını çeker
@@ -363,11 +465,15 @@ class UYAPAdvancedIntegration:
         """
         try:
             # Dosyanın detay sayfasını aç
-            detail_link = self.driver.find_element(
-                By.XPATH, f"//td[contains(text(), '{esas_no}')]/following-sibling::td//a[contains(@title, 'Detay') or contains(@class, 'detail')]"
-            )
-            detail_link.click()
-            time.sleep(3)
+            def open_details():
+                detail_link = self.driver.find_element(
+                    By.XPATH, f"//td[contains(text(), '{esas_no}')]/following-sibling::td//a[contains(@title, 'Detay') or contains(@class, 'detail')]"
+                )
+                detail_link.click()
+                wait_for_page(self.driver)
+            
+            with self.timer.step('detay_sayfasi'):
+                self.policy.call('detay_sayfasi', open_details)
             
             # Detayları topla
             details = {
@@ -378,8 +484,9 @@ class UYAPAdvancedIntegration:
             }
             
             # Geri dön
-            self.driver.back()
-            time.sleep(2)
+            with self.timer.step('sonuc_listesine_donus'):
+                self.driver.back()
+                wait_for_grid(self.driver)
             
             logger.info(f"Dosya detayları alındı: {esas_no}")
             return details
@@ -413,8 +520,9 @@ class UYAPAdvancedIntegration:
         try:
             # Taraflar sekmesine git
             parties_tab = self.driver.find_element(By.XPATH, "//span[contains(text(), 'Taraflar') or contains(text(), 'Parties')]")
-            parties_tab.click()
-            time.sleep(2)
+            with self.timer.step('taraflar_sekmesi'):
+                parties_tab.click()
+                wait_for_page(self.driver)
             
             # Taraf bilgilerini parse et
             party_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'party-info')]")
@@ -446,8 +554,9 @@ class UYAPAdvancedIntegration:
         try:
             # Masraflar sekmesine git
             expenses_tab = self.driver.find_element(By.XPATH, "//span[contains(text(), 'Masraflar') or contains(text(), 'Expenses')]")
-            expenses_tab.click()
-            time.sleep(2)
+            with self.timer.step('masraflar_sekmesi'):
+                expenses_tab.click()
+                wait_for_page(self.driver)
             
             # Masraf tablosunu bul
             expense_table = self.driver.find_element(By.XPATH, "//table[contains(@class, 'expense-table')]")
@@ -480,8 +589,9 @@ class UYAPAdvancedIntegration:
         try:
             # Evraklar sekmesine git
             documents_tab = self.driver.find_element(By.XPATH, "//span[contains(text(), 'Evraklar') or contains(text(), 'Documents')]")
-            documents_tab.click()
-            time.sleep(2)
+            with self.timer.step('evraklar_sekmesi'):
+                documents_tab.click()
+                wait_for_page(self.driver)
             
             # Evrak listesini bul
             document_list = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'document-item')]")
@@ -533,12 +643,11 @@ class UYAPAdvancedIntegration:
             safe_filename = self._sanitize_filename(document.name)
             target_path = os.path.join(target_folder, safe_filename)
             
-            # İndirme linkine tıkla
-            download_element = self.driver.find_element(By.XPATH, f"//a[@href='{document.download_url}']")
-            download_element.click()
-            
-            # İndirmenin tamamlanmasını bekle
-            download_completed = self._wait_for_download(safe_filename, timeout=60)
+            # İndirme linkine tıkla ve indirmenin tamamlanmasını bekle
+            with self.timer.step('evrak_indirme'):
+                download_element = self.driver.find_element(By.XPATH, f"//a[@href='{document.download_url}']")
+                download_element.click()
+                download_completed = self._wait_for_download(safe_filename, timeout=60)
             
             if download_completed:
                 # İndirilen dosyayı hedef klasöre taşı
@@ -565,48 +674,43 @@ class UYAPAdvancedIntegration:
         Returns:
             bool: İndirme tamamlandıysa True
         """
-        start_time = time.time()
-        temp_file = os.path.join(self.downloads_path, filename + ".crdownload")
-        target_file = os.path.join(self.downloads_path, filename)
-        
-        while time.time() - start_time < timeout:
-            if os.path.exists(target_file) and not os.path.exists(temp_file):
-                return True
-            time.sleep(1)
-        
-        return False
+        return wait_for_download(self.downloads_path, filename, timeout) is not None
     
     def _sanitize_filename(self, filename: str) -> str:
         """Dosya adını güvenli hale getirir"""
-        # Geçersiz karakterleri temizle
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Uzunluğu sınırla
-        if len(filename) > 255:
-            name, ext = os.path.splitext(filename)
-            filename = name[:255-len(ext)] + ext
-        
-        return filename
+        return sanitize_filename(filename)
     
     def _get_file_type_from_name(self, filename: str) -> str:
         """Dosya adından dosya türünü çıkarır"""
-        ext = os.path.splitext(filename)[1].lower()
-        
-        type_mapping = {
-            '.pdf': 'PDF',
-            '.doc': 'Word',
-            '.docx': 'Word',
-            '.xls': 'Excel',
-            '.xlsx': 'Excel',
-            '.jpg': 'Image',
-            '.jpeg': 'Image',
-            '.png': 'Image',
-            '.zip': 'Archive'
-        }
-        
-        return type_mapping.get(ext, 'Unknown')
+        return file_type_from_name(filename)
+    
+    def resource_usage(self) -> Optional[Dict]:
+        """Tarayıcı süreçlerinin bellek ve CPU kullanımı; ölçülemiyorsa None"""
+        if self.driver is None or self.runtime is None:
+            return None
+        return self.runtime.usage()
+    
+    def trim_memory(self) -> bool:
+        """
+        Oturumu kapatmadan tarayıcı belleğini azaltır
+        
+        Fazla pencereler kapatılır, önbellek temizlenir ve portal ana
+        sayfası yeniden yüklenir; çerezler korunduğu için giriş düşmez.
+        """
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            with self.timer.step('bellek_azaltma'):
+                self.driver.get("https://avukatbeta.uyap.gov.tr")
+                wait_for_page(self.driver)
+            return True
+        except Exception as e:
+            logger.warning(f"Tarayıcı belleği azaltılamadı: {str(e)}")
+            return False
     
     def close(self):
         """Tarayıcıyı kapatır"""
@@ -616,6 +720,8 @@ class UYAPAdvancedIntegration:
                 logger.info("UYAP entegrasyon sürücüsü kapatıldı")
             except Exception as e:
                 logger.error(f"Sürücü kapatılırken hata: {str(e)}")
+        if self.runtime is not None:
+            self.runtime.cleanup()
     
     def __enter__(self):
         """Context manager girişi"""
@@ -632,6 +738,10 @@ class UYAPAdvancedIntegration:
 class UYAPManager:
     """
     UYAP entegrasyonunu yöneten singleton sınıf
+    
+    Tarayıcı oturumları UYAPSessionPool üzerinden kullanıcı başına kiralanır;
+    farklı avukatların işlemleri paralel yürür, aynı oturumu iki istek
+    aynı anda kullanamaz.
     """
     _instance = None
     _lock = threading.Lock()
@@ -645,105 +755,228 @@ class UYAPManager:
     
     def __init__(self):
         if not hasattr(self, 'initialized'):
-            self.uyap_instance = None
+            self.timer = StepTimer()
+            self.metrics = OperationMetrics()
+            self.pool = UYAPSessionPool(self._create_integration)
+            self.pool.start_reaper()
+            self._session_ids = itertools.count(1)
             self.initialized = True
     
-    def get_uyap_instance(self) -> Optional[UYAPAdvancedIntegration]:
+    def _create_integration(self) -> UYAPAdvancedIntegration:
+        """Havuz için yeni entegrasyon oluşturur; her oturum ayrı indirme klasörü kullanır"""
+        uyap = UYAPAdvancedIntegration(
+            downloads_path=os.path.join(os.getcwd(), "uploads", "uyap", "oturumlar", str(next(self._session_ids)))
+        )
+        uyap.timer = self.timer
+        # Tüm oturumlar aynı hata ayıklama adresine bağlanıp tek tarayıcıyı
+        # paylaşmasın; yalnızca tek oturumlu havuzda izin verilir
+        uyap.attach_debugger = self.pool.max_sessions == 1
+        # Hız sınırı oturuma özel, işlem ölçümleri ortak
+        uyap.policy = UYAPPolicy(metrics=self.metrics)
+        return uyap
+    
+    @contextmanager
+    def session(self, owner=None):
         """
-        UYAP entegrasyon instance'ını döndürür
+        Kullanıcı için bağlı (giriş yapılmış) bir UYAP oturumu kiralar
         
-        Returns:
-            UYAPAdvancedIntegration: UYAP entegrasyon instance'ı
+        Args:
+            owner: Oturum sahibi kullanıcı ID'si
         """
-        if self.uyap_instance is None:
-            self.uyap_instance = UYAPAdvancedIntegration()
-            
-        return self.uyap_instance
+        with self.pool.session(owner) as uyap:
+            if not self.ensure_connection(uyap):
+                raise Exception("UYAP bağlantısı kurulamadı")
+            yield uyap
     
-    def ensure_connection(self) -> bool:
+    def ensure_connection(self, uyap: UYAPAdvancedIntegration) -> bool:
         """
         UYAP bağlantısının aktif olduğundan emin olur
         
         Returns:
             bool: Bağlantı aktifse True
         """
-        uyap = self.get_uyap_instance()
-        
         if not uyap.session_active:
-            if uyap.initialize_driver():
-                return uyap.wait_for_login()
+            if uyap.driver is None and not uyap.initialize_driver():
+                return False
+            return uyap.wait_for_login()
         
         return uyap.session_active
     
-    def search_files_with_filters(self, filters: Dict) -> List[UyapFile]:
+    def search_files_with_filters(self, filters: Dict, owner=None) -> List[UyapFile]:
         """
         Filtrelere göre dosya arar
         
         Args:
             filters: Arama filtreleri
+            owner: İşlemi yapan kullanıcı ID'si
             
         Returns:
             List[UyapFile]: Bulunan dosyalar
         """
-        if not self.ensure_connection():
-            raise Exception("UYAP bağlantısı kurulamadı")
-        
-        uyap = self.get_uyap_instance()
+        from uyap_api_client import UYAPApiError
         
-        # Dosya arama sayfasına git
-        if not uyap.navigate_to_file_search():
-            raise Exception("Dosya arama sayfasına gidilemedi")
-        
-        # Dosyaları ara
-        return uyap.search_files(filters)
+        with self.session(owner) as uyap:
+            if API_CONFIG['enabled']:
+                try:
+                    return uyap.fetch_files(filters)
+                except UYAPApiError as e:
+                    logger.warning(f"UYAP veri servisi kullanılamadı, sayfa üzerinden aranıyor: {str(e)}")
+            
+            # Dosya arama sayfasına git
+            if not uyap.navigate_to_file_search():
+                raise Exception("Dosya arama sayfasına gidilemedi")
+            
+            # Dosyaları ara
+            return uyap.search_files(filters)
     
-    def get_file_complete_details(self, file_id: str, esas_no: str) -> Optional[Dict]:
+    def get_file_complete_details(self, file_id: str, esas_no: str = None, owner=None) -> Optional[Dict]:
         """
         Dosyanın tüm detaylarını çeker
         
         Args:
             file_id: Dosya ID'si
             esas_no: Esas numarası
+            owner: İşlemi yapan kullanıcı ID'si
             
         Returns:
             Dict: Dosya detayları
         """
-        if not self.ensure_connection():
-            raise Exception("UYAP bağlantısı kurulamadı")
+        with self.session(owner) as uyap:
+            return self._file_details(uyap, file_id, esas_no)
+    
+    def get_files_complete_details(self, items: List[Tuple[str, str]], owner=None, on_progress=None) -> List:
+        """
+        Birden fazla dosyanın detaylarını PERFORMANCE_CONFIG['batch_size']
+        büyüklüğünde gruplar halinde çeker
+        
+        Oturum grup başına bir kez kiralanır; gruplar arasında oturum aynı
+        kullanıcının diğer işlerine açılır. Bir dosyanın hatası diğerlerini
+        durdurmaz.
         
-        uyap = self.get_uyap_instance()
+        Args:
+            items: (dosya ID'si, esas numarası) listesi
+            owner: İşlemi yapan kullanıcı ID'si
+            on_progress: Her grup bittiğinde (biten, toplam) ile çağrılır
+            
+        Returns:
+            List: Sırasıyla detay sözlüğü ya da oluşan hata
+        """
+        results = []
+        for batch in batches(items):
+            with self.session(owner) as uyap:
+                for file_id, esas_no in batch:
+                    try:
+                        results.append(self._file_details(uyap, file_id, esas_no))
+                    except Exception as e:
+                        logger.error(f"Dosya detayları alınamadı {esas_no or file_id}: {str(e)}")
+                        results.append(e)
+            if on_progress:
+                on_progress(len(results), len(items))
+        return results
+    
+    @staticmethod
+    def _file_details(uyap: UYAPAdvancedIntegration, file_id: str, esas_no: str = None) -> Optional[Dict]:
+        """Detayları önce veri servisinden, olmazsa detay sayfasından okur"""
+        from uyap_api_client import UYAPApiError
+        
+        if API_CONFIG['enabled']:
+            try:
+                return uyap.fetch_file_details(file_id)
+            except UYAPApiError as e:
+                logger.warning(f"UYAP veri servisi kullanılamadı, detay sayfası okunuyor: {str(e)}")
         return uyap.get_file_details(file_id, esas_no)
     
-    def download_file_documents(self, documents: List[UyapDocument], target_folder: str) -> List[str]:
+    def download_file_documents(self, documents: List[UyapDocument], target_folder: str, owner=None) -> List[str]:
         """
         Dosyanın evraklarını indirir
         
         Args:
             documents: İndirilecek evraklar
             target_folder: Hedef klasör
+            owner: İşlemi yapan kullanıcı ID'si
             
         Returns:
             List[str]: İndirilen dosya yolları
         """
-        if not self.ensure_connection():
-            raise Exception("UYAP bağlantısı kurulamadı")
-        
-        uyap = self.get_uyap_instance()
         downloaded_files = []
         
-        for document in documents:
-            try:
-                downloaded_path = uyap.download_document(document, target_folder)
-                if downloaded_path:
-                    downloaded_files.append(downloaded_path)
-            except Exception as e:
-                logger.error(f"Evrak indirilemedi {document.name}: {str(e)}")
-                continue
+        with self.session(owner) as uyap:
+            for document in documents:
+                try:
+                    downloaded_path = uyap.download_document(document, target_folder)
+                    if downloaded_path:
+                        downloaded_files.append(downloaded_path)
+                except Exception as e:
+                    logger.error(f"Evrak indirilemedi {document.name}: {str(e)}")
+                    continue
         
         return downloaded_files
     
+    def download_documents(self, documents: List, target_folder: str, owner=None, on_progress=None) -> List:
+        """
+        Evrakları oturum çerezleriyle paralel indirir
+        
+        Tarayıcı oturumu yalnızca çerezleri almak için kiralanır; indirme
+        sırasında oturum diğer işlemlere açıktır. İndirme bağlantısı olmayan
+        evraklar tarayıcıda tıklanarak indirilir.
+        
+        Args:
+            documents: UyapDocument ya da sözlük listesi
+            target_folder: Hedef klasör
+            owner: İşlemi yapan kullanıcı ID'si
+            on_progress: Her evrak bittiğinde (ilerleme, sonuç) ile çağrılır
+            
+        Returns:
+            List[DownloadResult]: Evrak sırasıyla indirme sonuçları
+        """
+        from uyap_downloader import DocumentDownloader, DownloadResult, HATA, INDIRILDI, as_document
+        
+        documents = [as_document(document) for document in documents]
+        linked = [index for index, document in enumerate(documents) if document.download_url]
+        results = [None] * len(documents)
+        
+        with self.session(owner) as uyap:
+            # Çerezler alan adlarıyla alınır; yalnızca portal sunucusuna gönderilir
+            cookies = requests.cookies.RequestsCookieJar()
+            cookies.update(uyap.api_client(refresh=True).http.cookies)
+            for index, document in enumerate(documents):
+                if document.download_url:
+                    continue
+                path = uyap.download_document(document, target_folder)
+                results[index] = DownloadResult(document=document, status=INDIRILDI if path else HATA,
+                                                path=path or "", attempts=1)
+        
+        if linked:
+            with self.timer.step('evrak_indirme_paralel'):
+                downloader = DocumentDownloader(cookies=cookies, on_progress=on_progress)
+                downloaded = downloader.download_all([documents[index] for index in linked], target_folder)
+            for index, result in zip(linked, downloaded):
+                results[index] = result
+        
+        return results
+    
+    def get_step_timings(self) -> Dict:
+        """
+        UYAP otomasyon adımlarının ölçülen sürelerini döndürür
+        
+        Returns:
+            Dict: adım -> süre özeti
+        """
+        return self.timer.summary()
+    
+    def get_operation_metrics(self) -> Dict:
+        """
+        Hız sınırı ve yeniden deneme politikasından geçen işlemlerin ölçümleri
+        
+        Returns:
+            Dict: işlem -> deneme, hata, bekleme ve süre özeti
+        """
+        return self.metrics.summary()
+    
+    def get_pool_status(self) -> Dict:
+        """Oturum havuzunun doluluk bilgisini ve oturumların kaynak kullanımını döndürür"""
+        return dict(self.pool.stats(), kaynaklar=self.pool.resource_usage())
+    
     def cleanup(self):
         """Kaynakları temizler"""
-        if self.uyap_instance:
-            self.uyap_instance.close()
-            self.uyap_instance = None
\ No newline at end of file
+        self.pool.close()
@@ -0,0 +1,344 @@
+"""
+UYAP işleri için kalıcı iş kuyruğu
+
+Uzun süren UYAP işlemleri (giriş bekleme, arama, detay, aktarım) HTTP
+isteğinde değil arka planda çalışır. İstek işi UyapIs tablosuna yazar ve
+hemen döner; arayüz durumu /api/uyap/jobs/<id> ile sorgular ya da
+/api/uyap/jobs/<id>/events akışından izler.
+
+- Kuyruk veritabanındadır; sunucu yeniden başlasa da bekleyen işler
+  kaybolmaz. İşler her worker sürecinden eklenebilir.
+- İşleri sunucuda tek bir süreç çalıştırır: UYAPSessionPool süreç başına
+  olduğundan kullanıcının giriş yapılmış tarayıcısı da bu süreçtedir. Süreç
+  kilit dosyasıyla (instance/uyap_jobs.lock) seçilir; süreç kapanınca
+  (ör. gunicorn max_requests) kilidi başka bir worker alır.
+- Aynı kullanıcının işleri sırayla çalışır (tek UYAP oturumu kullanılır).
+- Çalışan işler düzenli olarak kalp atışı yazar. Süreci kapanan ya da
+  stale_after saniyedir kalp atışı gelmeyen işler hata olarak işaretlenir;
+  böylece kullanıcının sonraki işleri beklemede kalmaz.
+
+Kullanım:
+    jobs = UYAPJobQueue(app)
+    jobs.register('dosya_arama', lambda job: search(job.user_id, job.params))
+    jobs.start()  # her süreçte (gunicorn post_fork); yalnızca biri iş çalıştırır
+    job = jobs.submit(current_user.id, 'dosya_arama', {'filters': filters})
+"""
+
+import os
+import json
+import socket
+try:
+    import fcntl
+except ImportError:  # Windows: waitress tek süreçte çalışır
+    fcntl = None
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select
+
+from models import db, UyapIs
+from uyap_config import JOB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# İş durumları
+BEKLIYOR = 'bekliyor'
+CALISIYOR = 'calisiyor'
+TAMAMLANDI = 'tamamlandi'
+HATA = 'hata'
+IPTAL = 'iptal'
+
+FINISHED = (TAMAMLANDI, HATA, IPTAL)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobContext:
+    """İş işleyicisine verilen bağlam"""
+
+    def __init__(self, job):
+        self.id = job.id
+        self.user_id = job.user_id
+        self.tur = job.tur
+        self.params = json.loads(job.parametreler) if job.parametreler else {}
+
+    def progress(self, yuzde=None, mesaj=None):
+        """
+        İlerlemeyi kaydeder
+
+        İşin veritabanı oturumu commit edilir; işleyici bunu yalnızca
+        yarım kalmış değişiklik yokken (ör. iki dosya arasında) çağırmalıdır.
+        """
+        job = db.session.get(UyapIs, self.id)
+        if yuzde is not None:
+            job.ilerleme = max(0, min(100, int(yuzde)))
+        if mesaj:
+            job.mesaj = mesaj[:250]
+        db.session.commit()
+
+
+class UYAPJobQueue:
+    """UyapIs tablosunu kuyruk olarak kullanan iş parçacığı havuzu"""
+
+    def __init__(self, app=None, workers=None, poll_interval=None, lock_path=None):
+        self.app = app
+        self.workers = workers or JOB_CONFIG['workers']
+        self.poll_interval = poll_interval or JOB_CONFIG['poll_interval']
+        self.lock_path = lock_path
+        self._handlers = {}
+        self._leader_hooks = []
+        self._threads = []
+        self._lock_file = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def register(self, tur, handler=None):
+        """
+        İş türü için işleyici kaydeder; işleyici JobContext alır, JSON'a
+        çevrilebilir sonuç döndürür ya da hata fırlatır
+
+        Dekoratör olarak da kullanılabilir: @jobs.register('senkron')
+        """
+        if handler is None:
+            return lambda func: self.register(tur, func)
+        self._handlers[tur] = handler
+        return handler
+
+    def when_leader(self, hook):
+        """
+        İşleri çalıştıran süreç seçildiğinde bir kez çağrılacak fonksiyon
+        (ör. zamanlayıcılar); böylece zamanlanmış işler de tek süreçte çalışır
+        """
+        self._leader_hooks.append(hook)
+        return hook
+
+    @property
+    def identity(self):
+        # gunicorn preload_app: nesne ana süreçte oluşur, işler worker'da çalışır
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def is_started(self):
+        return bool(self._threads)
+
+    @property
+    def is_leader(self):
+        return self._lock_file is not None
+
+    def submit(self, user_id, tur, params=None):
+        """
+        İşi kuyruğa ekler; işleri çalıştıran süreç bu süreçse onu uyandırır
+
+        Returns:
+            UyapIs: Kaydedilen iş
+        """
+        if tur not in self._handlers:
+            raise ValueError(f"Bilinmeyen iş türü: {tur}")
+        job = UyapIs(user_id=user_id, tur=tur, durum=BEKLIYOR,
+                     parametreler=json.dumps(params or {}, ensure_ascii=False))
+        db.session.add(job)
+        db.session.commit()
+        self.start()
+        self._wake.set()
+        return job
+
+    def get(self, job_id, user_id=None):
+        """İşi döndürür; user_id verilirse yalnızca o kullanıcının işi"""
+        job = db.session.get(UyapIs, job_id)
+        if job is None or (user_id is not None and job.user_id != user_id):
+            return None
+        return job
+
+    def active(self, user_id, tur=None):
+        """Kullanıcının bekleyen ya da çalışan işleri"""
+        query = UyapIs.query.filter(UyapIs.user_id == user_id, UyapIs.durum.in_((BEKLIYOR, CALISIYOR)))
+        if tur:
+            query = query.filter_by(tur=tur)
+        return query.order_by(UyapIs.id).all()
+
+    def cancel(self, job_id, user_id=None):
+        """Henüz başlamamış işi iptal eder; iptal edildiyse True"""
+        query = UyapIs.query.filter_by(id=job_id, durum=BEKLIYOR)
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        cancelled = query.update({'durum': IPTAL, 'bitis': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+        return bool(cancelled)
+
+    def start(self):
+        """
+        Süreç başına bir kez çağrılır (gunicorn post_fork, waitress, geliştirme
+        sunucusu). Kilidi alan süreç işleri çalıştırır; diğerleri kilidin
+        boşalmasını bekler.
+        """
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            thread = threading.Thread(target=self._lead, name='uyap-is-lider', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._release_leadership()
+
+    def recover(self):
+        """
+        Çalışırken süreci kapanmış ya da kalp atışı kesilmiş işleri hata olarak
+        işaretler ve saklama süresi dolan bitmiş işleri siler
+        """
+        host = socket.gethostname()
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=JOB_CONFIG['stale_after'])
+        last_seen = func.coalesce(UyapIs.kalp_atisi, UyapIs.baslangic, UyapIs.olusturma)
+        for job in UyapIs.query.filter(UyapIs.durum == CALISIYOR, UyapIs.calisan != self.identity):
+            owner_host, _, pid = (job.calisan or '').rpartition(':')
+            if owner_host == host and pid.isdigit() and not _process_alive(int(pid)):
+                job.durum, job.hata, job.bitis = HATA, 'İş çalışırken sunucu yeniden başlatıldı', now
+        UyapIs.query.filter(UyapIs.durum == CALISIYOR, or_(UyapIs.calisan.is_(None), UyapIs.calisan != self.identity),
+                            last_seen < stale_before) \
+            .update({'durum': HATA, 'hata': 'İşi çalıştıran süreç yanıt vermedi', 'bitis': now},
+                    synchronize_session=False)
+        UyapIs.query.filter(UyapIs.durum.in_(FINISHED),
+                            UyapIs.bitis < now - timedelta(days=JOB_CONFIG['keep_days'])) \
+            .delete(synchronize_session=False)
+        db.session.commit()
+
+    def heartbeat(self):
+        """Bu sürecin çalıştırdığı işlerin kalp atışını günceller"""
+        UyapIs.query.filter_by(durum=CALISIYOR, calisan=self.identity) \
+            .update({'kalp_atisi': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+
+    def _acquire_leadership(self):
+        if self._lock_file is not None:
+            return True
+        path = self.lock_path or os.path.join(self.app.instance_path, 'uyap_jobs.lock')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lock_file = open(path, 'a+')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+        self._lock_file = lock_file
+        return True
+
+    def _release_leadership(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _lead(self):
+        """Kilidi alana kadar bekler; sonra iş parçacıklarını başlatır ve kalp atışı yazar"""
+        while not self._stop.is_set():
+            if self._acquire_leadership():
+                break
+            self._stop.wait(JOB_CONFIG['heartbeat_interval'])
+        else:
+            return
+
+        logger.info(f"UYAP işleri bu süreçte çalışacak ({self.identity})")
+        with self.app.app_context():
+            try:
+                self.recover()
+            except Exception as e:
+                logger.error(f"UYAP iş kuyruğu hazırlanamadı: {str(e)}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        for hook in self._leader_hooks:
+            try:
+                hook(self.app)
+            except Exception as e:
+                logger.error(f"UYAP iş kuyruğu başlangıç görevi başarısız: {str(e)}")
+
+        workers = [threading.Thread(target=self._work, name=f'uyap-is-{index + 1}', daemon=True)
+                   for index in range(self.workers)]
+        for thread in workers:
+            thread.start()
+        while not self._stop.wait(JOB_CONFIG['heartbeat_interval']):
+            with self.app.app_context():
+                try:
+                    self.heartbeat()
+                    self.recover()
+                except Exception as e:
+                    logger.error(f"UYAP iş kalp atışı yazılamadı: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+        for thread in workers:
+            thread.join()
+
+    def _work(self):
+        while not self._stop.is_set():
+            job_id = None
+            with self.app.app_context():
+                try:
+                    job_id = self._claim()
+                    if job_id is not None:
+                        self._run(job_id)
+                except Exception as e:
+                    logger.error(f"UYAP iş kuyruğu hatası: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            if job_id is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _claim(self):
+        """En eski uygun bekleyen işi bu süreç adına alır; yoksa None"""
+        busy_users = select(UyapIs.user_id).where(UyapIs.durum == CALISIYOR)
+        while True:
+            job_id = db.session.query(UyapIs.id) \
+                .filter(UyapIs.durum == BEKLIYOR, UyapIs.user_id.not_in(busy_users)) \
+                .order_by(UyapIs.id).limit(1).scalar()
+            if job_id is None:
+                return None
+            # Koşullar UPDATE içinde tekrarlanır: başka bir iş parçacığı
+            # işi ya da aynı kullanıcının başka bir işini araya girip almış olabilir
+            now = datetime.utcnow()
+            claimed = UyapIs.query.filter(UyapIs.id == job_id, UyapIs.durum == BEKLIYOR,
+                                          UyapIs.user_id.not_in(busy_users)).update(
+                {'durum': CALISIYOR, 'baslangic': now, 'kalp_atisi': now, 'calisan': self.identity},
+                synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return job_id
+
+    def _run(self, job_id):
+        job = db.session.get(UyapIs, job_id)
+        context = JobContext(job)
+        try:
+            handler = self._handlers.get(job.tur)
+            if handler is None:
+                raise ValueError(f"Bilinmeyen iş türü: {job.tur}")
+            result = handler(context)
+            sonuc = self.app.json.dumps(result)
+        except Exception as e:
+            logger.error(f"UYAP işi başarısız ({job_id} {context.tur}): {str(e)}")
+            db.session.rollback()
+            job = db.session.get(UyapIs, job_id)
+            job.durum, job.hata = HATA, str(e)
+        else:
+            job = db.session.get(UyapIs, job_id)
+            job.durum, job.sonuc, job.ilerleme = TAMAMLANDI, sonuc, 100
+        job.bitis = datetime.utcnow()
+        db.session.commit()
@@ -0,0 +1,221 @@
+"""
+UYAP işlemleri için merkezi hız sınırı ve yeniden deneme politikası
+
+Tarayıcı ve veri servisi işlemleri UYAPPolicy.call() üzerinden çalışır;
+davranış kod değişikliği gerekmeden uyap_config ile ayarlanır ve
+update_config() ile yapılan değişiklikler bir sonraki işlemde geçerli olur:
+
+- Hız sınırı: aynı oturumdaki iki işlem arasında en az
+  PERFORMANCE_CONFIG['operation_delay'] saniye geçer.
+- Yeniden deneme: geçici hatalarda işlem ERROR_CONFIG['max_retries'] kez
+  daha denenir; bekleme retry_delay * backoff_factor ** (deneme - 1)
+  biçiminde büyür, max_retry_delay ile sınırlanır ve retry_jitter kadar
+  rastgele pay eklenir. `retryable = False` olan hatalar (ör. oturumun
+  sona ermesi) hemen iletilir.
+- Bekleme süreleri: eleman beklemeleri element_wait_timeout, sayfa içi
+  AJAX beklemeleri ajax_wait_time kadar sürer.
+- Gruplama: çoklu dosya işlemleri batch_size büyüklüğünde gruplara bölünür.
+- Ölçüm: her işlemin adedi, deneme sayısı, hataları, beklemeleri ve
+  süresi OperationMetrics'te toplanır (/api/uyap/timings).
+
+Kullanım:
+    policy = UYAPPolicy()
+    files = policy.call('api_sorgu', lambda: client.search_files(filters), retry_on=(UYAPApiError,))
+    for batch in batches(files):
+        ...
+"""
+
+import time
+import random
+import logging
+import threading
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, StaleElementReferenceException,
+    TimeoutException
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+from uyap_config import ERROR_CONFIG, PERFORMANCE_CONFIG
+from uyap_waits import POLL_INTERVAL, element_timeout, network_idle, wait_until
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan olarak yeniden denenen, sayfa henüz hazır değilken oluşan tarayıcı
+# hataları; bulunamayan eleman (NoSuchElementException) yeniden denenmez
+BROWSER_ERRORS = (TimeoutException, StaleElementReferenceException,
+                  ElementClickInterceptedException, ElementNotInteractableException)
+
+
+def backoff_delay(attempt, base=None, factor=None, maximum=None, jitter=None):
+    """
+    attempt. başarısız denemeden sonra beklenecek süre (saniye)
+
+    Verilmeyen değerler ERROR_CONFIG'den okunur.
+    """
+    base = ERROR_CONFIG['retry_delay'] if base is None else base
+    factor = ERROR_CONFIG.get('backoff_factor', 2) if factor is None else factor
+    maximum = ERROR_CONFIG.get('max_retry_delay', 60) if maximum is None else maximum
+    jitter = ERROR_CONFIG.get('retry_jitter', 0) if jitter is None else jitter
+    delay = min(base * factor ** max(0, attempt - 1), maximum)
+    return delay + delay * random.uniform(0, jitter) if jitter else delay
+
+
+def batches(items, size=None):
+    """Öğeleri PERFORMANCE_CONFIG['batch_size'] büyüklüğünde listelere böler"""
+    items = list(items)
+    size = max(1, size or PERFORMANCE_CONFIG['batch_size'])
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def is_retryable(error, retry_on=BROWSER_ERRORS):
+    """Hata yeniden denenebilir mi; hata kendi `retryable` bayrağıyla bunu kapatabilir"""
+    return isinstance(error, retry_on) and getattr(error, 'retryable', True)
+
+
+class Throttle:
+    """
+    Ardışık işlemler arasında en az `interval` saniye bırakır
+
+    interval verilmezse PERFORMANCE_CONFIG['operation_delay'] kullanılır.
+    """
+
+    def __init__(self, interval=None, clock=None, sleep=None):
+        self.interval = interval
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+        self._last = None
+
+    def wait(self):
+        """Gerekirse bekler; beklenen süreyi döndürür"""
+        interval = PERFORMANCE_CONFIG.get('operation_delay', 0) if self.interval is None else self.interval
+        with self._lock:
+            now = self.clock()
+            delay = 0
+            if self._last is not None and interval:
+                delay = max(0, self._last + interval - now)
+            if delay:
+                self.sleep(delay)
+            self._last = now + delay
+            return delay
+
+
+class OperationMetrics:
+    """İşlem başına deneme, hata, bekleme ve süre istatistikleri"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def record(self, name, seconds, attempts, success, waited=0):
+        with self._lock:
+            stats = self._operations.setdefault(name, {
+                'adet': 0, 'basarili': 0, 'hatali': 0, 'deneme': 0,
+                'bekleme': 0.0, 'toplam': 0.0, 'en_uzun': 0.0,
+            })
+            stats['adet'] += 1
+            stats['basarili' if success else 'hatali'] += 1
+            stats['deneme'] += attempts
+            stats['bekleme'] += waited
+            stats['toplam'] += seconds
+            stats['en_uzun'] = max(stats['en_uzun'], seconds)
+
+    def summary(self):
+        """
+        İşlem başına özet
+
+        Returns:
+            dict: işlem -> {'adet', 'basarili', 'hatali', 'deneme', 'yeniden_deneme',
+                  'bekleme', 'toplam', 'ortalama', 'en_uzun'} (süreler saniye)
+        """
+        with self._lock:
+            operations = {name: dict(stats) for name, stats in self._operations.items()}
+        for stats in operations.values():
+            stats['yeniden_deneme'] = stats['deneme'] - stats['adet']
+            stats['ortalama'] = round(stats['toplam'] / stats['adet'], 3)
+            for key in ('bekleme', 'toplam', 'en_uzun'):
+                stats[key] = round(stats[key], 3)
+        return operations
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+
+class UYAPPolicy:
+    """
+    Tek UYAP oturumunun hız sınırı ve yeniden deneme politikası
+
+    Hız sınırı oturuma özeldir; ölçümler UYAPManager'daki oturumlar
+    arasında paylaşılabilir.
+    """
+
+    def __init__(self, metrics=None, throttle=None, sleep=None):
+        self.metrics = metrics or OperationMetrics()
+        self.sleep = sleep or time.sleep
+        self.throttle = throttle or Throttle(sleep=self.sleep)
+
+    @property
+    def max_retries(self):
+        return ERROR_CONFIG['max_retries']
+
+    def call(self, name, func, retry_on=BROWSER_ERRORS, retries=None):
+        """
+        İşlemi hız sınırına uyarak çalıştırır; geçici hatalarda yeniden dener
+
+        Args:
+            name: Ölçümlerde görünecek işlem adı
+            func: Argümansız çağrılabilir
+            retry_on: Yeniden denenecek hata türleri
+            retries: En fazla yeniden deneme (varsayılan ERROR_CONFIG['max_retries'])
+
+        Returns:
+            func() sonucu
+
+        Raises:
+            Son denemenin hatası ya da yeniden denenmeyen hata
+        """
+        retries = self.max_retries if retries is None else retries
+        start = time.perf_counter()
+        attempts, waited = 0, 0.0
+        try:
+            while True:
+                waited += self.throttle.wait()
+                attempts += 1
+                try:
+                    result = func()
+                except Exception as e:
+                    if attempts > retries or not is_retryable(e, retry_on):
+                        raise
+                    delay = backoff_delay(attempts)
+                    logger.warning(f"UYAP işlemi '{name}' {delay:.1f} sn sonra yeniden denenecek "
+                                   f"({attempts}. deneme): {str(e)}")
+                    self.sleep(delay)
+                    waited += delay
+                else:
+                    self.metrics.record(name, time.perf_counter() - start, attempts, True, waited)
+                    return result
+        except Exception:
+            self.metrics.record(name, time.perf_counter() - start, attempts, False, waited)
+            raise
+
+    def wait(self, driver):
+        """Eleman beklemeleri için WebDriverWait (element_wait_timeout)"""
+        return WebDriverWait(driver, element_timeout(), poll_frequency=POLL_INTERVAL)
+
+    def settle(self, driver):
+        """
+        Sayfa içi işlemden sonra AJAX isteklerinin bitmesini en fazla
+        ajax_wait_time saniye bekler; süre dolarsa sessizce devam eder
+
+        Returns:
+            bool: Ağ sessizleştiyse True
+        """
+        try:
+            wait_until(driver, network_idle(), PERFORMANCE_CONFIG.get('ajax_wait_time', 2))
+            return True
+        except TimeoutException:
+            logger.debug("AJAX istekleri ajax_wait_time içinde bitmedi")
+            return False
@@ -0,0 +1,320 @@
+"""
+UYAP tarayıcı oturumu havuzu
+
+Her oturum kendi Chrome sürücüsünü ve kilidini taşır; bir oturum aynı anda
+yalnızca bir isteğe kiralanır. UYAP'a giriş e-imza ile avukat adına
+yapıldığı için oturumlar sahiplerine (kullanıcı ID) bağlıdır ve başka bir
+kullanıcıya verilmez.
+
+Kiralama sırası:
+    1. Aynı kullanıcının boştaki oturumu
+    2. Havuz dolmadıysa yeni oturum
+    3. Başka kullanıcının en uzun süredir boştaki oturumu kapatılıp yerine yeni oturum
+    4. Hiçbiri yoksa bir oturum geri verilene kadar beklenir
+
+Kiralanan oturumun sürücüsü yanıt vermiyorsa kapatılıp yenisiyle
+değiştirilir; idle_timeout süresince kullanılmayan oturumlar kapatılır.
+Bellek eşiğini (WEBDRIVER_CONFIG['restart_memory_mb']) aşan oturumun önce
+belleği azaltılır, yine aşıyorsa oturum yeniden başlatılır. Eşik işletim
+sistemi tarafından uygulanan bir sınır değildir; düzenli ölçümle denetlenir.
+
+Havuzdaki oturumlar uzaktan hata ayıklama ile açık Chrome'a bağlanmaz;
+aynı tarayıcı birden fazla kullanıcıya ait olur. Bu yalnızca havuz tek
+oturumluysa (max_sessions = 1) yapılır.
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from uyap_config import POOL_CONFIG
+from uyap_waits import logged_in
+
+logger = logging.getLogger(__name__)
+
+
+class UYAPPoolExhausted(Exception):
+    """Süre içinde boş oturum bulunamadı"""
+
+
+class PooledSession:
+    """Havuzdaki tek bir UYAP tarayıcı oturumu"""
+
+    def __init__(self, integration, owner):
+        self.integration = integration
+        self.owner = owner
+        self.lock = threading.Lock()
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.lease_count = 0
+
+    @property
+    def leased(self):
+        return self.lock.locked()
+
+    def is_healthy(self):
+        """
+        Sürücü yanıt veriyorsa True
+
+        Portal oturumu düşmüşse (ana menü yok) session_active sıfırlanır;
+        bir sonraki işlemde yeniden giriş beklenir.
+        """
+        driver = self.integration.driver
+        if driver is None:
+            return True  # Sürücü ilk işlemde başlatılır
+        try:
+            driver.execute_script("return document.readyState")
+            if self.integration.session_active and not logged_in()(driver):
+                logger.info("UYAP portal oturumu sona ermiş, yeniden giriş gerekecek")
+                self.integration.session_active = False
+            return True
+        except WebDriverException:
+            return False
+
+    def usage(self):
+        """Tarayıcı süreçlerinin kaynak kullanımı; ölçülemiyorsa None"""
+        resource_usage = getattr(self.integration, 'resource_usage', None)
+        return resource_usage() if resource_usage else None
+
+    def within_limits(self):
+        """
+        Bellek sınırı aşılmamışsa True
+
+        Sınır aşılmışsa oturum kapatılmadan bellek azaltılır ve yeniden ölçülür.
+        """
+        usage = self.usage()
+        if not usage or not usage['esik_asildi']:
+            return True
+        logger.warning(f"UYAP oturumu bellek eşiğini aştı ({usage['bellek_mb']} MB / "
+                       f"{usage['esik_bellek_mb']} MB), bellek azaltılıyor")
+        self.integration.trim_memory()
+        usage = self.usage()
+        return not usage or not usage['esik_asildi']
+
+    def close(self):
+        try:
+            self.integration.close()
+        except Exception as e:
+            logger.error(f"UYAP oturumu kapatılırken hata: {str(e)}")
+
+
+class UYAPSessionPool:
+    """Kullanıcılara kiralanan UYAP oturumları havuzu"""
+
+    def __init__(self, factory, max_sessions=None, idle_timeout=None, lease_timeout=None):
+        """
+        Args:
+            factory: Yeni UYAPAdvancedIntegration döndüren çağrılabilir
+            max_sessions: En fazla açık oturum
+            idle_timeout: Kullanılmayan oturumun kapatılacağı süre (saniye)
+            lease_timeout: Boş oturum için varsayılan bekleme süresi (saniye)
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions or POOL_CONFIG['max_sessions']
+        self.idle_timeout = idle_timeout or POOL_CONFIG['idle_timeout']
+        self.lease_timeout = lease_timeout or POOL_CONFIG['lease_timeout']
+        self._sessions = []
+        self._cond = threading.Condition()
+        self._reaper = None
+        self._stop = threading.Event()
+
+    def lease(self, owner=None, timeout=None) -> PooledSession:
+        """
+        Kullanıcı için bir oturum kiralar
+
+        Raises:
+            UYAPPoolExhausted: Süre içinde boş oturum bulunamazsa
+        """
+        timeout = self.lease_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        to_close = []
+
+        with self._cond:
+            while True:
+                to_close.extend(self._pop_idle())
+                session = self._acquire(owner, to_close)
+                if session is not None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._close_all(to_close)
+                    raise UYAPPoolExhausted("Tüm UYAP oturumları kullanımda, lütfen daha sonra tekrar deneyin")
+                self._cond.wait(remaining)
+
+        self._close_all(to_close)
+
+        try:
+            if not session.is_healthy():
+                logger.warning("Yanıt vermeyen UYAP oturumu yenileniyor")
+                session.close()
+                session.integration = self.factory()
+            elif not session.within_limits():
+                logger.warning("Bellek sınırını aşan UYAP oturumu yeniden başlatılıyor")
+                session.close()
+                session.integration = self.factory()
+        except Exception:
+            # Oturum yarım kaldı; kilidi bırakılır ve havuzdan çıkarılır
+            self._discard(session)
+            raise
+
+        session.lease_count += 1
+        return session
+
+    def _discard(self, session):
+        with self._cond:
+            if session in self._sessions:
+                self._sessions.remove(session)
+            session.lock.release()
+            self._cond.notify()
+        session.close()
+
+    def _acquire(self, owner, to_close):
+        """Kilit altında çağrılır; uygun oturumu kilitleyip döndürür"""
+        idle = [s for s in self._sessions if not s.leased]
+
+        for session in idle:
+            if session.owner == owner:
+                session.lock.acquire()
+                return session
+
+        if len(self._sessions) >= self.max_sessions:
+            if not idle:
+                return None
+            victim = min(idle, key=lambda s: s.last_used)
+            self._sessions.remove(victim)
+            to_close.append(victim)
+
+        session = PooledSession(self.factory(), owner)
+        session.lock.acquire()
+        self._sessions.append(session)
+        return session
+
+    def release(self, session):
+        """Kiralanan oturumu havuza geri verir"""
+        with self._cond:
+            session.last_used = time.monotonic()
+            session.lock.release()
+            self._cond.notify()
+
+    @contextmanager
+    def session(self, owner=None, timeout=None):
+        """
+        Kullanım:
+            with pool.session(current_user.id) as uyap:
+                uyap.search_files(filters)
+        """
+        pooled = self.lease(owner, timeout)
+        try:
+            yield pooled.integration
+        finally:
+            self.release(pooled)
+
+    def _pop_idle(self, now=None):
+        """Kilit altında çağrılır; süresi dolan boş oturumları havuzdan çıkarır"""
+        now = now or time.monotonic()
+        expired = [s for s in self._sessions
+                   if not s.leased and now - s.last_used >= self.idle_timeout]
+        for session in expired:
+            self._sessions.remove(session)
+        return expired
+
+    def evict_idle(self, now=None) -> int:
+        """Süresi dolan boş oturumları kapatır ve sayısını döndürür"""
+        with self._cond:
+            expired = self._pop_idle(now)
+            if expired:
+                self._cond.notify_all()
+        self._close_all(expired)
+        if expired:
+            logger.info(f"{len(expired)} boşta UYAP oturumu kapatıldı")
+        return len(expired)
+
+    def enforce_limits(self) -> int:
+        """Boştaki oturumlardan bellek sınırını aşanları kapatır ve sayısını döndürür"""
+        with self._cond:
+            idle = [s for s in self._sessions if s.lock.acquire(blocking=False)]
+        over = []
+        for session in idle:
+            try:
+                if not session.within_limits():
+                    over.append(session)
+            except Exception as e:
+                logger.error(f"UYAP oturumu kaynak kontrolü başarısız: {str(e)}")
+        with self._cond:
+            for session in over:
+                self._sessions.remove(session)
+            for session in idle:
+                session.lock.release()
+            self._cond.notify_all()
+        self._close_all(over)
+        if over:
+            logger.info(f"Bellek sınırını aşan {len(over)} UYAP oturumu kapatıldı")
+        return len(over)
+
+    def _close_all(self, sessions):
+        for session in sessions:
+            session.close()
+
+    def start_reaper(self, interval=None):
+        """Boşta kalan ve bellek sınırını aşan oturumları düzenli kapatan arka plan iş parçacığını başlatır"""
+        if self._reaper is not None:
+            return
+        interval = interval or POOL_CONFIG['reaper_interval']
+
+        def reap():
+            while not self._stop.wait(interval):
+                try:
+                    self.evict_idle()
+                    self.enforce_limits()
+                except Exception as e:
+                    logger.error(f"UYAP oturum temizleme hatası: {str(e)}")
+
+        self._reaper = threading.Thread(target=reap, name='uyap-session-reaper', daemon=True)
+        self._reaper.start()
+
+    def active_owners(self):
+        """Portal oturumu açık (giriş yapılmış) oturumların sahipleri"""
+        with self._cond:
+            return [s.owner for s in self._sessions
+                    if s.owner is not None and s.integration.session_active]
+
+    def close(self):
+        """Tüm oturumları kapatır"""
+        self._stop.set()
+        with self._cond:
+            sessions, self._sessions = self._sessions, []
+            self._cond.notify_all()
+        self._close_all(sessions)
+
+    def resource_usage(self):
+        """
+        Returns:
+            list: Oturum başına {'sahip', 'kullanimda', 'bellek_mb', 'cpu_yuzde', ...}
+        """
+        with self._cond:
+            sessions = [(s, s.leased) for s in self._sessions]
+        report = []
+        for session, leased in sessions:
+            try:
+                usage = session.usage()
+            except Exception:
+                usage = None
+            report.append(dict(usage or {}, sahip=session.owner, kullanimda=leased))
+        return report
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'toplam', 'kullanimda', 'bosta', 'en_fazla'}
+        """
+        with self._cond:
+            leased = sum(1 for s in self._sessions if s.leased)
+            return {
+                'toplam': len(self._sessions),
+                'kullanimda': leased,
+                'bosta': len(self._sessions) - leased,
+                'en_fazla': self.max_sessions,
+            }
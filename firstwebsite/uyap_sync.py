@@ -0,0 +1,482 @@
+"""
+UYAP dosyalarının yerel kayıtlarla artımlı eşitlenmesi
+
+Avukatın UYAP'taki tüm dosyaları (SYNC_CONFIG['yargi_turleri']) veri
+servisinden sayfa sayfa listelenir ve her liste satırının özeti, dosyanın
+son eşitleme kaydındaki (UyapDosyaSenkron) özetle karşılaştırılır:
+
+- Özet aynıysa dosyanın detayları çekilmez; yalnızca görülme zamanı yazılır.
+- Yeni ya da değişen dosyaların detayları (taraflar, masraflar, evraklar)
+  çekilir ve CaseFile / Expense / Document / CalendarEvent kayıtları
+  kararlı anahtarlarla güncellenir; yerelde elle eklenen kayıtlara dokunulmaz.
+- Liste satırı değişmese de detayları SYNC_CONFIG['detail_max_age_days']
+  günden eski dosyalar yeniden kontrol edilir.
+
+Her değişen dosya ayrı yazılır; yarıda kalan bir eşitleme tekrar
+çalıştırıldığında tamamlanan dosyalar atlanır. Kullanıcının son çalışması
+UyapSenkronImleci'nde tutulur.
+
+Zamanlanmış eşitleme portal oturumu gerektirir: start_scheduler() giriş
+yapılmış oturumu havuzda bulunan kullanıcıları, son başarılı eşitlemeleri
+SYNC_CONFIG['interval_hours'] saatten eskiyse eşitler.
+
+Kullanım:
+    python uyap_sync.py --user 1          # tarayıcıda giriş bekler ve eşitler
+    python uyap_sync.py --user 1 --full   # tüm dosyaların detaylarını yeniden çeker
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+
+from werkzeug.utils import secure_filename
+
+from models import db, ActivityLog, CalendarEvent, CaseFile, Document, Expense, UyapDosyaSenkron, UyapSenkronImleci
+from uyap_bulk_import import case_key, field_value, parse_date
+from uyap_config import API_CONFIG, SYNC_CONFIG
+from uyap_detail_cache import UYAPDetailCache, detail_fingerprint
+from uyap_api_client import UYAPApiError, UYAPSessionExpired
+from uyap_integration_advanced import file_key
+
+logger = logging.getLogger(__name__)
+
+# Liste satırı sonuçları
+YENI = 'yeni'
+DEGISEN = 'degisen'
+AYNI = 'ayni'
+
+HEARING_TYPES = ('durusma', 'e-durusma')
+
+_running = set()
+_running_lock = threading.Lock()
+
+
+class UYAPSyncRunning(Exception):
+    """Kullanıcı için zaten bir eşitleme çalışıyor"""
+
+
+def _as_dict(item):
+    return asdict(item) if is_dataclass(item) else dict(item)
+
+
+def _digest(value):
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def row_fingerprint(row):
+    """Liste satırının özeti; portalın oturuma bağlı dosyaId değeri ve türetilen kimlik katılmaz"""
+    data = _as_dict(row)
+    data.pop('id', None)
+    data.pop('key', None)
+    return _digest(data)
+
+
+def parse_hearing(value):
+    """'12.06.2024 10:30' -> (tarih, saat); saat yoksa None"""
+    hearing_date = parse_date(value)
+    if hearing_date is None:
+        return None, None
+    try:
+        return hearing_date, datetime.strptime(str(value).strip()[11:16], '%H:%M').time()
+    except ValueError:
+        return hearing_date, None
+
+
+class UYAPSync:
+    """
+    Tek kullanıcının UYAP dosyalarını yerel kayıtlarla eşitler
+
+    Uygulama bağlamında çalıştırılmalıdır.
+
+    Kullanım:
+        with UYAPManager().session(user_id) as uyap:
+            ozet = UYAPSync(user_id, uyap.fetch_files, uyap.fetch_file_details).run()
+    """
+
+    def __init__(self, user_id, list_files, get_details=None, yargi_turleri=None,
+                 detail_max_age=None, clock=None):
+        """
+        Args:
+            user_id: Kayıtların sahibi kullanıcı ID'si
+            list_files: Filtre sözlüğü alıp UyapFile listesi döndüren çağrılabilir
+            get_details: dosyaId alıp detay sözlüğü döndüren çağrılabilir;
+                None ise kayıtlar yalnızca liste satırından güncellenir
+            yargi_turleri: Taranacak yargı türleri
+            detail_max_age: Detayların yeniden kontrol edileceği süre (timedelta)
+            clock: Şimdiki zamanı döndüren çağrılabilir (UTC)
+        """
+        self.user_id = user_id
+        self.list_files = list_files
+        self.get_details = get_details
+        self.yargi_turleri = yargi_turleri or SYNC_CONFIG['yargi_turleri']
+        self.detail_max_age = detail_max_age or timedelta(days=SYNC_CONFIG['detail_max_age_days'])
+        self.clock = clock or datetime.utcnow
+        self.cache = UYAPDetailCache(user_id, clock=self.clock)
+        self.ozet = {}
+
+    def run(self, full=False):
+        """
+        Eşitlemeyi çalıştırır
+
+        Args:
+            full: True ise liste satırı değişmemiş dosyaların detayları da çekilir
+
+        Returns:
+            dict: {'toplam', 'yeni', 'degisen', 'ayni', 'detay_istegi', 'hata', 'hatalar', 'sure'}
+        """
+        started = time.monotonic()
+        now = self.clock()
+        self.ozet = {'toplam': 0, YENI: 0, DEGISEN: 0, AYNI: 0, 'detay_istegi': 0, 'hata': 0, 'hatalar': []}
+
+        cursor = UyapSenkronImleci.query.filter_by(user_id=self.user_id).first()
+        if cursor is None:
+            cursor = UyapSenkronImleci(user_id=self.user_id)
+            db.session.add(cursor)
+        cursor.durum, cursor.son_baslangic, cursor.hata = 'calisiyor', now, None
+        db.session.commit()
+
+        try:
+            rows = self._walk()
+            self.cache.store_files(rows, now)
+            db.session.commit()
+            states = {state.dosya_anahtari: state
+                      for state in UyapDosyaSenkron.query.filter_by(user_id=self.user_id)}
+            for row in rows:
+                self.ozet['toplam'] += 1
+                key = file_key(row.mahkeme, row.esas_no)
+                try:
+                    self.ozet[self._sync_file(row, key, states, now, full)] += 1
+                except UYAPSessionExpired:
+                    raise
+                except Exception as e:
+                    db.session.rollback()
+                    self._record_error(row, key, states, e)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self._finish(cursor, 'hata', started, error=str(e))
+            raise
+
+        self._finish(cursor, 'tamamlandi', started)
+        logger.info(f"UYAP eşitlemesi (kullanıcı {self.user_id}): {self.ozet['toplam']} dosya, "
+                    f"{self.ozet[YENI]} yeni, {self.ozet[DEGISEN]} değişen, "
+                    f"{self.ozet['detay_istegi']} detay isteği ({self.ozet['sure']} sn)")
+        return self.ozet
+
+    def _walk(self):
+        """Tüm yargı türlerindeki dosyaları listeler; aynı dosya bir kez döner"""
+        rows, seen, errors = [], set(), []
+        for yargi_turu in self.yargi_turleri:
+            try:
+                files = self.list_files({'yargi_turu': yargi_turu})
+            except UYAPSessionExpired:
+                raise
+            except UYAPApiError as e:
+                logger.warning(f"{yargi_turu} dosyaları listelenemedi: {str(e)}")
+                errors.append(e)
+                self.ozet['hatalar'].append(f"{yargi_turu}: {str(e)}")
+                continue
+            for row in files:
+                key = file_key(row.mahkeme, row.esas_no)
+                if key not in seen:
+                    seen.add(key)
+                    rows.append(row)
+        if errors and len(errors) == len(self.yargi_turleri):
+            raise errors[-1]
+        return rows
+
+    def _sync_file(self, row, key, states, now, full):
+        fingerprint = row_fingerprint(row)
+        state = states.get(key)
+        case = db.session.get(CaseFile, state.case_id) if state and state.case_id else None
+
+        if (not full and case is not None and state.liste_izi == fingerprint
+                and state.detay_tarihi and now - state.detay_tarihi < self.detail_max_age):
+            state.son_gorulme = now
+            return AYNI
+
+        details = self._details(row)
+        details_fingerprint = detail_fingerprint(details)
+        if self.get_details is not None:
+            self.cache.store_details(details, row=row, now=now)
+        is_new = case is None
+        changed = is_new or state.detay_izi != details_fingerprint
+
+        if state is None:
+            state = UyapDosyaSenkron(user_id=self.user_id, dosya_anahtari=key)
+            db.session.add(state)
+            states[key] = state
+        if changed:
+            case = self._apply(row, details, case)
+
+        state.uyap_dosya_id = row.id
+        state.case_id = case.id
+        state.liste_izi = fingerprint
+        state.detay_izi = details_fingerprint
+        state.son_gorulme = state.detay_tarihi = now
+        state.hata = None
+        db.session.commit()
+
+        if is_new:
+            return YENI
+        return DEGISEN if changed else AYNI
+
+    def _details(self, row):
+        if self.get_details is None:
+            return {'basic_info': {}, 'parties': [], 'expenses': [], 'documents': []}
+        self.ozet['detay_istegi'] += 1
+        return self.get_details(row.id)
+
+    def _record_error(self, row, key, states, error):
+        logger.error(f"UYAP dosyası eşitlenemedi {row.esas_no}: {str(error)}")
+        self.ozet['hata'] += 1
+        self.ozet['hatalar'].append(f"{row.mahkeme} {row.esas_no}: {str(error)}")
+        # Geri alınan yeni kayıt oturumdan çıkar; hatayı kalıcı kayda yaz
+        state = UyapDosyaSenkron.query.filter_by(user_id=self.user_id, dosya_anahtari=key).first()
+        if state is None:
+            state = UyapDosyaSenkron(user_id=self.user_id, dosya_anahtari=key, uyap_dosya_id=row.id)
+            db.session.add(state)
+        states[key] = state
+        state.hata = str(error)
+        db.session.commit()
+
+    def _finish(self, cursor, durum, started, error=None):
+        self.ozet['sure'] = round(time.monotonic() - started, 2)
+        cursor.durum = durum
+        cursor.son_bitis = self.clock()
+        if durum == 'tamamlandi':
+            cursor.son_basarili = cursor.son_baslangic
+        cursor.ozet = json.dumps(self.ozet, ensure_ascii=False)
+        cursor.hata = error
+        if self.ozet[YENI] or self.ozet[DEGISEN]:
+            db.session.add(ActivityLog(
+                activity_type='uyap_senkron',
+                description=f"UYAP eşitlemesi: {self.ozet[YENI]} yeni, {self.ozet[DEGISEN]} güncellenen dosya",
+                user_id=self.user_id,
+                details=self.ozet
+            ))
+        db.session.commit()
+
+    # --- Yerel kayıtların güncellenmesi ---
+
+    def _apply(self, row, details, case):
+        info = details.get('basic_info') or {}
+        mahkeme, esas_no, year = case_key({'mahkeme': info.get('mahkeme') or row.mahkeme,
+                                           'esas_no': info.get('esas_no') or row.esas_no,
+                                           'year': info.get('year')})
+
+        if case is None:
+            # Daha önce elle ya da tek dosya aktarımıyla eklenmiş olabilir
+            case = CaseFile.query.filter_by(courthouse=mahkeme, case_number=esas_no, year=year).first()
+        if case is None:
+            case = CaseFile(user_id=self.user_id, courthouse=mahkeme, case_number=esas_no, year=year)
+            db.session.add(case)
+
+        case.file_type = (info.get('yargi_turu') or row.yargi_turu or 'hukuk').lower()
+        case.department = info.get('yargi_birimi') or row.yargi_birimi or mahkeme
+        case.status = info.get('durum') or row.durum or 'Aktif'
+        open_date = parse_date(info.get('acilis_tarihi') or row.acilis_tarihi)
+        if open_date:
+            case.open_date = open_date
+
+        self._apply_parties(case, details.get('parties') or [], row)
+        db.session.flush()
+        self._apply_expenses(case, details.get('expenses') or [])
+        self._apply_documents(case, details.get('documents') or [])
+        self._apply_hearing(case, info.get('next_hearing') or row.next_hearing)
+        return case
+
+    def _apply_parties(self, case, parties, row):
+        """İlk taraf müvekkil, ikinci taraf karşı taraf; dolu alanların üzerine yazılmaz"""
+        if parties:
+            client = parties[0]
+            if not case.client_name:
+                case.client_name = field_value(client, 'name')
+                case.client_capacity = field_value(client, 'capacity')
+                case.client_identity_number = field_value(client, 'identity_number')
+                case.client_address = field_value(client, 'address')
+        if len(parties) > 1 and not case.opponent_name:
+            opponent = parties[1]
+            case.opponent_name = field_value(opponent, 'name')
+            case.opponent_capacity = field_value(opponent, 'capacity')
+            case.opponent_identity_number = field_value(opponent, 'identity_number')
+            case.opponent_address = field_value(opponent, 'address')
+            case.opponent_lawyer = field_value(opponent, 'lawyer')
+            case.opponent_lawyer_bar_number = field_value(opponent, 'lawyer_bar_number')
+        if not case.client_name:
+            case.client_name = row.davaci or (row.taraflar or '').split(' - ')[0].strip() or 'Belirtilmemiş'
+
+    def _apply_expenses(self, case, expenses):
+        """Masraflar (tür, tarih, tutar) anahtarıyla eşleşir; yalnızca ödeme durumu güncellenir"""
+        existing = {(e.expense_type, e.date, round(e.amount, 2)): e
+                    for e in Expense.query.filter_by(case_id=case.id)}
+        for item in expenses:
+            expense_date = parse_date(field_value(item, 'date')) or case.open_date
+            if expense_date is None:
+                continue
+            amount = round(float(field_value(item, 'amount', 0) or 0), 2)
+            key = (field_value(item, 'expense_type'), expense_date, amount)
+            expense = existing.get(key)
+            if expense is None:
+                expense = Expense(case_id=case.id, expense_type=key[0], date=expense_date, amount=amount,
+                                  description=field_value(item, 'description'))
+                db.session.add(expense)
+                existing[key] = expense
+            expense.is_paid = bool(field_value(item, 'is_paid', False))
+
+    def _apply_documents(self, case, documents):
+        """Evraklar dosya adıyla eşleşir; yalnızca eksik evrak kayıtları eklenir"""
+        existing = {d.filename for d in Document.query.filter_by(case_id=case.id)}
+        for item in documents:
+            filename = secure_filename(field_value(item, 'name')) or 'evrak'
+            if filename in existing:
+                continue
+            db.session.add(Document(
+                case_id=case.id,
+                document_type=f"UYAP {field_value(item, 'type') or 'PDF'}",
+                filename=filename,
+                filepath=f"uyap/{case.year}/{case.id}/{filename}",
+                user_id=self.user_id
+            ))
+            existing.add(filename)
+
+    def _apply_hearing(self, case, next_hearing):
+        """Sonraki duruşmayı dosyaya ve takvime yazar; ertelenen duruşmanın etkinliği taşınır"""
+        hearing_date, hearing_time = parse_hearing(next_hearing)
+        if hearing_date is None:
+            return
+        previous_date = case.next_hearing
+        case.next_hearing = hearing_date
+        if hearing_time:
+            case.hearing_time = hearing_time.strftime('%H:%M')
+
+        events = CalendarEvent.query.filter(CalendarEvent.case_id == case.id,
+                                            CalendarEvent.event_type.in_(HEARING_TYPES))
+        event = events.filter(CalendarEvent.date == hearing_date).first()
+        if event is None and previous_date and previous_date != hearing_date:
+            event = events.filter(CalendarEvent.date == previous_date,
+                                  CalendarEvent.is_completed.isnot(True)).first()
+        if event is None:
+            event = CalendarEvent(
+                title=f"{case.client_name} ({case.case_number})",
+                event_type=case.hearing_type or 'durusma',
+                description='',
+                user_id=self.user_id,
+                case_id=case.id
+            )
+            db.session.add(event)
+        event.date = hearing_date
+        event.time = hearing_time or event.time or dt_time(9, 0)
+        event.courthouse = case.courthouse
+        event.department = case.department
+        event.file_type = case.file_type
+
+
+def is_running(user_id):
+    with _running_lock:
+        return user_id in _running
+
+
+def is_due(user_id, now=None):
+    """Kullanıcının son başarılı eşitlemesi SYNC_CONFIG['interval_hours'] saatten eskiyse True"""
+    cursor = UyapSenkronImleci.query.filter_by(user_id=user_id).first()
+    if cursor is None or cursor.son_basarili is None:
+        return True
+    now = now or datetime.utcnow()
+    return now - cursor.son_basarili >= timedelta(hours=SYNC_CONFIG['interval_hours'])
+
+
+def sync_user(user_id, manager=None, full=False):
+    """
+    Kullanıcının UYAP oturumunu kiralayıp dosyalarını eşitler
+
+    Uygulama bağlamında çağrılır. Oturumda giriş yapılmamışsa giriş beklenir.
+
+    Raises:
+        UYAPSyncRunning: Kullanıcı için eşitleme zaten çalışıyorsa
+    """
+    with _running_lock:
+        if user_id in _running:
+            raise UYAPSyncRunning("UYAP eşitlemesi zaten çalışıyor")
+        _running.add(user_id)
+    try:
+        if not API_CONFIG['enabled']:
+            raise UYAPApiError("UYAP eşitlemesi için veri servisi (API_CONFIG['enabled']) açık olmalı")
+        if manager is None:
+            from uyap_integration_advanced import UYAPManager
+            manager = UYAPManager()
+        with manager.session(user_id) as uyap:
+            return UYAPSync(user_id, uyap.fetch_files, uyap.fetch_file_details).run(full=full)
+    finally:
+        with _running_lock:
+            _running.discard(user_id)
+
+
+def run_due(manager, now=None):
+    """
+    Oturumu açık ve eşitleme zamanı gelmiş kullanıcıları eşitler
+
+    Returns:
+        list: Eşitlenen kullanıcı ID'leri
+    """
+    synced = []
+    for user_id in manager.pool.active_owners():
+        if not is_due(user_id, now):
+            continue
+        try:
+            sync_user(user_id, manager)
+            synced.append(user_id)
+        except UYAPSyncRunning:
+            continue
+        except Exception as e:
+            logger.error(f"Zamanlanmış UYAP eşitlemesi başarısız (kullanıcı {user_id}): {str(e)}")
+    return synced
+
+
+def start_scheduler(app, manager=None, check_interval=None):
+    """Eşitleme zamanı gelen kullanıcıları düzenli kontrol eden arka plan iş parçacığını başlatır"""
+    check_interval = check_interval or SYNC_CONFIG['check_interval']
+    stop_event = threading.Event()
+
+    def run():
+        while not stop_event.wait(check_interval):
+            try:
+                with app.app_context():
+                    from uyap_integration_advanced import UYAPManager
+                    run_due(manager or UYAPManager())
+            except Exception as e:
+                logger.error(f"UYAP eşitleme zamanlayıcısı hatası: {str(e)}")
+
+    thread = threading.Thread(target=run, name='uyap-senkron-zamanlayici', daemon=True)
+    thread.start()
+    return stop_event
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    import argparse
+
+    sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+    parser = argparse.ArgumentParser(description="UYAP dosyalarını yerel kayıtlarla eşitler")
+    parser.add_argument('--user', type=int, required=True, help="Eşitlenecek kullanıcı ID'si")
+    parser.add_argument('--full', action='store_true', help="Değişmemiş dosyaların detaylarını da çek")
+    args = parser.parse_args()
+
+    from app_factory import create_app
+    app = create_app()
+
+    logging.basicConfig(level=logging.INFO)
+    with app.app_context():
+        db.create_all()
+        try:
+            print(json.dumps(sync_user(args.user, full=args.full), ensure_ascii=False, indent=2))
+        finally:
+            from uyap_integration_advanced import UYAPManager
+            UYAPManager().cleanup()
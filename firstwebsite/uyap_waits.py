@@ -0,0 +1,299 @@
+"""
+UYAP otomasyonu için olay tabanlı bekleme koşulları
+
+Sabit `time.sleep` beklemeleri yerine portalın gerçekten hazır olduğunu
+gösteren koşullar sık aralıkla yoklanır:
+
+- Sayfa hazır: document.readyState == 'complete'
+- Ağ boşta: jQuery.active, izlenen XHR/fetch istekleri ve son kaynak
+  yüklemesinden bu yana geçen süre
+- Tablo yüklendi: DevExtreme yükleme paneli görünmüyor ve
+  table.dx-datagrid-table sayfada
+- İndirme tamamlandı: hedef dosya var, .crdownload/.tmp yok ve boyutu sabit
+
+Her adımın süresi StepTimer ile ölçülür; özet UYAPManager.get_step_timings()
+ve /api/uyap/timings üzerinden görülebilir.
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+
+from uyap_config import PERFORMANCE_CONFIG, WEBDRIVER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Koşulların yoklanma aralığı (saniye)
+POLL_INTERVAL = 0.1
+# Son ağ hareketinden sonra sayfanın boşta sayılması için geçmesi gereken süre (ms)
+NETWORK_QUIET_MS = 300
+
+
+def element_timeout():
+    """Eleman bekleme süresi; yapılandırma değişikliği hemen geçerli olur"""
+    return PERFORMANCE_CONFIG.get('element_wait_timeout', 15)
+
+
+def page_timeout():
+    """Sayfa ve tablo yükleme bekleme süresi"""
+    return WEBDRIVER_CONFIG.get('page_load_timeout', 30)
+
+
+# XHR ve fetch isteklerini sayar; sayfa yenilendiğinde yeniden kurulur
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__uyapNet) { return; }
+    var net = window.__uyapNet = {pending: 0, last: performance.now()};
+    function done() {
+        net.pending = Math.max(0, net.pending - 1);
+        net.last = performance.now();
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        net.pending++;
+        net.last = performance.now();
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            net.pending++;
+            net.last = performance.now();
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+})();
+"""
+
+NETWORK_STATE_JS = NETWORK_TRACKER_JS + """
+var net = window.__uyapNet;
+var last = net.last;
+var entries = performance.getEntriesByType('resource');
+if (entries.length) { last = Math.max(last, entries[entries.length - 1].responseEnd); }
+return {
+    ready: document.readyState,
+    pending: net.pending + (window.jQuery ? window.jQuery.active : 0),
+    idle: performance.now() - last
+};
+"""
+
+# Görünür bir yükleme paneli yoksa istenen tabloyu, varsa null döndürür
+GRID_STATE_JS = """
+var loading = document.querySelectorAll('.dx-loadpanel-content, .dx-datagrid .dx-loadindicator');
+for (var i = 0; i < loading.length; i++) {
+    if (loading[i].offsetParent !== null) { return null; }
+}
+return document.querySelector(arguments[0]);
+"""
+
+
+class StepTimer:
+    """
+    Otomasyon adımlarının sürelerini ölçer
+
+    Kullanım:
+        with timer.step('arama'):
+            ...
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps = {}
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._steps.setdefault(name, []).append(seconds)
+        logger.info(f"UYAP adımı '{name}': {seconds:.2f} sn")
+
+    def summary(self):
+        """
+        Adım başına süre özeti
+
+        Returns:
+            dict: adım -> {'adet', 'toplam', 'ortalama', 'son', 'en_uzun'} (saniye)
+        """
+        with self._lock:
+            steps = {name: list(times) for name, times in self._steps.items()}
+        return {
+            name: {
+                'adet': len(times),
+                'toplam': round(sum(times), 3),
+                'ortalama': round(sum(times) / len(times), 3),
+                'son': round(times[-1], 3),
+                'en_uzun': round(max(times), 3),
+            }
+            for name, times in steps.items()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._steps.clear()
+
+
+def install_network_tracker(driver):
+    """
+    Ağ izleyicisini her yeni belgeye sayfa betiklerinden önce ekler
+
+    CDP desteklemeyen sürücülerde izleyici ilk kontrolde sayfaya eklenir;
+    bu durumda daha önce başlamış istekler yalnızca jQuery.active ve
+    performance kayıtlarıyla görülür.
+    """
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_TRACKER_JS})
+        return True
+    except (AttributeError, WebDriverException):
+        return False
+
+
+def document_ready(driver):
+    """Sayfa ve alt kaynakları yüklendiyse True"""
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+class network_idle:
+    """Bekleyen AJAX isteği yoksa ve ağ quiet_ms boyunca sessiz kaldıysa True"""
+
+    def __init__(self, quiet_ms=NETWORK_QUIET_MS):
+        self.quiet_ms = quiet_ms
+
+    def __call__(self, driver):
+        state = driver.execute_script(NETWORK_STATE_JS) or {}
+        return (state.get('ready') == 'complete'
+                and state.get('pending', 0) == 0
+                and state.get('idle', 0) >= self.quiet_ms)
+
+
+class grid_loaded:
+    """
+    DevExtreme tablosu yüklendiyse tablo elementini döndürür
+
+    Yükleme paneli görünürken, tablo henüz yokken ya da ağ isteği
+    sürerken False döner.
+    """
+
+    def __init__(self, selector="table.dx-datagrid-table", quiet_ms=NETWORK_QUIET_MS):
+        self.selector = selector
+        self.idle = network_idle(quiet_ms)
+
+    def __call__(self, driver):
+        if not self.idle(driver):
+            return False
+        return driver.execute_script(GRID_STATE_JS, self.selector) or False
+
+
+class logged_in:
+    """Giriş sonrası ana menü yüklendiyse True"""
+
+    def __init__(self, min_items=3, selector=".dx-menu-item"):
+        self.min_items = min_items
+        self.selector = selector
+
+    def __call__(self, driver):
+        return len(driver.find_elements(By.CSS_SELECTOR, self.selector)) > self.min_items
+
+
+class download_complete:
+    """
+    İndirme tamamlandıysa dosya yolunu döndürür
+
+    Chrome indirme sırasında dosyayı .crdownload uzantısıyla yazar. Dosya
+    yeniden adlandırıldıktan sonra boyutu iki kontrol arasında değişmiyorsa
+    indirme bitmiş sayılır.
+    """
+
+    TEMP_SUFFIXES = ('.crdownload', '.tmp', '.part')
+
+    def __init__(self, directory, filename):
+        self.path = os.path.join(directory, filename)
+        self._last_size = None
+
+    def __call__(self, driver=None):
+        if any(os.path.exists(self.path + suffix) for suffix in self.TEMP_SUFFIXES):
+            self._last_size = None
+            return False
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+        stable = size > 0 and size == self._last_size
+        self._last_size = size
+        return self.path if stable else False
+
+
+def wait_until(driver, condition, timeout=None, message=""):
+    """
+    Koşul sağlanana kadar POLL_INTERVAL aralığıyla bekler (varsayılan süre
+    PERFORMANCE_CONFIG['element_wait_timeout'])
+
+    Returns:
+        Koşulun döndürdüğü değer
+
+    Raises:
+        TimeoutException: Koşul süre içinde sağlanmazsa
+    """
+    return WebDriverWait(
+        driver, element_timeout() if timeout is None else timeout, poll_frequency=POLL_INTERVAL,
+        ignored_exceptions=(StaleElementReferenceException,)
+    ).until(condition, message)
+
+
+def wait_for_page(driver, timeout=None):
+    """Sayfa yüklenip ağ sessizleşene kadar bekler"""
+    return wait_until(driver, network_idle(), timeout or page_timeout(), "Sayfa hazır olmadı")
+
+
+def wait_for_grid(driver, selector="table.dx-datagrid-table", timeout=None):
+    """Sonuç tablosu yüklenene kadar bekler ve tablo elementini döndürür"""
+    return wait_until(driver, grid_loaded(selector), timeout or page_timeout(), "Sonuç tablosu yüklenmedi")
+
+
+def wait_for_port(host, port, timeout=15):
+    """
+    Yerel bir portun bağlantı kabul etmesini bekler (ör. Chrome hata ayıklama portu)
+
+    Raises:
+        TimeoutException: Port süre içinde açılmazsa
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=POLL_INTERVAL):
+                return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"{host}:{port} açılmadı")
+            time.sleep(POLL_INTERVAL)
+
+
+def wait_for_download(directory, filename, timeout=60):
+    """
+    İndirme bitene kadar bekler
+
+    Returns:
+        str: Dosya yolu, süre dolarsa None
+    """
+    condition = download_complete(directory, filename)
+    deadline = time.monotonic() + timeout
+    while True:
+        path = condition()
+        if path:
+            return path
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(POLL_INTERVAL)
@@ -0,0 +1,28 @@
+"""
+Üretim sunucusu için WSGI giriş noktası
+
+gunicorn (Linux/macOS) veya waitress (Windows) bu modüldeki `application`
+nesnesini sunar. Modül yüklenirken upload dizinleri, tablolar ve admin
+kullanıcısı bir kez hazırlanır; gunicorn preload_app ile bunu worker'lar
+çatallanmadan önce ana süreçte yapar. Arka plan işleri gunicorn altında
+worker'larda (gunicorn.conf.py post_fork), waitress altında burada başlar.
+
+Kullanım:
+    python start_app.py --production
+    gunicorn -c gunicorn.conf.py wsgi:application
+    waitress-serve --threads 8 wsgi:application
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import app, prepare_app, start_background_services
+
+prepare_app()
+
+if 'gunicorn' not in sys.modules:
+    start_background_services()
+
+application = app
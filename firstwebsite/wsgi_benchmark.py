@@ -0,0 +1,103 @@
+"""
+Çalışan sunucu için saniyedeki istek (RPS) ölçümü
+
+Admin kullanıcısı adına imzalı oturum çerezi üretilir ve ana sayfalar
+verilen eşzamanlılıkla belirli süre boyunca istenir. Sunucu ayrıca
+başlatılmalıdır (geliştirme sunucusu, gunicorn veya waitress).
+
+Kullanım:
+    python start_app.py --production --workers 3 --threads 4 &
+    python wsgi_benchmark.py --url http://127.0.0.1:8000 --duration 15 --concurrency 8
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+DEFAULT_PAGES = ['/', '/takvim', '/duyurular', '/odemeler', '/dosya_sorgula']
+
+
+def admin_session_cookie():
+    """Admin kullanıcısı için sunucunun kabul edeceği imzalı oturum çerezini döndürür"""
+    from app_factory import create_app
+    from models import User
+
+    app = create_app()
+    with app.app_context():
+        user = User.query.filter_by(is_admin=True).first()
+        if user is None:
+            raise SystemExit("Veritabanında admin kullanıcısı yok.")
+        serializer = app.session_interface.get_signing_serializer(app)
+        return app.config.get('SESSION_COOKIE_NAME', 'session'), serializer.dumps(
+            {'_user_id': str(user.id), '_fresh': True})
+
+
+def run(base_url, pages, duration, concurrency):
+    """
+    Sayfaları süre dolana kadar eşzamanlı ister
+
+    Returns:
+        dict: sayfa -> {'adet', 'hata', 'sureler'}
+    """
+    cookie_name, cookie_value = admin_session_cookie()
+    stats = defaultdict(lambda: {'adet': 0, 'hata': 0, 'sureler': []})
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset):
+        session = requests.Session()
+        session.cookies.set(cookie_name, cookie_value)
+        index = offset
+        while time.perf_counter() < deadline:
+            page = pages[index % len(pages)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                ok = session.get(base_url + page, allow_redirects=False, timeout=60).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                entry = stats[page]
+                entry['adet'] += 1
+                entry['hata'] += 0 if ok else 1
+                entry['sureler'].append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çalışan sunucu için RPS ölçümü")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="Sunucu adresi")
+    parser.add_argument('--duration', type=float, default=15, help="Ölçüm süresi (sn)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Eşzamanlı istemci sayısı")
+    parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES, help="İstenecek sayfalar")
+    args = parser.parse_args()
+
+    stats = run(args.url.rstrip('/'), args.pages, args.duration, args.concurrency)
+
+    print(f"{'Sayfa':<18}{'İstek':>8}{'Hata':>6}{'RPS':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    total = 0
+    for page in args.pages:
+        entry = stats[page]
+        times = sorted(entry['sureler']) or [0]
+        total += entry['adet']
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"{page:<18}{entry['adet']:>8}{entry['hata']:>6}{entry['adet'] / args.duration:>8.1f}"
+              f"{statistics.median(times) * 1000:>10.0f}{p95 * 1000:>10.0f}")
+    print(f"{'Toplam':<18}{total:>8}{'':>6}{total / args.duration:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -71,6 +71,7 @@ from bs4 import BeautifulSoup
 import time
 import html
 import json
+import threading
 
 # MCP modülleri artık unified_mcp_modules'tan import ediliyor
 # Eski import'lar kaldırıldı
@@ -180,18 +181,53 @@ class HttpRequestManager:
 # Global HTTP istek yöneticisi
 http_manager = HttpRequestManager()
 
+class LazyClient:
+    """
+    İlk erişimde oluşturulan mahkeme API istemcisi
+
+    İstemciler (ve açtıkları HTTP oturumları) yalnızca ilgili mahkemede
+    işlem yapıldığında kurulur; modülün import edilmesi bunları beklemez.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        with self._lock:
+            client = instance.__dict__.get(self.name)
+            if client is None:
+                client = instance.__dict__[self.name] = self.factory()
+        return client
+
+
 class YargiFlaskIntegration:
     """Yargı MCP modüllerini Flask ile entegre eden ana sınıf"""
-    
+
+    CLIENT_NAMES = ('yargitay_client', 'danistay_client', 'emsal_client', 'anayasa_client',
+                    'uyusmazlik_client', 'kik_client', 'rekabet_client')
+
+    yargitay_client = LazyClient(YargitayOfficialApiClient)
+    danistay_client = LazyClient(DanistayApiClient)
+    emsal_client = LazyClient(EmsalApiClient)
+    anayasa_client = LazyClient(AnayasaMahkemesiApiClient)
+    uyusmazlik_client = LazyClient(UyusmazlikApiClient)
+    kik_client = LazyClient(KikApiClient)
+    rekabet_client = LazyClient(RekabetKurumuApiClient)
+
     def __init__(self):
-        self.yargitay_client = YargitayOfficialApiClient()
-        self.danistay_client = DanistayApiClient()
-        self.emsal_client = EmsalApiClient()
-        self.anayasa_client = AnayasaMahkemesiApiClient()
-        self.uyusmazlik_client = UyusmazlikApiClient()
-        self.kik_client = KikApiClient()
-        self.rekabet_client = RekabetKurumuApiClient()
         self.http_manager = http_manager
+
+    def created_clients(self):
+        """Şimdiye kadar oluşturulmuş istemciler"""
+        return [self.__dict__[name] for name in self.CLIENT_NAMES if name in self.__dict__]
     
     def search_all_courts(self, 
                          keyword: str,
@@ -3224,13 +3260,8 @@ class YargiFlaskIntegration:
     async def close_all_clients(self):
         """Tüm client'ları kapat"""
         try:
-            await self.yargitay_client.close_client_session()
-            await self.danistay_client.close_client_session()
-            await self.emsal_client.close_client_session()
-            await self.anayasa_client.close_client_session()
-            await self.uyusmazlik_client.close_client_session()
-            await self.kik_client.close_client_session()
-            await self.rekabet_client.close_client_session()
+            for client in self.created_clients():
+                await client.close_client_session()
             # HTTP session'ı kapat
             if hasattr(self.http_manager.session, 'close'):
                 self.http_manager.session.close()